@@ -16,6 +16,7 @@ Decompile: binary map -> text-art for editing
 import argparse
 import json
 import sys
+from functools import lru_cache
 from pathlib import Path
 
 # Overworld map dimensions
@@ -31,8 +32,12 @@ DUNGEON_LEVELS = 8
 DUNGEON_SIZE = DUNGEON_LEVEL_SIZE * DUNGEON_LEVELS  # 2048
 
 
+@lru_cache(maxsize=None)
 def _load_tile_tables():
-    """Load tile character tables from constants.py or use built-in defaults."""
+    """Load tile character tables from constants.py or use built-in defaults.
+
+    Built once per process; callers must not modify the returned dicts.
+    """
     try:
         from ult3edit.constants import (
             TILE_CHARS_REVERSE, DUNGEON_TILE_CHARS_REVERSE,
@@ -52,6 +57,14 @@ def _load_tile_tables():
         return ({}, {}, {}, {})
 
 
+@lru_cache(maxsize=None)
+def _translate_table(is_dungeon):
+    """str.translate table mapping each tile character to its tile byte."""
+    _, overworld_reverse, _, dungeon_reverse = _load_tile_tables()
+    char_map = dungeon_reverse if is_dungeon else overworld_reverse
+    return {ord(ch): chr(tile) for ch, tile in char_map.items()}
+
+
 def parse_map_file(text, is_dungeon=False):
     """Parse a .map text file into grid data.
 
@@ -65,6 +78,7 @@ def parse_map_file(text, is_dungeon=False):
     """
     _, overworld_reverse, _, dungeon_reverse = _load_tile_tables()
     char_map = dungeon_reverse if is_dungeon else overworld_reverse
+    table = _translate_table(is_dungeon)
 
     lines = text.split('\n')
     grid_lines = []
@@ -83,18 +97,16 @@ def parse_map_file(text, is_dungeon=False):
                     current_level = []
             continue
 
-        # Parse row of tile characters
-        row = []
-        unknown_chars = set()
-        for ch in stripped:
-            if ch in char_map:
-                row.append(char_map[ch])
-            else:
-                unknown_chars.add(ch)
-                row.append(0)  # Default to first tile type
+        # Parse row of tile characters: one translate to tile bytes
+        unknown_chars = set(stripped).difference(char_map)
         if unknown_chars:
             print(f"Warning: unknown tile character(s) {unknown_chars!r} "
                   f"treated as tile 0", file=sys.stderr)
+            # Default to first tile type
+            row_table = {**table, **dict.fromkeys(map(ord, unknown_chars), '\x00')}
+        else:
+            row_table = table
+        row = list(stripped.translate(row_table).encode('latin-1'))
 
         if is_dungeon:
             width = DUNGEON_WIDTH
@@ -405,35 +405,11 @@ if [ -d "$SOURCES_DIR" ]; then
         echo "  Compiled and imported tile graphics (256 tiles)"
     fi
 
-    # Compile and import overworld map (via ult3edit map compile)
-    MAPA_SRC="${SOURCES_DIR}/mapa.map"
-    MAPA=$(find_file "MAPA")
-    if [ -f "$MAPA_SRC" ] && [ -f "$MAPA" ]; then
-        ult3edit map compile "$MAPA_SRC" -o "$MAPA" 2>/dev/null || true
-        echo "  Compiled and imported overworld map"
-    fi
-
-    # Compile and import surface maps (castles + towns, 12 files)
-    for letter in b c d e f g h i j k l z; do
-        MAP_UPPER=$(echo "$letter" | tr '[:lower:]' '[:upper:]')
-        MAP_SRC="${SOURCES_DIR}/map${letter}.map"
-        MAP_FILE=$(find_file "MAP${MAP_UPPER}")
-        if [ -f "$MAP_SRC" ] && [ -f "$MAP_FILE" ]; then
-            ult3edit map compile "$MAP_SRC" -o "$MAP_FILE" 2>/dev/null || true
-        fi
-    done
-    echo "  Compiled and imported 12 surface maps"
-
-    # Compile and import dungeon maps (7 dungeons, 8 levels each)
-    for letter in m n o p q r s; do
-        MAP_UPPER=$(echo "$letter" | tr '[:lower:]' '[:upper:]')
-        MAP_SRC="${SOURCES_DIR}/map${letter}.map"
-        MAP_FILE=$(find_file "MAP${MAP_UPPER}")
-        if [ -f "$MAP_SRC" ] && [ -f "$MAP_FILE" ]; then
-            ult3edit map compile "$MAP_SRC" --dungeon -o "$MAP_FILE" 2>/dev/null || true
-        fi
-    done
-    echo "  Compiled and imported 7 dungeon maps"
+    # Compile and import all 20 maps: overworld, 12 castles/towns and 7
+    # dungeons (8 levels each, detected from their "# Level" headers).
+    # Sources are compiled in parallel; unchanged ones are skipped on re-runs.
+    ult3edit map compile-all "$SOURCES_DIR" "$GAME_DIR" 2>/dev/null || true
+    echo "  Compiled and imported overworld, 12 surface maps and 7 dungeon maps"
 
     # Compile and apply name table (via ult3edit patch compile-names)
     NAMES_SRC="${SOURCES_DIR}/names.names"
@@ -33,3 +33,58 @@ def int_to_bcd16(val: int) -> tuple[int, int]:
 def is_valid_bcd(b: int) -> bool:
     """Check if a byte contains valid BCD (each nibble 0-9)."""
     return (b & 0x0F) <= 9 and ((b >> 4) & 0x0F) <= 9
+
+
+# ============================================================================
+# Bulk (whole-buffer) codec
+# ============================================================================
+# Precomputed 256-entry tables let a whole record, roster, or PLRS buffer be
+# decoded with one bytes.translate() call. Decoded values fit in a byte even
+# for invalid BCD ($FF decodes to 165, matching bcd_to_int).
+
+BCD_DECODE_TABLE = bytes(bcd_to_int(b) for b in range(256))
+BCD_ENCODE_TABLE = bytes(int_to_bcd(v) for v in range(100))
+_INVALID_BCD = frozenset(b for b in range(256) if not is_valid_bcd(b))
+_VALID_BCD_BYTES = bytes(b for b in range(256) if is_valid_bcd(b))
+
+
+def decode_bcd_bytes(data: bytes | bytearray | memoryview) -> bytes:
+    """Decode every byte of a buffer as single-byte BCD (result[i] = value)."""
+    return bytes(data).translate(BCD_DECODE_TABLE)
+
+
+def decode_bcd16_values(data: bytes | bytearray | memoryview) -> list[int]:
+    """Decode consecutive big-endian two-byte BCD values from a buffer."""
+    d = decode_bcd_bytes(data)
+    return [hi * 100 + lo for hi, lo in zip(d[0::2], d[1::2])]
+
+
+def encode_bcd_bytes(values) -> bytes:
+    """Encode integers as single-byte BCD, clamping each to 0-99."""
+    return bytes(BCD_ENCODE_TABLE[max(0, min(99, v))] for v in values)
+
+
+def encode_bcd16_bytes(values) -> bytes:
+    """Encode integers as big-endian two-byte BCD, clamping each to 0-9999."""
+    out = bytearray()
+    for v in values:
+        v = max(0, min(9999, v))
+        out.append(BCD_ENCODE_TABLE[v // 100])
+        out.append(BCD_ENCODE_TABLE[v % 100])
+    return bytes(out)
+
+
+def all_valid_bcd(data: bytes | bytearray | memoryview) -> bool:
+    """Check that every byte in a buffer is valid BCD."""
+    return not bytes(data).translate(None, _VALID_BCD_BYTES)
+
+
+def find_invalid_bcd(data: bytes | bytearray | memoryview) -> list[int]:
+    """Return the indices of bytes that are not valid BCD.
+
+    Valid buffers (the common case) are detected with a single translate
+    call before falling back to a per-byte scan.
+    """
+    if all_valid_bcd(data):
+        return []
+    return [i for i, b in enumerate(bytes(data)) if b in _INVALID_BCD]
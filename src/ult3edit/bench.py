@@ -0,0 +1,443 @@
+"""Ultima III: Exodus - Performance Benchmarks.
+
+Times the hot paths of the toolkit against synthetic game data (the same
+kind of fixtures the test suite builds; no real game files needed):
+  load_roster, load_monsters, render_map, parse_tlk_data,
+  encode_hgr_image, read_png / write_png, build_prodos_image,
+  diff_directories, _extract_inline_strings
+
+Each benchmark reports the best per-call time over several repeats.
+Results can be saved as a JSON baseline and later runs compared against
+it; any benchmark slower than the baseline by more than the threshold
+is reported as a regression and the command exits non-zero. Timings
+only compare meaningfully on the machine that recorded the baseline.
+
+Usage:
+    ult3edit bench                                    # Run all benchmarks
+    ult3edit bench render_map load_roster             # Run selected ones
+    ult3edit bench --save local.json                  # Record a baseline
+    ult3edit bench --baseline local.json --threshold 0.2
+    python -m ult3edit.bench --json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import timeit
+
+from .bcd import int_to_bcd, int_to_bcd16
+from .constants import (
+    CHAR_RECORD_SIZE, CHAR_MAX_SLOTS, CHAR_NAME_OFFSET, CHAR_STATUS,
+    CHAR_STR, CHAR_DEX, CHAR_INT, CHAR_WIS, CHAR_RACE, CHAR_CLASS, CHAR_GENDER,
+    CHAR_HP_HI, CHAR_MAX_HP_HI, CHAR_GOLD_HI, CHAR_FOOD_HI,
+    MON_FILE_SIZE, MON_LETTERS, MAP_OVERWORLD_SIZE, CON_FILE_SIZE, PRTY_FILE_SIZE,
+    CON_MAP_WIDTH, CON_MONSTER_COUNT, CON_PC_COUNT,
+    CON_MONSTER_X_OFFSET, CON_MONSTER_Y_OFFSET, CON_PC_X_OFFSET, CON_PC_Y_OFFSET,
+    TILES, JSR_46BA,
+)
+from .json_export import export_json
+
+# Bump when benchmark workloads change so old baselines are not compared.
+BASELINE_VERSION = 1
+
+# A run is a regression when best time exceeds baseline * (1 + threshold).
+DEFAULT_THRESHOLD = 0.25
+
+DEFAULT_REPEAT = 5
+
+# name -> setup(workdir) returning a zero-argument callable to time
+BENCHMARKS = {}
+
+
+def benchmark(name: str):
+    """Register a benchmark setup function under name."""
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+# =============================================================================
+# Synthetic fixtures
+# =============================================================================
+
+def _character(rng: random.Random, index: int) -> bytes:
+    rec = bytearray(CHAR_RECORD_SIZE)
+    name = f'HERO{index}'.encode('ascii')
+    rec[CHAR_NAME_OFFSET:CHAR_NAME_OFFSET + len(name)] = bytes(b | 0x80 for b in name)
+    rec[CHAR_STATUS] = ord('G')
+    for off in (CHAR_STR, CHAR_DEX, CHAR_INT, CHAR_WIS):
+        rec[off] = int_to_bcd(rng.randint(10, 50))
+    rec[CHAR_RACE] = ord(rng.choice('HEDBF'))
+    rec[CHAR_CLASS] = ord(rng.choice('FCWTPBLIDRA'))
+    rec[CHAR_GENDER] = ord(rng.choice('MFO'))
+    hp = rng.randint(100, 9999)
+    for off, value in ((CHAR_HP_HI, hp), (CHAR_MAX_HP_HI, hp),
+                       (CHAR_GOLD_HI, rng.randint(0, 9999)), (CHAR_FOOD_HI, rng.randint(100, 9999))):
+        rec[off:off + 2] = bytes(int_to_bcd16(value))
+    return bytes(rec)
+
+
+def make_roster(rng: random.Random) -> bytes:
+    """A full 20-slot roster."""
+    return b''.join(_character(rng, i) for i in range(CHAR_MAX_SLOTS))
+
+
+def make_monsters(rng: random.Random) -> bytes:
+    """A 256-byte columnar MON file with 16 populated monsters."""
+    return bytes(rng.randint(0, 0x7F) for _ in range(MON_FILE_SIZE))
+
+
+def make_map(rng: random.Random) -> bytes:
+    """A 64x64 overworld map of random known tiles."""
+    tiles = sorted(TILES)
+    return bytes(rng.choice(tiles) for _ in range(MAP_OVERWORLD_SIZE))
+
+
+def make_tlk(rng: random.Random, records: int = 64) -> bytes:
+    """A TLK file of multi-line high-ASCII dialog records."""
+    words = ['THE', 'EXODUS', 'LORD', 'BRITISH', 'SEEK', 'MOONGATE', 'MARK', 'FIRE']
+    out = bytearray()
+    for _ in range(records):
+        lines = [' '.join(rng.choice(words) for _ in range(4)) for _ in range(3)]
+        text = '\xff'.join(lines)
+        out += bytes(ord(ch) | 0x80 if ch != '\xff' else 0xFF for ch in text) + b'\x00'
+    return bytes(out)
+
+
+def make_engine_binary(rng: random.Random, strings: int = 250) -> bytes:
+    """Code-like filler with JSR $46BA inline strings scattered through it."""
+    out = bytearray()
+    for i in range(strings):
+        out += bytes(rng.randint(0, 0xFF) & 0xDF for _ in range(rng.randint(8, 40)))
+        out += JSR_46BA + bytes(ord(ch) | 0x80 for ch in f'STRING NUMBER {i}') + b'\x00'
+    return bytes(out)
+
+
+def make_pixels(rng: random.Random, width: int, height: int) -> list:
+    """A smooth RGB gradient with a little noise."""
+    pixels = []
+    for y in range(height):
+        for x in range(width):
+            n = rng.randint(-16, 16)
+            pixels.append((max(0, min(255, x * 255 // width + n)),
+                           max(0, min(255, y * 255 // height + n)),
+                           128))
+    return pixels
+
+
+def make_combat_map(rng: random.Random) -> bytes:
+    """A 192-byte CON file with random tiles and in-grid start positions."""
+    data = bytearray(rng.choice(sorted(TILES)) for _ in range(CON_FILE_SIZE))
+    for off, count in ((CON_MONSTER_X_OFFSET, CON_MONSTER_COUNT), (CON_MONSTER_Y_OFFSET, CON_MONSTER_COUNT),
+                       (CON_PC_X_OFFSET, CON_PC_COUNT), (CON_PC_Y_OFFSET, CON_PC_COUNT)):
+        data[off:off + count] = bytes(rng.randrange(CON_MAP_WIDTH) for _ in range(count))
+    return bytes(data)
+
+
+def make_game_dir(path: str, rng: random.Random) -> None:
+    """Write a synthetic game directory (roster, party, bestiary, maps, dialog)."""
+    os.makedirs(path, exist_ok=True)
+    files = {
+        'ROST': make_roster(rng),
+        'PLRS': make_roster(rng)[:4 * CHAR_RECORD_SIZE],
+        'PRTY': bytes(PRTY_FILE_SIZE),
+        'MAPA': make_map(rng),
+        'MAPB': make_map(rng),
+        'CONA': make_combat_map(rng),
+        'TLKA': make_tlk(rng),
+    }
+    for letter in MON_LETTERS:
+        files[f'MON{letter}'] = make_monsters(rng)
+    for name, data in files.items():
+        with open(os.path.join(path, name), 'wb') as f:
+            f.write(data)
+
+
+# =============================================================================
+# Benchmarks
+# =============================================================================
+
+@benchmark('load_roster')
+def _bench_load_roster(workdir: str):
+    from .roster import load_roster
+    path = os.path.join(workdir, 'ROST')
+    with open(path, 'wb') as f:
+        f.write(make_roster(random.Random(1)))
+
+    def run():
+        chars, _ = load_roster(path)
+        for c in chars:
+            c.to_dict()
+    return run
+
+
+@benchmark('load_monsters')
+def _bench_load_monsters(workdir: str):
+    from .bestiary import load_monsters
+    data = make_monsters(random.Random(2))
+    return lambda: load_monsters(data)
+
+
+@benchmark('render_map')
+def _bench_render_map(workdir: str):
+    from .map import render_map
+    data = make_map(random.Random(3))
+    return lambda: render_map(data, 64, 64)
+
+
+@benchmark('parse_tlk_data')
+def _bench_parse_tlk_data(workdir: str):
+    from .tlk import parse_tlk_data
+    data = make_tlk(random.Random(4))
+    return lambda: parse_tlk_data(data)
+
+
+@benchmark('encode_hgr_image')
+def _bench_encode_hgr_image(workdir: str):
+    from .exod import encode_hgr_image
+    width, height = 140, 48
+    pixels = make_pixels(random.Random(5), width, height)
+    return lambda: encode_hgr_image(pixels, width, height)
+
+
+@benchmark('write_png')
+def _bench_write_png(workdir: str):
+    from .shapes import write_png
+    width, height = 280, 192
+    pixels = make_pixels(random.Random(6), width, height)
+    path = os.path.join(workdir, 'write.png')
+    return lambda: write_png(path, pixels, width, height)
+
+
+@benchmark('read_png')
+def _bench_read_png(workdir: str):
+    from .exod import read_png
+    from .shapes import write_png
+    width, height = 280, 192
+    path = os.path.join(workdir, 'read.png')
+    write_png(path, make_pixels(random.Random(7), width, height), width, height)
+    return lambda: read_png(path)
+
+
+@benchmark('build_prodos_image')
+def _bench_build_prodos_image(workdir: str):
+    from .disk import build_prodos_image
+    rng = random.Random(8)
+    files = [{'name': f'FILE{i:02d}', 'data': bytes(rng.randrange(256) for _ in range(size)),
+              'file_type': 0x06, 'aux_type': 0x0000, 'subdir': 'GAME' if i % 2 else None}
+             for i, size in enumerate([256, 1280, 4096, 17000, 40000, 140000] * 2)]
+    path = os.path.join(workdir, 'bench.po')
+    return lambda: build_prodos_image(path, files)
+
+
+@benchmark('diff_directories')
+def _bench_diff_directories(workdir: str):
+    from .diff import diff_directories
+    dir1 = os.path.join(workdir, 'game1')
+    dir2 = os.path.join(workdir, 'game2')
+    make_game_dir(dir1, random.Random(9))
+    make_game_dir(dir2, random.Random(10))
+    return lambda: diff_directories(dir1, dir2)
+
+
+@benchmark('_extract_inline_strings')
+def _bench_extract_inline_strings(workdir: str):
+    from .patch import _extract_inline_strings
+    data = make_engine_binary(random.Random(11))
+    return lambda: _extract_inline_strings(data)
+
+
+# =============================================================================
+# Runner and baselines
+# =============================================================================
+
+def run_benchmarks(names: list[str] | None = None, repeat: int = DEFAULT_REPEAT,
+                   number: int = 0) -> dict:
+    """Run benchmarks and return {name: {'best', 'mean', 'number'}} in seconds per call.
+
+    number=0 picks the loop count automatically (timeit autorange, ~0.2s per repeat).
+    Raises ValueError for unknown benchmark names.
+    """
+    names = list(names) if names else list(BENCHMARKS)
+    unknown = [n for n in names if n not in BENCHMARKS]
+    if unknown:
+        raise ValueError(f"Unknown benchmark(s): {', '.join(unknown)}. "
+                         f"Available: {', '.join(BENCHMARKS)}")
+    results = {}
+    workdir = tempfile.mkdtemp(prefix='ult3edit_bench_')
+    try:
+        for name in names:
+            func = BENCHMARKS[name](workdir)
+            timer = timeit.Timer(func)
+            loops = number or timer.autorange()[0]
+            times = [t / loops for t in timer.repeat(repeat=repeat, number=loops)]
+            results[name] = {
+                'best': min(times),
+                'mean': sum(times) / len(times),
+                'number': loops,
+            }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def compare(results: dict, baseline: dict,
+            threshold: float = DEFAULT_THRESHOLD) -> list[dict]:
+    """Compare results against baseline results; return one row per shared benchmark.
+
+    Each row has name, baseline, current (best seconds), ratio and a
+    regression flag set when current exceeds baseline by more than threshold.
+    """
+    rows = []
+    for name, res in results.items():
+        base = baseline.get(name)
+        if not base or not base.get('best'):
+            continue
+        ratio = res['best'] / base['best']
+        rows.append({
+            'name': name,
+            'baseline': base['best'],
+            'current': res['best'],
+            'ratio': ratio,
+            'regression': ratio > 1 + threshold,
+        })
+    return rows
+
+
+def load_baseline(path: str) -> dict:
+    """Load baseline results from JSON. Raises ValueError if stale or malformed."""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if not isinstance(data, dict) or data.get('version') != BASELINE_VERSION:
+        raise ValueError(f"Baseline {path} is from a different benchmark version; re-record it")
+    results = data.get('results')
+    if not isinstance(results, dict):
+        raise ValueError(f"Baseline {path} has no results")
+    return results
+
+
+def save_baseline(path: str, results: dict) -> None:
+    """Write results as a JSON baseline."""
+    parent = os.path.dirname(path)
+    if parent:
+        os.makedirs(parent, exist_ok=True)
+    data = {
+        'version': BASELINE_VERSION,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+        f.write('\n')
+
+
+def _format_time(seconds: float) -> str:
+    if seconds >= 1:
+        return f'{seconds:.3f} s'
+    if seconds >= 1e-3:
+        return f'{seconds * 1e3:.3f} ms'
+    return f'{seconds * 1e6:.1f} us'
+
+
+def format_text(results: dict, rows: list[dict] | None = None) -> str:
+    """Format benchmark results (and optional baseline comparison) as text."""
+    by_name = {r['name']: r for r in rows or []}
+    lines = [f"{'Benchmark':<26s} {'Best':>12s} {'Mean':>12s} {'Loops':>7s}"
+             + (f" {'Baseline':>12s} {'Change':>8s}" if rows is not None else '')]
+    for name, res in results.items():
+        line = (f"{name:<26s} {_format_time(res['best']):>12s} "
+                f"{_format_time(res['mean']):>12s} {res['number']:>7d}")
+        row = by_name.get(name)
+        if row:
+            flag = '  REGRESSION' if row['regression'] else ''
+            line += (f" {_format_time(row['baseline']):>12s} "
+                     f"{(row['ratio'] - 1) * 100:>+7.1f}%{flag}")
+        elif rows is not None:
+            line += f" {'-':>12s} {'-':>8s}"
+        lines.append(line)
+    return '\n'.join(lines)
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def cmd_bench(args) -> None:
+    """Run benchmarks, optionally saving or comparing a baseline."""
+    if args.list:
+        for name in BENCHMARKS:
+            print(name)
+        return
+    try:
+        results = run_benchmarks(args.names, args.repeat, args.number)
+        baseline = load_baseline(args.baseline) if args.baseline else None
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    rows = compare(results, baseline, args.threshold) if baseline is not None else None
+    if args.save:
+        save_baseline(args.save, results)
+
+    if args.json:
+        report = {'results': results}
+        if rows is not None:
+            report['comparison'] = rows
+        export_json(report, args.output)
+    else:
+        print(format_text(results, rows))
+        if args.save:
+            print(f"Baseline saved to {args.save}")
+
+    regressions = [r['name'] for r in rows or [] if r['regression']]
+    if regressions:
+        print(f"Regression beyond {args.threshold:.0%}: {', '.join(regressions)}",
+              file=sys.stderr)
+        sys.exit(1)
+
+
+def _add_args(p) -> None:
+    p.add_argument('names', nargs='*', metavar='NAME',
+                   help='Benchmarks to run (default: all; see --list)')
+    p.add_argument('--list', action='store_true', help='List available benchmarks')
+    p.add_argument('--repeat', type=int, default=DEFAULT_REPEAT,
+                   help=f'Timing repeats per benchmark (default: {DEFAULT_REPEAT})')
+    p.add_argument('--number', type=int, default=0,
+                   help='Calls per repeat (default: auto)')
+    p.add_argument('--baseline', help='Compare against this JSON baseline')
+    p.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                   help=f'Allowed slowdown vs baseline as a fraction (default: {DEFAULT_THRESHOLD})')
+    p.add_argument('--save', help='Save results as a JSON baseline')
+    p.add_argument('--json', action='store_true', help='Output as JSON')
+    p.add_argument('--output', '-o', help='Output file (for --json)')
+
+
+def register_parser(subparsers) -> None:
+    """Register bench subcommand on a CLI subparser group."""
+    p = subparsers.add_parser('bench', help='Run performance benchmarks')
+    _add_args(p)
+
+
+def dispatch(args) -> None:
+    """Dispatch bench command."""
+    cmd_bench(args)
+
+
+def main() -> None:
+    """Standalone entry point."""
+    parser = argparse.ArgumentParser(
+        description='Ultima III: Exodus - Performance Benchmarks')
+    _add_args(parser)
+    args = parser.parse_args()
+    cmd_bench(args)
+
+
+if __name__ == '__main__':
+    main()
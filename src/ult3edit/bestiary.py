@@ -9,9 +9,11 @@ Bug fixes from prototype:
 """
 
 import argparse
+import hashlib
 import json
 import os
 import sys
+from bisect import bisect_left, insort
 
 from .constants import (
     MON_FILE_SIZE, MON_ATTR_COUNT, MON_MONSTERS_PER_FILE, MON_ATTR_NAMES,
@@ -25,26 +27,55 @@ from .constants import (
     MON_TERRAIN, MON_LETTERS, MONSTER_NAMES, MONSTER_NAMES_REVERSE,
     TILES,
 )
-from .fileutil import resolve_game_file, backup_file, hex_int
+from .fileutil import (
+    resolve_game_file, resolve_single_file, find_game_files, backup_file, hex_int, job_count,
+    load_json_cache, save_json_cache,
+)
 from .json_export import export_json
+from .query import read_roster_source
+from .roster import Roster
+from .simulate import select_party, party_stats, monster_stats, simulate_groups
+
+
+# Attribute name -> row (column-major: row r holds attribute r of all 16 monsters)
+MON_COLUMNS = {
+    'tile1': MON_ATTR_TILE1, 'tile2': MON_ATTR_TILE2,
+    'flags1': MON_ATTR_FLAGS1, 'flags2': MON_ATTR_FLAGS2,
+    'hp': MON_ATTR_HP, 'attack': MON_ATTR_ATTACK,
+    'defense': MON_ATTR_DEFENSE, 'speed': MON_ATTR_SPEED,
+    'ability1': MON_ATTR_ABILITY1, 'ability2': MON_ATTR_ABILITY2,
+}
+
+
+class _Attr:
+    """Descriptor for one attribute byte of a monster's row view."""
+
+    def __init__(self, row: int):
+        self.row = row
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        return obj.raw[self.row]
+
+    def __set__(self, obj, value: int) -> None:
+        obj.raw[self.row] = value
 
 
 class Monster:
-    """A single monster extracted from columnar MON data."""
+    """A single monster extracted from columnar MON data.
+
+    raw holds the monster's attribute bytes in row order. A memoryview is
+    kept as a live (strided) view into its Bestiary buffer; a list or
+    bytes is copied.
+    """
+
+    __slots__ = ('raw', 'index', 'file_letter')
 
-    def __init__(self, attrs: list[int], index: int, file_letter: str = ''):
+    def __init__(self, attrs: list[int] | memoryview, index: int, file_letter: str = ''):
+        self.raw = attrs if isinstance(attrs, memoryview) else bytearray(attrs)
         self.index = index
         self.file_letter = file_letter
-        self.tile1 = attrs[MON_ATTR_TILE1]
-        self.tile2 = attrs[MON_ATTR_TILE2]
-        self.flags1 = attrs[MON_ATTR_FLAGS1]
-        self.flags2 = attrs[MON_ATTR_FLAGS2]
-        self.hp = attrs[MON_ATTR_HP]
-        self.attack = attrs[MON_ATTR_ATTACK]
-        self.defense = attrs[MON_ATTR_DEFENSE]
-        self.speed = attrs[MON_ATTR_SPEED]
-        self.ability1 = attrs[MON_ATTR_ABILITY1]
-        self.ability2 = attrs[MON_ATTR_ABILITY2]
 
     @property
     def is_empty(self) -> bool:
@@ -131,6 +162,88 @@ class Monster:
             print()
 
 
+for _name, _row in MON_COLUMNS.items():
+    setattr(Monster, _name, _Attr(_row))
+del _name, _row
+
+
+def scale_table(factor: float, maximum: int = 255) -> bytes:
+    """256-entry translate table: round(value * factor), clamped to 0..maximum."""
+    return bytes(max(0, min(maximum, 255, round(v * factor))) for v in range(256))
+
+
+def cap_table(maximum: int) -> bytes:
+    """256-entry translate table: min(value, maximum)."""
+    return bytes(min(v, max(0, maximum)) for v in range(256))
+
+
+class Bestiary:
+    """One MON file held as a single buffer with zero-copy views.
+
+    columns maps each attribute name to a 16-byte memoryview of its row
+    (one byte per monster); monsters are Monster objects whose raw is a
+    strided view of the same buffer. Column-wide changes are one slice
+    assignment (see map_column), edits from either side land directly in
+    data, and save() is a single write. Rows past the 10 attributes are
+    preserved untouched.
+    """
+
+    __slots__ = ('data', 'columns', 'monsters', 'file_letter', 'path')
+
+    def __init__(self, data: bytes | bytearray, file_letter: str = '',
+                 path: str | None = None):
+        n = MON_MONSTERS_PER_FILE
+        if len(data) < MON_ATTR_COUNT * n:
+            raise ValueError(f"MON file too small ({len(data)} bytes, need at least {MON_ATTR_COUNT * n})")
+        self.data = data if isinstance(data, bytearray) else bytearray(data)
+        self.file_letter = file_letter
+        self.path = path
+        view = memoryview(self.data)
+        self.columns = {name: view[row * n:(row + 1) * n] for name, row in MON_COLUMNS.items()}
+        self.monsters = [Monster(view[i::n], i, file_letter) for i in range(n)]
+
+    @classmethod
+    def load(cls, path: str, file_letter: str = '') -> 'Bestiary':
+        """Read a MON file into one buffer."""
+        with open(path, 'rb') as f:
+            return cls(bytearray(f.read()), file_letter, path)
+
+    def __len__(self) -> int:
+        return len(self.monsters)
+
+    def __iter__(self):
+        return iter(self.monsters)
+
+    def __getitem__(self, index: int) -> Monster:
+        return self.monsters[index]
+
+    def map_column(self, name: str, table: bytes) -> int:
+        """Remap every byte of a column through a 256-entry table.
+
+        Returns the number of monsters whose value changed.
+        """
+        col = self.columns[name]
+        old = bytes(col)
+        new = old.translate(table)
+        col[:] = new
+        return sum(a != b for a, b in zip(old, new))
+
+    def scale(self, name: str, factor: float, maximum: int = 255) -> int:
+        """Multiply a column by factor (rounded, clamped to maximum)."""
+        return self.map_column(name, scale_table(factor, maximum))
+
+    def cap(self, name: str, maximum: int) -> int:
+        """Clamp a column to at most maximum."""
+        return self.map_column(name, cap_table(maximum))
+
+    def save(self, path: str | None = None) -> None:
+        """Write the buffer to path (default: the file it was loaded from)."""
+        path = path or self.path
+        with open(path, 'wb') as f:
+            f.write(self.data)
+        print(f"Saved to {path}")
+
+
 def validate_monster(monster: Monster) -> list[str]:
     """Check a monster for data integrity issues.
 
@@ -171,18 +284,10 @@ def validate_monster(monster: Monster) -> list[str]:
 
 
 def load_monsters(data: bytes, file_letter: str = '') -> list[Monster]:
-    """Extract 16 monsters from raw columnar MON data."""
+    """Extract 16 monsters from raw columnar MON data (views over a copy)."""
     if len(data) < MON_ATTR_COUNT * MON_MONSTERS_PER_FILE:
         return []
-
-    monsters = []
-    for i in range(MON_MONSTERS_PER_FILE):
-        attrs = []
-        for row in range(MON_ATTR_COUNT):
-            offset = row * MON_MONSTERS_PER_FILE + i
-            attrs.append(data[offset] if offset < len(data) else 0)
-        monsters.append(Monster(attrs, i, file_letter))
-    return monsters
+    return Bestiary(bytearray(data), file_letter).monsters
 
 
 def load_mon_file(path: str, file_letter: str = '') -> list[Monster]:
@@ -196,17 +301,156 @@ def save_mon_file(path: str, monsters: list[Monster],
                    original_data: bytes | None = None) -> None:
     """Write monsters back to columnar MON format, preserving unknown rows."""
     data = bytearray(original_data) if original_data else bytearray(MON_FILE_SIZE)
+    n = MON_MONSTERS_PER_FILE
     for m in monsters:
-        attrs = [m.tile1, m.tile2, m.flags1, m.flags2,
-                 m.hp, m.attack, m.defense, m.speed,
-                 m.ability1, m.ability2]
-        for row, val in enumerate(attrs):
-            data[row * MON_MONSTERS_PER_FILE + m.index] = val
+        # One strided slice per monster: rows 0-9 of column m.index
+        data[m.index:m.index + MON_ATTR_COUNT * n:n] = m.raw[:MON_ATTR_COUNT]
     with open(path, 'wb') as f:
         f.write(data)
     print(f"Saved to {path}")
 
 
+# =============================================================================
+# Monster index
+# =============================================================================
+
+INDEX_STATS = ('hp', 'attack', 'defense', 'speed')
+
+# MonsterIndex --cache version; entries store the INDEX_STATS columns by name
+INDEX_VERSION = 1
+
+
+def _mon_key(name: str) -> str:
+    """Normalize a MON path or name to its base file name (e.g. 'MONA')."""
+    return os.path.basename(name).split('#')[0].upper()
+
+
+class MonsterIndex:
+    """Name and stat index across a game's MON files.
+
+    files maps each MON file name to its content hash, its 16 monster
+    names ('' for empty slots) and its raw stat columns. names maps a
+    lowercased monster name to its (file, slot) locations; stats holds
+    each of INDEX_STATS as a sorted list of (value, file, slot) so range
+    queries are two bisects. update() re-decodes a file only when its
+    hash changes, so re-indexing after saving one MON file touches only
+    that file's entries.
+    """
+
+    __slots__ = ('files', 'names', 'stats')
+
+    def __init__(self):
+        self.files: dict[str, dict] = {}
+        self.names: dict[str, list[tuple[str, int]]] = {}
+        self.stats: dict[str, list[tuple[int, str, int]]] = {s: [] for s in INDEX_STATS}
+
+    def __len__(self) -> int:
+        return sum(len(locs) for locs in self.names.values())
+
+    def _add(self, name: str, entry: dict) -> None:
+        self.files[name] = entry
+        for slot, mon_name in enumerate(entry['names']):
+            if not mon_name:
+                continue
+            self.names.setdefault(mon_name.lower(), []).append((name, slot))
+            for stat in INDEX_STATS:
+                insort(self.stats[stat], (entry[stat][slot], name, slot))
+
+    def _drop(self, name: str) -> None:
+        if self.files.pop(name, None) is None:
+            return
+        for key in list(self.names):
+            locs = [loc for loc in self.names[key] if loc[0] != name]
+            if locs:
+                self.names[key] = locs
+            else:
+                del self.names[key]
+        for stat in INDEX_STATS:
+            self.stats[stat] = [t for t in self.stats[stat] if t[1] != name]
+
+    def update(self, name: str, data: bytes) -> bool:
+        """Index (or re-index) one MON file. Returns False if unchanged.
+
+        Data too short to be a MON file removes the file from the index.
+        """
+        name = _mon_key(name)
+        digest = hashlib.sha1(data).hexdigest()
+        entry = self.files.get(name)
+        if entry is not None and entry['sha1'] == digest:
+            return False
+        self._drop(name)
+        if len(data) < MON_ATTR_COUNT * MON_MONSTERS_PER_FILE:
+            return entry is not None
+        bestiary = Bestiary(data, name[-1])
+        entry = {'sha1': digest,
+                 'names': ['' if m.is_empty else m.name for m in bestiary]}
+        for stat in INDEX_STATS:
+            entry[stat] = list(bestiary.columns[stat])
+        self._add(name, entry)
+        return True
+
+    def remove(self, name: str) -> None:
+        """Drop a MON file from the index."""
+        self._drop(_mon_key(name))
+
+    def refresh(self, game_dir: str) -> list[str]:
+        """Sync the index with the MON files in game_dir.
+
+        Returns the names of files that were (re-)indexed or removed.
+        """
+        changed = []
+        present = set()
+        for letter, path in find_game_files(game_dir, 'MON', MON_LETTERS):
+            name = f'MON{letter}'
+            present.add(name)
+            with open(path, 'rb') as f:
+                if self.update(name, f.read()):
+                    changed.append(name)
+        for name in sorted(set(self.files) - present):
+            self._drop(name)
+            changed.append(name)
+        return changed
+
+    def find(self, text: str = '') -> list[tuple[str, int]]:
+        """(file, slot) of every monster whose name contains text."""
+        text = text.lower()
+        return sorted(loc for key, locs in self.names.items() if text in key for loc in locs)
+
+    def range(self, stat: str, lo: int = 0, hi: int = 255) -> list[tuple[str, int]]:
+        """(file, slot) of every monster with lo <= stat <= hi, by value."""
+        col = self.stats[stat]
+        i = bisect_left(col, (lo,))
+        j = bisect_left(col, (hi + 1,))
+        return [(name, slot) for _, name, slot in col[i:j]]
+
+    def record(self, name: str, slot: int) -> dict:
+        """Indexed fields of one monster as a dict."""
+        entry = self.files[name]
+        rec = {'file': name, 'slot': slot, 'name': entry['names'][slot]}
+        for stat in INDEX_STATS:
+            rec[stat] = entry[stat][slot]
+        return rec
+
+    @classmethod
+    def load(cls, path: str) -> 'MonsterIndex':
+        """Load an index written by save(); malformed entries are re-read on refresh."""
+        index = cls()
+        for name, entry in load_json_cache(path, INDEX_VERSION, 'files').items():
+            try:
+                clean = {'sha1': str(entry['sha1']), 'names': [str(n) for n in entry['names']]}
+                for stat in INDEX_STATS:
+                    clean[stat] = [int(v) for v in entry[stat]]
+            except (TypeError, KeyError, ValueError):
+                continue
+            if all(len(clean[stat]) == len(clean['names']) for stat in INDEX_STATS):
+                index._add(name, clean)
+        return index
+
+    def save(self, path: str) -> None:
+        """Persist the index as JSON."""
+        save_json_cache(path, INDEX_VERSION, 'files', self.files)
+
+
 def cmd_view(args) -> None:
     game_dir = args.game_dir
     do_validate = getattr(args, 'validate', False)
@@ -373,9 +617,8 @@ def _apply_edits(monster: Monster, args) -> bool:
 
 def cmd_edit(args) -> None:
     """Edit monster attributes in a MON file."""
-    with open(args.file, 'rb') as f:
-        original_data = f.read()
-    monsters = load_mon_file(args.file)
+    bestiary = Bestiary.load(args.file)
+    monsters = bestiary.monsters
     dry_run = getattr(args, 'dry_run', False)
     do_backup = getattr(args, 'backup', False)
     edit_all = getattr(args, 'all', False)
@@ -422,20 +665,24 @@ def cmd_edit(args) -> None:
     output = args.output if args.output else args.file
     if do_backup and (not args.output or args.output == args.file):
         backup_file(args.file)
-    save_mon_file(output, monsters, original_data)
+    bestiary.save(output)
 
 
 def cmd_import(args) -> None:
     """Import monster data from JSON into a MON file."""
-    with open(args.file, 'rb') as f:
-        original_data = f.read()
-    monsters = load_mon_file(args.file)
+    bestiary = Bestiary.load(args.file)
+    monsters = bestiary.monsters
     do_backup = getattr(args, 'backup', False)
     dry_run = getattr(args, 'dry_run', False)
 
     with open(args.json_file, 'r', encoding='utf-8') as f:
         data = json.load(f)
 
+    # Unwrap a single-file view export ({"MONA": {"terrain": ..., "monsters": [...]}})
+    if isinstance(data, dict) and 'monsters' not in data and len(data) == 1:
+        only = next(iter(data.values()))
+        if isinstance(only, dict) and 'monsters' in only:
+            data = only
     # Accept either a list of monsters or a dict with 'monsters' key
     mon_list = data if isinstance(data, list) else data.get('monsters', [])
     # Convert dict-of-dicts format ({"0": {...}, "1": {...}}) to list
@@ -525,10 +772,194 @@ def cmd_import(args) -> None:
     output = args.output if args.output else args.file
     if do_backup and (not args.output or args.output == args.file):
         backup_file(args.file)
-    save_mon_file(output, monsters, original_data)
+    bestiary.save(output)
     print(f"Imported {count} monster(s)")
 
 
+def cmd_adjust(args) -> None:
+    """Scale or cap attribute columns across a game's MON files."""
+    ops = ([('scale', name, v) for name, v in args.scale or []]
+           + [('cap', name, int(v)) for name, v in args.cap or []])
+    if not ops:
+        print("Error: --scale or --cap required", file=sys.stderr)
+        sys.exit(1)
+    mon_files = [(letter, path) for letter, path in find_game_files(args.game_dir, 'MON', MON_LETTERS)
+                 if not args.file or args.file.upper() == f'MON{letter}']
+    if not mon_files:
+        print(f"Error: No MON files found in {args.game_dir}", file=sys.stderr)
+        sys.exit(1)
+    dry_run = getattr(args, 'dry_run', False)
+    do_backup = getattr(args, 'backup', False)
+
+    for letter, path in mon_files:
+        bestiary = Bestiary.load(path, letter)
+        before = bytes(bestiary.data)
+        for op, name, value in ops:
+            if op == 'scale':
+                bestiary.scale(name, value)
+            else:
+                bestiary.cap(name, value)
+        changed = sum(a != b for a, b in zip(before, bestiary.data))
+        print(f"  MON{letter}: {changed} value(s) changed")
+        if changed and not dry_run:
+            if do_backup:
+                backup_file(path)
+            bestiary.save()
+    if dry_run:
+        print("Dry run - no changes written.")
+
+
+def cmd_find(args) -> None:
+    """Look up monsters across a game's MON files by name and stat ranges."""
+    cache_path = getattr(args, 'cache', None)
+    index = MonsterIndex.load(cache_path) if cache_path else MonsterIndex()
+    index.refresh(args.game_dir)
+    if not index.files:
+        print(f"Error: No MON files found in {args.game_dir}", file=sys.stderr)
+        sys.exit(1)
+    if cache_path:
+        index.save(cache_path)
+
+    hits = set(index.find(args.name or ''))
+    for stat in INDEX_STATS:
+        bounds = getattr(args, stat, None)
+        if bounds:
+            hits.intersection_update(index.range(stat, *bounds))
+    records = [index.record(name, slot) for name, slot in sorted(hits)]
+
+    if args.json:
+        export_json(records, args.output)
+        return
+    for rec in records:
+        print(f"  {rec['file']} [{rec['slot']:2d}] {rec['name']:<16s}  "
+              f"HP:{rec['hp']:3d}  ATK:{rec['attack']:3d}  "
+              f"DEF:{rec['defense']:3d}  SPD:{rec['speed']:3d}")
+    print(f"{len(records)} monster(s) matched")
+
+
+def cmd_simulate(args) -> None:
+    """Monte-Carlo fights between a roster party and each MON file."""
+    roster_path = args.roster or resolve_single_file(args.game_dir, 'ROST')
+    if not roster_path:
+        print(f"Error: No ROST file found in {args.game_dir} (use --roster)", file=sys.stderr)
+        sys.exit(1)
+    try:
+        roster = Roster(read_roster_source(roster_path))
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    members = select_party(roster.chars, args.slots)
+    party = party_stats(members)
+    if not party:
+        print("Error: Party has no living characters", file=sys.stderr)
+        sys.exit(1)
+    groups = {f'MON{letter}': monster_stats(load_mon_file(path, letter))
+              for letter, path in find_game_files(args.game_dir, 'MON', MON_LETTERS)
+              if not args.file or args.file.upper() == f'MON{letter}'}
+    if not groups:
+        print(f"Error: No MON files found in {args.game_dir}", file=sys.stderr)
+        sys.exit(1)
+
+    results = simulate_groups(party, groups, args.trials, args.group, args.jobs, args.seed)
+    if args.json:
+        export_json({'party': [c.name for c in members], 'group': args.group,
+                     'files': results}, args.output)
+        return
+    print(f"Party: {', '.join(f'{c.name} ({c.char_class}, HP {c.hp})' for c in members)}")
+    print(f"  {'File':<5s} {'Terrain':<20s} {'Win':>6s}  {'Damage':>7s}  {'Rounds':>6s}")
+    for name, r in results.items():
+        print(f"  {name:<5s} {MON_TERRAIN.get(name[-1], 'Unknown'):<20s} "
+              f"{r['win_rate']:6.1%}  {r['damage']:7.1f}  {r['rounds']:6.1f}")
+    print(f"{args.trials} fight(s) per file vs groups of {args.group}")
+
+
+def _slot_list(text: str) -> list[int]:
+    """argparse type for comma-separated roster slots (e.g. 0,1,2,3)."""
+    try:
+        return [int(s) for s in text.split(',') if s.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected slot numbers like 0,1,2,3, got '{text}'") from None
+
+
+def _positive_int(text: str) -> int:
+    """argparse type for a count of at least 1 (trials, group size)."""
+    try:
+        value = int(text)
+    except ValueError:
+        value = 0
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"expected a positive integer, got '{text}'")
+    return value
+
+
+def _stat_range(text: str) -> tuple[int, int]:
+    """argparse type for LO:HI, LO:, :HI or a single value (0-255)."""
+    lo, sep, hi = text.partition(':')
+    try:
+        lo = int(lo) if lo.strip() else 0
+        hi = (int(hi) if hi.strip() else 255) if sep else lo
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected LO:HI, got '{text}'") from None
+    if not 0 <= lo <= hi <= 255:
+        raise argparse.ArgumentTypeError(f"range must satisfy 0 <= LO <= HI <= 255, got '{text}'")
+    return lo, hi
+
+
+def _column_op(text: str) -> tuple[str, float]:
+    """argparse type for ATTR=NUMBER (e.g. hp=1.3)."""
+    name, _, value = text.partition('=')
+    name = name.strip().lower()
+    if name not in MON_COLUMNS:
+        raise argparse.ArgumentTypeError(
+            f"unknown attribute '{name}' (choose from {', '.join(MON_COLUMNS)})")
+    try:
+        return name, float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected ATTR=NUMBER, got '{text}'") from None
+
+
+def _add_adjust_args(p) -> None:
+    """Add column adjustment arguments to a parser."""
+    p.add_argument('game_dir', help='GAME directory containing MON* files')
+    p.add_argument('--file', help='Adjust only a specific MON file (e.g., MONA)')
+    p.add_argument('--scale', type=_column_op, action='append', metavar='ATTR=FACTOR',
+                   help='Multiply a column, clamped to 255 (e.g. hp=1.3); repeatable')
+    p.add_argument('--cap', type=_column_op, action='append', metavar='ATTR=MAX',
+                   help='Clamp a column to a maximum (e.g. speed=40); applied after --scale')
+    p.add_argument('--backup', action='store_true', help='Create .bak backup before overwrite')
+    p.add_argument('--dry-run', action='store_true', help='Show changes without writing')
+
+
+def _add_find_args(p) -> None:
+    """Add monster index lookup arguments to a parser."""
+    p.add_argument('game_dir', help='GAME directory containing MON* files')
+    p.add_argument('--name', help='Monster name contains (case-insensitive)')
+    for stat in INDEX_STATS:
+        p.add_argument(f'--{stat}', type=_stat_range, metavar='LO:HI',
+                       help=f'{stat.capitalize()} range, inclusive (e.g. 40:60, 100:)')
+    p.add_argument('--cache', metavar='FILE',
+                   help='Persist the index here; only changed MON files are re-read')
+    p.add_argument('--json', action='store_true', help='Output as JSON')
+    p.add_argument('--output', '-o', help='Output file (for --json)')
+
+
+def _add_simulate_args(p) -> None:
+    """Add encounter simulation arguments to a parser."""
+    p.add_argument('game_dir', help='GAME directory containing MON* files')
+    p.add_argument('--roster', help='ROST file or disk image for the party (default: GAME_DIR/ROST)')
+    p.add_argument('--slots', type=_slot_list,
+                   help='Roster slots to field (default: in-party characters, else first 4)')
+    p.add_argument('--file', help='Simulate only a specific MON file (e.g., MONA)')
+    p.add_argument('--trials', type=_positive_int, default=10_000,
+                   help='Fights per MON file (default: 10000)')
+    p.add_argument('--group', type=_positive_int, default=4, help='Monsters per encounter (default: 4)')
+    p.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+    p.add_argument('--jobs', '-j', type=job_count, default=0,
+                   help='Worker processes (default: CPU count, 1 = serial)')
+    p.add_argument('--json', action='store_true', help='Output as JSON')
+    p.add_argument('--output', '-o', help='Output file (for --json)')
+
+
 def _add_mon_edit_args(p) -> None:
     """Add common monster edit arguments to a parser."""
     p.add_argument('--hp', type=int, help='Hit points (0-255)')
@@ -605,6 +1036,15 @@ def register_parser(subparsers) -> None:
     p_import.add_argument('--backup', action='store_true', help='Create .bak backup before overwrite')
     p_import.add_argument('--dry-run', action='store_true', help='Show changes without writing')
 
+    p_adjust = sub.add_parser('adjust', help='Scale or cap attribute columns across MON files')
+    _add_adjust_args(p_adjust)
+
+    p_find = sub.add_parser('find', help='Find monsters by name and stat ranges across MON files')
+    _add_find_args(p_find)
+
+    p_sim = sub.add_parser('simulate', help='Simulate party-vs-monster fights per MON file')
+    _add_simulate_args(p_sim)
+
 
 def dispatch(args) -> None:
     """Dispatch bestiary subcommand."""
@@ -616,8 +1056,14 @@ def dispatch(args) -> None:
         cmd_edit(args)
     elif args.bestiary_command == 'import':
         cmd_import(args)
+    elif args.bestiary_command == 'adjust':
+        cmd_adjust(args)
+    elif args.bestiary_command == 'find':
+        cmd_find(args)
+    elif args.bestiary_command == 'simulate':
+        cmd_simulate(args)
     else:
-        print("Usage: ult3edit bestiary {view|dump|edit|import} ...", file=sys.stderr)
+        print("Usage: ult3edit bestiary {view|dump|edit|import|adjust|find|simulate} ...", file=sys.stderr)
 
 
 def main() -> None:
@@ -655,6 +1101,15 @@ def main() -> None:
     p_import.add_argument('--backup', action='store_true', help='Create .bak backup before overwrite')
     p_import.add_argument('--dry-run', action='store_true', help='Show changes without writing')
 
+    p_adjust = sub.add_parser('adjust', help='Scale or cap attribute columns across MON files')
+    _add_adjust_args(p_adjust)
+
+    p_find = sub.add_parser('find', help='Find monsters by name and stat ranges across MON files')
+    _add_find_args(p_find)
+
+    p_sim = sub.add_parser('simulate', help='Simulate party-vs-monster fights per MON file')
+    _add_simulate_args(p_sim)
+
     args = parser.parse_args()
     dispatch(args)
 
@@ -18,6 +18,9 @@ Dispatches to all tool modules via a single entry point:
     ult3edit ddrw view <file>
     ult3edit disk info <image>
     ult3edit diff <path1> <path2>
+    ult3edit validate <dir|image> ...
+    ult3edit bench [name ...]
+    ult3edit project export|import <dir> <src_dir>
 """
 
 import argparse
@@ -41,6 +44,9 @@ from . import patch
 from . import ddrw
 from . import diff
 from . import exod
+from . import validate
+from . import bench
+from . import project
 
 
 def _cmd_unified_edit(args) -> None:
@@ -97,6 +103,9 @@ def main() -> None:
     ddrw.register_parser(subparsers)
     diff.register_parser(subparsers)
     exod.register_parser(subparsers)
+    validate.register_parser(subparsers)
+    bench.register_parser(subparsers)
+    project.register_parser(subparsers)
 
     args = parser.parse_args()
 
@@ -123,6 +132,9 @@ def main() -> None:
         'ddrw': ddrw.dispatch,
         'diff': diff.dispatch,
         'exod': exod.dispatch,
+        'validate': validate.dispatch,
+        'bench': bench.dispatch,
+        'project': project.dispatch,
     }
 
     if args.tool == 'edit':
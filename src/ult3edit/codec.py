@@ -0,0 +1,123 @@
+"""Table-driven Apple II high-bit ASCII codec.
+
+Apple II text sets bit 7 on every character ($A0-$FE for printable ASCII).
+The engine uses $FF as a line break (TLK records, JSR $46BA inline strings)
+and $00 as the string/record terminator.
+
+Every conversion goes through a precomputed 256-entry table, so a whole
+buffer decodes with one bytes.translate() call and a whole string encodes
+with one str.translate() call instead of a Python loop per byte.
+"""
+
+from .constants import JSR_46BA
+
+LINE_BREAK = 0xFF
+TERMINATOR = 0x00
+
+
+def _is_printable(b: int) -> bool:
+    return 0x20 <= (b & 0x7F) < 0x7F
+
+
+# Decode: strip bit 7; optionally map $FF to '\n'. Bytes whose 7-bit value
+# is not printable ASCII are deleted by the second translate() argument.
+_DECODE = bytes(b & 0x7F for b in range(256))
+_DECODE_DELETE = bytes(b for b in range(256) if not _is_printable(b))
+_DECODE_BREAKS = bytes(0x0A if b == LINE_BREAK else b & 0x7F for b in range(256))
+_DECODE_BREAKS_DELETE = bytes(b for b in _DECODE_DELETE if b != LINE_BREAK)
+_NOT_HIGH_PRINTABLE = bytes(b for b in range(256) if not 0xA0 <= b <= 0xFE)
+
+
+class _EncodeTable(dict):
+    """str.translate table mapping code points to high-ASCII characters.
+
+    Code points 0-255 are filled in up front; anything else (smart quotes,
+    dashes) is masked to 7 bits on first use and cached, so encoding never
+    raises, matching the engine's `& 0x7F | 0x80` convention.
+    """
+
+    def __init__(self, upper: bool, line_breaks: bool):
+        super().__init__()
+        self.upper = upper
+        for cp in range(256):
+            self[cp]
+        if line_breaks:
+            self[ord('\n')] = chr(LINE_BREAK)
+
+    def __missing__(self, cp: int) -> str:
+        ch = chr(cp).upper() if self.upper else chr(cp)
+        if len(ch) != 1:
+            ch = chr(cp)
+        value = self[cp] = chr((ord(ch) & 0x7F) | 0x80)
+        return value
+
+
+_ENCODE_TABLES = {
+    (upper, line_breaks): _EncodeTable(upper, line_breaks)
+    for upper in (False, True) for line_breaks in (False, True)
+}
+
+
+def decode(data: bytes | bytearray, line_breaks: bool = False) -> str:
+    """Decode high-ASCII bytes up to the first $00 terminator.
+
+    Bit 7 is stripped and non-printable bytes are dropped. With
+    line_breaks=True, $FF becomes '\\n' instead of being dropped.
+    """
+    end = data.find(TERMINATOR)
+    if end >= 0:
+        data = data[:end]
+    if line_breaks:
+        return data.translate(_DECODE_BREAKS, _DECODE_BREAKS_DELETE).decode('ascii')
+    return data.translate(_DECODE, _DECODE_DELETE).decode('ascii')
+
+
+def decode_lines(data: bytes | bytearray) -> list[str]:
+    """Decode a $FF-separated, $00-terminated record into text lines.
+
+    A trailing $FF does not produce an empty final line, but an empty
+    record still decodes to a single empty line.
+    """
+    lines = decode(data, line_breaks=True).split('\n')
+    if len(lines) > 1 and not lines[-1]:
+        lines.pop()
+    return lines
+
+
+def encode(text: str, upper: bool = True, line_breaks: bool = False) -> bytes:
+    """Encode text as high-ASCII bytes (no terminator).
+
+    Characters are uppercased unless upper=False, matching the engine's
+    all-caps font. With line_breaks=True, '\\n' becomes $FF. Characters
+    outside Latin-1 are masked to 7 bits like any other.
+    """
+    return text.translate(_ENCODE_TABLES[upper, line_breaks]).encode('latin-1')
+
+
+def count_high_printable(data: bytes | bytearray) -> int:
+    """Count bytes in the high-ASCII printable range $A0-$FE."""
+    return len(data.translate(None, _NOT_HIGH_PRINTABLE))
+
+
+def scan_inline_strings(data: bytes | bytearray,
+                        marker: bytes = JSR_46BA) -> list[tuple[int, int, int, str]]:
+    """Find inline strings that follow a marker (default JSR $46BA).
+
+    Returns (marker_offset, text_offset, text_end, text) tuples, where
+    text_end is the offset of the $00 terminator (or len(data) if the
+    string runs off the end). Markers followed by no printable text are
+    skipped, and scanning resumes after each string's terminator.
+    """
+    found = []
+    skip = len(marker)
+    i = data.find(marker)
+    while i >= 0:
+        start = i + skip
+        end = data.find(TERMINATOR, start)
+        if end < 0:
+            end = len(data)
+        text = data[start:end].translate(_DECODE_BREAKS, _DECODE_BREAKS_DELETE).decode('ascii')
+        if text:
+            found.append((i, start, end, text))
+        i = data.find(marker, end + 1)
+    return found
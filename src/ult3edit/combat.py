@@ -28,7 +28,7 @@ from .constants import (
     CON_RUNTIME_MONSAVE_OFFSET, CON_RUNTIME_MONSTATUS_OFFSET,
     CON_RUNTIME_PCSAVE_OFFSET, CON_RUNTIME_PCTILE_OFFSET,
     CON_PADDING2_OFFSET, CON_PADDING2_SIZE,
-    tile_char, TILE_CHARS_REVERSE,
+    tile_chars, TILE_CHARS_REVERSE,
 )
 from .fileutil import resolve_game_file, backup_file, hex_int
 from .json_export import export_json
@@ -64,16 +64,8 @@ class CombatMap:
     def render(self) -> str:
         """Render 11x11 battlefield with position overlays."""
         # Build base grid
-        grid = []
-        for y in range(CON_MAP_HEIGHT):
-            row = []
-            for x in range(CON_MAP_WIDTH):
-                offset = y * CON_MAP_WIDTH + x
-                if offset < len(self.tiles):
-                    row.append(tile_char(self.tiles[offset]))
-                else:
-                    row.append(' ')
-            grid.append(row)
+        grid = [list(f'{tile_chars(self.tiles[y * CON_MAP_WIDTH:(y + 1) * CON_MAP_WIDTH]):<{CON_MAP_WIDTH}s}')
+                for y in range(CON_MAP_HEIGHT)]
 
         # Overlay monster positions
         for i in range(CON_MONSTER_COUNT):
@@ -106,11 +98,9 @@ class CombatMap:
 
     def to_dict(self) -> dict:
         result = {
-            'tiles': [[tile_char(self.tiles[y * CON_MAP_WIDTH + x])
-                        for x in range(CON_MAP_WIDTH)
-                        if y * CON_MAP_WIDTH + x < len(self.tiles)]
-                       for y in range(CON_MAP_HEIGHT)
-                       if y * CON_MAP_WIDTH < len(self.tiles)],
+            'tiles': [list(tile_chars(self.tiles[y * CON_MAP_WIDTH:(y + 1) * CON_MAP_WIDTH]))
+                      for y in range(CON_MAP_HEIGHT)
+                      if y * CON_MAP_WIDTH < len(self.tiles)],
             'monsters': [{'x': self.monster_x[i], 'y': self.monster_y[i]}
                          for i in range(CON_MONSTER_COUNT)],
             'pcs': [{'x': self.pc_x[i], 'y': self.pc_y[i]}
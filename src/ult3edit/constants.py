@@ -112,6 +112,47 @@ DUNGEON_TILES = {
 DUNGEON_TILE_CHARS_REVERSE = {ch: tile_id for tile_id, (ch, _) in DUNGEON_TILES.items()}
 DUNGEON_TILE_NAMES_REVERSE = {name.lower(): tile_id for tile_id, (_, name) in DUNGEON_TILES.items()}
 
+# =============================================================================
+# Precomputed Tile Lookup Tables
+# =============================================================================
+# 256-entry tables indexed by the raw tile byte, with the animation-frame
+# (overworld) or high-nibble (dungeon) masking already folded in. A whole
+# row of tiles renders with one bytes.translate() instead of a per-cell
+# tile_char() call.
+
+TILE_CHAR_TABLE = bytes(ord(tile_char(b)) for b in range(256))
+DUNGEON_CHAR_TABLE = bytes(ord(tile_char(b, True)) for b in range(256))
+TILE_NAME_TABLE = tuple(tile_name(b) for b in range(256))
+DUNGEON_NAME_TABLE = tuple(tile_name(b, True) for b in range(256))
+
+
+def tile_chars(data: bytes, is_dungeon: bool = False) -> str:
+    """Display characters for a run of tile bytes (one translate per call)."""
+    table = DUNGEON_CHAR_TABLE if is_dungeon else TILE_CHAR_TABLE
+    return bytes(data).translate(table).decode('latin-1')
+
+# =============================================================================
+# Tile Passability
+# =============================================================================
+# Canonical tile IDs (after &0xFC) the party can walk onto. NPCs and
+# monsters stand on walkable ground and move away, effects are transient
+# and doors open; counters, signs, beds and the ankh are solid.
+
+WALKABLE_TILES = frozenset({
+    0x04, 0x08, 0x0C, 0x14, 0x18, 0x1C, 0x20, 0x24, 0x28, 0x2C,
+    *range(0x40, 0x80, 4),
+    0x84, 0x88, 0x94, 0x98, 0xAC, 0xB0, 0xF0, 0xF4,
+})
+# Tiles a ship can sail over (sea monsters and whirlpools sit on water)
+SAILABLE_TILES = frozenset({0x00, 0x2C, 0x30, 0x34, 0x38, 0x3C})
+# Overworld tiles that lead into another map
+ENTRANCE_TILES = frozenset({0x14, 0x18, 0x1C})
+
+# Dungeon tiles (lower nibble) that can be walked onto
+DUNGEON_WALKABLE_TILES = frozenset(set(DUNGEON_TILES) - {0x01, 0x0F})
+DUNGEON_LADDER_DOWN = frozenset({0x05, 0x07})
+DUNGEON_LADDER_UP = frozenset({0x06, 0x07})
+
 # =============================================================================
 # Character Races and Classes
 # =============================================================================
@@ -153,32 +153,40 @@ def _diff_tile_grid(fd: FileDiff, data1: bytes, data2: bytes,
 # Per-type diff functions
 # =============================================================================
 
-def diff_roster(path1: str, path2: str) -> FileDiff:
-    """Compare two ROST files."""
-    chars1, _ = load_roster(path1)
-    chars2, _ = load_roster(path2)
-    fd = FileDiff('ROST', 'ROST')
-    for i in range(min(len(chars1), len(chars2))):
-        c1, c2 = chars1[i], chars2[i]
+def _diff_characters(fd: FileDiff, d1: bytes, d2: bytes, count: int, label: str) -> FileDiff:
+    """Compare character records slot by slot (label is formatted with the slot)."""
+    for i in range(min(count, len(d1) // CHAR_RECORD_SIZE, len(d2) // CHAR_RECORD_SIZE)):
+        off = i * CHAR_RECORD_SIZE
+        c1 = Character(d1[off:off + CHAR_RECORD_SIZE])
+        c2 = Character(d2[off:off + CHAR_RECORD_SIZE])
         if c1.is_empty and c2.is_empty:
             continue
-        label = f"Slot {i}"
-        if not c1.is_empty:
-            label += f": {c1.name}"
-        elif not c2.is_empty:
-            label += f": {c2.name}"
+        name = c1.name if not c1.is_empty else c2.name
+        slot_label = f"{label.format(i)}: {name}"
         if c1.is_empty and not c2.is_empty:
-            fd.added_entities.append(label)
+            fd.added_entities.append(slot_label)
             continue
         if not c1.is_empty and c2.is_empty:
-            fd.removed_entities.append(label)
+            fd.removed_entities.append(slot_label)
             continue
-        ed = EntityDiff('character', label)
+        ed = EntityDiff('character', slot_label)
         ed.fields = diff_dicts(c1.to_dict(), c2.to_dict())
         fd.entities.append(ed)
     return fd
 
 
+def diff_roster_data(d1: bytes, d2: bytes) -> FileDiff:
+    """Compare two ROST images."""
+    return _diff_characters(FileDiff('ROST', 'ROST'), d1, d2, len(d1), "Slot {}")
+
+
+def diff_roster(path1: str, path2: str) -> FileDiff:
+    """Compare two ROST files."""
+    _, data1 = load_roster(path1)
+    _, data2 = load_roster(path2)
+    return diff_roster_data(data1, data2)
+
+
 def diff_bestiary(path1: str, path2: str, letter: str) -> FileDiff:
     """Compare two MON files."""
     mons1 = load_mon_file(path1, letter)
@@ -225,44 +233,44 @@ def diff_combat(path1: str, path2: str, letter: str) -> FileDiff:
     return fd
 
 
-def _diff_prty(path1: str, path2: str) -> FileDiff:
-    """Compare two PRTY files."""
-    with open(path1, 'rb') as f:
-        party1 = PartyState(f.read())
-    with open(path2, 'rb') as f:
-        party2 = PartyState(f.read())
+def diff_prty_data(d1: bytes, d2: bytes) -> FileDiff:
+    """Compare two PRTY images."""
     fd = FileDiff('PRTY', 'PRTY')
     ed = EntityDiff('party', 'Party State')
-    ed.fields = diff_dicts(party1.to_dict(), party2.to_dict())
+    ed.fields = diff_dicts(PartyState(d1).to_dict(), PartyState(d2).to_dict())
     fd.entities.append(ed)
     return fd
 
 
-def _diff_plrs(path1: str, path2: str) -> FileDiff:
-    """Compare two PLRS files (4 active characters)."""
+def diff_plrs_data(d1: bytes, d2: bytes) -> FileDiff:
+    """Compare two PLRS images (4 active characters)."""
+    return _diff_characters(FileDiff('PLRS', 'PLRS'), d1, d2, 4, "Active slot {}")
+
+
+def _read_pair(path1: str, path2: str) -> tuple[bytes, bytes]:
     with open(path1, 'rb') as f:
         d1 = f.read()
     with open(path2, 'rb') as f:
         d2 = f.read()
-    fd = FileDiff('PLRS', 'PLRS')
-    for i in range(min(4, len(d1) // CHAR_RECORD_SIZE, len(d2) // CHAR_RECORD_SIZE)):
-        off = i * CHAR_RECORD_SIZE
-        c1 = Character(d1[off:off + CHAR_RECORD_SIZE])
-        c2 = Character(d2[off:off + CHAR_RECORD_SIZE])
-        if c1.is_empty and c2.is_empty:
-            continue
-        name = c1.name if not c1.is_empty else c2.name
-        label = f"Active slot {i}: {name}"
-        if c1.is_empty and not c2.is_empty:
-            fd.added_entities.append(label)
-            continue
-        if not c1.is_empty and c2.is_empty:
-            fd.removed_entities.append(label)
-            continue
-        ed = EntityDiff('character', label)
-        ed.fields = diff_dicts(c1.to_dict(), c2.to_dict())
-        fd.entities.append(ed)
-    return fd
+    return d1, d2
+
+
+def _diff_prty(path1: str, path2: str) -> FileDiff:
+    """Compare two PRTY files."""
+    return diff_prty_data(*_read_pair(path1, path2))
+
+
+def _diff_plrs(path1: str, path2: str) -> FileDiff:
+    """Compare two PLRS files (4 active characters)."""
+    return diff_plrs_data(*_read_pair(path1, path2))
+
+
+# Save-state file type -> data-level differ
+SAVE_DIFFERS = {
+    'ROST': diff_roster_data,
+    'PRTY': diff_prty_data,
+    'PLRS': diff_plrs_data,
+}
 
 
 def diff_map(path1: str, path2: str, name: str) -> FileDiff:
@@ -1,8 +1,19 @@
-"""File resolution, validation, and Apple II text utilities."""
+"""File resolution, validation, and Apple II text utilities.
 
+Also the shared plumbing of the batch commands: the process-pool fan-out
+behind every --jobs option and the versioned JSON files their --cache
+options persist.
+"""
+
+import argparse
 import glob
+import json
 import os
 import shutil
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from . import codec
 
 
 def hex_int(x: str) -> int:
@@ -14,6 +25,21 @@ def hex_int(x: str) -> int:
     return int(x, 0)
 
 
+def check_jobs(jobs: int) -> int:
+    """Validate a worker count: 0 (one per CPU) or more. Returns jobs."""
+    if jobs < 0:
+        raise ValueError(f"jobs must be 0 (one per CPU) or more, got {jobs}")
+    return jobs
+
+
+def job_count(text: str) -> int:
+    """argparse type for --jobs: 0 (one per CPU) or more."""
+    try:
+        return check_jobs(int(text))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected 0 (CPU count) or more, got '{text}'") from None
+
+
 def resolve_game_file(directory: str, prefix: str, letter: str) -> str | None:
     """Find a game file by prefix and letter, handling ProDOS #hash suffixes.
 
@@ -63,14 +89,7 @@ def decode_high_ascii(data: bytes) -> str:
 
     Strips bit 7, converts printable range to characters, stops at null.
     """
-    chars = []
-    for b in data:
-        if b == 0x00:
-            break
-        ch = b & 0x7F
-        if 0x20 <= ch < 0x7F:
-            chars.append(chr(ch))
-    return ''.join(chars).rstrip()
+    return codec.decode(data).rstrip()
 
 
 def backup_file(path: str) -> str:
@@ -88,7 +107,70 @@ def encode_high_ascii(text: str, length: int) -> bytearray:
 
     Unused bytes are filled with 0xA0 (high-ASCII space) to match the game format.
     """
-    result = bytearray([0xA0] * length)
-    for i, ch in enumerate(text[:length]):
-        result[i] = ord(ch.upper()) | 0x80
+    result = bytearray(codec.encode(text[:length]))
+    result.extend(b'\xa0' * (length - len(result)))
     return result
+
+
+# =============================================================================
+# Batch plumbing
+# =============================================================================
+
+def pool_imap(worker, tasks: list, jobs: int = 0, args: tuple = ()):
+    """Yield worker(task, *args) for each task, in task order.
+
+    jobs=0 uses one worker process per CPU; jobs=1 (or a single task) runs
+    in-process. At most four tasks per worker are in flight at a time, so
+    results waiting for the consumer stay bounded however many tasks there
+    are. Raises ValueError for a negative jobs before any work starts.
+    """
+    check_jobs(jobs)
+
+    def serial():
+        for task in tasks:
+            yield worker(task, *args)
+
+    def parallel():
+        window = workers * 4
+        pending = deque()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for task in tasks:
+                if len(pending) >= window:
+                    yield pending.popleft().result()
+                pending.append(pool.submit(worker, task, *args))
+            while pending:
+                yield pending.popleft().result()
+
+    if jobs == 1 or len(tasks) <= 1:
+        return serial()
+    workers = min(jobs or os.cpu_count() or 1, len(tasks))
+    return parallel()
+
+
+def pool_map(worker, tasks: list, jobs: int = 0, args: tuple = ()) -> list:
+    """List of worker(task, *args) for each task; see pool_imap()."""
+    return list(pool_imap(worker, tasks, jobs, args))
+
+
+def load_json_cache(path: str, version: int, key: str) -> dict:
+    """The `key` object of a versioned JSON cache file.
+
+    Empty if the file is missing, unreadable, not JSON, written with another
+    version, or `key` is not an object, so callers just rebuild whatever a
+    stale or damaged cache held. Individual entries are not checked.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get('version') != version:
+        return {}
+    entries = data.get(key)
+    return entries if isinstance(entries, dict) else {}
+
+
+def save_json_cache(path: str, version: int, key: str, entries: dict, **dump_args) -> None:
+    """Write entries as the `key` object of a versioned JSON cache file."""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'version': version, key: entries}, f, **dump_args)
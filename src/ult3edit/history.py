@@ -0,0 +1,266 @@
+"""Ultima III: Exodus - Save-State History Store.
+
+Keeps every snapshot of a game's save files (PRTY, PLRS, ROST) in a
+small content-addressed store:
+
+    STORE/pack        append-only object data
+    STORE/index.json  objects, keyframes and the snapshot log
+
+Objects are addressed by the SHA-1 of the file contents, so re-adding an
+unchanged file costs one log entry and no data. A new version is stored
+either as a keyframe (the full bytes) or as a delta against its file's
+current keyframe: the XOR of the two images reduced to byte runs
+(offset, length, xor bytes). Deltas never chain, so any version is
+rebuilt from at most two reads: the delta and its keyframe. A new
+keyframe is cut every KEYFRAME_INTERVAL deltas, when the size changes,
+or when a delta would be more than half the size of the file.
+
+Snapshots record file, object, UTC time and an optional tag; the log is
+in time order, so time ranges are bisected and tags are a dict lookup.
+"""
+
+import bisect
+import hashlib
+import json
+import os
+import re
+import struct
+from datetime import datetime, timezone
+
+from .constants import PRTY_FILE_SIZE, PLRS_FILE_SIZE, ROSTER_FILE_SIZE
+from .diff import SAVE_DIFFERS, FileDiff
+from .roster import Roster
+from .save import PartyState
+
+# Bump when the index layout changes; older stores are refused, not guessed at.
+STORE_VERSION = 1
+
+KEYFRAME_INTERVAL = 32
+
+# Snapshot reference kinds, in the order a bare ref is tried
+REF_KINDS = ('id', 'tag', 'sha1')
+
+# File name -> expected size
+HISTORY_FILES = {'PRTY': PRTY_FILE_SIZE, 'PLRS': PLRS_FILE_SIZE, 'ROST': ROSTER_FILE_SIZE}
+
+# Non-zero XOR runs, merging gaps shorter than a run header
+_RUN = re.compile(rb'[^\x00]+(?:\x00{1,3}[^\x00]+)*')
+_RUN_HEADER = struct.Struct('<HH')
+
+
+def encode_delta(base: bytes, data: bytes) -> bytes:
+    """XOR byte runs that turn base into data (same length)."""
+    n = len(data)
+    xor = (int.from_bytes(base, 'big') ^ int.from_bytes(data, 'big')).to_bytes(n, 'big')
+    out = bytearray()
+    for m in _RUN.finditer(xor):
+        out += _RUN_HEADER.pack(m.start(), m.end() - m.start())
+        out += m.group()
+    return bytes(out)
+
+
+def apply_delta(base: bytes, delta: bytes) -> bytes:
+    """Rebuild data from base and encode_delta(base, data)."""
+    out = bytearray(base)
+    pos = 0
+    while pos < len(delta):
+        start, length = _RUN_HEADER.unpack_from(delta, pos)
+        pos += _RUN_HEADER.size
+        run = int.from_bytes(delta[pos:pos + length], 'big')
+        old = int.from_bytes(out[start:start + length], 'big')
+        out[start:start + length] = (old ^ run).to_bytes(length, 'big')
+        pos += length
+    return bytes(out)
+
+
+def history_name(path: str) -> str | None:
+    """Base name ('PRTY', 'PLRS', 'ROST') if path is a tracked save file."""
+    base = os.path.basename(path).split('#')[0].upper()
+    return base if base in HISTORY_FILES else None
+
+
+def decode_snapshot(name: str, data: bytes):
+    """JSON view of a save file: the party dict, or character records."""
+    if name == 'PRTY':
+        return PartyState(data).to_dict()
+    return Roster(data).to_records()
+
+
+def diff_snapshot_data(name: str, old: bytes, new: bytes) -> FileDiff:
+    """Field-level diff of two versions of a save file."""
+    return SAVE_DIFFERS[name](old, new)
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+
+class HistoryStore:
+    """A save-state history store rooted at a directory.
+
+    objects maps sha1 -> [offset, length, base sha1 or None (keyframe)];
+    keyframes maps file name -> [keyframe sha1, deltas cut from it];
+    snapshots is the time-ordered log of {id, file, sha1, time, tag, source}.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self.objects: dict[str, list] = {}
+        self.keyframes: dict[str, list] = {}
+        self.snapshots: list[dict] = []
+        index_path = os.path.join(root, 'index.json')
+        if os.path.exists(index_path):
+            with open(index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            if index.get('version') != STORE_VERSION:
+                raise ValueError(f"Unsupported history store version in {root}")
+            self.objects = index['objects']
+            self.keyframes = index['keyframes']
+            self.snapshots = index['snapshots']
+        self._times = [s['time'] for s in self.snapshots]
+        self._by_id = {s['id']: s for s in self.snapshots}
+        self._tags: dict[str, list[int]] = {}
+        for s in self.snapshots:
+            if s['tag']:
+                self._tags.setdefault(s['tag'], []).append(s['id'])
+
+    @property
+    def pack_path(self) -> str:
+        return os.path.join(self.root, 'pack')
+
+    def save(self) -> None:
+        """Write the index."""
+        with open(os.path.join(self.root, 'index.json'), 'w', encoding='utf-8') as f:
+            json.dump({'version': STORE_VERSION, 'objects': self.objects,
+                       'keyframes': self.keyframes, 'snapshots': self.snapshots}, f)
+
+    # -- objects -------------------------------------------------------------
+
+    def _append(self, blob: bytes) -> int:
+        os.makedirs(self.root, exist_ok=True)
+        with open(self.pack_path, 'ab') as f:
+            offset = f.tell()
+            f.write(blob)
+        return offset
+
+    def _read(self, offset: int, length: int) -> bytes:
+        with open(self.pack_path, 'rb') as f:
+            f.seek(offset)
+            return f.read(length)
+
+    def put(self, name: str, data: bytes) -> str:
+        """Store one version of a file; returns its sha1."""
+        digest = hashlib.sha1(data).hexdigest()
+        if digest in self.objects:
+            return digest
+        key = self.keyframes.get(name)
+        base = None
+        if key and key[1] < KEYFRAME_INTERVAL:
+            base_data = self.get(key[0])
+            if len(base_data) == len(data):
+                delta = encode_delta(base_data, data)
+                if len(delta) <= len(data) // 2:
+                    base = key[0]
+        if base is None:
+            blob = data
+            self.keyframes[name] = [digest, 0]
+        else:
+            blob = delta
+            key[1] += 1
+        self.objects[digest] = [self._append(blob), len(blob), base]
+        return digest
+
+    def get(self, digest: str) -> bytes:
+        """File contents for an object sha1 (at most two pack reads)."""
+        offset, length, base = self.objects[digest]
+        blob = self._read(offset, length)
+        if base is None:
+            return blob
+        boffset, blength, _ = self.objects[base]
+        return apply_delta(self._read(boffset, blength), blob)
+
+    # -- snapshots -----------------------------------------------------------
+
+    def add(self, name: str, data: bytes, tag: str | None = None,
+            source: str | None = None, time: str | None = None) -> dict:
+        """Record a snapshot of a file's contents and return its log entry."""
+        time = time or _now()
+        entry = {'id': len(self.snapshots), 'file': name, 'sha1': self.put(name, data),
+                 'time': time, 'tag': tag, 'source': source}
+        # Keep the log in time order even if a caller back-dates a snapshot
+        pos = bisect.bisect_right(self._times, time)
+        self.snapshots.insert(pos, entry)
+        self._times.insert(pos, time)
+        self._by_id[entry['id']] = entry
+        if tag:
+            self._tags.setdefault(tag, []).append(entry['id'])
+        return entry
+
+    def snapshot(self, snap_id: int) -> dict:
+        """Log entry by id."""
+        return self._by_id[snap_id]
+
+    def resolve(self, ref: str, name: str | None = None) -> dict:
+        """Find a snapshot by id, tag (latest with that tag) or sha1 prefix.
+
+        A bare ref is tried as each of those in turn; an 'id:', 'tag:' or
+        'sha1:' prefix picks one, so a digit-only tag or hash prefix can
+        still be addressed. name restricts tag and sha1 matches to one file.
+        """
+        kind, sep, value = ref.partition(':')
+        kinds = (kind,) if sep and kind in REF_KINDS else REF_KINDS
+        if len(kinds) == 1:
+            ref = value
+        for kind in kinds:
+            snap = getattr(self, f'_resolve_{kind}')(ref, name)
+            if snap is not None:
+                return snap
+        raise KeyError(ref)
+
+    def _resolve_id(self, ref: str, name: str | None) -> dict | None:
+        return self._by_id.get(int(ref)) if ref.isdigit() else None
+
+    def _resolve_tag(self, ref: str, name: str | None) -> dict | None:
+        for snap_id in reversed(self._tags.get(ref, ())):
+            s = self.snapshot(snap_id)
+            if name is None or s['file'] == name:
+                return s
+        return None
+
+    def _resolve_sha1(self, ref: str, name: str | None) -> dict | None:
+        if len(ref) >= 4:
+            for s in reversed(self.snapshots):
+                if s['sha1'].startswith(ref.lower()) and (name is None or s['file'] == name):
+                    return s
+        return None
+
+    def log(self, name: str | None = None, tag: str | None = None,
+            since: str | None = None, until: str | None = None) -> list[dict]:
+        """Snapshots in time order, filtered by file, tag and ISO time range.
+
+        since/until may be prefixes: until='2026-10-19' includes that whole day.
+        """
+        lo = bisect.bisect_left(self._times, since) if since else 0
+        hi = bisect.bisect_right(self._times, until + '\uffff') if until else len(self.snapshots)
+        return [s for s in self.snapshots[lo:hi]
+                if (name is None or s['file'] == name) and (tag is None or s['tag'] == tag)]
+
+    def read(self, snap: dict) -> bytes:
+        """File contents of a snapshot."""
+        return self.get(snap['sha1'])
+
+    def stats(self) -> dict:
+        """Object counts and pack size."""
+        keyframes = sum(1 for o in self.objects.values() if o[2] is None)
+        size = os.path.getsize(self.pack_path) if os.path.exists(self.pack_path) else 0
+        return {'snapshots': len(self.snapshots), 'objects': len(self.objects),
+                'keyframes': keyframes, 'deltas': len(self.objects) - keyframes,
+                'pack_bytes': size}
+
+    def previous(self, snap: dict) -> dict | None:
+        """The snapshot of the same file just before snap in the log."""
+        pos = self.snapshots.index(snap)
+        for s in reversed(self.snapshots[:pos]):
+            if s['file'] == snap['file']:
+                return s
+        return None
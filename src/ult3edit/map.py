@@ -15,12 +15,20 @@ import sys
 
 from .constants import (
     MAP_NAMES, MAP_LETTERS, MAP_OVERWORLD_SIZE, MAP_DUNGEON_SIZE,
-    tile_char, tile_name, TILES, DUNGEON_TILES,
+    tile_name, tile_chars, TILES, DUNGEON_TILES, TILE_NAME_TABLE, DUNGEON_NAME_TABLE,
     TILE_CHARS_REVERSE, DUNGEON_TILE_CHARS_REVERSE,
     TILE_NAMES_REVERSE, DUNGEON_TILE_NAMES_REVERSE,
 )
-from .fileutil import resolve_game_file, backup_file, hex_int
+from .fileutil import resolve_game_file, resolve_single_file, backup_file, hex_int, job_count
 from .json_export import export_json
+from .raster import fill_rect, remap, find_all, copy_rect, paste
+from .mipmap import (
+    MIP_FACTORS, mip_level, load_cache as load_mip_cache, save_cache as save_mip_cache,
+)
+from .reach import analyze_game, format_text as format_analysis
+from .render import render_many
+from .tileindex import TileIndex, canonical_tile
+from .mapcompile import compile_map_text, compile_all
 
 
 def render_map(data: bytes, width: int, height: int,
@@ -43,30 +51,23 @@ def render_map(data: bytes, width: int, height: int,
         header += f'{x:<10d}'
     lines.append(header)
 
+    # One translate for the whole map; each row is then a slice
+    text = tile_chars(data[:width * height], is_dungeon)
+    span = x_end - x_start
     for y in range(y_start, y_end):
-        row_chars = []
-        for x in range(x_start, x_end):
-            offset = y * width + x
-            if offset < len(data):
-                row_chars.append(tile_char(data[offset], is_dungeon))
-            else:
-                row_chars.append(' ')
-        lines.append(f'  {y:3d} {"".join(row_chars)}')
+        row = text[y * width + x_start:y * width + x_end]
+        lines.append(f'  {y:3d} {row:<{span}s}')
     return '\n'.join(lines)
 
 
 def map_to_grid(data: bytes, width: int, height: int,
                 is_dungeon: bool = False) -> list[list[str]]:
     """Convert map data to a 2D grid of tile names (for JSON)."""
+    names = DUNGEON_NAME_TABLE if is_dungeon else TILE_NAME_TABLE
     grid = []
     for y in range(height):
-        row = []
-        for x in range(width):
-            offset = y * width + x
-            if offset < len(data):
-                row.append(tile_name(data[offset], is_dungeon))
-            else:
-                row.append('Unknown')
+        row = [names[b] for b in data[y * width:(y + 1) * width]]
+        row += ['Unknown'] * (width - len(row))
         grid.append(row)
     return grid
 
@@ -183,17 +184,35 @@ def cmd_overview(args) -> None:
         if mapa:
             with open(mapa, 'rb') as f:
                 data = f.read()
-            print("\n  --- Sosaria Overworld (scaled 4:1) ---\n")
-            for y in range(0, 64, 4):
-                row = '  '
-                for x in range(0, 64, 2):
-                    offset = y * 64 + x
-                    row += tile_char(data[offset]) if offset < len(data) else ' '
-                print(row)
+            zoom = getattr(args, 'zoom', 4)
+            cache_path = getattr(args, 'cache', None)
+            cache = load_mip_cache(cache_path) if cache_path else None
+            tiles, width, height = mip_level(data, 64, zoom, cache=cache)
+            if cache_path:
+                save_mip_cache(cache_path, cache)
+            # Each cell is printed twice across to keep text cells roughly square
+            print(f"\n  --- Sosaria Overworld (scaled {zoom}:1) ---\n")
+            for y in range(height):
+                row = tile_chars(tiles[y * width:(y + 1) * width])
+                print(f"  {''.join(ch * 2 for ch in row)}")
 
     print()
 
 
+def cmd_analyze(args) -> None:
+    """Check that towns, dungeon levels, moongates and the start are reachable."""
+    report = analyze_game(args.game_dir)
+    if not report['maps']:
+        print(f"Error: No MAP files found in {args.game_dir}", file=sys.stderr)
+        sys.exit(1)
+    if args.json:
+        export_json(report, args.output)
+    else:
+        print(format_analysis(report))
+    if report['issue_count']:
+        sys.exit(1)
+
+
 def cmd_legend(args) -> None:
     """Print tile legend."""
     print("\n=== Tile Legend ===\n")
@@ -237,13 +256,24 @@ def _get_map_slice(data: bytearray, is_dungeon: bool, level: int | None):
     return data, 0, 64, len(data) // 64
 
 
+def _write_map(args, data: bytearray) -> None:
+    """Honour --dry-run/--output/--backup for an edited map."""
+    if getattr(args, 'dry_run', False):
+        print("Dry run - no changes written.")
+        return
+    output = args.output if args.output else args.file
+    if getattr(args, 'backup', False) and (not args.output or args.output == args.file):
+        backup_file(args.file)
+    with open(output, 'wb') as f:
+        f.write(data)
+    print(f"Saved to {output}")
+
+
 def cmd_set(args) -> None:
     """Set a single tile at (x, y)."""
     with open(args.file, 'rb') as f:
         data = bytearray(f.read())
     is_dungeon = len(data) <= MAP_DUNGEON_SIZE
-    dry_run = getattr(args, 'dry_run', False)
-    do_backup = getattr(args, 'backup', False)
 
     _, base, width, height = _get_map_slice(data, is_dungeon, getattr(args, 'level', None))
 
@@ -255,17 +285,7 @@ def cmd_set(args) -> None:
     old_val = data[offset]
     data[offset] = args.tile
     print(f"Set ({args.x}, {args.y}): ${old_val:02X} -> ${args.tile:02X}")
-
-    if dry_run:
-        print("Dry run - no changes written.")
-        return
-
-    output = args.output if args.output else args.file
-    if do_backup and (not args.output or args.output == args.file):
-        backup_file(args.file)
-    with open(output, 'wb') as f:
-        f.write(data)
-    print(f"Saved to {output}")
+    _write_map(args, data)
 
 
 def cmd_fill(args) -> None:
@@ -273,33 +293,18 @@ def cmd_fill(args) -> None:
     with open(args.file, 'rb') as f:
         data = bytearray(f.read())
     is_dungeon = len(data) <= MAP_DUNGEON_SIZE
-    dry_run = getattr(args, 'dry_run', False)
-    do_backup = getattr(args, 'backup', False)
 
-    _, base, width, height = _get_map_slice(data, is_dungeon, getattr(args, 'level', None))
+    region, base, width, height = _get_map_slice(data, is_dungeon, getattr(args, 'level', None))
 
     x1 = max(0, min(args.x1, width - 1))
     y1 = max(0, min(args.y1, height - 1))
     x2 = max(x1, min(args.x2, width - 1))
     y2 = max(y1, min(args.y2, height - 1))
 
-    count = 0
-    for y in range(y1, y2 + 1):
-        for x in range(x1, x2 + 1):
-            data[base + y * width + x] = args.tile
-            count += 1
+    count = fill_rect(region, width, x1, y1, x2, y2, args.tile)
+    data[base:base + len(region)] = region
     print(f"Filled {count} tiles in ({x1},{y1})-({x2},{y2}) with ${args.tile:02X}")
-
-    if dry_run:
-        print("Dry run - no changes written.")
-        return
-
-    output = args.output if args.output else args.file
-    if do_backup and (not args.output or args.output == args.file):
-        backup_file(args.file)
-    with open(output, 'wb') as f:
-        f.write(data)
-    print(f"Saved to {output}")
+    _write_map(args, data)
 
 
 def cmd_replace(args) -> None:
@@ -307,66 +312,186 @@ def cmd_replace(args) -> None:
     with open(args.file, 'rb') as f:
         data = bytearray(f.read())
     is_dungeon = len(data) <= MAP_DUNGEON_SIZE
-    dry_run = getattr(args, 'dry_run', False)
-    do_backup = getattr(args, 'backup', False)
     from_tile = getattr(args, 'from_tile')
     to_tile = getattr(args, 'to_tile')
 
-    _, base, width, height = _get_map_slice(data, is_dungeon, getattr(args, 'level', None))
+    region, base, width, _ = _get_map_slice(data, is_dungeon, getattr(args, 'level', None))
 
-    count = 0
-    for y in range(height):
-        for x in range(width):
-            offset = base + y * width + x
-            if data[offset] == from_tile:
-                data[offset] = to_tile
-                count += 1
+    count = remap(region, width, {from_tile: to_tile})
+    data[base:base + len(region)] = region
     print(f"Replaced {count} tiles: ${from_tile:02X} -> ${to_tile:02X}")
+    _write_map(args, data)
 
-    if dry_run:
-        print("Dry run - no changes written.")
-        return
 
-    output = args.output if args.output else args.file
-    if do_backup and (not args.output or args.output == args.file):
-        backup_file(args.file)
-    with open(output, 'wb') as f:
-        f.write(data)
-    print(f"Saved to {output}")
+def _load_tile_index(args) -> TileIndex:
+    """Tile index for args.game_dir, reusing and updating --cache if given."""
+    cache_path = getattr(args, 'cache', None)
+    index = TileIndex.load(cache_path) if cache_path else TileIndex()
+    index.refresh(args.game_dir)
+    if not index.files:
+        print(f"Error: No map files found in {args.game_dir}", file=sys.stderr)
+        sys.exit(1)
+    if cache_path:
+        index.save(cache_path)
+    return index
+
+
+def _find_all(args, tiles: list[int]) -> None:
+    """Find tiles across every map in a game directory via the tile index."""
+    args.game_dir = args.file
+    index = _load_tile_index(args)
+    level = getattr(args, 'level', None)
+    dungeon = getattr(args, 'dungeon', False) or level is not None
+    bad = [t for t in tiles if t > 0x0F] if dungeon else []
+    if bad:
+        print(f"Error: dungeon tiles are 0x00-0x0F, got {', '.join(f'0x{t:02X}' for t in bad)}",
+              file=sys.stderr)
+        sys.exit(1)
+    results = []
+    for tile in tiles:
+        tile = canonical_tile(tile, dungeon)
+        locations = index.locations(tile, dungeon, level)
+        results.append({
+            'tile': tile,
+            'tile_name': tile_name(tile, dungeon),
+            'count': len(locations),
+            'files': len({loc[0] for loc in locations}),
+            'locations': [{'file': name, 'x': x, 'y': y,
+                           **({'level': lvl} if dungeon else {})}
+                          for name, x, y, lvl in locations],
+        })
+
+    if getattr(args, 'json', False):
+        export_json(results[0] if len(results) == 1 else results, getattr(args, 'output', None))
+        return
+    for result in results:
+        print(f"\nTile ${result['tile']:02X} ({result['tile_name']}): "
+              f"{result['count']} found in {result['files']} file(s)\n")
+        for loc in result['locations']:
+            where = f"L{loc['level']} " if dungeon else ''
+            print(f"  {loc['file']:<6s} {where}({loc['x']}, {loc['y']})")
+    print()
 
 
 def cmd_find(args) -> None:
-    """Find all locations of a tile type."""
+    """Find all locations of a tile type (or several) in one map or a whole game."""
+    tiles = args.tile if isinstance(args.tile, list) else [args.tile]
+    if getattr(args, 'all', False):
+        _find_all(args, tiles)
+        return
     with open(args.file, 'rb') as f:
         data = f.read()
     is_dungeon = len(data) <= MAP_DUNGEON_SIZE
 
-    _, base, width, height = _get_map_slice(data, is_dungeon, getattr(args, 'level', None))
-
-    locations = []
-    for y in range(height):
-        for x in range(width):
-            offset = base + y * width + x
-            if data[offset] == args.tile:
-                locations.append((x, y))
+    region, _, width, _ = _get_map_slice(data, is_dungeon, getattr(args, 'level', None))
 
-    if getattr(args, 'json', False):
-        result = {
-            'tile': args.tile,
-            'tile_name': tile_name(args.tile, is_dungeon),
+    results = []
+    for tile in tiles:
+        locations = find_all(region, width, tile)
+        results.append({
+            'tile': tile,
+            'tile_name': tile_name(tile, is_dungeon),
             'count': len(locations),
             'locations': [{'x': x, 'y': y} for x, y in locations],
-        }
-        export_json(result, getattr(args, 'output', None))
+        })
+
+    if getattr(args, 'json', False):
+        export_json(results[0] if len(results) == 1 else results, getattr(args, 'output', None))
         return
 
-    name = tile_name(args.tile, is_dungeon)
-    print(f"\nTile ${args.tile:02X} ({name}): {len(locations)} found\n")
-    for x, y in locations:
-        print(f"  ({x}, {y})")
+    for result in results:
+        print(f"\nTile ${result['tile']:02X} ({result['tile_name']}): {result['count']} found\n")
+        for loc in result['locations']:
+            print(f"  ({loc['x']}, {loc['y']})")
     print()
 
 
+def cmd_stats(args) -> None:
+    """Tile histograms for every map in a game directory."""
+    index = _load_tile_index(args)
+    names = sorted(index.files)
+    if args.file:
+        name = args.file.upper()
+        if name not in index.files:
+            print(f"Error: {args.file} not found in {args.game_dir}", file=sys.stderr)
+            sys.exit(1)
+        names = [name]
+
+    def rows(counts: dict[int, int], dungeon: bool) -> list[dict]:
+        total = sum(counts.values()) or 1
+        return [{'tile': tile, 'tile_name': tile_name(tile, dungeon), 'count': count,
+                 'percent': round(100 * count / total, 1)}
+                for tile, count in sorted(counts.items(), key=lambda kv: (-kv[1], kv[0]))]
+
+    result = {'files': {}}
+    for name in names:
+        dungeon = index.files[name]['dungeon']
+        result['files'][name] = {'type': 'dungeon' if dungeon else 'surface',
+                                 'tiles': rows(index.histogram(name), dungeon)}
+    if not args.file:
+        result['surface'] = rows(index.histogram(), False)
+        result['dungeon'] = rows(index.histogram(dungeon=True), True)
+
+    if args.json:
+        export_json(result, args.output)
+        return
+
+    sections = [(f'{name} ({entry["type"]})', entry['tiles'])
+                for name, entry in result['files'].items()]
+    if not args.file:
+        sections = [('All surface maps', result['surface']),
+                    ('All dungeons', result['dungeon'])] + sections
+    print(f"\n=== Tile Statistics ({len(names)} files) ===")
+    for title, tiles in sections:
+        if not tiles:
+            continue
+        print(f"\n  {title}:")
+        for row in tiles:
+            print(f"    ${row['tile']:02X} {row['tile_name']:<16s} "
+                  f"{row['count']:6d}  {row['percent']:5.1f}%")
+    print()
+
+
+def cmd_remap(args) -> None:
+    """Apply several tile replacements at once, optionally within a region."""
+    with open(args.file, 'rb') as f:
+        data = bytearray(f.read())
+    is_dungeon = len(data) <= MAP_DUNGEON_SIZE
+    region, base, width, _ = _get_map_slice(data, is_dungeon, getattr(args, 'level', None))
+
+    pairs = dict(args.pairs)
+    count = remap(region, width, pairs, args.region)
+    data[base:base + len(region)] = region
+    where = ' in ({},{})-({},{})'.format(*args.region) if args.region else ''
+    print(f"Remapped {count} tiles{where}: "
+          + ', '.join(f'${a:02X} -> ${b:02X}' for a, b in pairs.items()))
+    _write_map(args, data)
+
+
+def cmd_stamp(args) -> None:
+    """Copy a rectangle from one map (or level) into another."""
+    with open(args.file, 'rb') as f:
+        data = bytearray(f.read())
+    with open(args.source, 'rb') as f:
+        src = bytearray(f.read())
+    is_dungeon = len(data) <= MAP_DUNGEON_SIZE
+    src_dungeon = len(src) <= MAP_DUNGEON_SIZE
+    if is_dungeon != src_dungeon:
+        print("Error: cannot stamp between dungeon and overworld maps", file=sys.stderr)
+        sys.exit(1)
+
+    src_region, _, src_width, _ = _get_map_slice(src, src_dungeon, args.source_level)
+    region, base, width, _ = _get_map_slice(data, is_dungeon, getattr(args, 'level', None))
+
+    patch = copy_rect(src_region, src_width, *args.rect)
+    x, y = args.at
+    count = paste(region, width, patch, x, y, args.transparent)
+    data[base:base + len(region)] = region
+    print(f"Stamped {count} tiles ({patch[0]}x{patch[1]}) from "
+          f"{os.path.basename(args.source)} at ({x}, {y})")
+    _write_map(args, data)
+
+
 def cmd_import(args) -> None:
     """Import a map from JSON (tile char grid)."""
     with open(args.file, 'rb') as f:
@@ -493,87 +618,37 @@ def cmd_compile(args) -> None:
         text = f.read()
 
     is_dungeon = getattr(args, 'dungeon', False)
-    char_map = (dict(DUNGEON_TILE_CHARS_REVERSE) if is_dungeon
-                else dict(TILE_CHARS_REVERSE))
-
-    lines = text.split('\n')
-    current_level = []
-    level_grids = []
-    unknown_chars = set()
-
-    for line in lines:
-        stripped = line.rstrip()
-        if stripped.startswith('#') or not stripped:
-            if is_dungeon and current_level:
-                if stripped.startswith('# Level') or stripped.startswith('# ---'):
-                    level_grids.append(current_level)
-                    current_level = []
-            continue
-
-        row = []
-        for ch in stripped:
-            if ch not in char_map:
-                unknown_chars.add(ch)
-            row.append(char_map.get(ch, 0 if is_dungeon else 0x04))
-
-        width = 16 if is_dungeon else 64
-        pad_tile = 0 if is_dungeon else 0x04
-        if len(row) < width:
-            row.extend([pad_tile] * (width - len(row)))
-        elif len(row) > width:
-            row = row[:width]
-
-        current_level.append(row)
-
-    if unknown_chars:
-        default_hex = '0x00' if is_dungeon else '0x04'
-        print(f"  Warning: unknown tile chars mapped to {default_hex}: "
-              f"{sorted(unknown_chars)}", file=sys.stderr)
-
-    if is_dungeon:
-        if current_level:
-            level_grids.append(current_level)
-        if len(level_grids) < 8:
-            print(f"  Warning: only {len(level_grids)} dungeon levels found "
-                  f"(expected 8), padding with empty levels", file=sys.stderr)
-        while len(level_grids) < 8:
-            level_grids.append([[0] * 16 for _ in range(16)])
-        for lvl_idx, level in enumerate(level_grids):
-            if len(level) < 16:
-                print(f"  Warning: level {lvl_idx + 1} has {len(level)} rows "
-                      f"(expected 16), padding", file=sys.stderr)
-            while len(level) < 16:
-                level.append([0] * 16)
-
-        data = bytearray()
-        for level in level_grids[:8]:
-            for row in level[:16]:
-                data.extend(row[:16])
-        expected_size = 2048
-    else:
-        grid = current_level
-        if len(grid) < 64:
-            print(f"  Warning: only {len(grid)} rows found "
-                  f"(expected 64), padding with empty rows", file=sys.stderr)
-        while len(grid) < 64:
-            grid.append([0x04] * 64)  # Pad with Grass (not Water)
-        data = bytearray()
-        for row in grid[:64]:
-            data.extend(row[:64])
-        expected_size = 4096
-
-    assert len(data) == expected_size
+    data, warnings = compile_map_text(text, is_dungeon)
+    for warning in warnings:
+        print(f"  Warning: {warning}", file=sys.stderr)
 
     output = args.output
     if not output:
         print(f"Compiled {'dungeon' if is_dungeon else 'overworld'} map: "
-              f"{expected_size} bytes")
+              f"{len(data)} bytes")
         return
 
     with open(output, 'wb') as f:
         f.write(data)
     print(f"Compiled {'dungeon' if is_dungeon else 'overworld'} map "
-          f"({expected_size} bytes) to {output}")
+          f"({len(data)} bytes) to {output}")
+
+
+def cmd_compile_all(args) -> None:
+    """Compile every .map source in a directory, skipping unchanged ones."""
+    if not os.path.isdir(args.src_dir):
+        print(f"Error: {args.src_dir} is not a directory", file=sys.stderr)
+        sys.exit(1)
+    compiled, unchanged = compile_all(args.src_dir, args.out_dir, args.jobs,
+                                      args.cache, args.force)
+    if not compiled and not unchanged:
+        print(f"Error: No .map sources found in {args.src_dir}", file=sys.stderr)
+        sys.exit(1)
+    for name, out, is_dungeon, size, warnings in compiled:
+        for warning in warnings:
+            print(f"  Warning: {name}: {warning}", file=sys.stderr)
+        print(f"  {name} -> {out} ({'dungeon' if is_dungeon else 'overworld'}, {size} bytes)")
+    print(f"Compiled {len(compiled)} map(s), {len(unchanged)} unchanged")
 
 
 def cmd_decompile(args) -> None:
@@ -644,6 +719,69 @@ def cmd_decompile(args) -> None:
         print(result)
 
 
+def _unique_name(base: str, used: set[str]) -> str:
+    """base, or base-2, base-3, ... if already in used; records the result."""
+    name, n = base, 2
+    while name in used:
+        name = f'{base}-{n}'
+        n += 1
+    used.add(name)
+    return name
+
+
+def _render_tasks(args) -> list[tuple]:
+    """(map, png, shps, level, scale, mip) render tasks for every path in args.
+
+    A single MAP file renders to the --png path itself; otherwise --png is
+    a directory, with one subdirectory per game when several are given.
+    MAP files given individually whose names clash (two MAPA) get -2, -3
+    suffixes instead of overwriting each other's image.
+    """
+    single = len(args.paths) == 1 and os.path.isfile(args.paths[0])
+    tasks = []
+    used = set()
+    outputs = set()
+    for path in args.paths:
+        if os.path.isdir(path):
+            maps = [m for m in (resolve_game_file(path, 'MAP', letter) for letter in MAP_LETTERS) if m]
+            out_dir = args.png
+            if len(args.paths) > 1:
+                out_dir = os.path.join(
+                    args.png, _unique_name(os.path.basename(os.path.normpath(path)), used))
+            game_dir = path
+        elif os.path.isfile(path):
+            maps, out_dir, game_dir = [path], args.png, os.path.dirname(path) or '.'
+        else:
+            print(f"Error: {path} not found", file=sys.stderr)
+            sys.exit(1)
+        shps = args.shps or resolve_single_file(game_dir, 'SHPS')
+        if not shps:
+            print(f"Error: no SHPS file found for {path} (use --shps)", file=sys.stderr)
+            sys.exit(1)
+        for map_path in maps:
+            stem = os.path.basename(map_path).split('#')[0]
+            out = args.png if single else _unique_name(os.path.join(out_dir, stem), outputs) + '.png'
+            tasks.append((map_path, out, shps, args.level, args.scale, args.mip))
+    return tasks
+
+
+def cmd_render(args) -> None:
+    """Render maps as PNG images built from the SHPS tile glyphs."""
+    if args.level is not None and not 0 <= args.level <= 7:
+        print(f"Error: level {args.level} out of range (0-7)", file=sys.stderr)
+        sys.exit(1)
+    if args.scale < 1:
+        print("Error: --scale must be at least 1", file=sys.stderr)
+        sys.exit(1)
+    tasks = _render_tasks(args)
+    if not tasks:
+        print("Error: No MAP files found", file=sys.stderr)
+        sys.exit(1)
+    for out, width, height in render_many(tasks, args.jobs):
+        print(f"  {out} ({width}x{height})")
+    print(f"Rendered {len(tasks)} image(s)")
+
+
 def _add_map_write_args(p) -> None:
     """Add common write arguments for map edit commands."""
     p.add_argument('--output', '-o', help='Output file (default: overwrite)')
@@ -652,6 +790,131 @@ def _add_map_write_args(p) -> None:
     p.add_argument('--level', type=int, help='Dungeon level (0-7, default: 0)')
 
 
+def _int_list(count: int, label: str):
+    """argparse type for `count` comma-separated integers (e.g. x1,y1,x2,y2)."""
+    def parse(text: str) -> tuple[int, ...]:
+        try:
+            values = tuple(int(v) for v in text.split(','))
+        except ValueError:
+            values = ()
+        if len(values) != count:
+            raise argparse.ArgumentTypeError(f"expected {label}, got '{text}'")
+        return values
+    return parse
+
+
+def _tile_byte(text: str) -> int:
+    """argparse type for one tile byte (0-255, decimal or 0x hex)."""
+    try:
+        tile = hex_int(text)
+    except ValueError:
+        tile = -1
+    if not 0 <= tile <= 0xFF:
+        raise argparse.ArgumentTypeError(f"expected a tile byte (0-255), got '{text}'")
+    return tile
+
+
+def _tile_pair(text: str) -> tuple[int, int]:
+    """argparse type for FROM:TO tile bytes (e.g. 0x04:0x0C)."""
+    src, sep, dst = text.partition(':')
+    try:
+        pair = hex_int(src), hex_int(dst)
+    except ValueError:
+        pair = None
+    if not sep or pair is None or not all(0 <= t <= 0xFF for t in pair):
+        raise argparse.ArgumentTypeError(f"expected FROM:TO tile bytes, got '{text}'")
+    return pair
+
+
+def _add_raster_parsers(sub) -> None:
+    """Add the remap and stamp subcommands."""
+    p_remap = sub.add_parser('remap', help='Apply several tile replacements at once')
+    p_remap.add_argument('file', help='MAP file path')
+    p_remap.add_argument('--pair', type=_tile_pair, action='append', required=True,
+                         dest='pairs', metavar='FROM:TO', help='Tile replacement (repeatable)')
+    p_remap.add_argument('--region', type=_int_list(4, 'x1,y1,x2,y2'),
+                         help='Only remap inside x1,y1,x2,y2')
+    _add_map_write_args(p_remap)
+
+    p_stamp = sub.add_parser('stamp', help='Copy a rectangle from another map')
+    p_stamp.add_argument('file', help='MAP file to paste into')
+    p_stamp.add_argument('source', help='MAP file to copy from')
+    p_stamp.add_argument('--rect', type=_int_list(4, 'x1,y1,x2,y2'), required=True,
+                         help='Source rectangle x1,y1,x2,y2')
+    p_stamp.add_argument('--at', type=_int_list(2, 'x,y'), required=True,
+                         help='Top-left destination x,y')
+    p_stamp.add_argument('--transparent', type=_tile_byte,
+                         help='Source tile that leaves the destination unchanged')
+    p_stamp.add_argument('--source-level', type=int, help='Source dungeon level (0-7)')
+    _add_map_write_args(p_stamp)
+
+
+def _add_render_parser(sub) -> None:
+    """Add the render subcommand."""
+    p_render = sub.add_parser('render', help='Render maps as PNG images with SHPS glyphs')
+    p_render.add_argument('paths', nargs='+', metavar='MAP|GAME_DIR',
+                          help='MAP files or GAME directories (every MAP file)')
+    p_render.add_argument('--png', required=True, metavar='OUT',
+                          help='Output PNG (one MAP file) or output directory')
+    p_render.add_argument('--shps', help='SHPS glyph file (default: SHPS next to the maps)')
+    p_render.add_argument('--level', type=int, help='Dungeon level (0-7, default: all stacked)')
+    p_render.add_argument('--scale', type=int, default=1, help='Pixel scale factor (default: 1)')
+    p_render.add_argument('--mip', type=int, choices=(1,) + MIP_FACTORS, default=1,
+                          help='Render a majority-reduced thumbnail (2, 4 or 8 tiles per cell)')
+    p_render.add_argument('--jobs', '-j', type=job_count, default=0,
+                          help='Worker processes (default: CPU count, 1 = serial)')
+
+
+def _add_analyze_parser(sub) -> None:
+    """Add the analyze subcommand."""
+    p_analyze = sub.add_parser('analyze', help='Check reachability of towns, ladders and moongates')
+    p_analyze.add_argument('game_dir', help='GAME directory containing MAP* files')
+    p_analyze.add_argument('--json', action='store_true', help='Output as JSON')
+    p_analyze.add_argument('--output', '-o', help='Output file (for --json)')
+
+
+def _add_find_parsers(sub) -> None:
+    """Add the find and stats subcommands."""
+    p_find = sub.add_parser('find', help='Find all locations of a tile type')
+    p_find.add_argument('file', metavar='FILE|GAME_DIR',
+                        help='MAP file path (GAME directory with --all)')
+    p_find.add_argument('--tile', type=_tile_byte, action='append', required=True,
+                        help='Tile byte value to find (repeatable, 0-255; 0-15 with --dungeon)')
+    p_find.add_argument('--level', type=int, help='Dungeon level (0-7)')
+    p_find.add_argument('--all', action='store_true',
+                        help='Search every MAP, CON and special file in a GAME directory. '
+                             'Matches canonical tiles (animation frames and dungeon high bits '
+                             'masked), where single-file find matches exact bytes')
+    p_find.add_argument('--dungeon', action='store_true',
+                        help='With --all, search dungeons instead of surface maps')
+    p_find.add_argument('--cache', metavar='FILE',
+                        help='With --all, persist the tile index; only changed maps are rescanned')
+    p_find.add_argument('--json', action='store_true', help='Output as JSON')
+    p_find.add_argument('--output', '-o', help='Output file (for --json)')
+
+    p_stats = sub.add_parser('stats', help='Tile histograms for every map in a game')
+    p_stats.add_argument('game_dir', help='GAME directory containing MAP/CON files')
+    p_stats.add_argument('--file', help='Only this file (e.g. MAPA, CONB, SHRN)')
+    p_stats.add_argument('--cache', metavar='FILE',
+                         help='Persist the tile index; only changed maps are rescanned')
+    p_stats.add_argument('--json', action='store_true', help='Output as JSON')
+    p_stats.add_argument('--output', '-o', help='Output file (for --json)')
+
+
+def _add_compile_all_parser(sub) -> None:
+    """Add the compile-all subcommand."""
+    p_all = sub.add_parser('compile-all',
+                           help='Compile every .map source in a directory (changed only)')
+    p_all.add_argument('src_dir', help='Directory of text-art .map sources')
+    p_all.add_argument('out_dir', help='Output directory (existing MAP files are overwritten)')
+    p_all.add_argument('--jobs', '-j', type=job_count, default=0,
+                       help='Worker processes (default: CPU count, 1 = serial)')
+    p_all.add_argument('--cache', metavar='FILE',
+                       help='Build manifest (default: .map-compile.json in OUT_DIR)')
+    p_all.add_argument('--force', action='store_true',
+                       help='Recompile every source, even if unchanged')
+
+
 def register_parser(subparsers) -> None:
     """Register map subcommands on a CLI subparser group."""
     p = subparsers.add_parser('map', help='Map viewer/editor')
@@ -666,9 +929,15 @@ def register_parser(subparsers) -> None:
     p_over = sub.add_parser('overview', help='Overview of all maps')
     p_over.add_argument('game_dir', help='GAME directory containing MAP* files')
     p_over.add_argument('--preview', action='store_true', help='Show scaled overworld preview')
+    p_over.add_argument('--zoom', type=int, choices=MIP_FACTORS, default=4,
+                        help='Preview reduction factor (default: 4)')
+    p_over.add_argument('--cache', help='Persist preview pyramids in this JSON file')
     p_over.add_argument('--json', action='store_true', help='Output as JSON')
     p_over.add_argument('--output', '-o', help='Output file (for --json)')
 
+    _add_analyze_parser(sub)
+    _add_render_parser(sub)
+
     sub.add_parser('legend', help='Print tile legend')
 
     p_edit = sub.add_parser('edit', help='Edit a map (TUI)')
@@ -696,12 +965,9 @@ def register_parser(subparsers) -> None:
     p_replace.add_argument('--to', type=hex_int, required=True, dest='to_tile', help='Replacement tile')
     _add_map_write_args(p_replace)
 
-    p_find = sub.add_parser('find', help='Find all locations of a tile type')
-    p_find.add_argument('file', help='MAP file path')
-    p_find.add_argument('--tile', type=hex_int, required=True, help='Tile byte value to find')
-    p_find.add_argument('--level', type=int, help='Dungeon level (0-7)')
-    p_find.add_argument('--json', action='store_true', help='Output as JSON')
-    p_find.add_argument('--output', '-o', help='Output file (for --json)')
+    _add_find_parsers(sub)
+
+    _add_raster_parsers(sub)
 
     p_import = sub.add_parser('import', help='Import map from JSON')
     p_import.add_argument('file', help='MAP file path')
@@ -717,6 +983,8 @@ def register_parser(subparsers) -> None:
     p_compile.add_argument('--dungeon', action='store_true',
                            help='Compile as dungeon (8x 16x16)')
 
+    _add_compile_all_parser(sub)
+
     p_decompile = sub.add_parser('decompile',
                                  help='Decompile binary MAP to text-art')
     p_decompile.add_argument('file', help='Binary MAP file')
@@ -730,6 +998,10 @@ def dispatch(args) -> None:
         cmd_view(args)
     elif cmd == 'overview':
         cmd_overview(args)
+    elif cmd == 'analyze':
+        cmd_analyze(args)
+    elif cmd == 'render':
+        cmd_render(args)
     elif cmd == 'legend':
         cmd_legend(args)
     elif cmd == 'edit':
@@ -742,16 +1014,24 @@ def dispatch(args) -> None:
         cmd_replace(args)
     elif cmd == 'find':
         cmd_find(args)
+    elif cmd == 'stats':
+        cmd_stats(args)
+    elif cmd == 'remap':
+        cmd_remap(args)
+    elif cmd == 'stamp':
+        cmd_stamp(args)
     elif cmd == 'import':
         cmd_import(args)
     elif cmd == 'compile':
         cmd_compile(args)
+    elif cmd == 'compile-all':
+        cmd_compile_all(args)
     elif cmd == 'decompile':
         cmd_decompile(args)
     else:
         print("Usage: ult3edit map "
-              "{view|overview|legend|edit|set|fill|replace|find|import|"
-              "compile|decompile} ...", file=sys.stderr)
+              "{view|overview|analyze|render|legend|edit|set|fill|replace|find|stats|remap|stamp|"
+              "import|compile|compile-all|decompile} ...", file=sys.stderr)
 
 
 def main() -> None:
@@ -769,9 +1049,15 @@ def main() -> None:
     p_over = sub.add_parser('overview', help='Overview of all maps')
     p_over.add_argument('game_dir', help='GAME directory containing MAP* files')
     p_over.add_argument('--preview', action='store_true', help='Show scaled overworld preview')
+    p_over.add_argument('--zoom', type=int, choices=MIP_FACTORS, default=4,
+                        help='Preview reduction factor (default: 4)')
+    p_over.add_argument('--cache', help='Persist preview pyramids in this JSON file')
     p_over.add_argument('--json', action='store_true', help='Output as JSON')
     p_over.add_argument('--output', '-o', help='Output file (for --json)')
 
+    _add_analyze_parser(sub)
+    _add_render_parser(sub)
+
     sub.add_parser('legend', help='Print tile legend')
 
     p_edit = sub.add_parser('edit', help='Edit a map (TUI)')
@@ -801,12 +1087,9 @@ def main() -> None:
                            help='Replacement tile')
     _add_map_write_args(p_replace)
 
-    p_find = sub.add_parser('find', help='Find all locations of a tile type')
-    p_find.add_argument('file', help='MAP file path')
-    p_find.add_argument('--tile', type=hex_int, required=True, help='Tile byte value to find')
-    p_find.add_argument('--level', type=int, help='Dungeon level (0-7)')
-    p_find.add_argument('--json', action='store_true', help='Output as JSON')
-    p_find.add_argument('--output', '-o', help='Output file (for --json)')
+    _add_find_parsers(sub)
+
+    _add_raster_parsers(sub)
 
     p_import = sub.add_parser('import', help='Import map from JSON')
     p_import.add_argument('file', help='MAP file path')
@@ -824,6 +1107,8 @@ def main() -> None:
     p_compile.add_argument('--dungeon', action='store_true',
                            help='Compile as dungeon (8x 16x16)')
 
+    _add_compile_all_parser(sub)
+
     p_decompile = sub.add_parser('decompile',
                                  help='Decompile binary MAP to text-art')
     p_decompile.add_argument('file', help='Binary MAP file')
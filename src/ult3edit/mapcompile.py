@@ -0,0 +1,190 @@
+"""Ultima III: Exodus - Text-Art Map Compiler.
+
+Compiles .map sources (one display character per tile, as printed by
+`map decompile`) into binary MAP files. The char -> tile tables are built
+once at import as str.translate tables, so each source row becomes its
+tile bytes with one translate and one latin-1 encode instead of a dict
+lookup per character.
+
+compile_all() builds a whole directory of sources (a conversion keeps
+20+ of them) across a process pool. A JSON manifest records the SHA-1
+of each source and of the MAP file it produced; sources whose hash is
+unchanged and whose output still holds what was compiled are skipped.
+"""
+
+import hashlib
+import os
+
+from .constants import TILE_CHARS_REVERSE, DUNGEON_TILE_CHARS_REVERSE
+from .fileutil import load_json_cache, pool_map, resolve_single_file, save_json_cache
+
+# Bump when compiled output changes so manifests are discarded
+MANIFEST_VERSION = 1
+# Default manifest file name, written to the output directory
+MANIFEST_NAME = '.map-compile.json'
+
+OVERWORLD_WIDTH = 64
+OVERWORLD_HEIGHT = 64
+DUNGEON_WIDTH = 16
+DUNGEON_HEIGHT = 16
+DUNGEON_LEVELS = 8
+
+
+def _translate_table(reverse: dict[str, int]) -> dict[int, str]:
+    return {ord(ch): chr(tile) for ch, tile in reverse.items()}
+
+
+# is_dungeon -> (translate table, known chars, pad tile, row width)
+_FORMATS = {
+    False: (_translate_table(TILE_CHARS_REVERSE), frozenset(TILE_CHARS_REVERSE),
+            0x04, OVERWORLD_WIDTH),
+    True: (_translate_table(DUNGEON_TILE_CHARS_REVERSE),
+           frozenset(DUNGEON_TILE_CHARS_REVERSE), 0x00, DUNGEON_WIDTH),
+}
+
+
+def is_dungeon_source(text: str) -> bool:
+    """True if a .map source has '# Level' separators (dungeon layout)."""
+    return any(line.startswith('# Level') for line in text.split('\n'))
+
+
+def compile_map_text(text: str, is_dungeon: bool = False) -> tuple[bytes, list[str]]:
+    """Compile text-art to MAP bytes; returns (data, warnings).
+
+    Rows are padded or cut to the map width and missing rows and levels
+    are padded (Grass overworld, Open dungeon); unknown characters
+    compile to the pad tile. Each of these produces a warning.
+    """
+    table, known, pad, width = _FORMATS[is_dungeon]
+    pad_row = bytes([pad]) * width
+    unknown: set[str] = set()
+    levels = []
+    current: list[bytes] = []
+
+    for line in text.split('\n'):
+        stripped = line.rstrip()
+        if stripped.startswith('#') or not stripped:
+            if is_dungeon and current and (stripped.startswith('# Level')
+                                           or stripped.startswith('# ---')):
+                levels.append(current)
+                current = []
+            continue
+        if known.issuperset(stripped):
+            row = stripped.translate(table)
+        else:
+            missing = set(stripped).difference(known)
+            unknown |= missing
+            row = stripped.translate({**table, **dict.fromkeys(map(ord, missing), chr(pad))})
+        current.append((row.encode('latin-1') + pad_row)[:width])
+
+    warnings = []
+    if unknown:
+        warnings.append(f"unknown tile chars mapped to 0x{pad:02X}: {sorted(unknown)}")
+
+    if not is_dungeon:
+        if len(current) < OVERWORLD_HEIGHT:
+            warnings.append(f"only {len(current)} rows found "
+                            f"(expected {OVERWORLD_HEIGHT}), padding with empty rows")
+        rows = current[:OVERWORLD_HEIGHT]
+        return b''.join(rows) + pad_row * (OVERWORLD_HEIGHT - len(rows)), warnings
+
+    if current:
+        levels.append(current)
+    if len(levels) < DUNGEON_LEVELS:
+        warnings.append(f"only {len(levels)} dungeon levels found "
+                        f"(expected {DUNGEON_LEVELS}), padding with empty levels")
+    for i, level in enumerate(levels):
+        if len(level) < DUNGEON_HEIGHT:
+            warnings.append(f"level {i + 1} has {len(level)} rows "
+                            f"(expected {DUNGEON_HEIGHT}), padding")
+    levels += [[]] * (DUNGEON_LEVELS - len(levels))
+    data = b''.join(b''.join(level[:DUNGEON_HEIGHT])
+                    + pad_row * (DUNGEON_HEIGHT - len(level[:DUNGEON_HEIGHT]))
+                    for level in levels[:DUNGEON_LEVELS])
+    return data, warnings
+
+
+def compile_file(source: str, output: str,
+                 is_dungeon: bool | None = None) -> tuple[str, bool, int, list[str]]:
+    """Compile one .map source to a MAP file.
+
+    is_dungeon=None detects the layout from the source. Returns
+    (output, is_dungeon, size, warnings).
+    """
+    with open(source, 'r', encoding='utf-8') as f:
+        text = f.read()
+    if is_dungeon is None:
+        is_dungeon = is_dungeon_source(text)
+    data, warnings = compile_map_text(text, is_dungeon)
+    with open(output, 'wb') as f:
+        f.write(data)
+    return output, is_dungeon, len(data), warnings
+
+
+def _compile_worker(task: tuple[str, str]) -> tuple[str, bool, int, list[str]]:
+    return compile_file(*task)
+
+
+def output_path(out_dir: str, source: str) -> str:
+    """MAP file for a source: an existing (possibly #hash-suffixed) file
+    named after the source stem, else a new plain one (mapa.map -> MAPA)."""
+    name = os.path.splitext(os.path.basename(source))[0].upper()
+    return resolve_single_file(out_dir, name) or os.path.join(out_dir, name)
+
+
+def _sha1_file(path: str) -> str | None:
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha1(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def load_manifest(path: str) -> dict:
+    """Load the manifest written by save_manifest()."""
+    return load_json_cache(path, MANIFEST_VERSION, 'sources')
+
+
+def save_manifest(path: str, entries: dict) -> None:
+    """Persist a build manifest as JSON."""
+    save_json_cache(path, MANIFEST_VERSION, 'sources', entries, indent=1, sort_keys=True)
+
+
+def compile_all(src_dir: str, out_dir: str, jobs: int = 0, manifest: str | None = None,
+                force: bool = False) -> tuple[list[tuple[str, str, bool, int, list[str]]], list[str]]:
+    """Compile every .map source in src_dir into out_dir.
+
+    Returns (compiled, unchanged): (source name, output, is_dungeon, size,
+    warnings) per compiled source, and the names of skipped sources.
+    jobs is as for fileutil.pool_map(). manifest defaults to MANIFEST_NAME
+    in out_dir.
+    """
+    manifest = manifest or os.path.join(out_dir, MANIFEST_NAME)
+    entries = {} if force else load_manifest(manifest)
+    names = sorted(n for n in os.listdir(src_dir)
+                   if n.lower().endswith('.map') and os.path.isfile(os.path.join(src_dir, n)))
+    os.makedirs(out_dir, exist_ok=True)
+
+    tasks, digests, unchanged = [], {}, []
+    for name in names:
+        source = os.path.join(src_dir, name)
+        out = output_path(out_dir, source)
+        digests[name] = _sha1_file(source)
+        entry = entries.get(name)
+        if (isinstance(entry, dict) and entry.get('source') == digests[name]
+                and entry.get('output') == os.path.basename(out)
+                and entry.get('output_sha1') == _sha1_file(out)):
+            unchanged.append(name)
+            continue
+        tasks.append((source, out))
+
+    results = pool_map(_compile_worker, tasks, jobs)
+
+    compiled = []
+    for (source, _), (out, is_dungeon, size, warnings) in zip(tasks, results):
+        name = os.path.basename(source)
+        entries[name] = {'source': digests[name], 'output': os.path.basename(out),
+                         'output_sha1': _sha1_file(out)}
+        compiled.append((name, out, is_dungeon, size, warnings))
+    save_manifest(manifest, {n: entries[n] for n in names})
+    return compiled, unchanged
@@ -0,0 +1,115 @@
+"""Ultima III: Exodus - Map Preview Pyramid.
+
+Precomputed zoomed-out copies of a tile map ("mip levels") at 2x, 4x and
+8x reduction. Each cell of a reduced level is the majority tile of the
+factor x factor block it covers in the full map (animation frames and
+dungeon high bits are masked first; ties go to the tile seen first in
+the block). Every level is computed from the full map, so a lone town in
+an 8x8 block of grass stays grass at every zoom.
+
+Pyramids are cached by the map's SHA-1, so `map overview`, the TUI
+minimap and `map render --mip` thumbnails reuse them instead of
+re-reducing unchanged maps. The in-process cache is bounded; a JSON file
+cache (load_cache/save_cache) carries pyramids between runs.
+
+Dungeons are reduced as one 16-wide strip of stacked levels; with
+factors dividing 16, blocks never straddle two levels.
+"""
+
+import hashlib
+
+from .fileutil import load_json_cache, save_json_cache
+
+# Reduced level: (tile bytes, width, height)
+MipLevel = tuple[bytes, int, int]
+
+MIP_FACTORS = (2, 4, 8)
+# Bump when the reduction changes so persisted caches are discarded
+CACHE_VERSION = 1
+CACHE_MAX_ENTRIES = 256
+
+_OVERWORLD_MASK = bytes(b & 0xFC for b in range(256))
+_DUNGEON_MASK = bytes(b & 0x0F for b in range(256))
+
+# In-process cache: 'sha1:width:d|o' -> {factor: MipLevel}
+_cache: dict[str, dict[int, MipLevel]] = {}
+
+
+def downsample(data: bytes, width: int, factor: int, is_dungeon: bool = False) -> MipLevel:
+    """Majority-tile reduction of a row-major map by factor in both axes.
+
+    Partial blocks at the right and bottom edges are reduced as they are.
+    """
+    tiles = bytes(data).translate(_DUNGEON_MASK if is_dungeon else _OVERWORLD_MASK)
+    height = len(tiles) // width
+    out_w = -(-width // factor)
+    out_h = -(-height // factor)
+    out = bytearray()
+    for by in range(0, height, factor):
+        rows = [tiles[y * width:(y + 1) * width] for y in range(by, min(by + factor, height))]
+        for bx in range(0, width, factor):
+            block = b''.join(row[bx:bx + factor] for row in rows)
+            # dict keeps first-seen order, so max() breaks ties by position
+            out.append(max(dict.fromkeys(block), key=block.count))
+    return bytes(out), out_w, out_h
+
+
+def build_pyramid(data: bytes, width: int, is_dungeon: bool = False,
+                  factors=MIP_FACTORS) -> dict[int, MipLevel]:
+    """One reduced level per factor."""
+    return {factor: downsample(data, width, factor, is_dungeon) for factor in factors}
+
+
+def _key(data: bytes, width: int, is_dungeon: bool) -> str:
+    return f"{hashlib.sha1(data).hexdigest()}:{width}:{'d' if is_dungeon else 'o'}"
+
+
+def get_pyramid(data: bytes, width: int, is_dungeon: bool = False,
+                cache: dict | None = None) -> dict[int, MipLevel]:
+    """Pyramid for a map, built once per distinct content.
+
+    The default in-process cache keeps the CACHE_MAX_ENTRIES most
+    recently built pyramids (TUI edits create a new entry per change).
+    """
+    if cache is None:
+        cache = _cache
+    data = bytes(data)
+    key = _key(data, width, is_dungeon)
+    levels = cache.get(key)
+    if levels is None:
+        levels = cache[key] = build_pyramid(data, width, is_dungeon)
+        while cache is _cache and len(cache) > CACHE_MAX_ENTRIES:
+            del cache[next(iter(cache))]
+    return levels
+
+
+def mip_level(data: bytes, width: int, factor: int, is_dungeon: bool = False,
+              cache: dict | None = None) -> MipLevel:
+    """One level of the cached pyramid (factor 1 = the map itself)."""
+    if factor == 1:
+        return bytes(data), width, len(data) // width
+    levels = get_pyramid(data, width, is_dungeon, cache)
+    if factor not in levels:
+        raise ValueError(f"no mip level for factor {factor} (use 1, "
+                         f"{', '.join(str(f) for f in MIP_FACTORS)})")
+    return levels[factor]
+
+
+def load_cache(path: str) -> dict:
+    """Load pyramids written by save_cache()."""
+    cache = {}
+    for key, levels in load_json_cache(path, CACHE_VERSION, 'entries').items():
+        try:
+            cache[key] = {int(f): (bytes.fromhex(h), w, ht) for f, (h, w, ht) in levels.items()}
+        except (TypeError, ValueError, AttributeError):
+            continue
+    return cache
+
+
+def save_cache(path: str, cache: dict) -> None:
+    """Persist pyramids as JSON (tile bytes hex-encoded)."""
+    entries = {
+        key: {str(f): [tiles.hex(), w, h] for f, (tiles, w, h) in levels.items()}
+        for key, levels in cache.items()
+    }
+    save_json_cache(path, CACHE_VERSION, 'entries', entries)
@@ -14,7 +14,7 @@ import json
 import os
 import sys
 
-from .constants import JSR_46BA
+from . import codec
 from .fileutil import backup_file, hex_int
 from .json_export import export_json
 
@@ -118,19 +118,9 @@ def parse_text_region(data: bytes, offset: int, length: int) -> list[str]:
     if content_end < len(region):
         content_end += 1  # include final null terminator
 
-    strings = []
-    current = []
-    for i in range(content_end):
-        b = region[i]
-        if b == 0x00:
-            strings.append(''.join(current))
-            current = []
-        else:
-            ch = b & 0x7F
-            if 0x20 <= ch < 0x7F:
-                current.append(chr(ch))
-    if current:
-        strings.append(''.join(current))
+    strings = [codec.decode(part) for part in region[:content_end].split(b'\x00')]
+    if not strings[-1]:
+        strings.pop()  # text after the final null (empty when null-terminated)
     return strings
 
 
@@ -164,8 +154,7 @@ def encode_text_region(strings: list[str], max_length: int) -> bytes:
     """Encode strings as null-terminated high-ASCII text."""
     out = bytearray()
     for s in strings:
-        for ch in s:
-            out.append((ord(ch) & 0x7F) | 0x80)
+        out += codec.encode(s, upper=False)
         out.append(0x00)
     if len(out) > max_length:
         raise ValueError(f"Encoded text ({len(out)} bytes) exceeds max "
@@ -459,9 +448,6 @@ def cmd_import(args) -> None:
 # Inline string catalog
 # ============================================================================
 
-_JSR_46BA = JSR_46BA
-
-
 def _extract_inline_strings(data: bytes, org: int = 0):
     """Extract JSR $46BA inline strings from binary data.
 
@@ -469,49 +455,22 @@ def _extract_inline_strings(data: bytes, org: int = 0):
     but integrated into the ult3edit package (no external dependency).
     """
     strings = []
-    i = 0
-    idx = 0
-    while i < len(data) - 3:
-        if data[i:i + 3] == _JSR_46BA:
-            text_start = i + 3
-            chars = []
-            j = text_start
-            while j < len(data) and data[j] != 0x00:
-                b = data[j]
-                if b == 0xFF:
-                    chars.append('\n')
-                else:
-                    ch = b & 0x7F
-                    if 0x20 <= ch < 0x7F:
-                        chars.append(chr(ch))
-                j += 1
-            if chars:
-                text = ''.join(chars)
-                byte_count = j - text_start + 1  # including null
-                strings.append({
-                    'index': idx,
-                    'address': org + i,
-                    'text': text,
-                    'byte_count': byte_count,
-                    'text_offset': text_start,
-                    'text_end': j,
-                })
-                idx += 1
-            i = j + 1
-        else:
-            i += 1
+    for idx, (jsr, text_start, text_end, text) in enumerate(
+            codec.scan_inline_strings(data)):
+        strings.append({
+            'index': idx,
+            'address': org + jsr,
+            'text': text,
+            'byte_count': text_end - text_start + 1,  # including null
+            'text_offset': text_start,
+            'text_end': text_end,
+        })
     return strings
 
 
-def _encode_high_ascii(text: str) -> bytearray:
+def _encode_high_ascii(text: str) -> bytes:
     """Encode text as high-ASCII bytes with $FF for newlines."""
-    result = bytearray()
-    for ch in text:
-        if ch == '\n':
-            result.append(0xFF)
-        else:
-            result.append(ord(ch.upper()) | 0x80)
-    return result
+    return codec.encode(text, line_breaks=True)
 
 
 def _patch_inline_string(data: bytearray, string_info: dict,
@@ -0,0 +1,325 @@
+"""Ultima III: Exodus - Whole-Game Project Export/Import.
+
+Converts every data file in a game to editable JSON sources in one pass,
+and builds them back:
+  ROST            -> ROST.json   (roster)
+  MON*            -> MONx.json   (bestiary)
+  MAP*            -> MAPx.json   (maps)
+  CON*            -> CONx.json   (combat battlefields)
+  TLK*            -> TLKx.json   (dialog)
+  PRTY + PLRS     -> PRTY.json   (save state)
+  BRND/SHRN/...   -> SHRN.json   (special locations)
+  TEXT            -> TEXT.json   (game text)
+  ULT3            -> ULT3.json   (engine patch regions)
+
+Each file is handled by the same view --json / import command as the
+per-tool CLI, run in parallel across a process pool. Import validates
+everything before touching the game: every source is applied to a staged
+copy of its binary first, and only if all of them succeed is each changed
+binary moved into place (one write per binary).
+
+Usage:
+    ult3edit project export GAME_DIR SRC_DIR
+    ult3edit project import GAME_DIR SRC_DIR --dry-run
+    ult3edit project import GAME_DIR SRC_DIR --backup --jobs 4
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+
+from . import roster, bestiary, map, combat, tlk, save, special, text, patch
+from .constants import MON_LETTERS, MAP_LETTERS, CON_LETTERS, TLK_LETTERS, SPECIAL_NAMES
+from .fileutil import resolve_game_file, resolve_single_file, backup_file, job_count, pool_map
+from .patch import ENGINE_BINARIES, get_regions
+
+# Tool modules whose view/import commands the project runs, by CLI name.
+_TOOLS = {
+    'roster': roster, 'bestiary': bestiary, 'map': map, 'combat': combat, 'tlk': tlk,
+    'save': save, 'special': special, 'text': text, 'patch': patch,
+}
+
+
+# =============================================================================
+# Project layout
+# =============================================================================
+
+def project_files(game_dir: str) -> list[dict]:
+    """List the project entries present in a game directory.
+
+    Each entry is {'name', 'kind', 'paths'}: name is the JSON source stem
+    (e.g. 'MONA'), kind the tool that converts it, and paths the game
+    binaries it covers (PRTY covers both PRTY and PLRS).
+    """
+    entries = []
+
+    def add(name, kind, *paths):
+        paths = [p for p in paths if p]
+        if paths:
+            entries.append({'name': name, 'kind': kind, 'paths': paths})
+
+    add('ROST', 'roster', resolve_single_file(game_dir, 'ROST'))
+    for letter in MON_LETTERS:
+        add(f'MON{letter}', 'bestiary', resolve_game_file(game_dir, 'MON', letter))
+    for letter in MAP_LETTERS:
+        add(f'MAP{letter}', 'map', resolve_game_file(game_dir, 'MAP', letter))
+    for letter in CON_LETTERS:
+        add(f'CON{letter}', 'combat', resolve_game_file(game_dir, 'CON', letter))
+    for letter in TLK_LETTERS:
+        add(f'TLK{letter}', 'tlk', resolve_game_file(game_dir, 'TLK', letter))
+    prty = resolve_single_file(game_dir, 'PRTY')
+    if prty:
+        add('PRTY', 'save', prty, resolve_single_file(game_dir, 'PLRS'))
+    for name in SPECIAL_NAMES:
+        add(name, 'special', resolve_single_file(game_dir, name))
+    add('TEXT', 'text', resolve_single_file(game_dir, 'TEXT'))
+    for name in ENGINE_BINARIES:
+        if get_regions(name):
+            add(name, 'patch', resolve_single_file(game_dir, name))
+    return entries
+
+
+def export_argv(entry: dict, game_dir: str, json_path: str) -> list[str]:
+    """Build the CLI arguments that export one entry to JSON."""
+    kind, path = entry['kind'], entry['paths'][0]
+    if kind == 'bestiary':
+        target = [game_dir, '--file', entry['name']]
+    elif kind == 'save':
+        target = [game_dir]
+    else:
+        target = [path]
+    return [kind, 'view', *target, '--json', '--output', json_path]
+
+
+def import_argv(entry: dict, staged_dir: str, json_path: str) -> list[str]:
+    """Build the CLI arguments that import one entry into staged binaries."""
+    kind = entry['kind']
+    if kind == 'save':
+        target = staged_dir
+    else:
+        target = os.path.join(staged_dir, os.path.basename(entry['paths'][0]))
+    return [kind, 'import', target, json_path]
+
+
+# =============================================================================
+# Tool runner
+# =============================================================================
+
+_parser = None
+
+
+def _tool_parser() -> argparse.ArgumentParser:
+    global _parser
+    if _parser is None:
+        _parser = argparse.ArgumentParser(prog='ult3edit')
+        subparsers = _parser.add_subparsers(dest='tool')
+        for module in _TOOLS.values():
+            module.register_parser(subparsers)
+    return _parser
+
+
+def run_tool(argv: list[str]) -> dict:
+    """Run one tool command in-process, capturing its output.
+
+    Returns {'argv', 'ok', 'stdout', 'stderr', 'warnings'}. A non-zero
+    sys.exit() or an I/O or data error marks the run as failed instead of
+    propagating; warnings lists the stderr lines starting with "Warning"
+    (a skipped record or field), which the run itself does not fail on.
+    """
+    out, err = io.StringIO(), io.StringIO()
+    ok = True
+    with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+        try:
+            args = _tool_parser().parse_args(argv)
+            _TOOLS[args.tool].dispatch(args)
+        except SystemExit as e:
+            ok = not e.code
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            ok = False
+    warnings = [line.strip() for line in err.getvalue().splitlines()
+                if line.strip().lower().startswith('warning')]
+    return {'argv': argv, 'ok': ok, 'stdout': out.getvalue(), 'stderr': err.getvalue(),
+            'warnings': warnings}
+
+
+def run_tools(commands: list[list[str]], jobs: int = 0) -> list[dict]:
+    """Run many tool commands across a process pool (see fileutil.pool_map()).
+
+    Results are returned in command order.
+    """
+    return pool_map(run_tool, commands, jobs)
+
+
+# =============================================================================
+# Export / import
+# =============================================================================
+
+def export_project(game_dir: str, src_dir: str, jobs: int = 0) -> dict:
+    """Export every game file to JSON sources in src_dir.
+
+    Returns {'entries', 'results', 'errors'} where errors lists the names
+    of entries whose export failed.
+    """
+    entries = project_files(game_dir)
+    os.makedirs(src_dir, exist_ok=True)
+    commands = [export_argv(e, game_dir, os.path.join(src_dir, f"{e['name']}.json"))
+                for e in entries]
+    results = run_tools(commands, jobs)
+    errors = [e['name'] for e, r in zip(entries, results) if not r['ok']]
+    return {'entries': entries, 'results': results, 'errors': errors}
+
+
+def import_project(game_dir: str, src_dir: str, jobs: int = 0,
+                   dry_run: bool = False, backup: bool = False) -> dict:
+    """Import JSON sources from src_dir back into the game binaries.
+
+    Every source is applied to a staged copy of its binaries first. Only
+    if all imports succeed without warnings (and not dry_run) is each
+    binary whose content changed moved into place; an import that skips a
+    record or field counts as failed. Returns {'entries', 'results', 'errors',
+    'written', 'unchanged'}; entries without a matching NAME.json are skipped.
+    """
+    entries = [e for e in project_files(game_dir)
+               if os.path.isfile(os.path.join(src_dir, f"{e['name']}.json"))]
+    staged_dir = tempfile.mkdtemp(prefix='.ult3edit_import_', dir=game_dir)
+    report = {'entries': entries, 'results': [], 'errors': [], 'written': [], 'unchanged': []}
+    try:
+        for entry in entries:
+            for path in entry['paths']:
+                shutil.copyfile(path, os.path.join(staged_dir, os.path.basename(path)))
+        commands = [import_argv(e, staged_dir, os.path.join(src_dir, f"{e['name']}.json"))
+                    for e in entries]
+        report['results'] = run_tools(commands, jobs)
+        report['errors'] = [e['name'] for e, r in zip(entries, report['results'])
+                            if not r['ok'] or r['warnings']]
+        if report['errors'] or dry_run:
+            return report
+
+        for entry in entries:
+            for path in entry['paths']:
+                staged = os.path.join(staged_dir, os.path.basename(path))
+                with open(path, 'rb') as f:
+                    original = f.read()
+                with open(staged, 'rb') as f:
+                    changed = f.read() != original
+                if not changed:
+                    report['unchanged'].append(path)
+                    continue
+                if backup:
+                    backup_file(path)
+                os.replace(staged, path)
+                report['written'].append(path)
+    finally:
+        shutil.rmtree(staged_dir, ignore_errors=True)
+    return report
+
+
+def _print_failures(report: dict) -> None:
+    for entry, result in zip(report['entries'], report['results']):
+        if entry['name'] in report['errors']:
+            print(f"  {entry['name']}: FAILED", file=sys.stderr)
+            for line in result['stderr'].splitlines():
+                print(f"    {line}", file=sys.stderr)
+
+
+def cmd_export(args) -> None:
+    """Export a whole game to JSON sources."""
+    if not os.path.isdir(args.game_dir):
+        print(f"Error: Not a directory: {args.game_dir}", file=sys.stderr)
+        sys.exit(1)
+    report = export_project(args.game_dir, args.src_dir, args.jobs)
+    if not report['entries']:
+        print(f"Error: No game files found in {args.game_dir}", file=sys.stderr)
+        sys.exit(1)
+    _print_failures(report)
+    exported = len(report['entries']) - len(report['errors'])
+    print(f"Exported {exported} file(s) to {args.src_dir}")
+    if report['errors']:
+        print(f"Error: {len(report['errors'])} file(s) failed to export", file=sys.stderr)
+        sys.exit(1)
+
+
+def cmd_import(args) -> None:
+    """Import JSON sources into a whole game."""
+    if not os.path.isdir(args.game_dir):
+        print(f"Error: Not a directory: {args.game_dir}", file=sys.stderr)
+        sys.exit(1)
+    if not os.path.isdir(args.src_dir):
+        print(f"Error: Not a directory: {args.src_dir}", file=sys.stderr)
+        sys.exit(1)
+    dry_run = getattr(args, 'dry_run', False)
+    report = import_project(args.game_dir, args.src_dir, args.jobs,
+                            dry_run=dry_run, backup=getattr(args, 'backup', False))
+    if not report['entries']:
+        print(f"Error: No JSON sources in {args.src_dir} match files in {args.game_dir}",
+              file=sys.stderr)
+        sys.exit(1)
+    if report['errors']:
+        _print_failures(report)
+        print(f"Error: {len(report['errors'])} source(s) failed validation; "
+              "no files written.", file=sys.stderr)
+        sys.exit(1)
+    print(f"Import: {len(report['entries'])} source(s) validated")
+    if dry_run:
+        print("Dry run - no changes written.")
+        return
+    for path in report['written']:
+        print(f"  Wrote {os.path.basename(path)}")
+    print(f"Imported {len(report['written'])} changed file(s) "
+          f"({len(report['unchanged'])} unchanged)")
+
+
+def _add_export_args(p) -> None:
+    p.add_argument('game_dir', help='GAME directory')
+    p.add_argument('src_dir', help='Output directory for JSON sources')
+    p.add_argument('--jobs', '-j', type=job_count, default=0,
+                   help='Worker processes (default: CPU count, 1 = serial)')
+
+
+def _add_import_args(p) -> None:
+    p.add_argument('game_dir', help='GAME directory (files updated in place)')
+    p.add_argument('src_dir', help='Directory of JSON sources (from project export)')
+    p.add_argument('--jobs', '-j', type=job_count, default=0,
+                   help='Worker processes (default: CPU count, 1 = serial)')
+    p.add_argument('--backup', action='store_true', help='Create .bak backup before overwriting')
+    p.add_argument('--dry-run', action='store_true',
+                   help='Validate sources without writing (any warning fails the import)')
+
+
+def register_parser(subparsers) -> None:
+    """Register project subcommands on a CLI subparser group."""
+    p = subparsers.add_parser('project', help='Whole-game JSON export/import')
+    sub = p.add_subparsers(dest='project_command')
+    _add_export_args(sub.add_parser('export', help='Export every game file to JSON'))
+    _add_import_args(sub.add_parser('import', help='Import JSON sources into a game'))
+
+
+def dispatch(args) -> None:
+    """Dispatch project subcommand."""
+    cmd = args.project_command
+    if cmd == 'export':
+        cmd_export(args)
+    elif cmd == 'import':
+        cmd_import(args)
+    else:
+        print("Usage: ult3edit project {export|import} ...", file=sys.stderr)
+
+
+def main() -> None:
+    """Standalone entry point."""
+    parser = argparse.ArgumentParser(
+        description='Ultima III: Exodus - Whole-Game Project Export/Import')
+    sub = parser.add_subparsers(dest='project_command')
+    _add_export_args(sub.add_parser('export', help='Export every game file to JSON'))
+    _add_import_args(sub.add_parser('import', help='Import JSON sources into a game'))
+    args = parser.parse_args()
+    dispatch(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,517 @@
+"""Ultima III: Exodus - Roster Queries.
+
+Compiles a small boolean expression language into a predicate over raw
+64-byte character records, so scanning a corpus of rosters never builds
+Character objects or dicts for slots that do not match:
+
+    class=Wizard and hp>150 and "Kings" in marks
+    status!=Good or (hp<max_hp and not in_party)
+    weapon>=Sword and "Exotic" in armors
+
+Grammar:
+    expr    := and_expr ('or' and_expr)*
+    and_expr:= not_expr ('and' not_expr)*
+    not_expr:= 'not' not_expr | '(' expr ')' | test
+    test    := FIELD OP (FIELD | VALUE) | VALUE ['not'] 'in' FIELD | FIELD
+
+Fields are the roster JSON keys (name, race, class, gender, status,
+in_party, str, dex, int, wis, hp, max_hp, mp, exp, gold, food, gems, keys,
+powders, torches, sub_morsels, marks, cards, weapon, armor, weapons, armors)
+or the Character attribute names (strength, char_class, ...). Code and
+equipment values accept the same names and letters as `roster edit`
+(class=W, class=Wizard) and are resolved to byte values once, at compile
+time. `in` tests a mark/card bit, a non-zero inventory count, or a name
+substring.
+
+Roster sources may be ROST files, ProDOS disk images, or directories
+(searched recursively for both). Corpus scans (queries, endgame progress
+summaries) fan sources out across a process pool.
+"""
+
+import operator
+import os
+import re
+from collections import Counter
+from collections.abc import Callable
+from functools import lru_cache
+
+from .bcd import BCD_DECODE_TABLE
+from .constants import CHAR_RECORD_SIZE
+from .fileutil import pool_imap
+from .roster import (
+    CHARACTER_LAYOUT, Character, Roster, check_progress, _Bcd, _Bcd16, _Bits, _Code, _Flag, _Index, _Inventory, _Text,
+)
+
+Predicate = Callable[[bytes], bool]
+
+# Disk image extensions recognised when expanding directories
+IMAGE_EXTENSIONS = ('.po', '.2mg', '.dsk')
+
+_FIELDS = {}
+_GROUPS = {}
+for _f in CHARACTER_LAYOUT:
+    _FIELDS[_f.key] = _f
+    _FIELDS[_f.attr] = _f
+    if _f.group:
+        _GROUPS.setdefault(_f.group, []).append(_f)
+del _f
+
+# Keys every query record carries regardless of --fields
+_RECORD_KEYS = ('slot', 'file')
+
+_OPS = {
+    '=': operator.eq, '==': operator.eq, '!=': operator.ne,
+    '<': operator.lt, '<=': operator.le, '>': operator.gt, '>=': operator.ge,
+}
+
+_TOKEN_RE = re.compile(r"""
+    \s*(?:
+      (?P<num>0[xX][0-9A-Fa-f]+|\$[0-9A-Fa-f]+|-?\d+)
+    | (?P<str>"[^"]*"|'[^']*')
+    | (?P<op>==|!=|<=|>=|=|<|>|\(|\))
+    | (?P<word>[A-Za-z_][A-Za-z0-9_]*)
+    )""", re.VERBOSE)
+
+_TRUE = {'TRUE', 'YES', '1'}
+_FALSE = {'FALSE', 'NO', '0'}
+
+
+class QueryError(ValueError):
+    """Raised for a malformed query expression."""
+
+
+# =============================================================================
+# Tokenizer
+# =============================================================================
+
+def _tokenize(expr: str) -> list[tuple[str, object]]:
+    """Split an expression into (kind, value) tokens.
+
+    Kinds: 'num' (int), 'str' (quoted string), 'op', 'kw' (and/or/not/in),
+    'word' (field name or bare string value).
+    """
+    tokens = []
+    pos = 0
+    expr = expr.rstrip()
+    while pos < len(expr):
+        m = _TOKEN_RE.match(expr, pos)
+        if not m or m.end() == pos:
+            raise QueryError(f"Unexpected character at position {pos}: {expr[pos:]!r}")
+        pos = m.end()
+        kind = m.lastgroup
+        text = m.group(kind)
+        if kind == 'num':
+            value = int(text[1:], 16) if text.startswith('$') else int(text, 0)
+            tokens.append(('num', value))
+        elif kind == 'str':
+            tokens.append(('str', text[1:-1]))
+        elif kind == 'word' and text.lower() in ('and', 'or', 'not', 'in'):
+            tokens.append(('kw', text.lower()))
+        else:
+            tokens.append((kind, text))
+    return tokens
+
+
+# =============================================================================
+# Field accessors (raw record -> comparable value)
+# =============================================================================
+
+def _numeric_getter(field) -> Callable[[bytes], int] | None:
+    """Return a raw-bytes accessor for fields that compare as numbers."""
+    off = field.offset
+    if isinstance(field, _Bcd16):
+        return lambda raw: BCD_DECODE_TABLE[raw[off]] * 100 + BCD_DECODE_TABLE[raw[off + 1]]
+    if isinstance(field, _Bcd):
+        return lambda raw: BCD_DECODE_TABLE[raw[off]]
+    if isinstance(field, (_Code, _Index)):
+        return lambda raw: raw[off]
+    return None
+
+
+def _resolve_byte(field, value) -> int:
+    """Resolve a literal to the byte the field's setter would store."""
+    scratch = bytearray(CHAR_RECORD_SIZE)
+    try:
+        field.set(scratch, value)
+    except ValueError as e:
+        raise QueryError(str(e)) from None
+    return scratch[field.offset]
+
+
+def _compare(field, op: str, value, is_field: bool) -> Predicate:
+    """Compile FIELD OP VALUE (or FIELD OP FIELD) into a predicate."""
+    fn = _OPS[op]
+    getter = _numeric_getter(field)
+    if is_field:
+        other = _numeric_getter(value)
+        if getter is None or other is None:
+            raise QueryError(f"Cannot compare {field.key} with {value.key}")
+        return lambda raw: fn(getter(raw), other(raw))
+
+    if isinstance(field, (_Bcd, _Bcd16)):
+        if not isinstance(value, int):
+            raise QueryError(f"{field.key} needs a number, got {value!r}")
+        return lambda raw: fn(getter(raw), value)
+    if isinstance(field, (_Code, _Index)):
+        target = _resolve_byte(field, value)
+        return lambda raw: fn(getter(raw), target)
+    if op not in ('=', '==', '!='):
+        raise QueryError(f"{field.key} only supports = and !=")
+    if isinstance(field, _Flag):
+        text = str(value).upper()
+        if text not in _TRUE | _FALSE:
+            raise QueryError(f"{field.key} needs true or false, got {value!r}")
+        want = text in _TRUE
+        off = field.offset
+        return lambda raw: fn(raw[off] == 0xFF, want)
+    if isinstance(field, _Text):
+        target = str(value).upper()
+        return lambda raw: fn(field.get(raw).upper(), target)
+    raise QueryError(f"Use '\"NAME\" in {field.key}' to test {field.key}")
+
+
+def _contains(field, value) -> Predicate:
+    """Compile VALUE in FIELD into a predicate."""
+    off = field.offset
+    name = str(value).upper()
+    if isinstance(field, _Bits):
+        for bit, bit_name in field.bits.items():
+            if bit_name.upper() == name:
+                mask = 1 << bit
+                return lambda raw: bool(raw[off] & mask)
+        raise QueryError(f"Unknown {field.key[:-1]}: {value}")
+    if isinstance(field, _Inventory):
+        for i, item in enumerate(field.names[1:]):
+            if item.upper() == name:
+                return lambda raw: raw[off + i] != 0
+        raise QueryError(f"Unknown {field.key[:-1]}: {value}")
+    if isinstance(field, _Text):
+        return lambda raw: name in field.get(raw).upper()
+    raise QueryError(f"'in' does not apply to {field.key}")
+
+
+def _truthy(field) -> Predicate:
+    """Compile a bare FIELD test (non-zero, set, or non-empty)."""
+    off = field.offset
+    if isinstance(field, _Code):
+        raise QueryError(f"{field.key} needs a comparison (e.g. {field.key}=...)")
+    if isinstance(field, _Flag):
+        return lambda raw: raw[off] == 0xFF
+    if isinstance(field, _Bits):
+        mask = field.mask
+        return lambda raw: bool(raw[off] & mask)
+    if isinstance(field, _Inventory):
+        width = field.width
+        return lambda raw: any(raw[off:off + width])
+    if isinstance(field, _Text):
+        return lambda raw: raw[off] != 0
+    getter = _numeric_getter(field)
+    return lambda raw: getter(raw) != 0
+
+
+# =============================================================================
+# Parser
+# =============================================================================
+
+class _Parser:
+    """Recursive-descent parser producing predicate closures."""
+
+    def __init__(self, tokens: list[tuple[str, object]]):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self) -> tuple[str, object] | None:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def take(self) -> tuple[str, object]:
+        tok = self.peek()
+        if tok is None:
+            raise QueryError("Unexpected end of expression")
+        self.pos += 1
+        return tok
+
+    def accept(self, kind: str, value=None) -> bool:
+        tok = self.peek()
+        if tok and tok[0] == kind and (value is None or tok[1] == value):
+            self.pos += 1
+            return True
+        return False
+
+    def parse(self) -> Predicate:
+        pred = self.parse_or()
+        if self.peek() is not None:
+            raise QueryError(f"Unexpected {self.peek()[1]!r}")
+        return pred
+
+    def parse_or(self) -> Predicate:
+        terms = [self.parse_and()]
+        while self.accept('kw', 'or'):
+            terms.append(self.parse_and())
+        if len(terms) == 1:
+            return terms[0]
+        return lambda raw: any(t(raw) for t in terms)
+
+    def parse_and(self) -> Predicate:
+        terms = [self.parse_not()]
+        while self.accept('kw', 'and'):
+            terms.append(self.parse_not())
+        if len(terms) == 1:
+            return terms[0]
+        return lambda raw: all(t(raw) for t in terms)
+
+    def parse_not(self) -> Predicate:
+        if self.accept('kw', 'not'):
+            inner = self.parse_not()
+            return lambda raw: not inner(raw)
+        if self.accept('op', '('):
+            inner = self.parse_or()
+            if not self.accept('op', ')'):
+                raise QueryError("Missing ')'")
+            return inner
+        return self.parse_test()
+
+    def parse_test(self) -> Predicate:
+        kind, value = self.take()
+        if self.accept('kw', 'not'):
+            if not self.accept('kw', 'in'):
+                raise QueryError("Expected 'in' after 'not'")
+            pred = self._membership(value)
+            return lambda raw: not pred(raw)
+        if self.accept('kw', 'in'):
+            return self._membership(value)
+        field = _FIELDS.get(value) if kind == 'word' else None
+        if field is None:
+            raise QueryError(f"Unknown field: {value}")
+        tok = self.peek()
+        if tok is None or tok[0] != 'op' or tok[1] not in _OPS:
+            return _truthy(field)
+        self.pos += 1
+        rkind, rvalue = self.take()
+        if rkind in ('kw', 'op'):
+            raise QueryError(f"Expected a value after {tok[1]}")
+        other = _FIELDS.get(rvalue) if rkind == 'word' else None
+        if other is not None:
+            return _compare(field, tok[1], other, True)
+        return _compare(field, tok[1], rvalue, False)
+
+    def _membership(self, value) -> Predicate:
+        kind, name = self.take()
+        field = _FIELDS.get(name) if kind == 'word' else None
+        if field is None:
+            raise QueryError(f"Unknown field: {name}")
+        return _contains(field, value)
+
+
+@lru_cache(maxsize=64)
+def compile_query(expr: str) -> Predicate:
+    """Compile a query expression into a predicate over a raw 64-byte record.
+
+    Raises QueryError for syntax errors, unknown fields, and values that
+    do not resolve (e.g. class=Jester).
+    """
+    tokens = _tokenize(expr)
+    if not tokens:
+        raise QueryError("Empty query")
+    return _Parser(tokens).parse()
+
+
+def match_slots(data: bytes | bytearray, predicate: Predicate) -> list[int]:
+    """Return the non-empty slot indices of a roster buffer that match."""
+    view = memoryview(data)
+    matches = []
+    for i in range(len(data) // CHAR_RECORD_SIZE):
+        rec = view[i * CHAR_RECORD_SIZE:(i + 1) * CHAR_RECORD_SIZE]
+        if any(rec) and predicate(rec):
+            matches.append(i)
+    return matches
+
+
+# =============================================================================
+# Roster sources
+# =============================================================================
+
+def _is_roster_name(path: str) -> bool:
+    return os.path.basename(path).split('#')[0].upper() == 'ROST'
+
+
+def roster_paths(paths: list[str]) -> list[str]:
+    """Expand directories into the ROST files and disk images they contain.
+
+    Files are passed through unchanged (missing ones fail when read, so
+    they are reported per file rather than aborting the run).
+    """
+    found = []
+    for path in paths:
+        if not os.path.isdir(path):
+            found.append(path)
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                if _is_roster_name(name) or name.lower().endswith(IMAGE_EXTENSIONS):
+                    found.append(os.path.join(root, name))
+    return found
+
+
+def read_roster_source(path: str) -> bytes:
+    """Read roster bytes from a ROST file or a disk image containing one."""
+    if path.lower().endswith(IMAGE_EXTENSIONS):
+        from .disk import DiskContext
+        with DiskContext(path) as ctx:
+            data = ctx.read('ROST')
+        if data is None:
+            raise ValueError(f"No ROST file in {path}")
+        return data
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+# =============================================================================
+# Corpus scan
+# =============================================================================
+
+def resolve_fields(names: list[str]) -> tuple:
+    """Resolve --fields names to roster layout fields.
+
+    Names are JSON keys or attribute names, as in queries; a group name
+    such as 'stats' selects every field in it. Raises QueryError for
+    unknown names.
+    """
+    selected = []
+    for name in names:
+        if name in _RECORD_KEYS:
+            continue
+        if name in _GROUPS:
+            selected.extend(_GROUPS[name])
+        elif name in _FIELDS:
+            selected.append(_FIELDS[name])
+        else:
+            raise QueryError(f"Unknown field: {name}")
+    return tuple(dict.fromkeys(selected))
+
+
+def _project(rec: dict, fields: tuple) -> dict:
+    """Keep only the given fields of a to_dict() record, nesting grouped ones."""
+    out = {}
+    for field in fields:
+        if field.group:
+            out.setdefault(field.group, {})[field.key] = rec[field.group][field.key]
+        else:
+            out[field.key] = rec[field.key]
+    return out
+
+
+def query_file(path: str, expr: str, fields: list[str] | None = None) -> list[dict]:
+    """Return to_dict() records (plus 'slot' and 'file') for matching slots.
+
+    fields limits each record to those fields (see resolve_fields(); slot
+    and file are always kept).
+    """
+    selected = resolve_fields(fields) if fields else None
+    data = read_roster_source(path)
+    view = memoryview(data)
+    records = []
+    for i in match_slots(data, compile_query(expr)):
+        rec = Character(view[i * CHAR_RECORD_SIZE:(i + 1) * CHAR_RECORD_SIZE]).to_dict()
+        if selected:
+            rec = _project(rec, selected)
+        rec['slot'] = i
+        rec['file'] = path
+        records.append(rec)
+    return records
+
+
+def _query_worker(path: str, expr: str, fields: list[str] | None) -> tuple[str, list[dict], str | None]:
+    """Process-pool entry point: returns (path, records, error message)."""
+    try:
+        return path, query_file(path, expr, fields), None
+    except (OSError, ValueError) as e:
+        return path, [], str(e)
+
+
+def query_paths(paths: list[str], expr: str, jobs: int = 0,
+                fields: list[str] | None = None):
+    """Yield (path, records, error) for every roster source, in input order.
+
+    Directories are expanded with roster_paths(). The expression and
+    field names are checked up front so mistakes raise QueryError before
+    any work starts.
+    """
+    compile_query(expr)
+    if fields:
+        resolve_fields(fields)
+    yield from pool_imap(_query_worker, roster_paths(paths), jobs, (expr, fields))
+
+
+# =============================================================================
+# Corpus progress
+# =============================================================================
+
+def progress_file(path: str) -> dict:
+    """Endgame readiness for one roster plus its class/race counts."""
+    roster = Roster(read_roster_source(path))
+    progress = check_progress(roster.chars)
+    progress['classes'] = dict(Counter(c.char_class for c in roster if not c.is_empty))
+    progress['races'] = dict(Counter(c.race for c in roster if not c.is_empty))
+    return progress
+
+
+def _progress_worker(path: str) -> tuple[str, dict | None, str | None]:
+    """Process-pool entry point: returns (path, progress, error message)."""
+    try:
+        return path, progress_file(path), None
+    except (OSError, ValueError) as e:
+        return path, None, str(e)
+
+
+def progress_paths(paths: list[str], jobs: int = 0):
+    """Yield (path, progress, error) for every roster source, in input order."""
+    yield from pool_imap(_progress_worker, roster_paths(paths), jobs)
+
+
+_PROGRESS_FLAGS = ('exodus_ready', 'party_ready', 'marks_complete', 'cards_complete',
+                   'has_exotic_weapon', 'has_exotic_armor')
+
+
+def summarize_progress(results) -> dict:
+    """Aggregate (path, progress, error) results into a corpus summary.
+
+    Consumes results as a stream: only counters are kept, so memory stays
+    constant however many rosters are scanned. Percentages are of rosters
+    read successfully.
+    """
+    files = errors = 0
+    flags = Counter()
+    missing_marks = Counter()
+    missing_cards = Counter()
+    classes = Counter()
+    races = Counter()
+    for _path, progress, error in results:
+        if error is not None:
+            errors += 1
+            continue
+        files += 1
+        flags.update(k for k in _PROGRESS_FLAGS if progress[k])
+        missing_marks.update(progress['marks_missing'])
+        missing_cards.update(progress['cards_missing'])
+        classes.update(progress['classes'])
+        races.update(progress['races'])
+
+    def pct(n: int) -> float:
+        return round(100.0 * n / files, 1) if files else 0.0
+
+    def most_common(counter: Counter) -> str | None:
+        return counter.most_common(1)[0][0] if counter else None
+
+    return {
+        'files': files,
+        'errors': errors,
+        'characters': sum(classes.values()),
+        'pct': {k: pct(flags[k]) for k in _PROGRESS_FLAGS},
+        'missing_marks': dict(missing_marks.most_common()),
+        'missing_cards': dict(missing_cards.most_common()),
+        'most_missing_mark': most_common(missing_marks),
+        'most_missing_card': most_common(missing_cards),
+        'classes': dict(classes.most_common()),
+        'races': dict(races.most_common()),
+    }
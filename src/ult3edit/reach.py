@@ -0,0 +1,355 @@
+"""Ultima III: Exodus - Map Reachability Analysis.
+
+Finds the parts of each map the party can actually get to, so broken
+conversions (towns cut off by mountains, dungeon ladders that lead into
+rock, moongates placed in the sea) are caught before anyone plays them:
+
+  Overworld  - flood from the PRTY start on foot (moongates link to each
+               other), then by ship; every town, castle and dungeon
+               entrance is classified foot / ship / unreachable
+  Towns      - flood from the walkable map edge; chests must be reachable
+  Dungeons   - flood from the level 0 up ladders through all 8 levels,
+               following ladders; unmatched ladders and unreachable
+               chests, fountains, marks and orbs are reported
+
+Each map is held as one Python int used as a bitset (bit y*width + x per
+cell, dungeon levels stacked 256 bits apart). One BFS ring is a handful
+of shifts and ANDs over the whole map, so analysing every map of a game
+takes milliseconds and `map analyze` can run as a validation gate.
+"""
+
+import re
+from functools import lru_cache
+
+from .constants import (
+    MAP_NAMES, MAP_LETTERS, MAP_DUNGEON_SIZE, MAP_OVERWORLD_SIZE, PRTY_FILE_SIZE, PRTY_OFF_TRANSPORT,
+    WALKABLE_TILES, SAILABLE_TILES, ENTRANCE_TILES,
+    DUNGEON_WALKABLE_TILES, DUNGEON_LADDER_DOWN, DUNGEON_LADDER_UP,
+    TILE_NAME_TABLE, DUNGEON_NAME_TABLE,
+)
+from .fileutil import resolve_game_file, resolve_single_file
+from .patch import PATCHABLE_REGIONS
+from .save import PartyState
+
+OVERWORLD_LETTERS = 'AL'
+LEVEL_SIZE = 16
+LEVEL_CELLS = LEVEL_SIZE * LEVEL_SIZE
+
+# Only these location codes put the saved x/y on an overworld map
+PRTY_START_MAPS = {0x00: 'A', 0xFF: 'L'}
+PRTY_TRANSPORT_SHIP = 0x0B
+
+_ONE = re.compile('1')
+
+
+def _bit_table(tiles, mask: int) -> bytes:
+    """translate() table: tile byte -> '1' if (byte & mask) is in tiles, else '0'."""
+    return bytes(0x31 if (b & mask) in tiles else 0x30 for b in range(256))
+
+
+_WALK = _bit_table(WALKABLE_TILES, 0xFC)
+_SAIL = _bit_table(SAILABLE_TILES, 0xFC)
+_ENTRANCE = _bit_table(ENTRANCE_TILES, 0xFC)
+_CHEST = _bit_table({0x24}, 0xFC)
+_DUNGEON_WALK = _bit_table(DUNGEON_WALKABLE_TILES, 0x0F)
+_LADDER_DOWN = _bit_table(DUNGEON_LADDER_DOWN, 0x0F)
+_LADDER_UP = _bit_table(DUNGEON_LADDER_UP, 0x0F)
+# Dungeon features that should be reachable: chest, fountain, mark, orb
+_DUNGEON_SIGHTS = {DUNGEON_NAME_TABLE[t]: _bit_table({t}, 0x0F) for t in (0x04, 0x09, 0x0A, 0x0D)}
+
+
+# =============================================================================
+# Bitset primitives
+# =============================================================================
+
+def tile_bits(data: bytes, table: bytes) -> int:
+    """Bitset of the cells whose tile byte the table marks '1' (bit i = cell i)."""
+    if not data:
+        return 0
+    return int(bytes(data).translate(table)[::-1], 2)
+
+
+def cells(bits: int) -> list[int]:
+    """Cell indices of the set bits, ascending."""
+    return [m.start() for m in _ONE.finditer(format(bits, 'b')[::-1])]
+
+
+@lru_cache(maxsize=None)
+def _masks(width: int, height: int, layers: int = 1) -> tuple[int, int, int, int]:
+    """Masks clearing the first column, last column, top row and bottom row."""
+    full = (1 << (width * height * layers)) - 1
+    first_col = int(('0' * (width - 1) + '1') * (height * layers), 2)
+    top_row = int(('0' * (width * (height - 1)) + '1' * width) * layers, 2)
+    return (full ^ first_col, full ^ (first_col << (width - 1)),
+            full ^ top_row, full ^ (top_row << (width * (height - 1))))
+
+
+def edge_bits(width: int, height: int) -> int:
+    """Bitset of the cells on the border of a single-layer map."""
+    not_first, not_last, not_top, not_bottom = _masks(width, height)
+    return ((1 << (width * height)) - 1) & ~(not_first & not_last & not_top & not_bottom)
+
+
+def flood(seed: int, passable: int, width: int, height: int, layers: int = 1,
+          link=None) -> int:
+    """Every passable cell 4-connected to the seed cells (bitset BFS).
+
+    Each pass grows the reached set by one ring in all directions at once.
+    Steps never wrap between columns, rows of different layers, or layers.
+    link(reached) may return extra cells joined by non-adjacent connections
+    (moongates, ladders); they are filtered through passable like the rest.
+    """
+    not_first, not_last, not_top, not_bottom = _masks(width, height, layers)
+    reached = seed & passable
+    while True:
+        grown = (reached
+                 | (reached << 1) & not_first | (reached >> 1) & not_last
+                 | (reached << width) & not_top | (reached >> width) & not_bottom)
+        if link is not None:
+            grown |= link(reached)
+        grown &= passable
+        if grown == reached:
+            return reached
+        reached = grown
+
+
+def components(passable: int, width: int, height: int, layers: int = 1,
+               link=None) -> list[int]:
+    """Connected components of the passable cells, largest first."""
+    found = []
+    rest = passable
+    while rest:
+        comp = flood(rest & -rest, rest, width, height, layers, link)
+        found.append(comp)
+        rest &= ~comp
+    found.sort(key=int.bit_count, reverse=True)
+    return found
+
+
+# =============================================================================
+# Per-map analysis
+# =============================================================================
+
+def _issue(entity: str, message: str) -> dict:
+    return {'entity': entity, 'message': message}
+
+
+def _summary(passable: int, reached: int, comps: list[int], issues: list[dict]) -> dict:
+    return {
+        'components': len(comps),
+        'passable': passable.bit_count(),
+        'reachable': (reached & passable).bit_count(),
+        'issues': issues,
+    }
+
+
+def analyze_overworld(data: bytes, start: tuple[int, int] | None = None,
+                      ship: bool = False, moongates=()) -> dict:
+    """Analyse a 64-wide overworld (Sosaria or Ambrosia).
+
+    start is the party's (x, y); without one the largest walkable region
+    is used. moongates is a sequence of (x, y), one per moon phase; every
+    gate on walkable ground is linked to every other.
+    """
+    width, height = 64, len(data) // 64
+    walk = tile_bits(data, _WALK)
+    sail = tile_bits(data, _SAIL)
+    issues = []
+
+    gates = 0
+    for phase, (gx, gy) in enumerate(moongates):
+        entity = f'Moongate {phase}'
+        if not (0 <= gx < width and 0 <= gy < height):
+            issues.append(_issue(entity, f'({gx}, {gy}) is off the map'))
+        elif not walk >> (gy * width + gx) & 1:
+            tile = TILE_NAME_TABLE[data[gy * width + gx]]
+            issues.append(_issue(entity, f'({gx}, {gy}) is on {tile}'))
+        else:
+            gates |= 1 << (gy * width + gx)
+    link = (lambda r: gates if r & gates else 0) if gates else None
+
+    comps = components(walk, width, height, link=link)
+    if start is not None:
+        sx, sy = start
+        allowed = walk | sail if ship else walk
+        if not (0 <= sx < width and 0 <= sy < height):
+            issues.append(_issue('Start', f'({sx}, {sy}) is off the map'))
+            seed = 0
+        else:
+            seed = 1 << (sy * width + sx)
+            if not allowed & seed:
+                tile = TILE_NAME_TABLE[data[sy * width + sx]]
+                issues.append(_issue('Start', f'({sx}, {sy}) is on {tile}'))
+    else:
+        seed = comps[0] if comps else 0
+
+    foot = flood(seed, walk, width, height, link=link)
+    # By ship: sail any water touching the foot region and land on any shore
+    by_ship = flood(seed | foot, walk | sail, width, height, link=link) | foot
+    if gates and not gates & by_ship:
+        issues.append(_issue('Moongates', 'no moongate is reachable'))
+
+    entrances = tile_bits(data, _ENTRANCE)
+    for i in cells(entrances & ~by_ship):
+        x, y = i % width, i // width
+        issues.append(_issue(f'{TILE_NAME_TABLE[data[i]]} ({x}, {y})',
+                             'unreachable on foot or by ship'))
+
+    result = _summary(walk, foot, comps, issues)
+    result['entrances'] = {
+        'foot': (entrances & foot).bit_count(),
+        'ship': (entrances & by_ship & ~foot).bit_count(),
+        'unreachable': (entrances & ~by_ship).bit_count(),
+    }
+    return result
+
+
+def analyze_town(data: bytes) -> dict:
+    """Analyse a 64-wide town or castle map entered from its edge."""
+    width, height = 64, len(data) // 64
+    walk = tile_bits(data, _WALK)
+    issues = []
+    entry = walk & edge_bits(width, height)
+    if not entry:
+        issues.append(_issue('Edge', 'no walkable cell on the map edge'))
+    reached = flood(entry, walk, width, height)
+    for i in cells(tile_bits(data, _CHEST) & ~reached):
+        issues.append(_issue(f'Chest ({i % width}, {i // width})',
+                             'unreachable from the map edge'))
+    return _summary(walk, reached, components(walk, width, height), issues)
+
+
+def analyze_dungeon(data: bytes) -> dict:
+    """Analyse a dungeon: 16x16 levels joined by ladders at the same x, y.
+
+    A down ladder must sit above an up ladder (or a two-way ladder) on the
+    next level and vice versa. The party enters and leaves through the up
+    ladders on level 0.
+    """
+    layers = len(data) // LEVEL_CELLS
+    if not layers:
+        return _summary(0, 0, [], [])
+    data = bytes(data[:layers * LEVEL_CELLS])
+    walk = tile_bits(data, _DUNGEON_WALK)
+    down = tile_bits(data, _LADDER_DOWN)
+    up = tile_bits(data, _LADDER_UP)
+    issues = []
+
+    def where(i: int) -> str:
+        level, cell = divmod(i, LEVEL_CELLS)
+        return f'Level {level} ({cell % LEVEL_SIZE}, {cell // LEVEL_SIZE})'
+
+    for i in cells(down & ~(up >> LEVEL_CELLS)):
+        below = (DUNGEON_NAME_TABLE[data[i + LEVEL_CELLS]] if i + LEVEL_CELLS < len(data)
+                 else 'nothing (last level)')
+        issues.append(_issue(where(i), f'ladder down leads to {below}'))
+    for i in cells(up & ~(down << LEVEL_CELLS) & ~((1 << LEVEL_CELLS) - 1)):
+        above = DUNGEON_NAME_TABLE[data[i - LEVEL_CELLS]]
+        issues.append(_issue(where(i), f'ladder up leads to {above}'))
+
+    def link(r: int) -> int:
+        return ((r & down) << LEVEL_CELLS) & up | ((r & up) >> LEVEL_CELLS) & down
+
+    exits = up & ((1 << LEVEL_CELLS) - 1)
+    if not exits:
+        issues.append(_issue('Level 0', 'no ladder up (no way in or out)'))
+    reached = flood(exits, walk, LEVEL_SIZE, LEVEL_SIZE, layers, link)
+
+    level_mask = (1 << LEVEL_CELLS) - 1
+    sights = {name: tile_bits(data, table) for name, table in _DUNGEON_SIGHTS.items()}
+    # Without an entrance every level would be reported; one issue is enough
+    for level in range(layers if exits else 0):
+        shift = level * LEVEL_CELLS
+        if not (reached >> shift) & level_mask:
+            if (walk >> shift) & level_mask:
+                issues.append(_issue(f'Level {level}', 'unreachable from the entrance'))
+            continue
+        for name, bits in sights.items():
+            lost = ((bits & ~reached) >> shift & level_mask).bit_count()
+            if lost:
+                issues.append(_issue(f'Level {level}', f'{lost} {name}(s) unreachable'))
+
+    comps = components(walk, LEVEL_SIZE, LEVEL_SIZE, layers, link)
+    return _summary(walk, reached, comps, issues)
+
+
+# =============================================================================
+# Whole game
+# =============================================================================
+
+def _read(path: str | None) -> bytes | None:
+    if not path:
+        return None
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def load_moongates(data: bytes | None) -> list[tuple[int, int]]:
+    """(x, y) per moon phase from the ULT3 moongate-x/y patch regions."""
+    regions = PATCHABLE_REGIONS['ULT3']
+    rx, ry = regions['moongate-x'], regions['moongate-y']
+    if not data or len(data) < max(rx['offset'] + rx['max_length'],
+                                   ry['offset'] + ry['max_length']):
+        return []
+    xs = data[rx['offset']:rx['offset'] + rx['max_length']]
+    ys = data[ry['offset']:ry['offset'] + ry['max_length']]
+    return list(zip(xs, ys))
+
+
+def analyze_game(game_dir: str) -> dict:
+    """Analyse every MAP file in a game directory.
+
+    The PRTY saved position is checked on Sosaria (or on Ambrosia when the
+    party is there); inside a town, dungeon or other location it is not an
+    overworld coordinate and the largest region is used instead. The ULT3
+    moongates are checked on Sosaria.
+    """
+    prty = _read(resolve_single_file(game_dir, 'PRTY'))
+    party = PartyState(prty) if prty and len(prty) >= PRTY_FILE_SIZE else None
+    moongates = load_moongates(_read(resolve_single_file(game_dir, 'ULT3')))
+    start_map = PRTY_START_MAPS.get(party.location_code) if party is not None else None
+
+    maps = []
+    for letter in MAP_LETTERS:
+        data = _read(resolve_game_file(game_dir, 'MAP', letter))
+        if data is None:
+            continue
+        if len(data) not in (MAP_DUNGEON_SIZE, MAP_OVERWORLD_SIZE):
+            # Truncated or padded: neither layout applies, so nothing to flood
+            kind, result = 'unknown', _summary(0, 0, [], [_issue(
+                'File', f'{len(data)} bytes (expected {MAP_DUNGEON_SIZE} or {MAP_OVERWORLD_SIZE})')])
+        elif len(data) == MAP_DUNGEON_SIZE:
+            kind, result = 'dungeon', analyze_dungeon(data)
+        elif letter in OVERWORLD_LETTERS:
+            start = (party.x, party.y) if letter == start_map else None
+            ship = party is not None and party.raw[PRTY_OFF_TRANSPORT] == PRTY_TRANSPORT_SHIP
+            gates = moongates if letter == 'A' else ()
+            kind, result = 'overworld', analyze_overworld(data, start, ship, gates)
+        else:
+            kind, result = 'town', analyze_town(data)
+        maps.append({'file': f'MAP{letter}', 'name': MAP_NAMES.get(letter, 'Unknown'),
+                     'type': kind, **result})
+    return {
+        'path': game_dir,
+        'maps': maps,
+        'issue_count': sum(len(m['issues']) for m in maps),
+    }
+
+
+def format_text(report: dict) -> str:
+    """Format an analysis report as human-readable text."""
+    lines = [f"=== Map analysis: {report['path']} ==="]
+    for entry in report['maps']:
+        status = 'OK' if not entry['issues'] else f"{len(entry['issues'])} issue(s)"
+        lines.append(f"  {entry['file']:<6s} {entry['name']:<28s} "
+                     f"{entry['reachable']:>4d}/{entry['passable']:<4d} reachable, "
+                     f"{entry['components']} region(s)  {status}")
+        if 'entrances' in entry:
+            e = entry['entrances']
+            lines.append(f"         entrances: {e['foot']} on foot, {e['ship']} by ship, "
+                         f"{e['unreachable']} unreachable")
+        for issue in entry['issues']:
+            lines.append(f"    {issue['entity']}: {issue['message']}")
+    lines.append('')
+    lines.append(f"Total: {report['issue_count']} issue(s) in {len(report['maps'])} map(s)")
+    return '\n'.join(lines)
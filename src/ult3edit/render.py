@@ -0,0 +1,162 @@
+"""Ultima III: Exodus - Map Image Rendering.
+
+Draws MAP files as PNG images using the game's own SHPS tile glyphs:
+each cell becomes its 7x8 glyph, so the 64x64 overworld is a 448x512
+image, a dungeon level is 112x128 and a whole dungeon (levels stacked
+top to bottom) is 112x1024.
+
+The 256 glyphs are decoded once per SHPS file into a GlyphAtlas: for
+each of the 8 pixel rows, a 256-entry list of ready-made RGB strips
+(coloured and widened by the scale factor). A map row of pixels is then
+one b''.join over the row's tile bytes; no per-pixel work happens while
+rendering. Batches of maps (every MAP file in hundreds of builds) fan
+out across a process pool, each worker reusing its atlases.
+"""
+
+import hashlib
+import os
+
+from .constants import MAP_DUNGEON_SIZE
+from .fileutil import pool_map
+from .mipmap import mip_level
+from .shapes import (
+    GLYPH_SIZE, GLYPH_WIDTH, GLYPH_HEIGHT, GLYPHS_PER_FILE, HGR_COLORS, encode_png,
+)
+
+OVERWORLD_WIDTH = 64
+DUNGEON_WIDTH = 16
+BACKGROUND = (0, 0, 0)
+
+# Foreground colour by canonical tile ID (glyphs are 1 bit per pixel);
+# anything not listed is drawn white
+TILE_COLORS = {
+    **dict.fromkeys((0x00, 0x2C, 0x30, 0x34, 0x38, 0x3C), HGR_COLORS['blue']),
+    **dict.fromkeys((0x04, 0x08, 0x0C), HGR_COLORS['green']),
+    **dict.fromkeys((0x10, 0x84, 0xF4), HGR_COLORS['orange']),
+    **dict.fromkeys((0x80, 0x88, 0xF0), HGR_COLORS['purple']),
+}
+
+# SHPS has no dungeon glyphs: each dungeon tile borrows the closest
+# overworld glyph and a colour of its own. (glyph tile ID, colour name)
+DUNGEON_GLYPHS = {
+    0x00: (0x90, 'black'),    # Open -> Void
+    0x01: (0x8C, 'white'),    # Wall
+    0x02: (0xAC, 'orange'),   # Door
+    0x03: (0x8C, 'purple'),   # Secret Door -> tinted wall
+    0x04: (0x24, 'orange'),   # Chest
+    0x05: (0x98, 'green'),    # Ladder Down -> Bridge
+    0x06: (0x98, 'blue'),     # Ladder Up -> Bridge
+    0x07: (0x98, 'white'),    # Ladder Both -> Bridge
+    0x08: (0x84, 'orange'),   # Trap -> Lava
+    0x09: (0x00, 'blue'),     # Fountain -> Water
+    0x0A: (0xA8, 'white'),    # Mark -> Ankh
+    0x0B: (0xF0, 'blue'),     # Wind -> Magic
+    0x0C: (0x64, 'green'),    # Gremlins -> Skeleton
+    0x0D: (0x88, 'purple'),   # Orb -> Moongate
+    0x0E: (0x90, 'purple'),   # Pit -> Void
+    0x0F: (0xFC, 'white'),    # Unknown -> Hidden
+}
+
+# Atlases by (SHPS SHA-1, scale, dungeon); built once per process
+_atlases: dict[tuple[str, int, bool], 'GlyphAtlas'] = {}
+
+
+class GlyphAtlas:
+    """Pre-rendered RGB strips for all 256 tile bytes.
+
+    rows[r][tile] is pixel row r of the glyph drawn for that tile byte,
+    as packed RGB bytes already widened by scale.
+    """
+
+    __slots__ = ('scale', 'cell_width', 'rows')
+
+    def __init__(self, shps: bytes, scale: int = 1, dungeon: bool = False):
+        self.scale = scale
+        self.cell_width = GLYPH_WIDTH * scale
+        bg = bytes(BACKGROUND) * scale
+        # Decoded strip per (glyph row byte, colour), shared across glyphs
+        strips: dict[tuple[int, tuple], bytes] = {}
+
+        def strip(bits: int, fg: tuple) -> bytes:
+            key = (bits, fg)
+            if key not in strips:
+                on = bytes(fg) * scale
+                strips[key] = b''.join(on if bits >> x & 1 else bg for x in range(GLYPH_WIDTH))
+            return strips[key]
+
+        glyphs, colors = [], []
+        for tile in range(256):
+            if dungeon:
+                glyph, color = DUNGEON_GLYPHS[tile & 0x0F]
+                colors.append(HGR_COLORS[color])
+            else:
+                glyph = tile
+                colors.append(TILE_COLORS.get(tile & 0xFC, HGR_COLORS['white']))
+            glyphs.append(glyph % GLYPHS_PER_FILE * GLYPH_SIZE)
+        self.rows = tuple(
+            [strip(shps[g + r] if g + r < len(shps) else 0, fg)
+             for g, fg in zip(glyphs, colors)]
+            for r in range(GLYPH_HEIGHT))
+
+    def render(self, data: bytes, width: int) -> list[bytes]:
+        """Pixel rows (packed RGB) for a row-major tile buffer of the given width."""
+        out = []
+        for y in range(len(data) // width):
+            tiles = data[y * width:(y + 1) * width]
+            for strips in self.rows:
+                line = b''.join(map(strips.__getitem__, tiles))
+                out.extend([line] * self.scale)
+        return out
+
+
+def get_atlas(shps: bytes, scale: int = 1, dungeon: bool = False) -> GlyphAtlas:
+    """Atlas for a SHPS file, decoded on first use and cached by content hash."""
+    key = (hashlib.sha1(shps).hexdigest(), scale, dungeon)
+    atlas = _atlases.get(key)
+    if atlas is None:
+        atlas = _atlases[key] = GlyphAtlas(shps, scale, dungeon)
+    return atlas
+
+
+def render_map_image(data: bytes, shps: bytes, level: int | None = None,
+                     scale: int = 1, mip: int = 1) -> tuple[list[bytes], int, int]:
+    """Render a map to (pixel rows, width, height).
+
+    Dungeons render one level when level is given, otherwise all levels
+    stacked vertically. mip > 1 renders the cached majority-reduced level
+    (one glyph per mip x mip block) for thumbnails.
+    """
+    dungeon = len(data) <= MAP_DUNGEON_SIZE
+    width = DUNGEON_WIDTH if dungeon else OVERWORLD_WIDTH
+    if dungeon and level is not None:
+        data = data[level * 256:(level + 1) * 256]
+    data, width, _ = mip_level(data, width, mip, dungeon)
+    atlas = get_atlas(bytes(shps), scale, dungeon)
+    rows = atlas.render(bytes(data), width)
+    return rows, width * atlas.cell_width, len(rows)
+
+
+def render_png(map_path: str, out_path: str, shps_path: str,
+               level: int | None = None, scale: int = 1, mip: int = 1) -> tuple[str, int, int]:
+    """Render one MAP file to a PNG; returns (out_path, width, height)."""
+    with open(map_path, 'rb') as f:
+        data = f.read()
+    with open(shps_path, 'rb') as f:
+        shps = f.read()
+    rows, width, height = render_map_image(data, shps, level, scale, mip)
+    out_dir = os.path.dirname(out_path)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    with open(out_path, 'wb') as f:
+        f.write(encode_png(rows, width, height))
+    return out_path, width, height
+
+
+def _render_worker(task: tuple) -> tuple[str, int, int]:
+    return render_png(*task)
+
+
+def render_many(tasks: list[tuple], jobs: int = 0) -> list[tuple[str, int, int]]:
+    """Render (map_path, out_path, shps_path, level, scale[, mip]) tasks
+    across a process pool (see fileutil.pool_map())."""
+    return pool_map(_render_worker, tasks, jobs)
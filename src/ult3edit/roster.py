@@ -12,10 +12,16 @@ Bug fixes from prototype:
 
 import argparse
 import json
+import mmap
 import os
 import sys
+from abc import ABC, abstractmethod
+from operator import itemgetter
 
-from .bcd import bcd_to_int, bcd16_to_int, int_to_bcd, int_to_bcd16, is_valid_bcd
+from .bcd import (
+    BCD_DECODE_TABLE, bcd16_to_int, int_to_bcd, int_to_bcd16,
+    decode_bcd_bytes, find_invalid_bcd,
+)
 from .constants import (
     CHAR_RECORD_SIZE, RACES, RACE_CODES, CLASSES, CLASS_CODES, GENDERS, STATUS_CODES,
     WEAPONS, ARMORS, MARKS_BITS, CARDS_BITS, RACE_MAX_STATS,
@@ -32,265 +38,304 @@ from .constants import (
     CHAR_WORN_ARMOR, CHAR_ARMOR_START,
     CHAR_READIED_WEAPON, CHAR_WEAPON_START,
 )
-from .fileutil import decode_high_ascii, backup_file
+from . import codec
+from .fileutil import decode_high_ascii, backup_file, job_count
 from .json_export import export_json
 
 
-class Character:
-    """A single Ultima III character record (64 bytes)."""
+# =============================================================================
+# Record layout
+# =============================================================================
+# Each Character field is declared once below as (JSON key, offset, codec).
+# The codec classes are data descriptors: the table is compiled onto
+# Character as attributes (char.hp, char.race, ...), and to_dict() /
+# apply_dict() walk the same table, decoding every BCD byte of a record
+# in one translate() call instead of one property call per field.
 
-    def __init__(self, data: bytes | bytearray):
-        if len(data) != CHAR_RECORD_SIZE:
-            raise ValueError(f"Character record must be {CHAR_RECORD_SIZE} bytes, got {len(data)}")
-        self.raw = bytearray(data)
+class _Field(ABC):
+    """Base descriptor for one field of a 64-byte character record."""
 
-    @property
-    def is_empty(self) -> bool:
-        return all(b == 0 for b in self.raw)
+    width = 1
 
-    # --- Name (14-byte field: up to 13 chars + null terminator at 0x0D) ---
-    # Engine BOOT.s input loop: CPY #$0D limits name to 13 characters.
-    # Display routine in SUBS.s ($46F9) reads until null byte.
-    @property
-    def name(self) -> str:
-        return decode_high_ascii(self.raw[CHAR_NAME_OFFSET:CHAR_NAME_OFFSET + CHAR_NAME_FIELD])
-
-    @name.setter
-    def name(self, val: str) -> None:
-        # Null-fill the full 14-byte field, then write name chars.
-        # This matches the engine's character creation behavior (zero-fill
-        # then overwrite with typed characters, null-terminated).
-        field = bytearray(CHAR_NAME_FIELD)  # all zeros
-        for i, ch in enumerate(val[:CHAR_NAME_MAX].upper()):
-            field[i] = ord(ch) | 0x80
-        self.raw[CHAR_NAME_OFFSET:CHAR_NAME_OFFSET + CHAR_NAME_FIELD] = field
-
-    # --- Marks and Cards (byte 0x0E) ---
-    # R-2 FIX: High nibble = marks (bits 7-4), low nibble = cards (bits 3-0)
-    @property
-    def marks(self) -> list[str]:
-        b = self.raw[CHAR_MARKS_CARDS]
-        return [name for bit, name in MARKS_BITS.items() if b & (1 << bit)]
+    def __init__(self, key: str, offset: int, attr: str | None = None,
+                 group: str | None = None):
+        self.key = key
+        self.offset = offset
+        self.attr = attr or key
+        self.group = group  # nested JSON object (e.g. 'stats'), or None
 
-    @marks.setter
-    def marks(self, names: list[str]) -> None:
-        b = self.raw[CHAR_MARKS_CARDS] & 0x0F  # Keep cards
-        lower_names = [n.lower() for n in names]
-        for bit, name in MARKS_BITS.items():
-            if name.lower() in lower_names:
-                b |= (1 << bit)
-        self.raw[CHAR_MARKS_CARDS] = b
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        return self.get(obj.raw)
 
-    @property
-    def cards(self) -> list[str]:
-        b = self.raw[CHAR_MARKS_CARDS]
-        return [name for bit, name in CARDS_BITS.items() if b & (1 << bit)]
+    def __set__(self, obj, value) -> None:
+        self.set(obj.raw, value)
 
-    @cards.setter
-    def cards(self, names: list[str]) -> None:
-        b = self.raw[CHAR_MARKS_CARDS] & 0xF0  # Keep marks
-        lower_names = [n.lower() for n in names]
-        for bit, name in CARDS_BITS.items():
-            if name.lower() in lower_names:
-                b |= (1 << bit)
-        self.raw[CHAR_MARKS_CARDS] = b
+    @abstractmethod
+    def get(self, raw):
+        """Decode this field from a raw record."""
 
-    @property
-    def marks_cards(self) -> list[str]:
-        return self.marks + self.cards
+    def set(self, raw, value) -> None:
+        raise AttributeError(f"'{self.attr}' is read-only")
 
-    # --- Simple BCD fields ---
-    @property
-    def torches(self) -> int:
-        return bcd_to_int(self.raw[CHAR_TORCHES])
+    def from_decoded(self, raw, decoded: bytes):
+        """Value of this field given the record and its BCD-decoded bytes."""
+        return self.get(raw)
 
-    @torches.setter
-    def torches(self, val: int) -> None:
-        self.raw[CHAR_TORCHES] = int_to_bcd(val)
 
-    @property
-    def in_party(self) -> bool:
-        return self.raw[CHAR_IN_PARTY] == 0xFF
+class _Bcd(_Field):
+    """One-byte BCD number (0-99)."""
 
-    @in_party.setter
-    def in_party(self, val: bool) -> None:
-        self.raw[CHAR_IN_PARTY] = 0xFF if val else 0x00
+    def get(self, raw) -> int:
+        return BCD_DECODE_TABLE[raw[self.offset]]
 
-    @property
-    def status(self) -> str:
-        return STATUS_CODES.get(self.raw[CHAR_STATUS], f'?({self.raw[CHAR_STATUS]:02X})')
+    def set(self, raw, value: int) -> None:
+        raw[self.offset] = int_to_bcd(value)
 
-    @status.setter
-    def status(self, code) -> None:
-        if isinstance(code, int):
-            self.raw[CHAR_STATUS] = code & 0xFF
-            return
-        code_str = str(code).upper()
-        for k, v in STATUS_CODES.items():
-            if v[0].upper() == code_str or v.upper() == code_str:
-                self.raw[CHAR_STATUS] = k
-                return
-        # Raw int/hex string fallback for total conversions
-        try:
-            self.raw[CHAR_STATUS] = int(str(code), 0) & 0xFF
-            return
-        except ValueError:
-            pass
-        raise ValueError(f'Unknown status: {code}')
+    def from_decoded(self, raw, decoded: bytes) -> int:
+        return decoded[self.offset]
 
-    @property
-    def strength(self) -> int:
-        return bcd_to_int(self.raw[CHAR_STR])
 
-    @strength.setter
-    def strength(self, val: int) -> None:
-        self.raw[CHAR_STR] = int_to_bcd(val)
+class _Bcd16(_Field):
+    """Two-byte big-endian BCD number (0-9999)."""
 
-    @property
-    def dexterity(self) -> int:
-        return bcd_to_int(self.raw[CHAR_DEX])
+    width = 2
 
-    @dexterity.setter
-    def dexterity(self, val: int) -> None:
-        self.raw[CHAR_DEX] = int_to_bcd(val)
+    def get(self, raw) -> int:
+        return bcd16_to_int(raw[self.offset], raw[self.offset + 1])
 
-    @property
-    def intelligence(self) -> int:
-        return bcd_to_int(self.raw[CHAR_INT])
+    def set(self, raw, value: int) -> None:
+        raw[self.offset], raw[self.offset + 1] = int_to_bcd16(value)
 
-    @intelligence.setter
-    def intelligence(self, val: int) -> None:
-        self.raw[CHAR_INT] = int_to_bcd(val)
+    def from_decoded(self, raw, decoded: bytes) -> int:
+        return decoded[self.offset] * 100 + decoded[self.offset + 1]
 
-    @property
-    def wisdom(self) -> int:
-        return bcd_to_int(self.raw[CHAR_WIS])
 
-    @wisdom.setter
-    def wisdom(self, val: int) -> None:
-        self.raw[CHAR_WIS] = int_to_bcd(val)
+class _Flag(_Field):
+    """Boolean byte ($FF = set, $00 = clear)."""
 
-    @property
-    def race(self) -> str:
-        return RACES.get(self.raw[CHAR_RACE], f'?({self.raw[CHAR_RACE]:02X})')
+    def get(self, raw) -> bool:
+        return raw[self.offset] == 0xFF
 
-    @race.setter
-    def race(self, code) -> None:
-        if isinstance(code, int):
-            self.raw[CHAR_RACE] = code & 0xFF
-            return
-        code_str = str(code).upper()
-        if code_str in RACE_CODES:
-            self.raw[CHAR_RACE] = RACE_CODES[code_str]
-            return
-        for k, v in RACES.items():
-            if v.upper() == code_str:
-                self.raw[CHAR_RACE] = k
-                return
-        # Raw int/hex string fallback for total conversions
-        try:
-            self.raw[CHAR_RACE] = int(str(code), 0) & 0xFF
-            return
-        except ValueError:
-            pass
-        raise ValueError(f'Unknown race: {code}')
+    def set(self, raw, value: bool) -> None:
+        raw[self.offset] = 0xFF if value else 0x00
 
-    @property
-    def char_class(self) -> str:
-        return CLASSES.get(self.raw[CHAR_CLASS], f'?({self.raw[CHAR_CLASS]:02X})')
 
-    @char_class.setter
-    def char_class(self, code) -> None:
+class _Text(_Field):
+    """Null-filled high-ASCII text field."""
+
+    def __init__(self, key: str, offset: int, width: int, max_len: int, **kw):
+        super().__init__(key, offset, **kw)
+        self.width = width
+        self.max_len = max_len
+
+    def get(self, raw) -> str:
+        return decode_high_ascii(bytes(raw[self.offset:self.offset + self.width]))
+
+    def set(self, raw, value: str) -> None:
+        # Null-fill the whole field, then write the characters. This matches
+        # the engine's character creation (zero-fill, then typed characters).
+        field = bytearray(self.width)
+        encoded = codec.encode(value[:self.max_len])
+        field[:len(encoded)] = encoded
+        raw[self.offset:self.offset + self.width] = field
+
+
+class _Code(_Field):
+    """Single-byte code with a name table (race, class, gender, status).
+
+    Accepts an int, a code letter (codes table, or a name's initial when
+    match_initial is set), a full name, or a raw int/hex string for total
+    conversions.
+    """
+
+    def __init__(self, key: str, offset: int, names: dict, codes: dict | None = None,
+                 match_initial: bool = False, label: str | None = None, **kw):
+        super().__init__(key, offset, **kw)
+        self.names = names
+        self.codes = codes or {}
+        self.match_initial = match_initial
+        self.label = label or key
+
+    def get(self, raw) -> str:
+        b = raw[self.offset]
+        return self.names.get(b, f'?({b:02X})')
+
+    def set(self, raw, code) -> None:
         if isinstance(code, int):
-            self.raw[CHAR_CLASS] = code & 0xFF
+            raw[self.offset] = code & 0xFF
             return
         code_str = str(code).upper()
-        if code_str in CLASS_CODES:
-            self.raw[CHAR_CLASS] = CLASS_CODES[code_str]
+        if code_str in self.codes:
+            raw[self.offset] = self.codes[code_str]
             return
-        for k, v in CLASSES.items():
-            if v.upper() == code_str:
-                self.raw[CHAR_CLASS] = k
+        for k, v in self.names.items():
+            if v.upper() == code_str or (self.match_initial and v[0].upper() == code_str):
+                raw[self.offset] = k
                 return
         # Raw int/hex string fallback for total conversions
         try:
-            self.raw[CHAR_CLASS] = int(str(code), 0) & 0xFF
+            raw[self.offset] = int(str(code), 0) & 0xFF
             return
         except ValueError:
             pass
-        raise ValueError(f'Unknown class: {code}')
+        raise ValueError(f'Unknown {self.label}: {code}')
 
-    @property
-    def gender(self) -> str:
-        return GENDERS.get(self.raw[CHAR_GENDER], f'?({self.raw[CHAR_GENDER]:02X})')
 
-    @gender.setter
-    def gender(self, code) -> None:
-        if isinstance(code, int):
-            self.raw[CHAR_GENDER] = code & 0xFF
+class _Index(_Field):
+    """Single-byte index into a name list (readied weapon, worn armor)."""
+
+    def __init__(self, key: str, offset: int, names: list, **kw):
+        super().__init__(key, offset, **kw)
+        self.names = names
+
+    def get(self, raw) -> str:
+        idx = raw[self.offset]
+        return self.names[idx] if idx < len(self.names) else f'?({idx})'
+
+    def set(self, raw, value) -> None:
+        if isinstance(value, int):
+            raw[self.offset] = max(0, min(255, value))
             return
-        code_str = str(code).upper()
-        for k, v in GENDERS.items():
-            if v[0].upper() == code_str or v.upper() == code_str:
-                self.raw[CHAR_GENDER] = k
+        name = str(value)
+        for i, n in enumerate(self.names):
+            if n.upper() == name.upper():
+                raw[self.offset] = i
                 return
-        # Raw int/hex string fallback for total conversions
+        # Raw hex string fallback for total conversions
         try:
-            self.raw[CHAR_GENDER] = int(str(code), 0) & 0xFF
+            raw[self.offset] = max(0, min(255, int(name, 0)))
             return
         except ValueError:
             pass
-        raise ValueError(f'Unknown gender: {code}')
+        raise ValueError(f'Unknown {self.key}: {value}')
 
-    @property
-    def mp(self) -> int:
-        return bcd_to_int(self.raw[CHAR_MP])
 
-    @mp.setter
-    def mp(self, val: int) -> None:
-        self.raw[CHAR_MP] = int_to_bcd(val)
+class _Bits(_Field):
+    """Named bits within a byte; bits outside the mask are preserved."""
 
-    # --- 16-bit BCD fields ---
-    @property
-    def hp(self) -> int:
-        return bcd16_to_int(self.raw[CHAR_HP_HI], self.raw[CHAR_HP_LO])
+    def __init__(self, key: str, offset: int, bits: dict, **kw):
+        super().__init__(key, offset, **kw)
+        self.bits = bits
+        self.mask = sum(1 << bit for bit in bits)
 
-    @hp.setter
-    def hp(self, val: int) -> None:
-        self.raw[CHAR_HP_HI], self.raw[CHAR_HP_LO] = int_to_bcd16(val)
+    def get(self, raw) -> list[str]:
+        b = raw[self.offset]
+        return [name for bit, name in self.bits.items() if b & (1 << bit)]
 
-    @property
-    def max_hp(self) -> int:
-        return bcd16_to_int(self.raw[CHAR_MAX_HP_HI], self.raw[CHAR_MAX_HP_LO])
+    def set(self, raw, names: list[str]) -> None:
+        b = raw[self.offset] & ~self.mask & 0xFF
+        lower_names = [n.lower() for n in names]
+        for bit, name in self.bits.items():
+            if name.lower() in lower_names:
+                b |= (1 << bit)
+        raw[self.offset] = b
+
+
+class _Inventory(_Field):
+    """BCD item counts for names[1:] (index 0 - Hands/Skin - has no count)."""
+
+    def __init__(self, key: str, offset: int, names: list, **kw):
+        super().__init__(key, offset, **kw)
+        self.names = names
+        self.width = len(names) - 1
+
+    def get(self, raw) -> dict[str, int]:
+        return self.from_decoded(raw, decode_bcd_bytes(raw))
+
+    def from_decoded(self, raw, decoded: bytes) -> dict[str, int]:
+        counts = decoded[self.offset:self.offset + self.width]
+        return {self.names[i + 1]: n for i, n in enumerate(counts) if n > 0}
+
+    def set_count(self, raw, index: int, count: int) -> None:
+        if 1 <= index < len(self.names):
+            raw[self.offset + index - 1] = int_to_bcd(count)
+
+
+CHARACTER_LAYOUT = (
+    _Text('name', CHAR_NAME_OFFSET, CHAR_NAME_FIELD, CHAR_NAME_MAX),
+    _Code('race', CHAR_RACE, RACES, RACE_CODES),
+    _Code('class', CHAR_CLASS, CLASSES, CLASS_CODES, attr='char_class'),
+    _Code('gender', CHAR_GENDER, GENDERS, match_initial=True),
+    _Code('status', CHAR_STATUS, STATUS_CODES, match_initial=True),
+    _Flag('in_party', CHAR_IN_PARTY),
+    _Bcd('str', CHAR_STR, attr='strength', group='stats'),
+    _Bcd('dex', CHAR_DEX, attr='dexterity', group='stats'),
+    _Bcd('int', CHAR_INT, attr='intelligence', group='stats'),
+    _Bcd('wis', CHAR_WIS, attr='wisdom', group='stats'),
+    _Bcd16('hp', CHAR_HP_HI),
+    _Bcd16('max_hp', CHAR_MAX_HP_HI),
+    _Bcd('mp', CHAR_MP),
+    _Bcd16('exp', CHAR_EXP_HI),
+    _Bcd16('gold', CHAR_GOLD_HI),
+    _Bcd16('food', CHAR_FOOD_HI),
+    _Bcd('gems', CHAR_GEMS),
+    _Bcd('keys', CHAR_KEYS),
+    _Bcd('powders', CHAR_POWDERS),
+    _Bcd('torches', CHAR_TORCHES),
+    # R-4 FIX: Decode sub-morsels (food fraction at offset 0x20)
+    _Bcd('sub_morsels', CHAR_SUB_MORSELS),
+    # R-2 FIX: High nibble = marks (bits 7-4), low nibble = cards (bits 3-0)
+    _Bits('marks', CHAR_MARKS_CARDS, MARKS_BITS),
+    _Bits('cards', CHAR_MARKS_CARDS, CARDS_BITS),
+    _Index('weapon', CHAR_READIED_WEAPON, WEAPONS, attr='equipped_weapon'),
+    _Index('armor', CHAR_WORN_ARMOR, ARMORS, attr='equipped_armor'),
+    _Inventory('weapons', CHAR_WEAPON_START, WEAPONS, attr='weapon_inventory'),
+    _Inventory('armors', CHAR_ARMOR_START, ARMORS, attr='armor_inventory'),
+)
+_FIELDS = {f.attr: f for f in CHARACTER_LAYOUT}
+# Numeric fields by JSON key and attribute name (edit values may copy these)
+_NUMERIC_FIELDS = {name: f for f in CHARACTER_LAYOUT if isinstance(f, (_Bcd, _Bcd16))
+                   for name in (f.key, f.attr)}
 
-    @max_hp.setter
-    def max_hp(self, val: int) -> None:
-        self.raw[CHAR_MAX_HP_HI], self.raw[CHAR_MAX_HP_LO] = int_to_bcd16(val)
 
-    @property
-    def exp(self) -> int:
-        return bcd16_to_int(self.raw[CHAR_EXP_HI], self.raw[CHAR_EXP_LO])
+def _record_to_dict(raw, decoded: bytes) -> dict:
+    """Build the JSON dict for one record from its BCD-decoded bytes."""
+    out = {}
+    for field in CHARACTER_LAYOUT:
+        value = field.from_decoded(raw, decoded)
+        if field.group:
+            out.setdefault(field.group, {})[field.key] = value
+        else:
+            out[field.key] = value
+    return out
 
-    @exp.setter
-    def exp(self, val: int) -> None:
-        self.raw[CHAR_EXP_HI], self.raw[CHAR_EXP_LO] = int_to_bcd16(val)
 
-    # R-4 FIX: Decode sub-morsels (food fraction at offset 0x20)
-    @property
-    def sub_morsels(self) -> int:
-        return bcd_to_int(self.raw[CHAR_SUB_MORSELS])
+class Character:
+    """A single Ultima III character record (64 bytes).
+
+    Field accessors (name, race, hp, ...) are compiled from CHARACTER_LAYOUT.
+    A memoryview is kept as a live view, so edits land directly in the
+    buffer it slices (see Roster); any other input is copied.
+    """
 
-    @sub_morsels.setter
-    def sub_morsels(self, val: int) -> None:
-        self.raw[CHAR_SUB_MORSELS] = int_to_bcd(val)
+    __slots__ = ('raw',)
+
+    def __init__(self, data: bytes | bytearray | memoryview):
+        if len(data) != CHAR_RECORD_SIZE:
+            raise ValueError(f"Character record must be {CHAR_RECORD_SIZE} bytes, got {len(data)}")
+        self.raw = data if isinstance(data, memoryview) else bytearray(data)
+
+    @classmethod
+    def from_dict(cls, entry: dict) -> 'Character':
+        """Build a new character from a to_dict()-style dict.
+
+        Raises ValueError for unknown equipment or inventory names.
+        """
+        char = cls(bytearray(CHAR_RECORD_SIZE))
+        warnings = char.apply_dict(entry)
+        if warnings:
+            raise ValueError(warnings[0])
+        return char
 
     @property
-    def food(self) -> int:
-        return bcd16_to_int(self.raw[CHAR_FOOD_HI], self.raw[CHAR_FOOD_LO])
+    def is_empty(self) -> bool:
+        return not any(self.raw)
 
-    @food.setter
-    def food(self, val: int) -> None:
-        self.raw[CHAR_FOOD_HI], self.raw[CHAR_FOOD_LO] = int_to_bcd16(val)
+    @property
+    def marks_cards(self) -> list[str]:
+        return self.marks + self.cards
 
     @property
     def food_float(self) -> float:
@@ -303,138 +348,50 @@ class Character:
         self.food = int(val)
         self.sub_morsels = int(round((val - int(val)) * 100))
 
-    @property
-    def gold(self) -> int:
-        return bcd16_to_int(self.raw[CHAR_GOLD_HI], self.raw[CHAR_GOLD_LO])
-
-    @gold.setter
-    def gold(self, val: int) -> None:
-        self.raw[CHAR_GOLD_HI], self.raw[CHAR_GOLD_LO] = int_to_bcd16(val)
-
-    @property
-    def gems(self) -> int:
-        return bcd_to_int(self.raw[CHAR_GEMS])
-
-    @gems.setter
-    def gems(self, val: int) -> None:
-        self.raw[CHAR_GEMS] = int_to_bcd(val)
-
-    @property
-    def keys(self) -> int:
-        return bcd_to_int(self.raw[CHAR_KEYS])
-
-    @keys.setter
-    def keys(self, val: int) -> None:
-        self.raw[CHAR_KEYS] = int_to_bcd(val)
-
-    @property
-    def powders(self) -> int:
-        return bcd_to_int(self.raw[CHAR_POWDERS])
-
-    @powders.setter
-    def powders(self, val: int) -> None:
-        self.raw[CHAR_POWDERS] = int_to_bcd(val)
-
-    # --- Equipment ---
-    @property
-    def equipped_armor(self) -> str:
-        idx = self.raw[CHAR_WORN_ARMOR]
-        return ARMORS[idx] if idx < len(ARMORS) else f'?({idx})'
-
-    @equipped_armor.setter
-    def equipped_armor(self, val) -> None:
-        if isinstance(val, int):
-            self.raw[CHAR_WORN_ARMOR] = max(0, min(255, val))
-            return
-        name = str(val)
-        for i, a in enumerate(ARMORS):
-            if a.upper() == name.upper():
-                self.raw[CHAR_WORN_ARMOR] = i
-                return
-        # Raw hex string fallback for total conversions
-        try:
-            self.raw[CHAR_WORN_ARMOR] = max(0, min(255, int(name, 0)))
-            return
-        except ValueError: # pragma: no cover
-            pass # pragma: no cover
-        raise ValueError(f'Unknown armor: {val}')
-
-    @property
-    def equipped_weapon(self) -> str:
-        idx = self.raw[CHAR_READIED_WEAPON]
-        return WEAPONS[idx] if idx < len(WEAPONS) else f'?({idx})'
-
-    @equipped_weapon.setter
-    def equipped_weapon(self, val) -> None:
-        if isinstance(val, int):
-            self.raw[CHAR_READIED_WEAPON] = max(0, min(255, val))
-            return
-        name = str(val)
-        for i, w in enumerate(WEAPONS):
-            if w.upper() == name.upper():
-                self.raw[CHAR_READIED_WEAPON] = i
-                return
-        # Raw hex string fallback for total conversions
-        try:
-            self.raw[CHAR_READIED_WEAPON] = max(0, min(255, int(name, 0)))
-            return
-        except ValueError:
-            pass
-        raise ValueError(f'Unknown weapon: {val}')
-
-    @property
-    def armor_inventory(self) -> dict[str, int]:
-        inv = {}
-        for i in range(len(ARMORS) - 1):  # 7 armor counts (Cloth..Exotic)
-            count = bcd_to_int(self.raw[CHAR_ARMOR_START + i])
-            if count > 0:
-                inv[ARMORS[i + 1]] = count
-        return inv
-
     def set_armor_count(self, index: int, count: int) -> None:
         """Set inventory count for armor at index (1-7, skipping Skin)."""
-        if 1 <= index < len(ARMORS):
-            self.raw[CHAR_ARMOR_START + index - 1] = int_to_bcd(count)
-
-    @property
-    def weapon_inventory(self) -> dict[str, int]:
-        inv = {}
-        for i in range(len(WEAPONS) - 1):  # 15 weapon counts (Dagger..Exotic)
-            count = bcd_to_int(self.raw[CHAR_WEAPON_START + i])
-            if count > 0:
-                inv[WEAPONS[i + 1]] = count
-        return inv
+        _FIELDS['armor_inventory'].set_count(self.raw, index, count)
 
     def set_weapon_count(self, index: int, count: int) -> None:
         """Set inventory count for weapon at index (1-15, skipping Hands)."""
-        if 1 <= index < len(WEAPONS):
-            self.raw[CHAR_WEAPON_START + index - 1] = int_to_bcd(count)
+        _FIELDS['weapon_inventory'].set_count(self.raw, index, count)
 
     def to_dict(self) -> dict:
-        """Convert to JSON-serializable dict."""
-        return {
-            'name': self.name,
-            'race': self.race,
-            'class': self.char_class,
-            'gender': self.gender,
-            'status': self.status,
-            'in_party': self.in_party,
-            'stats': {
-                'str': self.strength, 'dex': self.dexterity,
-                'int': self.intelligence, 'wis': self.wisdom,
-            },
-            'hp': self.hp, 'max_hp': self.max_hp,
-            'mp': self.mp, 'exp': self.exp,
-            'gold': self.gold, 'food': self.food,
-            'gems': self.gems, 'keys': self.keys,
-            'powders': self.powders, 'torches': self.torches,
-            'sub_morsels': self.sub_morsels,
-            'marks': self.marks, 'cards': self.cards,
-            'weapon': self.equipped_weapon,
-            'armor': self.equipped_armor,
-            'weapons': self.weapon_inventory,
-            'armors': self.armor_inventory,
-        }
+        """Convert to JSON-serializable dict (one BCD decode pass per record)."""
+        return _record_to_dict(self.raw, decode_bcd_bytes(self.raw))
+
+    def apply_dict(self, entry: dict, where: str = '') -> list[str]:
+        """Apply the fields present in a to_dict()-style dict.
+
+        Setting hp raises max_hp to match if needed. Unknown equipment and
+        inventory names are skipped and returned as warning strings
+        (suffixed with where, e.g. ' in slot 3').
+        """
+        warnings = []
+        raw = self.raw
+        for field in CHARACTER_LAYOUT:
+            source = entry.get(field.group, {}) if field.group else entry
+            if field.key not in source or field.key == 'hp':
+                continue
+            value = source[field.key]
+            if isinstance(field, _Inventory):
+                if isinstance(value, dict):
+                    for name, count in value.items():
+                        try:
+                            field.set_count(raw, field.names.index(name), count)
+                        except (ValueError, TypeError):
+                            warnings.append(f"Unknown {field.key[:-1]} '{name}'{where} inventory")
+            elif isinstance(field, _Index):
+                try:
+                    field.set(raw, value)
+                except ValueError:
+                    warnings.append(f"Unknown {field.key} '{value}'{where}")
+            else:
+                field.set(raw, value)
+        if 'hp' in entry:
+            self.hp = entry['hp']
+            self.max_hp = max(self.max_hp, entry['hp'])
+        return warnings
 
     # R-1 FIX: Removed fake "Lv" display (was reading food byte as level)
     def display(self, slot: int = -1) -> None:
@@ -466,22 +423,118 @@ class Character:
         print()
 
 
-def load_roster(path: str) -> tuple[list[Character], bytes]:
-    """Load a roster file and return list of Character objects + raw data."""
-    with open(path, 'rb') as f:
-        data = f.read()
+for _field in CHARACTER_LAYOUT:
+    setattr(Character, _field.attr, _field)
+del _field
 
-    if len(data) < CHAR_RECORD_SIZE:
-        raise ValueError(
-            f"Roster file too small ({len(data)} bytes, need at least {CHAR_RECORD_SIZE})"
-        )
 
-    num_slots = len(data) // CHAR_RECORD_SIZE
-    chars = []
-    for i in range(num_slots):
-        offset = i * CHAR_RECORD_SIZE
-        chars.append(Character(data[offset:offset + CHAR_RECORD_SIZE]))
-    return chars, data
+class Roster:
+    """A whole roster file held in one buffer (bytearray or mmap).
+
+    Each slot is a Character view over a memoryview slice of the buffer,
+    so edits land directly in the file image and saving is a single write.
+    Works for any whole number of records (ROST = 20 slots, PLRS = 4).
+    """
+
+    __slots__ = ('data', 'chars', 'path', '_view')
+
+    def __init__(self, data: bytes | bytearray | mmap.mmap, path: str | None = None):
+        if len(data) < CHAR_RECORD_SIZE:
+            raise ValueError(
+                f"Roster file too small ({len(data)} bytes, need at least {CHAR_RECORD_SIZE})"
+            )
+        if not isinstance(data, (bytearray, mmap.mmap)):
+            data = bytearray(data)
+        self.data = data
+        self.path = path
+        self._view = memoryview(data)
+        self.chars = [Character(self._view[off:off + CHAR_RECORD_SIZE])
+                      for off in range(0, len(data) - CHAR_RECORD_SIZE + 1, CHAR_RECORD_SIZE)]
+
+    @classmethod
+    def load(cls, path: str, use_mmap: bool = False, writable: bool = True) -> 'Roster':
+        """Load a roster file into one buffer.
+
+        With use_mmap=True the file is memory-mapped instead of read:
+        edits go straight to the mapped file (writable=True) or the map is
+        read-only, which is the cheapest way to scan many rosters.
+        """
+        if not use_mmap:
+            with open(path, 'rb') as f:
+                return cls(bytearray(f.read()), path)
+        with open(path, 'r+b' if writable else 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < CHAR_RECORD_SIZE:
+                raise ValueError(
+                    f"Roster file too small ({size} bytes, need at least {CHAR_RECORD_SIZE})"
+                )
+            mm = mmap.mmap(f.fileno(), 0,
+                           access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+        return cls(mm, path)
+
+    def __len__(self) -> int:
+        return len(self.chars)
+
+    def __iter__(self):
+        return iter(self.chars)
+
+    def __getitem__(self, slot: int) -> Character:
+        return self.chars[slot]
+
+    def __setitem__(self, slot: int, char: Character) -> None:
+        """Copy a character's record into a slot (the slot view is kept)."""
+        self.chars[slot].raw[:] = char.raw
+
+    def save(self, path: str | None = None) -> None:
+        """Write the roster to path (default: the file it was loaded from)."""
+        path = path or self.path
+        if (isinstance(self.data, mmap.mmap) and self.path
+                and os.path.abspath(path) == os.path.abspath(self.path)):
+            self.data.flush()
+        else:
+            with open(path, 'wb') as f:
+                f.write(self.data)
+        print(f"Saved to {path}")
+
+    def to_records(self, include_empty: bool = False) -> list[dict]:
+        """Export every slot as a to_dict() record with a 'slot' key.
+
+        The whole buffer is BCD-decoded in one pass. Empty slots are
+        skipped unless include_empty is set.
+        """
+        decoded = decode_bcd_bytes(self.data[:len(self.chars) * CHAR_RECORD_SIZE])
+        records = []
+        for i, char in enumerate(self.chars):
+            if char.is_empty and not include_empty:
+                continue
+            start = i * CHAR_RECORD_SIZE
+            d = _record_to_dict(char.raw, decoded[start:start + CHAR_RECORD_SIZE])
+            d['slot'] = i
+            records.append(d)
+        return records
+
+    def close(self) -> None:
+        """Release the slot views and unmap the file (if memory-mapped)."""
+        for char in self.chars:
+            char.raw.release()
+        self._view.release()
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+
+    def __enter__(self) -> 'Roster':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def load_roster(path: str) -> tuple[list[Character], bytearray]:
+    """Load a roster file and return list of Character objects + raw data.
+
+    The characters are views into the returned buffer (see Roster).
+    """
+    roster = Roster.load(path)
+    return roster.chars, roster.data
 
 
 def save_roster(path: str, chars: list[Character], original_data: bytes) -> None:
@@ -495,6 +548,22 @@ def save_roster(path: str, chars: list[Character], original_data: bytes) -> None
     print(f"Saved to {path}")
 
 
+# BCD-encoded byte fields checked by validate_character()
+_BCD_FIELDS = [
+    (CHAR_STR, 'Strength'), (CHAR_DEX, 'Dexterity'),
+    (CHAR_INT, 'Intelligence'), (CHAR_WIS, 'Wisdom'),
+    (CHAR_MP, 'MP'), (CHAR_GEMS, 'Gems'),
+    (CHAR_KEYS, 'Keys'), (CHAR_POWDERS, 'Powders'),
+    (CHAR_TORCHES, 'Torches'), (CHAR_SUB_MORSELS, 'Sub-morsels'),
+    (CHAR_HP_HI, 'HP high'), (CHAR_HP_LO, 'HP low'),
+    (CHAR_MAX_HP_HI, 'MaxHP high'), (CHAR_MAX_HP_LO, 'MaxHP low'),
+    (CHAR_EXP_HI, 'Exp high'), (CHAR_EXP_LO, 'Exp low'),
+    (CHAR_FOOD_HI, 'Food high'), (CHAR_FOOD_LO, 'Food low'),
+    (CHAR_GOLD_HI, 'Gold high'), (CHAR_GOLD_LO, 'Gold low'),
+]
+_gather_bcd_fields = itemgetter(*(offset for offset, _ in _BCD_FIELDS))
+
+
 def validate_character(char: Character) -> list[str]:
     """Check a character for game-rule violations and data integrity issues.
 
@@ -504,22 +573,10 @@ def validate_character(char: Character) -> list[str]:
     if char.is_empty:
         return warnings
 
-    # BCD integrity checks
-    bcd_fields = [
-        (CHAR_STR, 'Strength'), (CHAR_DEX, 'Dexterity'),
-        (CHAR_INT, 'Intelligence'), (CHAR_WIS, 'Wisdom'),
-        (CHAR_MP, 'MP'), (CHAR_GEMS, 'Gems'),
-        (CHAR_KEYS, 'Keys'), (CHAR_POWDERS, 'Powders'),
-        (CHAR_TORCHES, 'Torches'), (CHAR_SUB_MORSELS, 'Sub-morsels'),
-        (CHAR_HP_HI, 'HP high'), (CHAR_HP_LO, 'HP low'),
-        (CHAR_MAX_HP_HI, 'MaxHP high'), (CHAR_MAX_HP_LO, 'MaxHP low'),
-        (CHAR_EXP_HI, 'Exp high'), (CHAR_EXP_LO, 'Exp low'),
-        (CHAR_FOOD_HI, 'Food high'), (CHAR_FOOD_LO, 'Food low'),
-        (CHAR_GOLD_HI, 'Gold high'), (CHAR_GOLD_LO, 'Gold low'),
-    ]
-    for offset, label in bcd_fields:
-        if not is_valid_bcd(char.raw[offset]):
-            warnings.append(f"Invalid BCD in {label}: ${char.raw[offset]:02X}")
+    # BCD integrity checks (gather all BCD bytes, validate in one pass)
+    for i in find_invalid_bcd(bytes(_gather_bcd_fields(char.raw))):
+        offset, label = _BCD_FIELDS[i]
+        warnings.append(f"Invalid BCD in {label}: ${char.raw[offset]:02X}")
 
     # HP vs Max HP
     if char.hp > char.max_hp:
@@ -555,40 +612,50 @@ def validate_character(char: Character) -> list[str]:
 
 
 def _apply_edits(char: Character, args) -> bool:
-    """Apply CLI edit flags to a character. Returns True if anything changed."""
+    """Apply CLI edit flags to a character. Returns True if anything changed.
+
+    Numeric flags may name another numeric field (e.g. --hp max_hp); such
+    values are read from the character as it was before any edits.
+    """
+    before = bytes(char.raw)
+
+    def value(v):
+        return _NUMERIC_FIELDS[v].get(before) if isinstance(v, str) else v
+
     modified = False
     if args.name is not None:
         char.name = args.name; modified = True
     if args.str is not None:
-        char.strength = args.str; modified = True
+        char.strength = value(args.str); modified = True
     if args.dex is not None:
-        char.dexterity = args.dex; modified = True
+        char.dexterity = value(args.dex); modified = True
     if args.int_ is not None:
-        char.intelligence = args.int_; modified = True
+        char.intelligence = value(args.int_); modified = True
     if args.wis is not None:
-        char.wisdom = args.wis; modified = True
+        char.wisdom = value(args.wis); modified = True
     if args.max_hp is not None:
-        char.max_hp = args.max_hp; modified = True
+        char.max_hp = value(args.max_hp); modified = True
     if args.hp is not None:
-        char.hp = args.hp
-        char.max_hp = max(char.max_hp, args.hp)
+        hp = value(args.hp)
+        char.hp = hp
+        char.max_hp = max(char.max_hp, hp)
         modified = True
     if args.mp is not None:
-        char.mp = args.mp; modified = True
+        char.mp = value(args.mp); modified = True
     if args.gold is not None:
-        char.gold = args.gold; modified = True
+        char.gold = value(args.gold); modified = True
     if args.exp is not None:
-        char.exp = args.exp; modified = True
+        char.exp = value(args.exp); modified = True
     if args.food is not None:
-        char.food = args.food; modified = True
+        char.food = value(args.food); modified = True
     if args.gems is not None:
-        char.gems = args.gems; modified = True
+        char.gems = value(args.gems); modified = True
     if args.keys is not None:
-        char.keys = args.keys; modified = True
+        char.keys = value(args.keys); modified = True
     if args.powders is not None:
-        char.powders = args.powders; modified = True
+        char.powders = value(args.powders); modified = True
     if args.torches is not None:
-        char.torches = args.torches; modified = True
+        char.torches = value(args.torches); modified = True
     if args.status is not None:
         char.status = args.status; modified = True
     if args.race is not None:
@@ -616,26 +683,23 @@ def _apply_edits(char: Character, args) -> bool:
     if getattr(args, 'not_in_party', None):
         char.in_party = False; modified = True
     if getattr(args, 'sub_morsels', None) is not None:
-        char.sub_morsels = args.sub_morsels; modified = True
+        char.sub_morsels = value(args.sub_morsels); modified = True
     return modified
 
 
 def cmd_view(args) -> None:
-    chars, _ = load_roster(args.file)
+    roster = Roster.load(args.file)
+    chars = roster.chars
     filename = os.path.basename(args.file)
 
     do_validate = getattr(args, 'validate', False)
 
     if args.json:
-        roster = []
-        for i, char in enumerate(chars):
-            if not char.is_empty:
-                d = char.to_dict()
-                d['slot'] = i
-                if do_validate:
-                    d['warnings'] = validate_character(char)
-                roster.append(d)
-        export_json(roster, args.output)
+        records = roster.to_records()
+        if do_validate:
+            for d in records:
+                d['warnings'] = validate_character(chars[d['slot']])
+        export_json(records, args.output)
         return
 
     print(f"\n=== Ultima III Roster: {filename} ({len(chars)} slots) ===\n")
@@ -663,30 +727,61 @@ def cmd_view(args) -> None:
 
 
 def cmd_edit(args) -> None:
-    chars, original = load_roster(args.file)
+    """Edit one slot, all slots, or --where-selected slots in one or more rosters."""
+    files = [args.file] + list(getattr(args, 'more_files', None) or [])
+    where = getattr(args, 'where', None)
+    if args.slot is not None and where:
+        print("Error: --where cannot be combined with --slot", file=sys.stderr)
+        sys.exit(1)
+    if args.output and len(files) > 1:
+        print("Error: --output requires a single roster file", file=sys.stderr)
+        sys.exit(1)
+    predicate = None
+    if where:
+        from .query import QueryError, compile_query
+        try:
+            predicate = compile_query(where)
+        except QueryError as e:
+            print(f"Error: Invalid --where: {e}", file=sys.stderr)
+            sys.exit(1)
+    for path in files:
+        if len(files) > 1:
+            print(f"=== {path} ===")
+        _edit_roster(path, args, predicate)
+
+
+def _edit_roster(path: str, args, predicate) -> None:
+    """Apply edit flags to the selected slots of one roster (one write)."""
+    roster = Roster.load(path)
+    chars = roster.chars
     do_validate = getattr(args, 'validate', False)
     dry_run = getattr(args, 'dry_run', False)
     do_backup = getattr(args, 'backup', False)
     edit_all = getattr(args, 'all', False)
 
-    if edit_all:
-        # Bulk edit: apply to all non-empty slots
-        modified = False
+    if edit_all or predicate is not None:
+        # Bulk edit: apply to all non-empty (and matching) slots
+        modified = matched = False
         for i, char in enumerate(chars):
-            if not char.is_empty:
-                if _apply_edits(char, args):
-                    print(f"Modified slot {i}:")
-                    char.display(i)
-                    if do_validate:
-                        for w in validate_character(char):
-                            print(f"  WARNING: {w}", file=sys.stderr)
-                    modified = True
+            if char.is_empty or (predicate is not None and not predicate(char.raw)):
+                continue
+            matched = True
+            if _apply_edits(char, args):
+                print(f"Modified slot {i}:")
+                char.display(i)
+                if do_validate:
+                    for w in validate_character(char):
+                        print(f"  WARNING: {w}", file=sys.stderr)
+                modified = True
+        if not matched and predicate is not None:
+            print("No matching characters.")
+            return
         if not modified:
             print("No modifications specified.")
             return
     else:
         if args.slot is None:
-            print("Error: --slot or --all required", file=sys.stderr)
+            print("Error: --slot, --all or --where required", file=sys.stderr)
             sys.exit(1)
         if args.slot < 0 or args.slot >= len(chars):
             print(f"Error: Slot {args.slot} out of range", file=sys.stderr)
@@ -711,14 +806,15 @@ def cmd_edit(args) -> None:
         print("Dry run - no changes written.")
         return
 
-    output = args.output if args.output else args.file
-    if do_backup and (not args.output or args.output == args.file):
-        backup_file(args.file)
-    save_roster(output, chars, original)
+    output = args.output if args.output else path
+    if do_backup and (not args.output or args.output == path):
+        backup_file(path)
+    roster.save(output)
 
 
 def cmd_create(args) -> None:
-    chars, original = load_roster(args.file)
+    roster = Roster.load(args.file)
+    chars = roster.chars
     dry_run = getattr(args, 'dry_run', False)
     do_backup = getattr(args, 'backup', False)
 
@@ -749,7 +845,7 @@ def cmd_create(args) -> None:
     # Override defaults with any user-specified values
     _apply_edits(char, args)
 
-    chars[args.slot] = char
+    roster[args.slot] = char
     print(f"Created character in slot {args.slot}:")
     char.display(args.slot)
 
@@ -760,12 +856,13 @@ def cmd_create(args) -> None:
     output = args.output if args.output else args.file
     if do_backup and (not args.output or args.output == args.file):
         backup_file(args.file)
-    save_roster(output, chars, original)
+    roster.save(output)
 
 
 def cmd_import(args) -> None:
     """Import character data from a JSON file into a roster."""
-    chars, original = load_roster(args.file)
+    roster = Roster.load(args.file)
+    chars = roster.chars
     do_backup = getattr(args, 'backup', False)
     dry_run = getattr(args, 'dry_run', False)
 
@@ -783,84 +880,8 @@ def cmd_import(args) -> None:
             if slot is not None:
                 print(f"  Warning: skipping out-of-range slot {slot}", file=sys.stderr)
             continue
-        char = chars[slot]
-        if char.is_empty:
-            char = Character(bytearray(CHAR_RECORD_SIZE))
-            chars[slot] = char
-        if 'name' in entry:
-            char.name = entry['name']
-        if 'race' in entry:
-            char.race = entry['race']
-        if 'class' in entry:
-            char.char_class = entry['class']
-        if 'gender' in entry:
-            char.gender = entry['gender']
-        if 'status' in entry:
-            char.status = entry['status']
-        stats = entry.get('stats', {})
-        if 'str' in stats:
-            char.strength = stats['str']
-        if 'dex' in stats:
-            char.dexterity = stats['dex']
-        if 'int' in stats:
-            char.intelligence = stats['int']
-        if 'wis' in stats:
-            char.wisdom = stats['wis']
-        if 'max_hp' in entry:
-            char.max_hp = entry['max_hp']
-        if 'hp' in entry:
-            char.hp = entry['hp']
-            char.max_hp = max(char.max_hp, entry['hp'])
-        if 'mp' in entry:
-            char.mp = entry['mp']
-        if 'exp' in entry:
-            char.exp = entry['exp']
-        if 'gold' in entry:
-            char.gold = entry['gold']
-        if 'food' in entry:
-            char.food = entry['food']
-        if 'gems' in entry:
-            char.gems = entry['gems']
-        if 'keys' in entry:
-            char.keys = entry['keys']
-        if 'powders' in entry:
-            char.powders = entry['powders']
-        if 'torches' in entry:
-            char.torches = entry['torches']
-        if 'marks' in entry:
-            char.marks = entry['marks']
-        if 'cards' in entry:
-            char.cards = entry['cards']
-        if 'in_party' in entry:
-            char.in_party = entry['in_party']
-        if 'sub_morsels' in entry:
-            char.sub_morsels = entry['sub_morsels']
-        if 'weapon' in entry:
-            try:
-                char.equipped_weapon = entry['weapon']
-            except ValueError:
-                print(f"  Warning: Unknown weapon '{entry['weapon']}' in slot {slot}, skipping",
-                      file=sys.stderr)
-        if 'armor' in entry:
-            try:
-                char.equipped_armor = entry['armor']
-            except ValueError:
-                print(f"  Warning: Unknown armor '{entry['armor']}' in slot {slot}, skipping",
-                      file=sys.stderr)
-        if isinstance(entry.get('weapons'), dict):
-            for wname, wcount in entry['weapons'].items():
-                try:
-                    char.set_weapon_count(WEAPONS.index(wname), wcount)
-                except (ValueError, TypeError):
-                    print(f"  Warning: Unknown weapon '{wname}' in slot {slot} inventory, skipping",
-                          file=sys.stderr)
-        if isinstance(entry.get('armors'), dict):
-            for aname, acount in entry['armors'].items():
-                try:
-                    char.set_armor_count(ARMORS.index(aname), acount)
-                except (ValueError, TypeError):
-                    print(f"  Warning: Unknown armor '{aname}' in slot {slot} inventory, skipping",
-                          file=sys.stderr)
+        for w in chars[slot].apply_dict(entry, where=f' in slot {slot}'):
+            print(f"  Warning: {w}, skipping", file=sys.stderr)
         count += 1
 
     print(f"Import: {count} character(s) to update")
@@ -872,7 +893,7 @@ def cmd_import(args) -> None:
     output = args.output if args.output else args.file
     if do_backup and (not args.output or args.output == args.file):
         backup_file(args.file)
-    save_roster(output, chars, original)
+    roster.save(output)
     print(f"Imported {count} character(s)")
 
 
@@ -931,9 +952,55 @@ def check_progress(chars: list[Character]) -> dict:
     }
 
 
+def _is_corpus(args) -> bool:
+    """True if check-progress should summarize many rosters."""
+    if getattr(args, 'corpus', False) or getattr(args, 'more_files', None):
+        return True
+    from .query import IMAGE_EXTENSIONS
+    return os.path.isdir(args.file) or args.file.lower().endswith(IMAGE_EXTENSIONS)
+
+
+def cmd_progress_corpus(args) -> None:
+    """Summarize endgame readiness across many rosters."""
+    from .query import progress_paths, summarize_progress
+
+    def reported(results):
+        for path, progress, error in results:
+            if error is not None:
+                print(f"Warning: {path}: {error}", file=sys.stderr)
+            yield path, progress, error
+
+    paths = [args.file] + list(getattr(args, 'more_files', None) or [])
+    summary = summarize_progress(reported(progress_paths(paths, getattr(args, 'jobs', 0))))
+
+    if getattr(args, 'json', False):
+        export_json(summary, getattr(args, 'output', None))
+        return
+
+    print(f"\n=== Exodus Endgame Readiness: {summary['files']} roster(s), "
+          f"{summary['characters']} character(s) ===\n")
+    labels = {
+        'exodus_ready': 'Exodus ready', 'party_ready': 'Party ready',
+        'marks_complete': 'All marks', 'cards_complete': 'All cards',
+        'has_exotic_weapon': 'Exotic weapon', 'has_exotic_armor': 'Exotic armor',
+    }
+    for key, label in labels.items():
+        print(f"  {label + ':':<16s}{summary['pct'][key]:5.1f}%")
+    print(f"  Most missing:   mark {summary['most_missing_mark'] or '-'}, "
+          f"card {summary['most_missing_card'] or '-'}")
+    print(f"  Classes:        {', '.join(f'{k} {v}' for k, v in summary['classes'].items()) or '-'}")
+    print(f"  Races:          {', '.join(f'{k} {v}' for k, v in summary['races'].items()) or '-'}")
+    if summary['errors']:
+        print(f"  Errors:         {summary['errors']} file(s) unreadable")
+    print()
+
+
 def cmd_check_progress(args) -> None:
     """Check roster for endgame readiness."""
-    chars, _ = load_roster(args.file)
+    if _is_corpus(args):
+        cmd_progress_corpus(args)
+        return
+    chars = Roster.load(args.file).chars
 
     progress = check_progress(chars)
 
@@ -984,23 +1051,91 @@ def cmd_check_progress(args) -> None:
     print()
 
 
+def cmd_query(args) -> None:
+    """Stream characters matching a query expression as NDJSON."""
+    from .query import QueryError, compile_query, query_paths, resolve_fields
+    fields = [f.strip() for f in args.fields.split(',')] if getattr(args, 'fields', None) else None
+    # Check before opening -o so a bad query never truncates the output
+    try:
+        compile_query(args.expr)
+        if fields:
+            resolve_fields(fields)
+    except QueryError as e:
+        print(f"Error: Invalid query: {e}", file=sys.stderr)
+        sys.exit(1)
+    output = getattr(args, 'output', None)
+    out = open(output, 'w', encoding='utf-8') if output else sys.stdout
+    matched = files = 0
+    try:
+        for path, records, error in query_paths(args.paths, args.expr,
+                                                getattr(args, 'jobs', 0), fields):
+            if error:
+                print(f"Warning: {path}: {error}", file=sys.stderr)
+                continue
+            files += 1
+            for rec in records:
+                out.write(json.dumps(rec) + '\n')
+            matched += len(records)
+            out.flush()
+    finally:
+        if output:
+            out.close()
+    print(f"{matched} match(es) in {files} roster(s)", file=sys.stderr)
+
+
+def _add_progress_args(p) -> None:
+    """Add check-progress arguments to a parser."""
+    p.add_argument('file', help='ROST file path (or image/directory for a corpus summary)')
+    p.add_argument('more_files', nargs='*', metavar='PATH',
+                   help='Further ROST files, disk images, or directories (corpus summary)')
+    p.add_argument('--corpus', action='store_true',
+                   help='Summarize across rosters even for a single ROST file')
+    p.add_argument('--jobs', '-j', type=job_count, default=0,
+                   help='Worker processes for a corpus (default: CPU count, 1 = serial)')
+    p.add_argument('--json', action='store_true', help='Output as JSON')
+    p.add_argument('--output', '-o', help='Output file (for --json)')
+
+
+def _add_query_args(p) -> None:
+    """Add roster query arguments to a parser."""
+    p.add_argument('expr', help="Query, e.g. 'class=Wizard and hp>150 and \"Kings\" in marks'")
+    p.add_argument('paths', nargs='+', metavar='PATH',
+                   help='ROST files, disk images, or directories (searched recursively)')
+    p.add_argument('--fields',
+                   help="Comma-separated fields to emit, named as in queries or 'stats' (default: all)")
+    p.add_argument('--jobs', '-j', type=job_count, default=0,
+                   help='Worker processes (default: CPU count, 1 = serial)')
+    p.add_argument('--output', '-o', help='Output NDJSON file (default: stdout)')
+
+
+def _int_or_field(text: str) -> int | str:
+    """argparse type: an integer, or a numeric field name to copy (e.g. max_hp)."""
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    if text.lower() in _NUMERIC_FIELDS:
+        return text.lower()
+    raise argparse.ArgumentTypeError(f"expected a number or numeric field name, got '{text}'")
+
+
 def _add_edit_args(p) -> None:
     """Add common character edit arguments to a parser."""
     p.add_argument('--name', help='Character name (max 13 chars)')
-    p.add_argument('--str', type=int, help='Strength (0-99)')
-    p.add_argument('--dex', type=int, help='Dexterity (0-99)')
-    p.add_argument('--int', type=int, dest='int_', help='Intelligence (0-99)')
-    p.add_argument('--wis', type=int, help='Wisdom (0-99)')
-    p.add_argument('--hp', type=int, help='Hit points (0-9999)')
-    p.add_argument('--max-hp', type=int, help='Max HP (0-9999)')
-    p.add_argument('--mp', type=int, help='Magic points (0-99)')
-    p.add_argument('--gold', type=int, help='Gold (0-9999)')
-    p.add_argument('--exp', type=int, help='Experience (0-9999)')
-    p.add_argument('--food', type=int, help='Food (0-9999)')
-    p.add_argument('--gems', type=int, help='Gems (0-99)')
-    p.add_argument('--keys', type=int, help='Keys (0-99)')
-    p.add_argument('--powders', type=int, help='Powders (0-99)')
-    p.add_argument('--torches', type=int, help='Torches (0-99)')
+    p.add_argument('--str', type=_int_or_field, help='Strength (0-99)')
+    p.add_argument('--dex', type=_int_or_field, help='Dexterity (0-99)')
+    p.add_argument('--int', type=_int_or_field, dest='int_', help='Intelligence (0-99)')
+    p.add_argument('--wis', type=_int_or_field, help='Wisdom (0-99)')
+    p.add_argument('--hp', type=_int_or_field, help='Hit points (0-9999)')
+    p.add_argument('--max-hp', type=_int_or_field, help='Max HP (0-9999)')
+    p.add_argument('--mp', type=_int_or_field, help='Magic points (0-99)')
+    p.add_argument('--gold', type=_int_or_field, help='Gold (0-9999)')
+    p.add_argument('--exp', type=_int_or_field, help='Experience (0-9999)')
+    p.add_argument('--food', type=_int_or_field, help='Food (0-9999)')
+    p.add_argument('--gems', type=_int_or_field, help='Gems (0-99)')
+    p.add_argument('--keys', type=_int_or_field, help='Keys (0-99)')
+    p.add_argument('--powders', type=_int_or_field, help='Powders (0-99)')
+    p.add_argument('--torches', type=_int_or_field, help='Torches (0-99)')
     p.add_argument('--race', help='Race: H(uman) E(lf) D(warf) B(obbit) F(uzzy)')
     p.add_argument('--class', dest='class_', help='Class: F C W T L I D A R P B')
     p.add_argument('--status', help='Status: G(ood) P(oisoned) D(ead) A(shes)')
@@ -1018,7 +1153,7 @@ def _add_edit_args(p) -> None:
                              help='Set character as in-party')
     party_group.add_argument('--not-in-party', action='store_true', default=None,
                              help='Remove character from party')
-    p.add_argument('--sub-morsels', type=int, help='Sub-morsels food fraction (0-99)')
+    p.add_argument('--sub-morsels', type=_int_or_field, help='Sub-morsels food fraction (0-99)')
 
 
 def register_parser(subparsers) -> None:
@@ -1035,11 +1170,15 @@ def register_parser(subparsers) -> None:
     p_view.add_argument('--validate', action='store_true', help='Check game-rule violations')
 
     # Edit
-    p_edit = sub.add_parser('edit', help='Edit a character')
+    p_edit = sub.add_parser('edit', help='Edit characters')
     p_edit.add_argument('file', help='ROST file path')
-    slot_group = p_edit.add_mutually_exclusive_group(required=True)
+    p_edit.add_argument('more_files', nargs='*', metavar='FILE',
+                        help='Further ROST files to apply the same edits to')
+    slot_group = p_edit.add_mutually_exclusive_group()
     slot_group.add_argument('--slot', type=int, help='Slot number (0-19)')
     slot_group.add_argument('--all', action='store_true', help='Edit all non-empty slots')
+    p_edit.add_argument('--where', metavar='EXPR',
+                        help="Edit non-empty slots matching a query (e.g. 'status=Dead')")
     p_edit.add_argument('--output', '-o', help='Output file (default: overwrite)')
     p_edit.add_argument('--backup', action='store_true', help='Create .bak backup before overwrite')
     p_edit.add_argument('--dry-run', action='store_true', help='Show changes without writing')
@@ -1066,9 +1205,11 @@ def register_parser(subparsers) -> None:
 
     # Check progress
     p_progress = sub.add_parser('check-progress', help='Check endgame readiness')
-    p_progress.add_argument('file', help='ROST file path')
-    p_progress.add_argument('--json', action='store_true', help='Output as JSON')
-    p_progress.add_argument('--output', '-o', help='Output file (for --json)')
+    _add_progress_args(p_progress)
+
+    # Query
+    p_query = sub.add_parser('query', help='Find characters across many rosters (NDJSON)')
+    _add_query_args(p_query)
 
 
 def dispatch(args) -> None:
@@ -1083,8 +1224,10 @@ def dispatch(args) -> None:
         cmd_import(args)
     elif args.roster_command == 'check-progress':
         cmd_check_progress(args)
+    elif args.roster_command == 'query':
+        cmd_query(args)
     else:
-        print("Usage: ult3edit roster {view|edit|create|import|check-progress} ...", file=sys.stderr)
+        print("Usage: ult3edit roster {view|edit|create|import|check-progress|query} ...", file=sys.stderr)
 
 
 def main() -> None:
@@ -1100,11 +1243,15 @@ def main() -> None:
     p_view.add_argument('--output', '-o', help='Output file (for --json)')
     p_view.add_argument('--validate', action='store_true', help='Check game-rule violations')
 
-    p_edit = sub.add_parser('edit', help='Edit a character')
+    p_edit = sub.add_parser('edit', help='Edit characters')
     p_edit.add_argument('file', help='ROST file path')
-    slot_group = p_edit.add_mutually_exclusive_group(required=True)
+    p_edit.add_argument('more_files', nargs='*', metavar='FILE',
+                        help='Further ROST files to apply the same edits to')
+    slot_group = p_edit.add_mutually_exclusive_group()
     slot_group.add_argument('--slot', type=int, help='Slot number (0-19)')
     slot_group.add_argument('--all', action='store_true', help='Edit all non-empty slots')
+    p_edit.add_argument('--where', metavar='EXPR',
+                        help="Edit non-empty slots matching a query (e.g. 'status=Dead')")
     p_edit.add_argument('--output', '-o', help='Output file (default: overwrite)')
     p_edit.add_argument('--backup', action='store_true', help='Create .bak backup before overwrite')
     p_edit.add_argument('--dry-run', action='store_true', help='Show changes without writing')
@@ -1128,9 +1275,10 @@ def main() -> None:
     p_import.add_argument('--dry-run', action='store_true', help='Show changes without writing')
 
     p_progress = sub.add_parser('check-progress', help='Check endgame readiness')
-    p_progress.add_argument('file', help='ROST file path')
-    p_progress.add_argument('--json', action='store_true', help='Output as JSON')
-    p_progress.add_argument('--output', '-o', help='Output file (for --json)')
+    _add_progress_args(p_progress)
+
+    p_query = sub.add_parser('query', help='Find characters across many rosters (NDJSON)')
+    _add_query_args(p_query)
 
     args = parser.parse_args()
     dispatch(args)
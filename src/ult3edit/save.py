@@ -12,7 +12,9 @@ Reads multiple save files from a GAME directory:
 
 import argparse
 import json
+import os
 import sys
+import time
 
 from .constants import (
     PRTY_TRANSPORT, PRTY_TRANSPORT_CODES,
@@ -21,7 +23,6 @@ from .constants import (
     PRTY_OFF_SAVED_X, PRTY_OFF_SAVED_Y, PRTY_OFF_SENTINEL,
     PRTY_OFF_SLOT_IDS,
     PRTY_FILE_SIZE, CHAR_RECORD_SIZE, tile_char,
-    WEAPONS, ARMORS,
 )
 from .fileutil import resolve_single_file, backup_file
 from .roster import Character
@@ -492,80 +493,8 @@ def cmd_import(args) -> None:
                     break
                 offset = i * CHAR_RECORD_SIZE
                 char = Character(plrs_raw[offset:offset + CHAR_RECORD_SIZE])
-                if 'name' in entry:
-                    char.name = entry['name']
-                if 'race' in entry:
-                    char.race = entry['race']
-                if 'class' in entry:
-                    char.char_class = entry['class']
-                if 'gender' in entry:
-                    char.gender = entry['gender']
-                if 'status' in entry:
-                    char.status = entry['status']
-                if 'in_party' in entry:
-                    char.in_party = entry['in_party']
-                stats = entry.get('stats', {})
-                if 'str' in stats:
-                    char.strength = stats['str']
-                if 'dex' in stats:
-                    char.dexterity = stats['dex']
-                if 'int' in stats:
-                    char.intelligence = stats['int']
-                if 'wis' in stats:
-                    char.wisdom = stats['wis']
-                if 'max_hp' in entry:
-                    char.max_hp = entry['max_hp']
-                if 'hp' in entry:
-                    char.hp = entry['hp']
-                    char.max_hp = max(char.max_hp, entry['hp'])
-                if 'mp' in entry:
-                    char.mp = entry['mp']
-                if 'exp' in entry:
-                    char.exp = entry['exp']
-                if 'gold' in entry:
-                    char.gold = entry['gold']
-                if 'food' in entry:
-                    char.food = entry['food']
-                if 'gems' in entry:
-                    char.gems = entry['gems']
-                if 'keys' in entry:
-                    char.keys = entry['keys']
-                if 'powders' in entry:
-                    char.powders = entry['powders']
-                if 'torches' in entry:
-                    char.torches = entry['torches']
-                if 'sub_morsels' in entry:
-                    char.sub_morsels = entry['sub_morsels']
-                if 'marks' in entry:
-                    char.marks = entry['marks']
-                if 'cards' in entry:
-                    char.cards = entry['cards']
-                if 'weapon' in entry:
-                    try:
-                        char.equipped_weapon = entry['weapon']
-                    except ValueError:
-                        print(f"  Warning: Unknown weapon '{entry['weapon']}' in PLRS slot {i}",
-                              file=sys.stderr)
-                if 'armor' in entry:
-                    try:
-                        char.equipped_armor = entry['armor']
-                    except ValueError:
-                        print(f"  Warning: Unknown armor '{entry['armor']}' in PLRS slot {i}",
-                              file=sys.stderr)
-                if isinstance(entry.get('weapons'), dict):
-                    for wname, wcount in entry['weapons'].items():
-                        try:
-                            char.set_weapon_count(WEAPONS.index(wname), wcount)
-                        except (ValueError, TypeError):
-                            print(f"  Warning: Unknown weapon '{wname}' in PLRS slot {i} inventory",
-                                  file=sys.stderr)
-                if isinstance(entry.get('armors'), dict):
-                    for aname, acount in entry['armors'].items():
-                        try:
-                            char.set_armor_count(ARMORS.index(aname), acount)
-                        except (ValueError, TypeError):
-                            print(f"  Warning: Unknown armor '{aname}' in PLRS slot {i} inventory",
-                                  file=sys.stderr)
+                for w in char.apply_dict(entry, where=f' in PLRS slot {i}'):
+                    print(f"  Warning: {w}", file=sys.stderr)
                 plrs_raw[offset:offset + CHAR_RECORD_SIZE] = char.raw
                 count += 1
 
@@ -582,6 +511,217 @@ def cmd_import(args) -> None:
         print("Dry run - no changes written.")
 
 
+# =============================================================================
+# Snapshot history
+# =============================================================================
+
+def _history_sources(paths: list[str]) -> list[tuple[str, str]]:
+    """(name, path) for each tracked save file in paths (files or GAME dirs)."""
+    from .history import HISTORY_FILES, history_name
+    sources = []
+    for path in paths:
+        if os.path.isdir(path):
+            for name in HISTORY_FILES:
+                found = resolve_single_file(path, name)
+                if found:
+                    sources.append((name, found))
+        elif history_name(path):
+            sources.append((history_name(path), path))
+        else:
+            print(f"  Warning: {path} is not a PRTY, PLRS or ROST file, skipping",
+                  file=sys.stderr)
+    return sources
+
+
+def _open_history(path: str):
+    from .history import HistoryStore
+    try:
+        return HistoryStore(path)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def _resolve_snapshot(store, ref: str, name: str | None) -> dict:
+    try:
+        return store.resolve(ref, name)
+    except KeyError:
+        print(f"Error: No snapshot matches '{ref}'", file=sys.stderr)
+        sys.exit(1)
+
+
+def cmd_history_add(args) -> None:
+    """Snapshot save files into a history store."""
+    sources = _history_sources(args.paths)
+    if not sources:
+        print("Error: No PRTY, PLRS or ROST files to snapshot", file=sys.stderr)
+        sys.exit(1)
+    store = _open_history(args.store)
+    for name, path in sources:
+        with open(path, 'rb') as f:
+            entry = store.add(name, f.read(), args.tag, os.path.abspath(path))
+        print(f"  #{entry['id']} {name} {entry['sha1'][:10]}")
+    store.save()
+    stats = store.stats()
+    print(f"{stats['snapshots']} snapshot(s), {stats['objects']} object(s), "
+          f"{stats['pack_bytes']} byte(s) stored")
+
+
+def cmd_history_log(args) -> None:
+    """List snapshots in time order."""
+    store = _open_history(args.store)
+    name = args.file.upper() if args.file else None
+    entries = store.log(name, args.tag, args.since, args.until)
+    if args.json:
+        export_json(entries, args.output)
+        return
+    for s in entries:
+        tag = f"  [{s['tag']}]" if s['tag'] else ''
+        print(f"  #{s['id']:<5d} {s['time']}  {s['file']}  {s['sha1'][:10]}{tag}")
+    print(f"{len(entries)} snapshot(s)")
+
+
+def cmd_history_show(args) -> None:
+    """Print (or extract) one snapshot."""
+    from .history import decode_snapshot
+    store = _open_history(args.store)
+    snap = _resolve_snapshot(store, args.ref, args.file.upper() if args.file else None)
+    data = store.read(snap)
+    if args.raw:
+        if not args.output:
+            print("Error: --raw requires --output", file=sys.stderr)
+            sys.exit(1)
+        with open(args.output, 'wb') as f:
+            f.write(data)
+        print(f"Wrote snapshot #{snap['id']} ({snap['file']}) to {args.output}")
+        return
+    export_json({**snap, 'data': decode_snapshot(snap['file'], data)}, args.output)
+
+
+def cmd_history_diff(args) -> None:
+    """Field-level diff between two snapshots of the same file."""
+    from .diff import GameDiff, format_text, to_json
+    from .history import diff_snapshot_data
+    store = _open_history(args.store)
+    name = args.file.upper() if args.file else None
+    new = _resolve_snapshot(store, args.new or args.old, name)
+    old = _resolve_snapshot(store, args.old, name) if args.new else store.previous(new)
+    if old is None:
+        print(f"Error: Snapshot #{new['id']} has no earlier {new['file']} snapshot",
+              file=sys.stderr)
+        sys.exit(1)
+    if old['file'] != new['file']:
+        print(f"Error: Cannot diff {old['file']} against {new['file']}", file=sys.stderr)
+        sys.exit(1)
+    gd = GameDiff()
+    gd.files.append(diff_snapshot_data(new['file'], store.read(old), store.read(new)))
+    if args.json:
+        export_json(to_json(gd), args.output)
+    else:
+        print(f"#{old['id']} -> #{new['id']}")
+        print(format_text(gd))
+
+
+def cmd_history(args) -> None:
+    cmd = getattr(args, 'history_command', None)
+    if cmd == 'add':
+        cmd_history_add(args)
+    elif cmd == 'log':
+        cmd_history_log(args)
+    elif cmd == 'show':
+        cmd_history_show(args)
+    elif cmd == 'diff':
+        cmd_history_diff(args)
+    else:
+        print("Usage: ult3edit save history {add|log|show|diff} STORE ...", file=sys.stderr)
+
+
+def _add_history_parsers(parent_sub) -> None:
+    """Add snapshot history subcommands to a subparser group."""
+    p = parent_sub.add_parser('history', help='Delta-compressed snapshot history of save files')
+    hsub = p.add_subparsers(dest='history_command')
+
+    p_add = hsub.add_parser('add', help='Snapshot PRTY/PLRS/ROST files')
+    p_add.add_argument('store', help='History store directory (created if missing)')
+    p_add.add_argument('paths', nargs='+', metavar='PATH', help='Save files or GAME directories')
+    p_add.add_argument('--tag', help='Label these snapshots (e.g. session-12)')
+
+    p_log = hsub.add_parser('log', help='List snapshots in time order')
+    p_log.add_argument('store', help='History store directory')
+    p_log.add_argument('--file', help='Only PRTY, PLRS or ROST')
+    p_log.add_argument('--tag', help='Only snapshots with this tag')
+    p_log.add_argument('--since', help='ISO time or prefix (e.g. 2026-10-01)')
+    p_log.add_argument('--until', help='ISO time or prefix, inclusive')
+    p_log.add_argument('--json', action='store_true', help='Output as JSON')
+    p_log.add_argument('--output', '-o', help='Output file (for --json)')
+
+    p_show = hsub.add_parser('show', help='Show one snapshot as JSON')
+    p_show.add_argument('store', help='History store directory')
+    p_show.add_argument('ref', help='Snapshot id, tag, or sha1 prefix (or id:N, tag:NAME, sha1:HEX)')
+    p_show.add_argument('--file', help='Resolve tags/hashes within PRTY, PLRS or ROST')
+    p_show.add_argument('--raw', action='store_true', help='Write the file bytes (needs --output)')
+    p_show.add_argument('--output', '-o', help='Output file')
+
+    p_diff = hsub.add_parser('diff', help='Field-level diff between two snapshots')
+    p_diff.add_argument('store', help='History store directory')
+    p_diff.add_argument('old', help='Snapshot id, tag, or sha1 prefix (or id:N, tag:NAME, sha1:HEX)')
+    p_diff.add_argument('new', nargs='?',
+                        help='Later snapshot (default: compare OLD with its predecessor)')
+    p_diff.add_argument('--file', help='Resolve tags/hashes within PRTY, PLRS or ROST')
+    p_diff.add_argument('--json', action='store_true', help='Output as JSON')
+    p_diff.add_argument('--output', '-o', help='Output file (for --json)')
+
+
+# =============================================================================
+# Directory watcher
+# =============================================================================
+
+def cmd_watch(args) -> None:
+    """Stream field-level diffs of PRTY/PLRS/ROST changes as NDJSON."""
+    from .watch import SaveWatcher
+    if not os.path.isdir(args.game_dir):
+        print(f"Error: {args.game_dir} is not a directory", file=sys.stderr)
+        sys.exit(1)
+    watcher = SaveWatcher(args.game_dir)
+    out = open(args.output, 'a', encoding='utf-8') if args.output else sys.stdout
+    print(f"Watching {', '.join(sorted(watcher.paths)) or 'nothing yet'} in {args.game_dir} "
+          f"(every {args.interval}s, Ctrl-C to stop)", file=sys.stderr)
+    emitted = 0
+    try:
+        while not args.count or emitted < args.count:
+            time.sleep(args.interval)
+            for event in watcher.poll():
+                out.write(json.dumps(event) + '\n')
+                emitted += 1
+            out.flush()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+def _positive_float(text: str) -> float:
+    """argparse type for a polling interval in seconds (above 0)."""
+    try:
+        value = float(text)
+    except ValueError:
+        value = 0.0
+    if not 0 < value < float('inf'):
+        raise argparse.ArgumentTypeError(f"expected a positive number of seconds, got '{text}'")
+    return value
+
+
+def _add_watch_args(p) -> None:
+    """Add save directory watcher arguments to a parser."""
+    p.add_argument('game_dir', help='GAME directory to watch (e.g. an emulator save folder)')
+    p.add_argument('--interval', type=_positive_float, default=0.05,
+                   help='Seconds between polls (default: 0.05)')
+    p.add_argument('--count', type=int, default=0,
+                   help='Stop after this many events (default: run until Ctrl-C)')
+    p.add_argument('--output', '-o', help='Append NDJSON events to a file (default: stdout)')
+
+
 def _add_plrs_edit_args(p) -> None:
     """Add PLRS character editing arguments."""
     p.add_argument('--plrs-slot', type=int, help='Active character slot (0-3)')
@@ -647,6 +787,11 @@ def register_parser(subparsers) -> None:
     p_import.add_argument('--backup', action='store_true', help='Create .bak backup before overwrite')
     p_import.add_argument('--dry-run', action='store_true', help='Show changes without writing')
 
+    _add_history_parsers(sub)
+
+    p_watch = sub.add_parser('watch', help='Stream PRTY/PLRS/ROST field diffs as NDJSON')
+    _add_watch_args(p_watch)
+
 
 def dispatch(args) -> None:
     cmd = args.save_command
@@ -656,8 +801,12 @@ def dispatch(args) -> None:
         cmd_edit(args)
     elif cmd == 'import':
         cmd_import(args)
+    elif cmd == 'history':
+        cmd_history(args)
+    elif cmd == 'watch':
+        cmd_watch(args)
     else:
-        print("Usage: ult3edit save {view|edit|import} ...", file=sys.stderr)
+        print("Usage: ult3edit save {view|edit|import|history|watch} ...", file=sys.stderr)
 
 
 def main() -> None:
@@ -703,6 +852,11 @@ def main() -> None:
     p_import.add_argument('--dry-run', action='store_true',
                           help='Show changes without writing')
 
+    _add_history_parsers(sub)
+
+    p_watch = sub.add_parser('watch', help='Stream PRTY/PLRS/ROST field diffs as NDJSON')
+    _add_watch_args(p_watch)
+
     args = parser.parse_args()
     dispatch(args)
 
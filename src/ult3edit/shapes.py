@@ -18,7 +18,8 @@ import sys
 import zlib
 from pathlib import Path
 
-from .constants import TILES, SHPS_FILE_SIZE, JSR_46BA
+from . import codec
+from .constants import TILES, SHPS_FILE_SIZE
 from .fileutil import resolve_single_file, backup_file, hex_int
 from .json_export import export_json
 
@@ -52,9 +53,6 @@ SHP_SHOP_TYPES = {
     '7': 'Horse Trader',
 }
 
-# JSR $46BA inline string pattern (Apple II)
-_JSR_46BA = JSR_46BA
-
 # Apple II NTSC artifact colors for HGR rendering
 HGR_COLORS = {
     'black':  (0, 0, 0),
@@ -217,24 +215,22 @@ def _png_chunk(chunk_type: bytes, data: bytes) -> bytes:
             struct.pack('>I', zlib.crc32(chunk) & 0xFFFFFFFF))
 
 
+def encode_png(rows: list[bytes], width: int, height: int) -> bytes:
+    """Encode an RGB PNG from packed pixel rows (3 bytes per pixel)."""
+    # Filter byte 0 (None) before every row
+    compressed = zlib.compress(b''.join(b'\x00' + bytes(row) for row in rows))
+    ihdr_data = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+    return (b'\x89PNG\r\n\x1a\n' + _png_chunk(b'IHDR', ihdr_data)
+            + _png_chunk(b'IDAT', compressed) + _png_chunk(b'IEND', b''))
+
+
 def write_png(filepath: str, pixels: list[tuple[int, int, int]],
               width: int, height: int) -> None:
     """Write an RGB PNG file from pixel data (stdlib, no Pillow)."""
-    raw_rows = bytearray()
-    for y in range(height):
-        raw_rows.append(0)  # filter byte: None
-        for x in range(width):
-            r, g, b = pixels[y * width + x]
-            raw_rows.extend([r, g, b])
-
-    compressed = zlib.compress(bytes(raw_rows))
-
+    rows = [bytes(c for px in pixels[y * width:(y + 1) * width] for c in px)
+            for y in range(height)]
     with open(filepath, 'wb') as f:
-        f.write(b'\x89PNG\r\n\x1a\n')
-        ihdr_data = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
-        f.write(_png_chunk(b'IHDR', ihdr_data))
-        f.write(_png_chunk(b'IDAT', compressed))
-        f.write(_png_chunk(b'IEND', b''))
+        f.write(encode_png(rows, width, height))
 
 
 def scale_pixels(pixels: list[tuple[int, int, int]],
@@ -277,34 +273,10 @@ def extract_overlay_strings(data: bytes) -> list[dict]:
     SHP0-SHP7 are code overlays that use JSR $46BA followed by inline
     high-ASCII text terminated by $00. This finds all such strings.
     """
-    strings = []
-    i = 0
-    while i <= len(data) - 3:
-        if data[i:i + 3] == _JSR_46BA:
-            # Found JSR $46BA — extract inline text starting at i+3
-            text_start = i + 3
-            chars = []
-            j = text_start
-            while j < len(data) and data[j] != 0x00:
-                b = data[j]
-                if b == 0xFF:
-                    chars.append('\n')
-                else:
-                    ch = b & 0x7F
-                    if 0x20 <= ch < 0x7F:
-                        chars.append(chr(ch))
-                j += 1
-            if chars:
-                strings.append({
-                    'jsr_offset': i,
-                    'text_offset': text_start,
-                    'text_end': j,
-                    'text': ''.join(chars),
-                })
-            i = j + 1
-        else:
-            i += 1
-    return strings
+    return [
+        {'jsr_offset': jsr, 'text_offset': text_start, 'text_end': text_end, 'text': text}
+        for jsr, text_start, text_end, text in codec.scan_inline_strings(data)
+    ]
 
 
 def encode_overlay_string(text: str) -> bytearray:
@@ -313,12 +285,7 @@ def encode_overlay_string(text: str) -> bytearray:
     Newlines (\\n) become $FF (Apple II line break).
     Terminates with $00.
     """
-    result = bytearray()
-    for ch in text:
-        if ch == '\n':
-            result.append(0xFF)
-        else:
-            result.append(ord(ch.upper()) | 0x80)
+    result = bytearray(codec.encode(text, line_breaks=True))
     result.append(0x00)  # null terminator
     return result
 
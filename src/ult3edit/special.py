@@ -15,7 +15,7 @@ import sys
 
 from .constants import (
     SPECIAL_NAMES, SPECIAL_MAP_WIDTH, SPECIAL_MAP_HEIGHT, SPECIAL_META_OFFSET, SPECIAL_META_SIZE,
-    tile_char, TILE_CHARS_REVERSE,
+    tile_chars, TILE_CHARS_REVERSE,
 )
 from .fileutil import resolve_single_file, backup_file, hex_int
 from .json_export import export_json
@@ -38,18 +38,19 @@ def get_trailing_bytes(data: bytes) -> list[int]:
 get_metadata = get_trailing_bytes
 
 
+def _tile_rows(data: bytes) -> list[list[str]]:
+    """Display characters of an 11x11 map, row by row (for JSON)."""
+    return [list(tile_chars(data[y * SPECIAL_MAP_WIDTH:(y + 1) * SPECIAL_MAP_WIDTH]))
+            for y in range(SPECIAL_MAP_HEIGHT)
+            if y * SPECIAL_MAP_WIDTH < len(data)]
+
+
 def render_special_map(data: bytes) -> str:
     """Render 11x11 special location map as text art."""
     lines = ['     ' + ''.join(f'{x % 10}' for x in range(SPECIAL_MAP_WIDTH))]
     for y in range(SPECIAL_MAP_HEIGHT):
-        row = []
-        for x in range(SPECIAL_MAP_WIDTH):
-            offset = y * SPECIAL_MAP_WIDTH + x
-            if offset < len(data):
-                row.append(tile_char(data[offset]))
-            else:
-                row.append(' ')
-        lines.append(f'  {y:2d}  {"".join(row)}')
+        row = tile_chars(data[y * SPECIAL_MAP_WIDTH:(y + 1) * SPECIAL_MAP_WIDTH])
+        lines.append(f'  {y:2d}  {row:<{SPECIAL_MAP_WIDTH}s}')
 
     # Show trailing padding bytes if non-zero (disk residue, not game data)
     trailing = get_trailing_bytes(data)
@@ -82,11 +83,7 @@ def cmd_view(args) -> None:
                     data = f.read()
                 result[prefix] = {
                     'name': SPECIAL_NAMES.get(prefix, 'Unknown'),
-                    'tiles': [[tile_char(data[y * SPECIAL_MAP_WIDTH + x])
-                                for x in range(SPECIAL_MAP_WIDTH)
-                                if y * SPECIAL_MAP_WIDTH + x < len(data)]
-                               for y in range(SPECIAL_MAP_HEIGHT)
-                               if y * SPECIAL_MAP_WIDTH < len(data)],
+                    'tiles': _tile_rows(data),
                     'trailing_bytes': get_trailing_bytes(data),
                 }
             export_json(result, args.output)
@@ -111,11 +108,7 @@ def cmd_view(args) -> None:
         if args.json:
             result = {
                 'file': filename, 'name': name,
-                'tiles': [[tile_char(data[y * SPECIAL_MAP_WIDTH + x])
-                            for x in range(SPECIAL_MAP_WIDTH)
-                            if y * SPECIAL_MAP_WIDTH + x < len(data)]
-                           for y in range(SPECIAL_MAP_HEIGHT)
-                           if y * SPECIAL_MAP_WIDTH < len(data)],
+                'tiles': _tile_rows(data),
                 'trailing_bytes': get_trailing_bytes(data),
             }
             export_json(result, args.output)
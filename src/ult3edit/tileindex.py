@@ -0,0 +1,208 @@
+"""Ultima III: Exodus - Tile Index.
+
+Where every tile sits across a game's maps: MAP* files (overworld, towns
+and dungeons), CON* combat maps and the special locations (BRND, SHRN,
+FNTN, TIME). Each file is scanned once, one bytes.count and bytes.find
+loop per distinct tile value, into a posting list of offsets per tile;
+`map find --all` and `map stats` answer from those lists instead of
+re-reading and re-scanning every file per question.
+
+Tiles are indexed by canonical value: animation frames are masked off
+overworld/town/combat tiles (& 0xFC) and the high nibble off dungeon
+tiles (& 0x0F), so one query finds every frame of a monster or a wall
+with stray high bits. Surface maps and dungeons use separate tile sets
+and are queried separately.
+"""
+
+import hashlib
+import os
+
+from .constants import (
+    MAP_LETTERS, MAP_DUNGEON_SIZE, CON_LETTERS, CON_MAP_WIDTH, CON_MAP_TILES,
+    SPECIAL_NAMES, SPECIAL_MAP_WIDTH, SPECIAL_MAP_TILES,
+)
+from .fileutil import find_game_files, load_json_cache, resolve_single_file, save_json_cache
+
+# Layout version of the --cache JSON (per-file sha1, kind and tile offsets)
+INDEX_VERSION = 1
+
+OVERWORLD_WIDTH = 64
+DUNGEON_WIDTH = 16
+DUNGEON_LEVEL_SIZE = 256
+
+_SURFACE_MASK = bytes(b & 0xFC for b in range(256))
+_DUNGEON_MASK = bytes(b & 0x0F for b in range(256))
+
+# A located tile: (file, x, y, dungeon level or None)
+Location = tuple[str, int, int, int | None]
+
+
+def canonical_tile(tile: int, dungeon: bool = False) -> int:
+    """The indexed value for a tile byte."""
+    return tile & 0x0F if dungeon else tile & 0xFC
+
+
+def _key(name: str) -> str:
+    """Normalize a path or name to its base file name (e.g. 'MAPA')."""
+    return os.path.basename(name).split('#')[0].upper()
+
+
+def scan(grid: bytes, dungeon: bool = False) -> dict[int, list[int]]:
+    """Offsets of every canonical tile value in a tile grid."""
+    tiles = bytes(grid).translate(_DUNGEON_MASK if dungeon else _SURFACE_MASK)
+    postings = {}
+    for tile in sorted(set(tiles)):
+        needle = bytes([tile])
+        offsets = [0] * tiles.count(needle)
+        pos = -1
+        for i in range(len(offsets)):
+            pos = tiles.find(needle, pos + 1)
+            offsets[i] = pos
+        postings[tile] = offsets
+    return postings
+
+
+class TileIndex:
+    """Tile locations and histograms across a game's maps.
+
+    files maps each indexed file name to its content hash, whether it is
+    a dungeon, its row width and its posting lists (canonical tile ->
+    sorted grid offsets). surface and dungeon map each canonical tile to
+    the files holding it. update() rescans a file only when its hash
+    changes, so re-indexing after saving one map touches only that
+    file's entries.
+    """
+
+    __slots__ = ('files', 'surface', 'dungeon')
+
+    def __init__(self):
+        self.files: dict[str, dict] = {}
+        self.surface: dict[int, set[str]] = {}
+        self.dungeon: dict[int, set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self.files)
+
+    def _tiles(self, dungeon: bool) -> dict[int, set[str]]:
+        return self.dungeon if dungeon else self.surface
+
+    def _add(self, name: str, entry: dict) -> None:
+        self.files[name] = entry
+        tiles = self._tiles(entry['dungeon'])
+        for tile in entry['tiles']:
+            tiles.setdefault(tile, set()).add(name)
+
+    def _drop(self, name: str) -> None:
+        entry = self.files.pop(name, None)
+        if entry is None:
+            return
+        tiles = self._tiles(entry['dungeon'])
+        for tile in entry['tiles']:
+            tiles[tile].discard(name)
+            if not tiles[tile]:
+                del tiles[tile]
+
+    def update(self, name: str, data: bytes) -> bool:
+        """Index (or re-index) one map file. Returns False if unchanged.
+
+        MAP files of dungeon size are indexed as dungeons; CON and special
+        files index only their 11x11 tile grid. Empty data removes the
+        file from the index.
+        """
+        name = _key(name)
+        digest = hashlib.sha1(data).hexdigest()
+        entry = self.files.get(name)
+        if entry is not None and entry['sha1'] == digest:
+            return False
+        self._drop(name)
+        if not data:
+            return entry is not None
+        if name.startswith('MAP'):
+            dungeon = len(data) <= MAP_DUNGEON_SIZE
+            width = DUNGEON_WIDTH if dungeon else OVERWORLD_WIDTH
+        elif name.startswith('CON'):
+            dungeon, width, data = False, CON_MAP_WIDTH, data[:CON_MAP_TILES]
+        else:
+            dungeon, width, data = False, SPECIAL_MAP_WIDTH, data[:SPECIAL_MAP_TILES]
+        self._add(name, {'sha1': digest, 'dungeon': dungeon, 'width': width,
+                         'tiles': scan(data, dungeon)})
+        return True
+
+    def remove(self, name: str) -> None:
+        """Drop a map file from the index."""
+        self._drop(_key(name))
+
+    def refresh(self, game_dir: str) -> list[str]:
+        """Sync the index with the MAP, CON and special files in game_dir.
+
+        Returns the names of files that were (re-)indexed or removed.
+        """
+        paths = [(f'{prefix}{letter}', path)
+                 for prefix, letters in (('MAP', MAP_LETTERS), ('CON', CON_LETTERS))
+                 for letter, path in find_game_files(game_dir, prefix, letters)]
+        for prefix in SPECIAL_NAMES:
+            path = resolve_single_file(game_dir, prefix)
+            if path:
+                paths.append((prefix, path))
+        changed = []
+        for name, path in paths:
+            with open(path, 'rb') as f:
+                if self.update(name, f.read()):
+                    changed.append(name)
+        for name in sorted(set(self.files) - {name for name, _ in paths}):
+            self._drop(name)
+            changed.append(name)
+        return changed
+
+    def locations(self, tile: int, dungeon: bool = False,
+                  level: int | None = None) -> list[Location]:
+        """(file, x, y, level) of every cell holding tile, by file name.
+
+        level is None for surface maps; for dungeons it restricts the
+        search to one level.
+        """
+        tile = canonical_tile(tile, dungeon)
+        found = []
+        for name in sorted(self._tiles(dungeon).get(tile, ())):
+            entry = self.files[name]
+            width = entry['width']
+            for off in entry['tiles'][tile]:
+                if dungeon:
+                    lvl, off = divmod(off, DUNGEON_LEVEL_SIZE)
+                    if level is not None and lvl != level:
+                        continue
+                    found.append((name, off % width, off // width, lvl))
+                else:
+                    found.append((name, off % width, off // width, None))
+        return found
+
+    def histogram(self, name: str | None = None, dungeon: bool = False) -> dict[int, int]:
+        """Cell count per canonical tile for one file, or summed over every
+        surface (or dungeon) file."""
+        if name is not None:
+            entries = [self.files[_key(name)]]
+        else:
+            entries = [e for e in self.files.values() if e['dungeon'] == dungeon]
+        counts: dict[int, int] = {}
+        for entry in entries:
+            for tile, offsets in entry['tiles'].items():
+                counts[tile] = counts.get(tile, 0) + len(offsets)
+        return dict(sorted(counts.items()))
+
+    @classmethod
+    def load(cls, path: str) -> 'TileIndex':
+        """Load an index written by save(), skipping malformed entries."""
+        index = cls()
+        for name, entry in load_json_cache(path, INDEX_VERSION, 'files').items():
+            try:
+                entry = {'sha1': entry['sha1'], 'dungeon': bool(entry['dungeon']),
+                         'width': int(entry['width']),
+                         'tiles': {int(t): list(offs) for t, offs in entry['tiles'].items()}}
+            except (TypeError, KeyError, ValueError, AttributeError):
+                continue
+            index._add(name, entry)
+        return index
+
+    def save(self, path: str) -> None:
+        """Persist the index as JSON."""
+        save_json_cache(path, INDEX_VERSION, 'files', self.files)
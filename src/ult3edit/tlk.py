@@ -12,6 +12,7 @@ import re
 import sys
 from pathlib import Path
 
+from . import codec
 from .constants import TLK_LETTERS, TLK_NAMES, TLK_LINE_BREAK, TLK_RECORD_END
 from .fileutil import resolve_game_file, backup_file
 from .json_export import export_json
@@ -26,14 +27,8 @@ def is_text_record(data: bytes) -> bool:
     """
     if not data:
         return False
-    content_bytes = 0
-    high_ascii_printable = 0
-    for b in data:
-        if b == TLK_LINE_BREAK or b == TLK_RECORD_END:
-            continue
-        content_bytes += 1
-        if 0xA0 <= b <= 0xFE:
-            high_ascii_printable += 1
+    content_bytes = len(data) - data.count(TLK_LINE_BREAK) - data.count(TLK_RECORD_END)
+    high_ascii_printable = codec.count_high_printable(data)
     if content_bytes == 0:
         return False
     # 70% threshold: real TLK text is nearly all high-ASCII; binary/code
@@ -44,34 +39,13 @@ def is_text_record(data: bytes) -> bool:
 
 def decode_record(data: bytes) -> list[str]:
     """Decode a single TLK record into a list of text lines."""
-    lines: list[str] = []
-    cur: list[str] = []
-    for b in data:
-        if b == TLK_LINE_BREAK:
-            lines.append(''.join(cur))
-            cur = []
-            continue
-        if b == TLK_RECORD_END:
-            break
-        ch = b & 0x7F
-        if 0x20 <= ch < 0x7F:
-            cur.append(chr(ch))
-        # Skip non-printable bytes
-    if cur or not lines:
-        lines.append(''.join(cur))
-    return lines
+    return codec.decode_lines(data)
 
 
 def encode_record(lines: list[str]) -> bytes:
     """Encode text lines into a TLK binary record."""
-    out = bytearray()
-    for idx, line in enumerate(lines):
-        if idx > 0:
-            out.append(TLK_LINE_BREAK)
-        for ch in line:
-            out.append((ord(ch.upper()) & 0x7F) | 0x80)
-    out.append(TLK_RECORD_END)
-    return bytes(out)
+    out = bytes([TLK_LINE_BREAK]).join(codec.encode(line) for line in lines)
+    return out + bytes([TLK_RECORD_END])
 
 
 def parse_tlk_data(data: bytes, skip_binary: bool = True) -> list[list[str]]:
@@ -94,14 +94,14 @@ class UnifiedApp:
 
     @staticmethod
     def _save_tabs(tabs) -> list[str]:
-        """Save each tab and return names that failed to save."""
+        """Save each tab; returns "name: error" for each tab that failed."""
         import sys
         failed = []
         for tab in tabs:
             try:
                 tab.save()
             except Exception as e:
-                failed.append(tab.name)
+                failed.append(f'{tab.name}: {e}')
                 print(f'Warning: failed to save {tab.name}: {e}',
                       file=sys.stderr) # pragma: no cover
         return failed
@@ -322,10 +322,13 @@ class UnifiedApp:
             img = os.path.basename(app_ref.session.image_path)
             dirty_count = sum(1 for t in app_ref.tabs if t.is_dirty)
             dirty_text = f' ({dirty_count} modified)' if dirty_count else ''
+            warn_count = sum(len(w) for w in app_ref.session.warnings.values())
+            warn_text = f' | {warn_count} warning(s)' if warn_count else ''
             return [
                 ('class:status', f' ult3edit: {img}'),
                 ('class:status-dirty' if dirty_count else 'class:status', dirty_text),
                 ('class:status', f' | Tab {app_ref.active_tab_index + 1}/{len(app_ref.tabs)}'),
+                ('class:status-dirty', warn_text),
             ]
 
         # Global help bar
@@ -450,7 +453,7 @@ class UnifiedApp:
                         from prompt_toolkit.shortcuts import message_dialog
                         message_dialog(
                             title='Save Failed',
-                            text=f"Failed to save: {', '.join(failures)}",
+                            text="Failed to save:\n" + '\n'.join(failures),
                         ).run()
 
         @global_kb.add('c-f')
@@ -482,7 +485,7 @@ class UnifiedApp:
                     if failures:
                         message_dialog(
                             title='Save Failed',
-                            text=f"Failed to save: {', '.join(failures)}\nQuit cancelled.",
+                            text="Failed to save:\n" + '\n'.join(failures) + "\nQuit cancelled.",
                         ).run()
                         return
             event.app.exit(result=True)
@@ -2,7 +2,12 @@
 
 from dataclasses import dataclass, field
 
-from ..constants import tile_char, tile_name, TILES, DUNGEON_TILES
+from ..constants import (
+    tile_char, tile_name, TILES, DUNGEON_TILES, TILE_CHAR_TABLE, DUNGEON_CHAR_TABLE,
+)
+from .. import raster
+from ..mipmap import MIP_FACTORS, mip_level
+from .undo import UndoLog
 
 
 # =============================================================================
@@ -29,12 +34,19 @@ class EditorState:
     picker_mode: bool = False
     palette: list = field(default_factory=list)
     palette_index: int = 0
-    undo_stack: list = field(default_factory=list)
-    redo_stack: list = field(default_factory=list)
+    history: UndoLog = field(default_factory=UndoLog)
     revision: int = 0
     saved_revision: int = 0
+    selection: bytearray | None = None
+    select_anchor: tuple | None = None
+    lasso: list = field(default_factory=list)
+    # Render cache keys: per-row edit counters, plus an epoch for global changes
+    row_versions: list = field(default_factory=list)
+    render_epoch: int = 0
 
     def __post_init__(self):
+        if not self.row_versions:
+            self.row_versions = [0] * self.height
         if not self.palette:
             source = DUNGEON_TILES if self.is_dungeon else TILES
             self.palette = sorted(source.keys())
@@ -51,26 +63,47 @@ class EditorState:
             offset = y * self.width + x
             old_value = self.data[offset]
             if old_value != value:
-                if track_undo:
-                    self.undo_stack.append((offset, old_value, value))
-                    self.redo_stack.clear()
                 self.data[offset] = value
-                self.revision += 1
-                self._sync_dirty()
+                if track_undo:
+                    self._record([(offset, old_value, value)])
+                else:
+                    self._touch((y,))
+                    self.revision += 1
+                    self._sync_dirty()
+
+    def _record(self, changes: list) -> None:
+        """Push one undo group of (offset, old, new) cell changes."""
+        self.history.record(changes)
+        self._touch({offset // self.width for offset, _, _ in changes})
+        self.revision += 1
+        self._sync_dirty()
+
+    def _touch(self, rows) -> None:
+        """Mark rows as changed so the viewport re-renders only those lines."""
+        for y in rows:
+            self.row_versions[y] += 1
+
+    def _touch_spans(self, spans) -> None:
+        w = self.width
+        self._touch({y for offset, run in spans
+                     for y in range(offset // w, (offset + run - 1) // w + 1)})
+
+    def invalidate_rows(self) -> None:
+        """Force every row to re-render (overlays, selection, or data swapped)."""
+        self.render_epoch += 1
 
     def undo(self) -> None:
-        if self.undo_stack:
-            offset, old_value, new_value = self.undo_stack.pop()
-            self.data[offset] = old_value
-            self.redo_stack.append((offset, old_value, new_value))
+        """Revert the most recent edit (a single cell or a whole fill)."""
+        spans = self.history.undo(self.data)
+        if spans is not None:
+            self._touch_spans(spans)
             self.revision = max(0, self.revision - 1)
             self._sync_dirty()
 
     def redo(self) -> None:
-        if self.redo_stack:
-            offset, old_value, new_value = self.redo_stack.pop()
-            self.data[offset] = new_value
-            self.undo_stack.append((offset, old_value, new_value))
+        spans = self.history.redo(self.data)
+        if spans is not None:
+            self._touch_spans(spans)
             self.revision += 1
             self._sync_dirty()
 
@@ -108,6 +141,74 @@ class EditorState:
     def paint(self) -> None:
         self.set_tile(self.cursor_x, self.cursor_y, self.selected_tile)
 
+    def _apply_raster(self, op, *args) -> int:
+        """Run a raster operation on the grid as one undo group; returns cells changed."""
+        before = bytes(self.data)
+        op(self.data, self.width, *args)
+        changes = [(offset, before[offset], self.data[offset])
+                   for offset in raster.changed_offsets(before, self.data)]
+        if changes:
+            self._record(changes)
+        return len(changes)
+
+    def fill_rect(self, x1: int, y1: int, x2: int, y2: int) -> int:
+        """Fill a rectangle with the selected tile; returns cells changed."""
+        return self._apply_raster(raster.fill_rect, x1, y1, x2, y2, self.selected_tile)
+
+    def replace_all(self, from_tile: int) -> int:
+        """Replace every from_tile (within the selection, if any) with the selected tile."""
+        pairs = {from_tile: self.selected_tile}
+        if self.selection is not None:
+            return self._apply_raster(raster.replace_masked, self.selection, pairs)
+        return self._apply_raster(raster.remap, pairs)
+
+    def flood_fill(self) -> int:
+        """Flood-fill the region under the cursor with the selected tile."""
+        return self._apply_raster(raster.flood_fill, self.cursor_x, self.cursor_y,
+                                  self.selected_tile)
+
+    # -- selection -----------------------------------------------------------
+
+    def toggle_rect_select(self) -> None:
+        """First call anchors at the cursor; second selects anchor..cursor."""
+        if self.select_anchor is None:
+            self.select_anchor = (self.cursor_x, self.cursor_y)
+            return
+        ax, ay = self.select_anchor
+        self.selection = raster.rect_mask(self.width, self.height,
+                                          ax, ay, self.cursor_x, self.cursor_y)
+        self.select_anchor = None
+        self.invalidate_rows()
+
+    def add_lasso_point(self) -> None:
+        """Add the cursor position as the next lasso vertex."""
+        self.lasso.append((self.cursor_x, self.cursor_y))
+        self._touch((self.cursor_y,))
+
+    def close_lasso(self) -> None:
+        """Select the polygon traced by the lasso vertices."""
+        if self.lasso:
+            self.selection = raster.polygon_mask(self.width, self.height, self.lasso)
+            self.lasso = []
+            self.invalidate_rows()
+
+    def clear_selection(self) -> None:
+        self.selection = None
+        self.select_anchor = None
+        self.lasso = []
+        self.invalidate_rows()
+
+    def is_selected(self, x: int, y: int) -> bool:
+        return (self.selection is not None and 0 <= x < self.width and 0 <= y < self.height
+                and bool(self.selection[y * self.width + x]))
+
+    def fill_selection(self) -> int:
+        """Paint every selected cell with the selected tile."""
+        if self.selection is None:
+            return 0
+        pairs = dict.fromkeys(range(256), self.selected_tile)
+        return self._apply_raster(raster.replace_masked, self.selection, pairs)
+
     def select_next_tile(self) -> None:
         if self.palette:
             self.palette_index = (self.palette_index + 1) % len(self.palette)
@@ -131,6 +232,8 @@ class BaseTileEditor:
     +---------------------------+----------+
     |   Grid Viewport           | Palette  |
     |   (with cursor highlight) | Sidebar  |
+    |                           +----------+
+    |                           | Minimap  |
     +---------------------------+----------+
     | Status: pos, tile, mode, dirty       |
     | Keys: arrows/space/[]/Ctrl-S/Ctrl-Q  |
@@ -150,6 +253,7 @@ class BaseTileEditor:
         self.title = title
         self.show_help = False
         self.save_callback = save_callback
+        self._row_cache: dict[int, tuple] = {}
 
     def _save(self) -> None:
         """Write data to file. Override in subclasses."""
@@ -166,7 +270,8 @@ class BaseTileEditor:
 
     def _render_cell(self, x: int, y: int, tile_byte: int) -> tuple[str, str]:
         """Return (style, char) for a cell. Override for custom overlays."""
-        ch = tile_char(tile_byte, self.state.is_dungeon)
+        table = DUNGEON_CHAR_TABLE if self.state.is_dungeon else TILE_CHAR_TABLE
+        ch = chr(table[tile_byte & 0xFF])
         from .theme import tile_style
         style = tile_style(tile_byte, self.state.is_dungeon)
         return style, ch
@@ -175,6 +280,66 @@ class BaseTileEditor:
         """Add subclass-specific keybindings. Override as needed."""
         pass
 
+    def render_row(self, gy: int) -> list:
+        """Formatted fragments for one viewport row.
+
+        Cached per row and reused until that row's tiles change, the
+        viewport scrolls horizontally, the cursor enters or leaves the
+        row, or invalidate_rows() is called; a paint stroke re-renders
+        one line instead of the whole viewport.
+        """
+        state = self.state
+        key = (state.render_epoch, state.row_versions[gy], state.viewport_x,
+               state.viewport_w, state.cursor_x if gy == state.cursor_y else -1)
+        cached = self._row_cache.get(gy)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        fragments = [('class:row-label', f'{gy:3d} ')]
+        for gx in range(state.viewport_x, state.viewport_x + state.viewport_w):
+            style, ch = self._render_cell(gx, gy, state.tile_at(gx, gy))
+            if gx == state.cursor_x and gy == state.cursor_y:
+                style = 'class:cursor'
+            elif state.is_selected(gx, gy) or (gx, gy) in state.lasso:
+                style = 'class:highlight'
+            fragments.append((style, ch))
+        self._row_cache[gy] = (key, fragments)
+        return fragments
+
+    def minimap_lines(self, max_w: int = 16, max_h: int = 16) -> list:
+        """Formatted rows for a zoomed-out view of the whole map.
+
+        Uses the smallest mip level that fits max_w x max_h. Levels come
+        from the content-hash pyramid cache, so redraws of an unchanged map
+        (or one returned to an earlier state by undo) do not re-reduce it.
+        Cells under the viewport are underlined; the cursor's cell is
+        highlighted.
+        """
+        from .theme import tile_style
+        state = self.state
+        factor = next((f for f in (1,) + MIP_FACTORS
+                       if -(-state.width // f) <= max_w and -(-state.height // f) <= max_h),
+                      MIP_FACTORS[-1])
+        tiles, w, h = mip_level(state.data, state.width, factor, state.is_dungeon)
+        table = DUNGEON_CHAR_TABLE if state.is_dungeon else TILE_CHAR_TABLE
+        vx1, vy1 = state.viewport_x // factor, state.viewport_y // factor
+        vx2 = (state.viewport_x + state.viewport_w - 1) // factor
+        vy2 = (state.viewport_y + state.viewport_h - 1) // factor
+        cursor = (state.cursor_x // factor, state.cursor_y // factor)
+        lines = []
+        for y in range(h):
+            fragments = []
+            for x in range(w):
+                tile = tiles[y * w + x]
+                if (x, y) == cursor:
+                    style = 'class:cursor'
+                else:
+                    style = tile_style(tile, state.is_dungeon)
+                    if vx1 <= x <= vx2 and vy1 <= y <= vy2:
+                        style += ' underline'
+                fragments.append((style, chr(table[tile])))
+            lines.append(fragments)
+        return lines
+
     def _build_ui(self, embedded: bool = False):  # pragma: no cover
         """Build the UI container and keybindings.
 
@@ -203,19 +368,8 @@ class BaseTileEditor:
                 state.viewport_h = min(usable_h, state.height)
                 state._scroll_viewport()
 
-                lines = []
-                for vy in range(state.viewport_h):
-                    gy = state.viewport_y + vy
-                    fragments = []
-                    fragments.append(('class:row-label', f'{gy:3d} '))
-                    for vx in range(state.viewport_w):
-                        gx = state.viewport_x + vx
-                        tile_byte = state.tile_at(gx, gy)
-                        style, ch = editor._render_cell(gx, gy, tile_byte)
-                        if gx == state.cursor_x and gy == state.cursor_y:
-                            style = 'class:cursor'
-                        fragments.append((style, ch))
-                    lines.append(fragments)
+                lines = [editor.render_row(state.viewport_y + vy)
+                         for vy in range(state.viewport_h)]
                 return UIContent(
                     get_line=lambda i: lines[i] if i < len(lines) else [],
                     line_count=len(lines),
@@ -279,6 +433,16 @@ class BaseTileEditor:
                     line_count=len(lines),
                 )
 
+        # --- Minimap ---
+        class MiniControl(UIControl):
+            def create_content(self, width: int, height: int):
+                lines = [[('class:palette-header', ' Map ')]]
+                lines += [[('', ' ')] + row for row in editor.minimap_lines(width - 2, height - 1)]
+                return UIContent(
+                    get_line=lambda i: lines[i] if i < len(lines) else [],
+                    line_count=len(lines),
+                )
+
         # --- Status bar ---
         def get_status():
             t = state.tile_at(state.cursor_x, state.cursor_y)
@@ -304,6 +468,12 @@ class BaseTileEditor:
                     ('class:help-key', 'Space'), ('class:help-text', '=paint '),
                     ('class:help-key', '[ ]'), ('class:help-text', '=tile '),
                     ('class:help-key', 'P'), ('class:help-text', '=picker '),
+                    ('class:help-key', 'R'), ('class:help-text', '=replace all '),
+                    ('class:help-key', 'f'), ('class:help-text', '=flood '),
+                    ('class:help-key', 'v'), ('class:help-text', '=rect '),
+                    ('class:help-key', 'l/L'), ('class:help-text', '=lasso '),
+                    ('class:help-key', 'F'), ('class:help-text', '=fill sel '),
+                    ('class:help-key', 'x'), ('class:help-text', '=clear sel '),
                     ('class:help-key', 'Ctrl-S'), ('class:help-text', '=save '),
                     ('class:help-key', 'Ctrl-Q'), ('class:help-text', '=quit '),
                     ('class:help-key', 'Ctrl-Z'), ('class:help-text', '=undo '),
@@ -319,11 +489,12 @@ class BaseTileEditor:
         # --- Layout ---
         grid_window = Window(content=GridControl(), wrap_lines=False)
         palette_window = Window(content=PalControl(), width=18, wrap_lines=False)
+        minimap_window = Window(content=MiniControl(), width=18, height=17, wrap_lines=False)
         status_bar = Window(content=FormattedTextControl(get_status), height=1)
         help_bar = Window(content=FormattedTextControl(get_help), height=1)
 
         root = HSplit([
-            VSplit([grid_window, palette_window]),
+            VSplit([grid_window, HSplit([palette_window, minimap_window])]),
             status_bar,
             help_bar,
         ])
@@ -377,6 +548,34 @@ class BaseTileEditor:
             else:
                 state.paint()
 
+        @kb.add('R')
+        def _replace_all(event):
+            state.replace_all(state.tile_at(state.cursor_x, state.cursor_y))
+
+        @kb.add('f')
+        def _flood_fill(event):
+            state.flood_fill()
+
+        @kb.add('v')
+        def _rect_select(event):
+            state.toggle_rect_select()
+
+        @kb.add('l')
+        def _lasso_point(event):
+            state.add_lasso_point()
+
+        @kb.add('L')
+        def _lasso_close(event):
+            state.close_lasso()
+
+        @kb.add('F')
+        def _fill_selection(event):
+            state.fill_selection()
+
+        @kb.add('x')
+        def _clear_selection(event):
+            state.clear_selection()
+
         @kb.add(']')
         def _next_tile(event):
             state.select_next_tile()
@@ -1,7 +1,7 @@
 """TUI bestiary editor: form-based monster list with field editing."""
 
-from ..constants import MON_MONSTERS_PER_FILE, MON_ATTR_COUNT
-from ..bestiary import Monster
+from ..bestiary import Bestiary
+from ..constants import MON_FILE_SIZE
 from .form_editor import FormField, FormEditorTab
 
 
@@ -83,26 +83,16 @@ def _monster_fields(monster):
 
 def make_bestiary_tab(data, file_letter, save_callback):
     """Create a FormEditorTab for a single MON file."""
-    original_data = bytes(data)
-
-    # Parse monsters from columnar format
-    monsters = []
-    for i in range(MON_MONSTERS_PER_FILE):
-        attrs = []
-        for row in range(MON_ATTR_COUNT):
-            offset = row * MON_MONSTERS_PER_FILE + i
-            attrs.append(data[offset] if offset < len(data) else 0)
-        monsters.append(Monster(attrs, i, file_letter))
+    # Monsters are row views over one copy of the file (unknown rows kept);
+    # a truncated file is zero-padded to full size
+    buf = bytearray(data)
+    if len(buf) < MON_FILE_SIZE:
+        buf.extend(bytes(MON_FILE_SIZE - len(buf)))
+    bestiary = Bestiary(buf, file_letter)
+    monsters = bestiary.monsters
 
     def get_save_data():
-        out = bytearray(original_data)  # Preserve unknown rows
-        for m in monsters:
-            attrs = [m.tile1, m.tile2, m.flags1, m.flags2,
-                     m.hp, m.attack, m.defense, m.speed,
-                     m.ability1, m.ability2]
-            for row, val in enumerate(attrs):
-                out[row * MON_MONSTERS_PER_FILE + m.index] = val
-        return bytes(out)
+        return bytes(bestiary.data)
 
     return FormEditorTab(
         tab_name=f'MON{file_letter}',
@@ -89,6 +89,8 @@ class CombatEditor(BaseTileEditor):
             self.placement_slot = (self.placement_slot + 1) % CON_PC_COUNT
         else:
             self.state.paint()
+            return
+        self.state.invalidate_rows()  # markers are drawn by _render_cell
 
     def _extra_keybindings(self, kb) -> None:  # pragma: no cover
         editor = self
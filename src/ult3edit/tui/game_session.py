@@ -4,6 +4,7 @@ Wraps DiskContext for read/write and catalogs available files by category
 (maps, combat, special, dialog, text, roster, bestiary, party).
 """
 
+import hashlib
 import os
 
 from ..constants import (
@@ -12,7 +13,13 @@ from ..constants import (
     MON_LETTERS, MON_GROUP_NAMES,
     SPECIAL_NAMES,
 )
+from ..bestiary import MonsterIndex
 from ..disk import DiskContext
+from ..validate import file_kind, validate_data
+
+
+class SaveBlocked(Exception):
+    """A save was held back because the data failed validation."""
 
 
 class GameSession:
@@ -28,6 +35,9 @@ class GameSession:
         self.image_path = image_path
         self.ctx = None
         self.catalog = {}  # category -> [(file_name, display_name), ...]
+        self.warnings = {}  # file_name -> validation issues from last save
+        self.held = {}  # file_name -> SHA-1 of data held back by validation
+        self._monster_index = None  # built on first monster_index() call
 
     def __enter__(self):  # pragma: no cover
         self.ctx = DiskContext(self.image_path)
@@ -142,17 +152,57 @@ class GameSession:
         return None
 
     def write(self, name: str, data: bytes) -> None:
-        """Stage a file for writing back to disk image."""
+        """Stage a file for writing back to disk image.
+
+        A written MON file is re-indexed in the monster index (if built).
+        """
         if self.ctx:
             self.ctx.write(name, data)
+            if self._monster_index is not None and name.startswith('MON'):
+                self._monster_index.update(name, data)
+
+    def monster_index(self) -> MonsterIndex:
+        """Name and stat index of the bestiary files.
+
+        Built from the image on first use; write() keeps it current as MON
+        files are saved, so searches never re-read or re-hash them.
+        """
+        if self._monster_index is None:
+            self._monster_index = MonsterIndex()
+            for fname, _ in self.files_in('bestiary'):
+                data = self.read(fname)
+                if data:
+                    self._monster_index.update(fname, data)
+        return self._monster_index
+
+    def check_save(self, name: str, data: bytes) -> list[dict]:
+        """Validate data before it is written; returns the issues found.
+
+        Raises SaveBlocked the first time a given file content fails
+        validation. Saving the same content again confirms it and writes
+        anyway; the issues stay in warnings (shown in the status bar).
+        """
+        issues = validate_data(name, data)['issues']
+        self.warnings[name] = issues
+        digest = hashlib.sha1(data).hexdigest()
+        if issues and self.held.get(name) != digest:
+            self.held[name] = digest
+            first = issues[0]
+            raise SaveBlocked(f"{len(issues)} validation issue(s), e.g. {first['entity']}: "
+                              f"{first['message']} (save again to write anyway)")
+        self.held.pop(name, None)
+        return issues
 
     def make_save_callback(self, file_name: str):
         """Return a callable that writes data to this file in the session.
 
         Handles virtual names like 'EXOD:crawl' by writing to the base file.
+        Validatable files are checked before the write (see check_save).
         """
         base = file_name.split(':')[0] if ':' in file_name else file_name
         def callback(data: bytes):
+            if file_kind(base):
+                self.check_save(base, data)
             self.write(base, data)
         return callback
 
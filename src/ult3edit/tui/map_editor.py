@@ -46,8 +46,8 @@ class MapEditor(BaseTileEditor):
         self.current_level = level
         offset = level * 256
         self.state.data = bytearray(self.full_data[offset:offset + 256])
-        self.state.undo_stack.clear()
-        self.state.redo_stack.clear()
+        self.state.history.clear()
+        self.state.clear_selection()  # also invalidates the row cache
         self.state.revision = 0
         self.state.saved_revision = 0
         self.state.dirty = False
@@ -159,21 +159,19 @@ class SearchTab(EditorTab):
                                 'jump': ('dialog', fname, i)
                             })
 
-        # 3. Search Bestiary
+        # 3. Search Bestiary (session index, kept current as MON files are saved)
         if self.session.has_category('bestiary'):
-            for fname, display in self.session.files_in('bestiary'):
-                data = self.session.read(fname)
-                if data:
-                    from ..bestiary import load_monsters
-                    monsters = load_monsters(data, fname[-1])
-                    for i, mon in enumerate(monsters):
-                        if not mon.is_empty and q in mon.name.lower():
-                            self.results.append({
-                                'type': 'Monster',
-                                'file': fname,
-                                'label': f"{mon.name} ({display}, slot {i})",
-                                'jump': ('bestiary', fname, i)
-                            })
+            index = self.session.monster_index()
+            displays = dict(self.session.files_in('bestiary'))
+            for fname, i in index.find(q):
+                if fname in displays:
+                    name = index.files[fname]['names'][i]
+                    self.results.append({
+                        'type': 'Monster',
+                        'file': fname,
+                        'label': f"{name} ({displays[fname]}, slot {i})",
+                        'jump': ('bestiary', fname, i)
+                    })
 
         # 4. Search Maps / Special
         for cat in ['maps', 'special']:
@@ -146,8 +146,14 @@ _DUNGEON_TILE_STYLES = {
 }
 
 
+# Style strings per raw tile byte, masking folded in
+_TILE_STYLE_TABLE = tuple('class:' + _TILE_STYLES.get(b & 0xFC, 'tile-default')
+                          for b in range(256))
+_DUNGEON_STYLE_TABLE = tuple('class:' + _DUNGEON_TILE_STYLES.get(b & 0x0F, 'tile-default')
+                             for b in range(256))
+
+
 def tile_style(byte_val: int, is_dungeon: bool = False) -> str:
     """Map a tile byte value to a prompt_toolkit style string."""
-    if is_dungeon:
-        return 'class:' + _DUNGEON_TILE_STYLES.get(byte_val & 0x0F, 'tile-default')
-    return 'class:' + _TILE_STYLES.get(byte_val & 0xFC, 'tile-default')
+    table = _DUNGEON_STYLE_TABLE if is_dungeon else _TILE_STYLE_TABLE
+    return table[byte_val & 0xFF]
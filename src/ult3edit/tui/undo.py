@@ -0,0 +1,145 @@
+"""Compact grouped undo log for tile editors (pure data, no prompt_toolkit).
+
+Edits are stored as run-length records in parallel typed arrays rather
+than one Python tuple per cell:
+
+    offset (uint32), run length (uint16), old tile, new tile
+
+A run covers consecutive cells that had the same old tile and received
+the same new tile, so filling an ocean row is one 8-byte record instead
+of 64 tuples. Records are grouped: one paint, fill or replace is one
+group, and undo/redo always apply a whole group.
+
+The log is bounded by max_bytes. When a new group pushes it over the
+cap, the oldest groups are dropped from the front (the log behaves as a
+ring buffer over groups); dropped space is compacted lazily.
+"""
+
+from array import array
+
+# Default memory cap for one editor's undo history
+UNDO_MAX_BYTES = 1 << 20
+
+MAX_RUN = 0xFFFF
+RECORD_BYTES = 8   # offset (4) + run (2) + old (1) + new (1)
+GROUP_BYTES = 4    # group start index
+
+
+class UndoLog:
+    """Grouped, run-length encoded undo/redo history.
+
+    Groups [head, pos) can be undone; groups [pos, len) can be redone.
+    """
+
+    __slots__ = ('max_bytes', '_offsets', '_runs', '_old', '_new', '_groups', '_head', '_pos')
+
+    def __init__(self, max_bytes: int = UNDO_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.clear()
+
+    def clear(self) -> None:
+        self._offsets = array('I')
+        self._runs = array('H')
+        self._old = bytearray()
+        self._new = bytearray()
+        self._groups = array('I')   # record index where each group starts
+        self._head = 0              # first live group
+        self._pos = 0               # groups before this are undoable
+
+    # -- sizes ---------------------------------------------------------------
+
+    @property
+    def undo_depth(self) -> int:
+        return self._pos - self._head
+
+    @property
+    def redo_depth(self) -> int:
+        return len(self._groups) - self._pos
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by live records and group markers."""
+        records = len(self._offsets) - self._group_start(self._head)
+        return records * RECORD_BYTES + (len(self._groups) - self._head) * GROUP_BYTES
+
+    def _group_start(self, g: int) -> int:
+        return self._groups[g] if g < len(self._groups) else len(self._offsets)
+
+    def _group_spans(self, g: int) -> range:
+        return range(self._group_start(g), self._group_start(g + 1))
+
+    # -- recording -----------------------------------------------------------
+
+    def record(self, changes) -> int:
+        """Add one group from (offset, old, new) cell changes in any order.
+
+        Discards the redo history. Returns the number of run records
+        stored (0 if there were no changes).
+        """
+        # Drop redoable groups
+        if self._pos < len(self._groups):
+            cut = self._groups[self._pos]
+            del self._groups[self._pos:]
+            del self._offsets[cut:], self._runs[cut:], self._old[cut:], self._new[cut:]
+        start = len(self._offsets)
+        last = None
+        for offset, old, new in sorted(changes):
+            if (last is not None and offset == last[0] + last[1] and old == last[2]
+                    and new == last[3] and last[1] < MAX_RUN):
+                last[1] += 1
+                continue
+            if last is not None:
+                self._append(*last)
+            last = [offset, 1, old, new]
+        if last is None:
+            return 0
+        self._append(*last)
+        self._groups.append(start)
+        self._pos = len(self._groups)
+        self._trim()
+        return len(self._offsets) - start
+
+    def _append(self, offset: int, run: int, old: int, new: int) -> None:
+        self._offsets.append(offset)
+        self._runs.append(run)
+        self._old.append(old)
+        self._new.append(new)
+
+    def _trim(self) -> None:
+        """Drop the oldest groups until the log fits max_bytes (keeps the newest)."""
+        while self.nbytes > self.max_bytes and self._head < self._pos - 1:
+            self._head += 1
+        # Compact once the dead prefix outweighs the live data
+        dead = self._group_start(self._head)
+        if dead and dead >= len(self._offsets) - dead:
+            del self._offsets[:dead], self._runs[:dead], self._old[:dead], self._new[:dead]
+            groups = array('I', (s - dead for s in self._groups[self._head:]))
+            self._pos -= self._head
+            self._groups = groups
+            self._head = 0
+
+    # -- undo / redo ---------------------------------------------------------
+
+    def undo(self, data: bytearray) -> list[tuple[int, int]] | None:
+        """Revert the newest group in data; returns its (offset, run) spans."""
+        if self._pos <= self._head:
+            return None
+        self._pos -= 1
+        spans = []
+        for i in reversed(self._group_spans(self._pos)):
+            offset, run = self._offsets[i], self._runs[i]
+            data[offset:offset + run] = bytes([self._old[i]]) * run
+            spans.append((offset, run))
+        return spans
+
+    def redo(self, data: bytearray) -> list[tuple[int, int]] | None:
+        """Re-apply the next undone group in data; returns its (offset, run) spans."""
+        if self._pos >= len(self._groups):
+            return None
+        spans = []
+        for i in self._group_spans(self._pos):
+            offset, run = self._offsets[i], self._runs[i]
+            data[offset:offset + run] = bytes([self._new[i]]) * run
+            spans.append((offset, run))
+        self._pos += 1
+        return spans
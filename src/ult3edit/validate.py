@@ -0,0 +1,339 @@
+"""Ultima III: Exodus - Batch Game Validator.
+
+Runs every data validator over every file in a game in a single pass:
+  ROST  - validate_character for each non-empty roster slot
+  PLRS  - validate_character for each active character
+  PRTY  - validate_party_state
+  MON*  - validate_monster for each non-empty monster
+  CON*  - validate_combat_map
+
+Results are cached by file content hash, so re-validating an unchanged
+file (TUI pre-save checks, CI runs over many scenario builds that share
+most files) costs one SHA-1. Multiple games fan out across a process pool.
+
+Usage:
+    ult3edit validate GAME_DIR                     # Human-readable report
+    ult3edit validate game.po --json               # Machine-readable report
+    ult3edit validate build1/ build2/ --jobs 8     # Many games in parallel
+    ult3edit validate builds/*/ --cache .u3cache   # Persist results between runs
+"""
+
+import argparse
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+
+from .constants import CHAR_RECORD_SIZE, MON_LETTERS, CON_LETTERS
+from .fileutil import (
+    check_jobs, job_count, load_json_cache, pool_imap, resolve_game_file, resolve_single_file,
+    save_json_cache,
+)
+from .json_export import export_json
+from .roster import Character, validate_character
+from .bestiary import load_monsters, validate_monster
+from .combat import CombatMap, validate_combat_map
+from .save import PartyState, validate_party_state
+
+# Bump when any validator's output changes so persisted caches are discarded.
+CACHE_VERSION = 1
+
+# In-process result cache: 'TYPE:sha1' -> list of issue dicts
+_cache: dict[str, list[dict]] = {}
+
+
+# =============================================================================
+# Per-file validators
+# =============================================================================
+
+def _validate_characters(data: bytes, max_slots: int | None = None) -> list[dict]:
+    count = len(data) // CHAR_RECORD_SIZE
+    if max_slots is not None:
+        count = min(count, max_slots)
+    issues = []
+    for i in range(count):
+        char = Character(data[i * CHAR_RECORD_SIZE:(i + 1) * CHAR_RECORD_SIZE])
+        for w in validate_character(char):
+            issues.append({'entity': f'Slot {i}', 'message': w})
+    return issues
+
+
+def _validate_roster(data: bytes) -> list[dict]:
+    if len(data) < CHAR_RECORD_SIZE:
+        raise ValueError(f"Roster file too small ({len(data)} bytes, need at least {CHAR_RECORD_SIZE})")
+    return _validate_characters(data)
+
+
+def _validate_plrs(data: bytes) -> list[dict]:
+    return _validate_characters(data, max_slots=4)
+
+
+def _validate_party(data: bytes) -> list[dict]:
+    party = PartyState(data)
+    return [{'entity': 'Party', 'message': w} for w in validate_party_state(party)]
+
+
+def _validate_monsters(data: bytes) -> list[dict]:
+    issues = []
+    for m in load_monsters(data):
+        for w in validate_monster(m):
+            issues.append({'entity': f'Monster {m.index}', 'message': w})
+    return issues
+
+
+def _validate_combat(data: bytes) -> list[dict]:
+    cm = CombatMap(data)
+    return [{'entity': 'Battlefield', 'message': w} for w in validate_combat_map(cm)]
+
+
+VALIDATORS = {
+    'ROST': _validate_roster,
+    'PLRS': _validate_plrs,
+    'PRTY': _validate_party,
+    'MON': _validate_monsters,
+    'CON': _validate_combat,
+}
+
+
+def file_kind(name: str) -> str | None:
+    """Map a game file name (e.g. 'MONA', 'CONF#069900') to a validator key."""
+    base = os.path.basename(name).split('#')[0].upper()
+    if base in ('ROST', 'PLRS', 'PRTY'):
+        return base
+    if len(base) == 4 and base[:3] == 'MON' and base[3] in MON_LETTERS:
+        return 'MON'
+    if len(base) == 4 and base[:3] == 'CON' and base[3] in CON_LETTERS:
+        return 'CON'
+    return None
+
+
+def validate_data(name: str, data: bytes, cache: dict | None = None) -> dict:
+    """Validate one file's contents and return its report entry.
+
+    Results are looked up in (and stored into) cache by content hash;
+    the module-level cache is used when none is given. Files that fail to
+    parse are reported as a single issue rather than raising.
+    """
+    if cache is None:
+        cache = _cache
+    kind = file_kind(name)
+    digest = hashlib.sha1(data).hexdigest()
+    entry = {'file': os.path.basename(name).split('#')[0].upper(), 'type': kind, 'sha1': digest}
+    key = f'{kind}:{digest}'
+    issues = cache.get(key)
+    if issues is None:
+        try:
+            issues = VALIDATORS[kind](data)
+        except ValueError as e:
+            issues = [{'entity': 'File', 'message': str(e)}]
+        cache[key] = issues
+    entry['issues'] = issues
+    return entry
+
+
+# =============================================================================
+# Game-level validation
+# =============================================================================
+
+def game_files(game_dir: str) -> list[tuple[str, str]]:
+    """List (name, path) for every validatable file in a game directory."""
+    found = []
+    for name in ('ROST', 'PLRS', 'PRTY'):
+        path = resolve_single_file(game_dir, name)
+        if path:
+            found.append((name, path))
+    for prefix, letters in (('MON', MON_LETTERS), ('CON', CON_LETTERS)):
+        for letter in letters:
+            path = resolve_game_file(game_dir, prefix, letter)
+            if path:
+                found.append((f'{prefix}{letter}', path))
+    return found
+
+
+def _make_report(path: str, files: list[dict]) -> dict:
+    return {
+        'path': path,
+        'files': files,
+        'issue_count': sum(len(f['issues']) for f in files),
+    }
+
+
+def validate_directory(game_dir: str, cache: dict | None = None) -> dict:
+    """Validate every game file in a directory and return a report dict."""
+    files = []
+    for name, path in game_files(game_dir):
+        with open(path, 'rb') as f:
+            data = f.read()
+        files.append(validate_data(name, data, cache))
+    return _make_report(game_dir, files)
+
+
+def validate_image(image_path: str, cache: dict | None = None) -> dict:
+    """Extract a disk image to a temporary directory and validate it."""
+    from .disk import disk_extract_all
+    tmpdir = tempfile.mkdtemp(prefix='ult3edit_')
+    try:
+        if not disk_extract_all(image_path, tmpdir):
+            raise ValueError(f"Failed to extract disk image: {image_path}")
+        report = validate_directory(tmpdir, cache)
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+    report['path'] = image_path
+    return report
+
+
+def validate_path(path: str, cache: dict | None = None) -> dict:
+    """Validate a game directory or disk image.
+
+    Errors (missing path, unreadable image) are recorded in the report's
+    'error' field so one bad input does not abort a batch run.
+    """
+    try:
+        if os.path.isdir(path):
+            return validate_directory(path, cache)
+        if os.path.isfile(path):
+            return validate_image(path, cache)
+        raise FileNotFoundError(f"Not found: {path}")
+    except (OSError, ValueError) as e:
+        report = _make_report(path, [])
+        report['error'] = str(e)
+        return report
+
+
+def _cached_entries(path: str, cache: dict) -> dict:
+    """The cache entries for a game directory's current files.
+
+    Disk images are extracted by the worker, so none are known up front.
+    """
+    if not cache or not os.path.isdir(path):
+        return {}
+    entries = {}
+    for name, file_path in game_files(path):
+        try:
+            with open(file_path, 'rb') as f:
+                key = f'{file_kind(name)}:{hashlib.sha1(f.read()).hexdigest()}'
+        except OSError:
+            continue
+        if key in cache:
+            entries[key] = cache[key]
+    return entries
+
+
+def _validate_worker(task: tuple[str, dict]) -> tuple[dict, dict]:
+    """Process-pool entry point: returns (report, new cache entries).
+
+    task is (path, the cache entries for that path's files).
+    """
+    path, entries = task
+    known = set(entries)
+    report = validate_path(path, entries)
+    return report, {k: v for k, v in entries.items() if k not in known}
+
+
+def validate_paths(paths: list[str], jobs: int = 0, cache: dict | None = None) -> list[dict]:
+    """Validate many games, fanning out across a process pool.
+
+    jobs is as for fileutil.pool_map(). Each task carries only the cache
+    entries for its own files, and new entries computed by workers are
+    merged back into cache.
+    """
+    if cache is None:
+        cache = _cache
+    if check_jobs(jobs) == 1 or len(paths) <= 1:
+        # In-process: validate straight into cache instead of per-path copies
+        return [validate_path(p, cache) for p in paths]
+    tasks = [(p, _cached_entries(p, cache)) for p in paths]
+    reports = []
+    for report, new_entries in pool_imap(_validate_worker, tasks, jobs):
+        cache.update(new_entries)
+        reports.append(report)
+    return reports
+
+
+def load_cache(path: str) -> dict:
+    """Load results written by save_cache()."""
+    return load_json_cache(path, CACHE_VERSION, 'entries')
+
+
+def save_cache(path: str, cache: dict) -> None:
+    """Persist a result cache as JSON."""
+    save_json_cache(path, CACHE_VERSION, 'entries', cache)
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def format_text(reports: list[dict]) -> str:
+    """Format validation reports as human-readable text."""
+    lines = []
+    for report in reports:
+        lines.append(f"=== {report['path']} ===")
+        if 'error' in report:
+            lines.append(f"  ERROR: {report['error']}")
+        elif not report['files']:
+            lines.append("  (no validatable files found)")
+        for entry in report['files']:
+            status = 'OK' if not entry['issues'] else f"{len(entry['issues'])} issue(s)"
+            lines.append(f"  {entry['file']:<6s} {status}")
+            for issue in entry['issues']:
+                lines.append(f"    {issue['entity']}: {issue['message']}")
+        lines.append('')
+    total = sum(r['issue_count'] for r in reports)
+    errors = sum(1 for r in reports if 'error' in r)
+    lines.append(f"Total: {total} issue(s) in {len(reports)} game(s)"
+                 + (f", {errors} error(s)" if errors else ''))
+    return '\n'.join(lines)
+
+
+def cmd_validate(args) -> None:
+    """Validate one or more game directories or disk images."""
+    cache_path = getattr(args, 'cache', None)
+    cache = load_cache(cache_path) if cache_path else _cache
+    reports = validate_paths(args.paths, getattr(args, 'jobs', 0), cache)
+    if cache_path:
+        save_cache(cache_path, cache)
+
+    if args.json:
+        total = sum(r['issue_count'] for r in reports)
+        export_json({'games': reports, 'issue_count': total}, getattr(args, 'output', None))
+    else:
+        print(format_text(reports))
+
+    if any(r['issue_count'] or 'error' in r for r in reports):
+        sys.exit(1)
+
+
+def _add_args(p) -> None:
+    p.add_argument('paths', nargs='+', metavar='DIR|IMAGE',
+                   help='Game directories or ProDOS disk images')
+    p.add_argument('--json', action='store_true', help='Output as JSON')
+    p.add_argument('--output', '-o', help='Output file (for --json)')
+    p.add_argument('--jobs', '-j', type=job_count, default=0,
+                   help='Worker processes for multiple games (default: CPU count, 1 = serial)')
+    p.add_argument('--cache', help='Persist validation results in this JSON file')
+
+
+def register_parser(subparsers) -> None:
+    """Register validate subcommand on a CLI subparser group."""
+    p = subparsers.add_parser('validate', help='Validate every data file in one or more games')
+    _add_args(p)
+
+
+def dispatch(args) -> None:
+    """Dispatch validate command."""
+    cmd_validate(args)
+
+
+def main() -> None:
+    """Standalone entry point."""
+    parser = argparse.ArgumentParser(
+        description='Ultima III: Exodus - Batch Game Validator')
+    _add_args(parser)
+    args = parser.parse_args()
+    cmd_validate(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+"""Ultima III: Exodus - Save Directory Watcher.
+
+Polls an extracted GAME directory (e.g. an emulator's save folder) for
+changes to PRTY, PLRS and ROST and turns each change into a field-level
+diff event. Polling is stat-based and dependency-free:
+
+  - the directory is re-listed only when its own mtime changes (files
+    added, removed or replaced by rename);
+  - a save file is read and hashed only when its (mtime, size) changes;
+  - a diff is computed only when the content hash changes, so touching
+    a file without modifying it emits nothing.
+
+An idle poll is therefore four stat calls.
+"""
+
+import hashlib
+import os
+from datetime import datetime, timezone
+
+from .diff import SAVE_DIFFERS, GameDiff, to_json
+
+WATCH_FILES = ('PRTY', 'PLRS', 'ROST')
+
+
+def _save_name(filename: str) -> str | None:
+    """'PRTY' for 'PRTY' or 'PRTY#060000'; None for backups and other files."""
+    if '.' in filename:
+        return None
+    base = filename.split('#')[0].upper()
+    return base if base in WATCH_FILES else None
+
+
+class SaveWatcher:
+    """Tracks the save files in one directory between polls.
+
+    The constructor takes a silent baseline; each poll() returns the
+    events since the previous poll, as JSON-ready dicts:
+
+        {'event': 'changed', 'file': 'PRTY', 'sha1': ..., 'entities': [...]}
+        {'event': 'added' | 'removed', 'file': ...}
+        {'event': 'error', 'file': ..., 'error': ...}
+
+    'changed' events carry the same file/entities/added/removed keys as
+    `ult3edit diff --json`.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.paths: dict[str, str] = {}
+        self._dir_stamp = None
+        self._stamps: dict[str, tuple[int, int]] = {}
+        self._digests: dict[str, str] = {}
+        self._data: dict[str, bytes] = {}
+        self._primed = False
+        self.poll()
+        self._primed = True
+
+    def _scan(self) -> None:
+        st = os.stat(self.directory)
+        stamp = (st.st_mtime_ns, st.st_size)
+        if stamp == self._dir_stamp:
+            return
+        self._dir_stamp = stamp
+        paths = {}
+        for entry in sorted(os.scandir(self.directory), key=lambda e: e.name):
+            name = _save_name(entry.name)
+            if name and name not in paths and entry.is_file():
+                paths[name] = entry.path
+        self.paths = paths
+
+    def _stat(self, name: str):
+        path = self.paths.get(name)
+        if path is None:
+            return None
+        try:
+            return os.stat(path)
+        except FileNotFoundError:
+            return None
+
+    def poll(self) -> list[dict]:
+        """Check every watched file once and return the resulting events."""
+        self._scan()
+        events = []
+        for name in WATCH_FILES:
+            st = self._stat(name)
+            if st is None:
+                if name in self._data:
+                    for store in (self._stamps, self._digests, self._data):
+                        store.pop(name, None)
+                    events.append({'event': 'removed', 'file': name})
+                continue
+            stamp = (st.st_mtime_ns, st.st_size)
+            if stamp == self._stamps.get(name):
+                continue
+            try:
+                with open(self.paths[name], 'rb') as f:
+                    data = f.read()
+            except OSError:
+                continue  # replaced or removed mid-poll; picked up next time
+            self._stamps[name] = stamp
+            digest = hashlib.sha1(data).hexdigest()
+            if digest == self._digests.get(name):
+                continue
+            old = self._data.get(name)
+            self._digests[name] = digest
+            self._data[name] = data
+            if old is None:
+                events.append({'event': 'added', 'file': name, 'sha1': digest})
+                continue
+            try:
+                fd = SAVE_DIFFERS[name](old, data)
+            except ValueError as e:
+                events.append({'event': 'error', 'file': name, 'sha1': digest, 'error': str(e)})
+                continue
+            gd = GameDiff()
+            gd.files.append(fd)
+            files = to_json(gd)['files']
+            detail = files[0] if files else {'file': name, 'type': name, 'entities': []}
+            events.append({'event': 'changed', 'sha1': digest, **detail})
+        if not self._primed:
+            return []
+        now = datetime.now(timezone.utc).isoformat(timespec='milliseconds')
+        for event in events:
+            event['time'] = now
+        return events
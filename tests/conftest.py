@@ -257,3 +257,24 @@ def sample_prty_bytes():
     data[8] = 2     # $E8: Slot 2
     data[9] = 3     # $E9: Slot 3
     return bytes(data)
+
+
+# ---- Whole game directory ----
+
+@pytest.fixture
+def sample_game_dir(tmp_dir, sample_roster_bytes, sample_character_bytes,
+                    sample_prty_bytes, sample_mon_bytes, sample_con_bytes):
+    """Write a minimal GAME directory (ROST, PLRS, PRTY, MONA, CONA)."""
+    plrs = bytearray(4 * CHAR_RECORD_SIZE)
+    plrs[:CHAR_RECORD_SIZE] = sample_character_bytes
+    files = {
+        'ROST#069500': sample_roster_bytes,
+        'PLRS#069500': bytes(plrs),
+        'PRTY#060000': sample_prty_bytes,
+        'MONA#069900': sample_mon_bytes,
+        'CONA#069900': sample_con_bytes,
+    }
+    for name, data in files.items():
+        with open(os.path.join(tmp_dir, name), 'wb') as f:
+            f.write(data)
+    return tmp_dir
@@ -228,3 +228,46 @@ class TestBcd16Docstring:
 # Batch 11: Remaining gap coverage
 # ============================================================================
 
+
+
+class TestBulkBcd:
+    """Whole-buffer BCD codec matches the per-byte functions."""
+
+    def test_decode_table_matches_bcd_to_int(self):
+        from ult3edit.bcd import decode_bcd_bytes
+        assert list(decode_bcd_bytes(bytes(range(256)))) == [bcd_to_int(b) for b in range(256)]
+
+    def test_decode_accepts_memoryview(self):
+        from ult3edit.bcd import decode_bcd_bytes
+        assert decode_bcd_bytes(memoryview(bytearray([0x12, 0x99]))) == bytes([12, 99])
+
+    def test_decode_bcd16_values(self):
+        from ult3edit.bcd import decode_bcd16_values
+        assert decode_bcd16_values(bytes([0x01, 0x50, 0x99, 0x99, 0x00, 0x07])) == [150, 9999, 7]
+
+    def test_encode_bcd_bytes_clamps(self):
+        from ult3edit.bcd import encode_bcd_bytes
+        assert encode_bcd_bytes([0, 25, 99, 150, -5]) == bytes([0x00, 0x25, 0x99, 0x99, 0x00])
+
+    def test_encode_bcd16_bytes(self):
+        from ult3edit.bcd import encode_bcd16_bytes
+        assert encode_bcd16_bytes([150, 12345, -1]) == bytes([0x01, 0x50, 0x99, 0x99, 0x00, 0x00])
+
+    def test_roundtrip_all_values(self):
+        from ult3edit.bcd import decode_bcd_bytes, encode_bcd_bytes
+        values = list(range(100))
+        assert list(decode_bcd_bytes(encode_bcd_bytes(values))) == values
+        assert encode_bcd_bytes(values) == bytes(int_to_bcd(v) for v in values)
+
+    def test_all_valid_bcd(self):
+        from ult3edit.bcd import all_valid_bcd
+        assert all_valid_bcd(bytes([0x00, 0x99, 0x45]))
+        assert all_valid_bcd(b'')
+        assert not all_valid_bcd(bytes([0x00, 0x9A]))
+
+    def test_find_invalid_bcd(self):
+        from ult3edit.bcd import find_invalid_bcd
+        assert find_invalid_bcd(bytes([0x12, 0x34])) == []
+        assert find_invalid_bcd(bytes([0x12, 0xA0, 0x34, 0x0F])) == [1, 3]
+        expected = [b for b in range(256) if not is_valid_bcd(b)]
+        assert find_invalid_bcd(bytes(range(256))) == expected
@@ -0,0 +1,186 @@
+"""Tests for the benchmark runner."""
+
+import argparse
+import json
+import os
+import random
+import sys
+
+import pytest
+
+from ult3edit import bench
+from ult3edit.bench import (
+    BENCHMARKS, run_benchmarks, compare, load_baseline, save_baseline,
+    format_text, cmd_bench, make_game_dir,
+)
+
+
+def _args(**kw):
+    defaults = {'names': [], 'list': False, 'repeat': 1, 'number': 1,
+                'baseline': None, 'threshold': 0.25, 'save': None,
+                'json': False, 'output': None}
+    defaults.update(kw)
+    return argparse.Namespace(**defaults)
+
+
+def _result(best):
+    return {'best': best, 'mean': best, 'number': 1}
+
+
+class TestRegistry:
+    def test_requested_benchmarks_registered(self):
+        assert set(BENCHMARKS) == {
+            'load_roster', 'load_monsters', 'render_map', 'parse_tlk_data',
+            'encode_hgr_image', 'write_png', 'read_png', 'build_prodos_image',
+            'diff_directories', '_extract_inline_strings',
+        }
+
+    def test_every_benchmark_runs(self):
+        results = run_benchmarks(repeat=1, number=1)
+        assert list(results) == list(BENCHMARKS)
+        for res in results.values():
+            assert res['best'] > 0
+            assert res['number'] == 1
+
+    def test_autorange(self):
+        results = run_benchmarks(['load_monsters'], repeat=2)
+        assert results['load_monsters']['number'] >= 1
+        assert results['load_monsters']['best'] <= results['load_monsters']['mean']
+
+    def test_unknown_name(self):
+        with pytest.raises(ValueError, match='nope'):
+            run_benchmarks(['nope'])
+
+
+class TestFixtures:
+    def test_game_dir_is_diffable(self, tmp_dir):
+        from ult3edit.diff import diff_directories
+        d1, d2 = os.path.join(tmp_dir, 'a'), os.path.join(tmp_dir, 'b')
+        make_game_dir(d1, random.Random(1))
+        make_game_dir(d2, random.Random(2))
+        gd = diff_directories(d1, d2)
+        assert gd.changed
+        assert {f.file_type for f in gd.files} >= {'ROST', 'PLRS', 'PRTY', 'MONA', 'MAPA', 'CONA', 'TLKA'}
+
+    def test_engine_binary_strings(self):
+        from ult3edit.patch import _extract_inline_strings
+        data = bench.make_engine_binary(random.Random(0), strings=10)
+        assert len(_extract_inline_strings(data)) == 10
+
+    def test_tlk_records(self):
+        from ult3edit.tlk import parse_tlk_data
+        records = parse_tlk_data(bench.make_tlk(random.Random(0), records=5))
+        assert len(records) == 5
+        assert len(records[0]) == 3
+
+
+class TestCompare:
+    def test_regression_flagged(self):
+        rows = compare({'a': _result(1.3), 'b': _result(1.1)},
+                       {'a': _result(1.0), 'b': _result(1.0)}, threshold=0.25)
+        assert [r['regression'] for r in rows] == [True, False]
+        assert rows[0]['ratio'] == pytest.approx(1.3)
+
+    def test_missing_baseline_entries_skipped(self):
+        rows = compare({'a': _result(1.0), 'b': _result(1.0)}, {'a': _result(0.0)})
+        assert rows == []
+
+
+class TestBaselineFile:
+    def test_roundtrip(self, tmp_dir):
+        path = os.path.join(tmp_dir, 'sub', 'baseline.json')
+        save_baseline(path, {'a': _result(0.5)})
+        assert load_baseline(path) == {'a': _result(0.5)}
+
+    def test_save_in_cwd(self, tmp_dir, monkeypatch):
+        monkeypatch.chdir(tmp_dir)
+        save_baseline('baseline.json', {})
+        assert load_baseline('baseline.json') == {}
+
+    def test_stale_version(self, tmp_dir):
+        path = os.path.join(tmp_dir, 'old.json')
+        with open(path, 'w') as f:
+            json.dump({'version': 0, 'results': {}}, f)
+        with pytest.raises(ValueError, match='different benchmark version'):
+            load_baseline(path)
+
+    def test_missing_results(self, tmp_dir):
+        path = os.path.join(tmp_dir, 'bad.json')
+        with open(path, 'w') as f:
+            json.dump({'version': bench.BASELINE_VERSION}, f)
+        with pytest.raises(ValueError, match='no results'):
+            load_baseline(path)
+
+    def test_shipped_baseline_loads(self):
+        path = os.path.join(os.path.dirname(__file__), '..', 'benchmarks', 'baseline.json')
+        assert set(load_baseline(path)) == set(BENCHMARKS)
+
+
+class TestFormatText:
+    def test_units(self):
+        text = format_text({'a': _result(2.0), 'b': _result(0.002), 'c': _result(2e-6)})
+        assert '2.000 s' in text
+        assert '2.000 ms' in text
+        assert '2.0 us' in text
+        assert 'Baseline' not in text
+
+    def test_comparison_columns(self):
+        results = {'a': _result(1.5), 'b': _result(1.0)}
+        rows = compare(results, {'a': _result(1.0)})
+        text = format_text(results, rows)
+        assert '+50.0%  REGRESSION' in text
+        assert text.splitlines()[2].rstrip().endswith('-')
+
+
+class TestCmdBench:
+    def test_list(self, capsys):
+        cmd_bench(_args(list=True))
+        assert capsys.readouterr().out.split() == list(BENCHMARKS)
+
+    def test_save_and_compare(self, tmp_dir, capsys):
+        path = os.path.join(tmp_dir, 'baseline.json')
+        cmd_bench(_args(names=['load_monsters'], save=path))
+        assert 'Baseline saved' in capsys.readouterr().out
+        cmd_bench(_args(names=['load_monsters'], baseline=path, threshold=1000.0))
+        assert 'load_monsters' in capsys.readouterr().out
+
+    def test_regression_exits_nonzero(self, tmp_dir, capsys):
+        path = os.path.join(tmp_dir, 'baseline.json')
+        save_baseline(path, {'load_monsters': _result(1e-12)})
+        with pytest.raises(SystemExit) as exc_info:
+            cmd_bench(_args(names=['load_monsters'], baseline=path))
+        assert exc_info.value.code == 1
+        assert 'Regression beyond 25%: load_monsters' in capsys.readouterr().err
+
+    def test_json_output(self, tmp_dir):
+        base = os.path.join(tmp_dir, 'baseline.json')
+        save_baseline(base, {'load_monsters': _result(1.0)})
+        out = os.path.join(tmp_dir, 'out.json')
+        cmd_bench(_args(names=['load_monsters'], baseline=base, json=True, output=out))
+        with open(out) as f:
+            report = json.load(f)
+        assert 'load_monsters' in report['results']
+        assert report['comparison'][0]['regression'] is False
+
+    def test_json_without_baseline(self, capsys):
+        cmd_bench(_args(names=['load_monsters'], json=True))
+        assert 'comparison' not in json.loads(capsys.readouterr().out)
+
+    def test_errors(self, tmp_dir, capsys):
+        with pytest.raises(SystemExit):
+            cmd_bench(_args(names=['nope']))
+        assert 'Unknown benchmark' in capsys.readouterr().err
+        with pytest.raises(SystemExit):
+            cmd_bench(_args(names=['load_monsters'], baseline=os.path.join(tmp_dir, 'missing.json')))
+
+    def test_main(self, monkeypatch, capsys):
+        monkeypatch.setattr(sys, 'argv', ['ult3-bench', '--list'])
+        bench.main()
+        assert 'render_map' in capsys.readouterr().out
+
+    def test_cli_dispatch(self, monkeypatch, capsys):
+        from ult3edit.cli import main
+        monkeypatch.setattr(sys, 'argv', ['ult3edit', 'bench', 'load_monsters',
+                                          '--repeat', '1', '--number', '1'])
+        main()
+        assert 'load_monsters' in capsys.readouterr().out
@@ -7,7 +7,9 @@ import os
 import pytest
 
 from ult3edit.bestiary import (
-    Monster, load_mon_file, save_mon_file, cmd_edit, cmd_import, validate_monster,
+    Bestiary, Monster, MonsterIndex, load_mon_file, load_monsters,
+    save_mon_file, cmd_adjust, cmd_edit, cmd_find, cmd_import,
+    cmd_simulate, validate_monster, scale_table, cap_table,
 )
 from ult3edit.constants import (
     MON_FILE_SIZE, MON_MONSTERS_PER_FILE,
@@ -153,6 +155,309 @@ class TestLoadSave:
         assert result[4 * 16 + 0] == 50  # Known data still correct
 
 
+class TestBestiaryBuffer:
+    def test_columns_are_zero_copy_rows(self, sample_mon_bytes):
+        b = Bestiary(sample_mon_bytes, 'A')
+        assert len(b) == 16
+        assert isinstance(b.columns['hp'], memoryview)
+        assert bytes(b.columns['hp'][:3]) == bytes([50, 200, 30])
+        b.columns['attack'][0] = 99
+        assert b.data[5 * 16 + 0] == 99
+        assert b[0].attack == 99
+
+    def test_monsters_are_strided_views(self, sample_mon_bytes):
+        b = Bestiary(sample_mon_bytes)
+        b[2].defense = 77
+        assert b.data[6 * 16 + 2] == 77
+        assert b.columns['defense'][2] == 77
+        assert not hasattr(b[2], '__dict__')
+        assert b[1].file_letter == '' and list(b)[1].name == 'Dragon'
+
+    def test_monster_copies_lists(self):
+        attrs = [0x48] * 10
+        m = Monster(attrs, 0)
+        m.hp = 5
+        assert attrs[4] == 0x48
+        assert Monster.hp.row == 4
+
+    def test_too_small(self):
+        with pytest.raises(ValueError, match='too small'):
+            Bestiary(bytes(100))
+
+    def test_load_monsters_copies_bytearray(self, sample_mon_bytes):
+        buf = bytearray(sample_mon_bytes)
+        monsters = load_monsters(buf)
+        monsters[0].hp = 1
+        assert buf == sample_mon_bytes
+        buf.extend(b'\x00')  # no views pin the caller's buffer
+
+    def test_scale_and_cap(self, sample_mon_bytes):
+        b = Bestiary(sample_mon_bytes)
+        assert b.scale('hp', 1.3) == 3
+        assert bytes(b.columns['hp'][:4]) == bytes([65, 255, 39, 0])
+        assert b.cap('speed', 12) == 2
+        assert [m.speed for m in b.monsters[:3]] == [12, 12, 10]
+        assert b.scale('hp', 0.5, maximum=100) == 3
+        assert b[1].hp == 100
+        assert bytes(b.data[10 * 16:]) == bytes(sample_mon_bytes[10 * 16:])
+
+    def test_tables(self):
+        assert scale_table(2.0)[200] == 255
+        assert scale_table(-1.0)[10] == 0
+        assert cap_table(-5)[3] == 0
+        assert len(cap_table(40)) == 256
+
+    def test_load_save(self, sample_mon_file, tmp_dir, capsys):
+        b = Bestiary.load(sample_mon_file, 'A')
+        assert b.path == sample_mon_file
+        b[0].hp = 1
+        b.save()
+        assert load_mon_file(sample_mon_file)[0].hp == 1
+        out = os.path.join(tmp_dir, 'MONA_OUT')
+        b.save(out)
+        assert 'Saved to' in capsys.readouterr().out
+        with open(out, 'rb') as f:
+            assert f.read() == b.data
+
+
+class TestCmdAdjust:
+    def _args(self, game_dir, **kw):
+        defaults = {'game_dir': game_dir, 'file': None, 'scale': None, 'cap': None,
+                    'dry_run': False, 'backup': False}
+        defaults.update(kw)
+        return argparse.Namespace(**defaults)
+
+    def test_scale_all_files(self, sample_game_dir, capsys):
+        path = os.path.join(sample_game_dir, 'MONA#069900')
+        cmd_adjust(self._args(sample_game_dir, scale=[('hp', 2.0)], cap=[('hp', 90.0)],
+                              backup=True))
+        assert 'MONA: 3 value(s) changed' in capsys.readouterr().out
+        assert [m.hp for m in load_mon_file(path)[:3]] == [90, 90, 60]
+        assert os.path.exists(path + '.bak')
+
+    def test_dry_run_and_unchanged(self, sample_game_dir, capsys):
+        path = os.path.join(sample_game_dir, 'MONA#069900')
+        with open(path, 'rb') as f:
+            before = f.read()
+        cmd_adjust(self._args(sample_game_dir, file='mona', cap=[('speed', 20.0)], dry_run=True))
+        cmd_adjust(self._args(sample_game_dir, cap=[('speed', 255.0)]))
+        out = capsys.readouterr().out
+        assert 'MONA: 1 value(s) changed' in out and 'Dry run' in out
+        assert 'MONA: 0 value(s) changed' in out
+        with open(path, 'rb') as f:
+            assert f.read() == before
+
+    @pytest.mark.parametrize('kw, message', [
+        ({}, '--scale or --cap required'),
+        ({'file': 'MONB', 'cap': [('hp', 1.0)]}, 'No MON files'),
+    ])
+    def test_errors(self, sample_game_dir, kw, message, capsys):
+        with pytest.raises(SystemExit):
+            cmd_adjust(self._args(sample_game_dir, **kw))
+        assert message in capsys.readouterr().err
+
+    def test_column_op_parsing(self):
+        from ult3edit.bestiary import _column_op
+        assert _column_op('HP=1.3') == ('hp', 1.3)
+        for bad in ('mana=2', 'hp=lots'):
+            with pytest.raises(argparse.ArgumentTypeError):
+                _column_op(bad)
+
+    def test_cli(self, sample_game_dir, monkeypatch, capsys):
+        import sys
+        from ult3edit.cli import main
+        monkeypatch.setattr(sys, 'argv', ['ult3edit', 'bestiary', 'adjust', sample_game_dir,
+                                          '--scale', 'attack=0.5', '--dry-run'])
+        main()
+        assert 'MONA: 3 value(s) changed' in capsys.readouterr().out
+
+
+class TestMonsterIndex:
+    def test_names_and_ranges(self, sample_mon_bytes):
+        index = MonsterIndex()
+        assert index.update('MONA#069900', sample_mon_bytes)
+        assert len(index) == 3
+        assert index.names['dragon'] == [('MONA', 1)]
+        assert index.find('SKEL') == [('MONA', 2)]
+        assert index.range('attack', 15, 30) == [('MONA', 2), ('MONA', 0)]
+        assert index.range('hp', 201) == []
+        assert index.record('MONA', 1) == {'file': 'MONA', 'slot': 1, 'name': 'Dragon',
+                                           'hp': 200, 'attack': 80, 'defense': 50, 'speed': 25}
+
+    def test_update_is_incremental(self, sample_mon_bytes):
+        index = MonsterIndex()
+        index.update('MONA', sample_mon_bytes)
+        index.update('MONB', sample_mon_bytes)
+        assert not index.update('MONA', sample_mon_bytes)
+        bestiary = Bestiary(sample_mon_bytes)
+        bestiary[1].attack = 45
+        assert index.update('MONA', bytes(bestiary.data))
+        assert index.range('attack', 40, 60) == [('MONA', 1)]
+        assert index.names['dragon'] == [('MONB', 1), ('MONA', 1)]
+        assert index.update('MONA', b'')
+        assert 'MONA' not in index.files and index.find('dragon') == [('MONB', 1)]
+        index.remove('MONB#069900')
+        assert len(index) == 0 and index.names == {}
+        assert not index.update('MONC', b'')
+
+    def test_refresh_and_cache(self, sample_game_dir, tmp_dir):
+        cache = os.path.join(tmp_dir, 'mon.idx')
+        index = MonsterIndex()
+        assert index.refresh(sample_game_dir) == ['MONA']
+        assert index.refresh(sample_game_dir) == []
+        index.save(cache)
+        loaded = MonsterIndex.load(cache)
+        assert loaded.find() == index.find() and loaded.stats == index.stats
+        os.remove(os.path.join(sample_game_dir, 'MONA#069900'))
+        assert loaded.refresh(sample_game_dir) == ['MONA'] and len(loaded) == 0
+
+    @pytest.mark.parametrize('content', [
+        '{bad json',
+        '{"version": 0, "files": {}}',
+        '{"version": 1, "files": {"MONA": {"sha1": "x"}}}',
+        '{"version": 1, "files": {"MONA": null}}',
+        '{"version": 1, "files": {"MONA": {"sha1": "x", "names": ["Orc"], "hp": [1],'
+        ' "attack": [1], "defense": [1], "speed": ["fast"]}}}',
+        '{"version": 1, "files": {"MONA": {"sha1": "x", "names": ["Orc"], "hp": [],'
+        ' "attack": [1], "defense": [1], "speed": [1]}}}',
+    ])
+    def test_stale_cache_is_empty(self, tmp_dir, content):
+        path = os.path.join(tmp_dir, 'mon.idx')
+        with open(path, 'w') as f:
+            f.write(content)
+        assert MonsterIndex.load(path).files == {}
+        assert MonsterIndex.load(os.path.join(tmp_dir, 'missing')).files == {}
+
+    def test_bad_entry_skipped(self, sample_game_dir, tmp_dir):
+        cache = os.path.join(tmp_dir, 'mon.idx')
+        index = MonsterIndex()
+        index.refresh(sample_game_dir)
+        index.save(cache)
+        with open(cache) as f:
+            data = json.load(f)
+        data['files']['MONB'] = {'sha1': 'x'}
+        with open(cache, 'w') as f:
+            json.dump(data, f)
+        loaded = MonsterIndex.load(cache)
+        assert list(loaded.files) == ['MONA'] and loaded.find() == index.find()
+
+
+class TestCmdFind:
+    def _args(self, game_dir, **kw):
+        defaults = {'game_dir': game_dir, 'name': None, 'hp': None, 'attack': None,
+                    'defense': None, 'speed': None, 'cache': None,
+                    'json': False, 'output': None}
+        defaults.update(kw)
+        return argparse.Namespace(**defaults)
+
+    def test_stat_range(self, sample_game_dir, capsys):
+        cmd_find(self._args(sample_game_dir, attack=(15, 30), speed=(12, 255)))
+        out = capsys.readouterr().out
+        assert 'MONA [ 0] Fighter' in out and '1 monster(s) matched' in out
+
+    def test_name_json_with_cache(self, sample_game_dir, tmp_dir):
+        cache = os.path.join(tmp_dir, 'mon.idx')
+        out = os.path.join(tmp_dir, 'found.json')
+        cmd_find(self._args(sample_game_dir, name='dragon', cache=cache, json=True, output=out))
+        with open(out) as f:
+            assert [r['slot'] for r in json.load(f)] == [1]
+        assert 'MONA' in MonsterIndex.load(cache).files
+
+    def test_no_mon_files(self, tmp_dir, capsys):
+        with pytest.raises(SystemExit):
+            cmd_find(self._args(tmp_dir))
+        assert 'No MON files' in capsys.readouterr().err
+
+    def test_stat_range_parsing(self):
+        from ult3edit.bestiary import _stat_range
+        assert _stat_range('40:60') == (40, 60)
+        assert _stat_range('100:') == (100, 255)
+        assert _stat_range(':9') == (0, 9)
+        assert _stat_range('7') == (7, 7)
+        for bad in ('a:b', '60:40', '0:300'):
+            with pytest.raises(argparse.ArgumentTypeError):
+                _stat_range(bad)
+
+    def test_cli(self, sample_game_dir, monkeypatch, capsys):
+        import sys
+        from ult3edit.cli import main
+        monkeypatch.setattr(sys, 'argv', ['ult3edit', 'bestiary', 'find', sample_game_dir,
+                                          '--hp', '100:'])
+        main()
+        assert 'Dragon' in capsys.readouterr().out
+
+
+class TestCmdSimulate:
+    def _args(self, game_dir, **kw):
+        defaults = {'game_dir': game_dir, 'roster': None, 'slots': None, 'file': None,
+                    'trials': 200, 'group': 2, 'seed': 0, 'jobs': 1,
+                    'json': False, 'output': None}
+        defaults.update(kw)
+        return argparse.Namespace(**defaults)
+
+    def test_text_report(self, sample_game_dir, capsys):
+        cmd_simulate(self._args(sample_game_dir))
+        out = capsys.readouterr().out
+        assert 'Party: HERO (Fighter, HP 150)' in out
+        assert 'MONA  Grassland/Plains' in out and '200 fight(s) per file' in out
+
+    def test_json_report(self, sample_game_dir, tmp_dir):
+        out = os.path.join(tmp_dir, 'sim.json')
+        cmd_simulate(self._args(sample_game_dir, file='mona', json=True, output=out,
+                                roster=os.path.join(sample_game_dir, 'PLRS#069500')))
+        with open(out) as f:
+            result = json.load(f)
+        assert result['party'] == ['HERO'] and result['group'] == 2
+        assert result['files']['MONA']['trials'] == 200
+
+    @pytest.mark.parametrize('kw, message', [
+        ({'slots': [5]}, 'no living characters'),
+        ({'file': 'MONB'}, 'No MON files'),
+        ({'roster': 'missing.rost'}, 'Error:'),
+    ])
+    def test_errors(self, sample_game_dir, kw, message, capsys):
+        with pytest.raises(SystemExit):
+            cmd_simulate(self._args(sample_game_dir, **kw))
+        assert message in capsys.readouterr().err
+
+    def test_no_roster(self, tmp_dir, sample_mon_file, capsys):
+        with pytest.raises(SystemExit):
+            cmd_simulate(self._args(tmp_dir))
+        assert 'No ROST file' in capsys.readouterr().err
+
+    def test_slot_list(self):
+        from ult3edit.bestiary import _slot_list
+        assert _slot_list('0, 2,') == [0, 2]
+        with pytest.raises(argparse.ArgumentTypeError):
+            _slot_list('a,b')
+
+    def test_count_types(self):
+        from ult3edit.bestiary import _positive_int
+        assert _positive_int('3') == 3
+        for text in ('0', '-2', 'x'):
+            with pytest.raises(argparse.ArgumentTypeError):
+                _positive_int(text)
+
+    @pytest.mark.parametrize('flag, value', [('--group', '0'), ('--trials', '0'), ('-j', '-1')])
+    def test_cli_rejects_bad_counts(self, sample_game_dir, monkeypatch, capsys, flag, value):
+        import sys
+        from ult3edit.cli import main
+        monkeypatch.setattr(sys, 'argv', ['ult3edit', 'bestiary', 'simulate', sample_game_dir,
+                                          flag, value])
+        with pytest.raises(SystemExit) as exc_info:
+            main()
+        assert exc_info.value.code == 2
+        assert 'expected' in capsys.readouterr().err
+
+    def test_cli(self, sample_game_dir, monkeypatch, capsys):
+        import sys
+        from ult3edit.cli import main
+        monkeypatch.setattr(sys, 'argv', ['ult3edit', 'bestiary', 'simulate', sample_game_dir,
+                                          '--trials', '50', '--slots', '0', '-j', '1'])
+        main()
+        assert '50 fight(s) per file vs groups of 4' in capsys.readouterr().out
+
+
 class TestCmdEdit:
     def test_edit_hp(self, sample_mon_file, tmp_dir):
         out = os.path.join(tmp_dir, 'MONA_OUT')
@@ -391,6 +696,20 @@ class TestCmdImport:
         monsters = load_mon_file(out)
         assert monsters[0].hp == 77
 
+    def test_import_single_file_view_export(self, sample_mon_file, tmp_dir):
+        """`bestiary view --file MONA --json` output imports directly."""
+        json_path = os.path.join(tmp_dir, 'monsters.json')
+        with open(json_path, 'w') as f:
+            json.dump({'MONA': {'terrain': 'Grassland',
+                                'monsters': [{'index': 0, 'hp': 55}]}}, f)
+        out = os.path.join(tmp_dir, 'MONA_OUT')
+        args = argparse.Namespace(
+            file=sample_mon_file, json_file=json_path,
+            output=out, backup=False,
+        )
+        cmd_import(args)
+        assert load_mon_file(out)[0].hp == 55
+
 
 class TestDryRun:
     def test_dry_run_no_write(self, sample_mon_file, tmp_dir, capsys):
@@ -1158,6 +1477,15 @@ class TestBestiaryEditorTUI:
         tab = make_bestiary_tab(sample_mon_bytes, 'A', lambda d: None)
         assert tab.records[1].attack == 80
 
+    def test_short_file_padded(self, sample_mon_bytes):
+        """A truncated MON file opens zero-padded to full size."""
+        from ult3edit.tui.bestiary_editor import make_bestiary_tab
+        tab = make_bestiary_tab(sample_mon_bytes[:100], 'A', lambda d: None)
+        assert len(tab.records) == MON_MONSTERS_PER_FILE
+        assert tab.records[0].tile1 == sample_mon_bytes[0]
+        assert tab.records[0].ability2 == 0
+        assert tab.get_save_data() == sample_mon_bytes[:100] + bytes(156)
+
     def test_save_roundtrip_unmodified(self, sample_mon_bytes):
         """get_save_data() on unmodified tab returns original bytes."""
         from ult3edit.tui.bestiary_editor import make_bestiary_tab
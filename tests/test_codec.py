@@ -0,0 +1,211 @@
+"""Tests for the table-driven high-ASCII codec."""
+
+import random
+
+from ult3edit import codec
+from ult3edit.fileutil import decode_high_ascii, encode_high_ascii
+from ult3edit.patch import _extract_inline_strings, parse_text_region, encode_text_region
+from ult3edit.shapes import extract_overlay_strings
+from ult3edit.tlk import decode_record, encode_record, is_text_record, parse_tlk_data
+
+
+# Reference implementations: the original per-byte loops, kept here so the
+# table-driven codec can be checked for byte-identical output.
+
+def _ref_decode_high_ascii(data):
+    chars = []
+    for b in data:
+        if b == 0x00:
+            break
+        ch = b & 0x7F
+        if 0x20 <= ch < 0x7F:
+            chars.append(chr(ch))
+    return ''.join(chars).rstrip()
+
+
+def _ref_decode_record(data):
+    lines, cur = [], []
+    for b in data:
+        if b == 0xFF:
+            lines.append(''.join(cur))
+            cur = []
+            continue
+        if b == 0x00:
+            break
+        ch = b & 0x7F
+        if 0x20 <= ch < 0x7F:
+            cur.append(chr(ch))
+    if cur or not lines:
+        lines.append(''.join(cur))
+    return lines
+
+
+def _ref_inline_strings(data):
+    strings = []
+    i = 0
+    while i <= len(data) - 3:
+        if data[i:i + 3] == b'\x20\xBA\x46':
+            chars = []
+            j = i + 3
+            while j < len(data) and data[j] != 0x00:
+                b = data[j]
+                if b == 0xFF:
+                    chars.append('\n')
+                elif 0x20 <= (b & 0x7F) < 0x7F:
+                    chars.append(chr(b & 0x7F))
+                j += 1
+            if chars:
+                strings.append((i, i + 3, j, ''.join(chars)))
+            i = j + 1
+        else:
+            i += 1
+    return strings
+
+
+def _ref_is_text_record(data):
+    content = high = 0
+    for b in data:
+        if b in (0xFF, 0x00):
+            continue
+        content += 1
+        if 0xA0 <= b <= 0xFE:
+            high += 1
+    return content > 0 and high / content > 0.7
+
+
+def _random_blobs(count=200, seed=1983):
+    rng = random.Random(seed)
+    blobs = [b'', b'\x00', b'\xff', b'\xff\xff\x00', bytes(range(256))]
+    for _ in range(count):
+        # Bias toward high-ASCII text with sprinkled breaks, nulls and markers
+        out = bytearray()
+        for _ in range(rng.randint(0, 80)):
+            r = rng.random()
+            if r < 0.05:
+                out += b'\x20\xBA\x46'
+            elif r < 0.12:
+                out.append(0x00)
+            elif r < 0.2:
+                out.append(0xFF)
+            elif r < 0.3:
+                out.append(rng.randint(0, 255))
+            else:
+                out.append(rng.randint(0xA0, 0xDF))
+        blobs.append(bytes(out))
+    return blobs
+
+
+class TestDecode:
+    def test_strips_high_bit(self):
+        assert codec.decode(bytes([0xC8, 0xC9])) == 'HI'
+
+    def test_stops_at_terminator(self):
+        assert codec.decode(bytes([0xC1, 0x00, 0xC2])) == 'A'
+
+    def test_drops_line_break_by_default(self):
+        assert codec.decode(bytes([0xC1, 0xFF, 0xC2])) == 'AB'
+
+    def test_line_breaks(self):
+        assert codec.decode(bytes([0xC1, 0xFF, 0xC2]), line_breaks=True) == 'A\nB'
+
+    def test_drops_control_bytes(self):
+        assert codec.decode(bytes([0x8A, 0x8D, 0xC1, 0x0A])) == 'A'
+        assert codec.decode(bytes([0x8A, 0xC1]), line_breaks=True) == 'A'
+
+    def test_accepts_bytearray(self):
+        assert codec.decode(bytearray([0xC1, 0xC2])) == 'AB'
+
+    def test_matches_reference(self):
+        for blob in _random_blobs():
+            assert decode_high_ascii(blob) == _ref_decode_high_ascii(blob)
+
+
+class TestDecodeLines:
+    def test_empty_record(self):
+        assert codec.decode_lines(b'\x00') == ['']
+
+    def test_trailing_break_dropped(self):
+        assert codec.decode_lines(bytes([0xC1, 0xFF, 0x00])) == ['A']
+
+    def test_blank_lines_kept(self):
+        assert codec.decode_lines(bytes([0xFF, 0xFF, 0xC1])) == ['', '', 'A']
+
+    def test_matches_reference(self):
+        for blob in _random_blobs():
+            assert decode_record(blob) == _ref_decode_record(blob)
+
+
+class TestEncode:
+    def test_uppercases(self):
+        assert codec.encode('hi') == bytes([0xC8, 0xC9])
+
+    def test_preserve_case(self):
+        assert codec.encode('hi', upper=False) == bytes([0xE8, 0xE9])
+
+    def test_newline_default(self):
+        assert codec.encode('A\nB') == bytes([0xC1, 0x8A, 0xC2])
+
+    def test_newline_as_line_break(self):
+        assert codec.encode('A\nB', line_breaks=True) == bytes([0xC1, 0xFF, 0xC2])
+
+    def test_matches_reference_loop(self):
+        text = ''.join(chr(c) for c in range(0x20, 0x7F))
+        expected = bytes(ord(ch.upper()) | 0x80 for ch in text)
+        assert codec.encode(text) == expected
+        expected = bytes((ord(ch) & 0x7F) | 0x80 for ch in text)
+        assert codec.encode(text, upper=False) == expected
+
+    def test_non_latin1_is_masked(self):
+        # Never raises: U+2014 & 0x7F = 0x14, as the original per-char loops did
+        assert codec.encode('A\u2014B') == bytes([0xC1, 0x94, 0xC2])
+        assert encode_record(['HELLO \u2014 WORLD\u2019S'])[6] == 0x94
+        assert encode_text_region(['\u201cHI\u201d'], 8)[:4] == bytes([0x9C, 0xC8, 0xC9, 0x9D])
+
+    def test_fileutil_padding(self):
+        assert encode_high_ascii('ab', 4) == bytearray([0xC1, 0xC2, 0xA0, 0xA0])
+
+    def test_tlk_record(self):
+        assert encode_record(['Hi', 'yo']) == bytes([0xC8, 0xC9, 0xFF, 0xD9, 0xCF, 0x00])
+
+    def test_text_region_roundtrip(self):
+        encoded = encode_text_region(['one', '', 'two'], 16)
+        assert parse_text_region(encoded, 0, 16) == ['one', '', 'two']
+
+
+class TestScanInlineStrings:
+    def test_basic(self):
+        data = b'\xEA\x20\xBA\x46' + bytes([0xC8, 0xC9, 0x00]) + b'\x60'
+        assert codec.scan_inline_strings(data) == [(1, 4, 6, 'HI')]
+
+    def test_runs_off_end(self):
+        data = b'\x20\xBA\x46' + bytes([0xC1, 0xC2])
+        assert codec.scan_inline_strings(data) == [(0, 3, 5, 'AB')]
+
+    def test_custom_marker(self):
+        assert codec.scan_inline_strings(b'\x01\xC1\x00', marker=b'\x01') == [(0, 1, 2, 'A')]
+
+    def test_matches_reference(self):
+        for blob in _random_blobs():
+            expected = _ref_inline_strings(blob)
+            assert codec.scan_inline_strings(blob) == expected
+            patched = [(s['address'], s['text_offset'], s['text_end'], s['text'])
+                       for s in _extract_inline_strings(blob)]
+            assert patched == expected
+            overlay = [(s['jsr_offset'], s['text_offset'], s['text_end'], s['text'])
+                       for s in extract_overlay_strings(blob)]
+            assert overlay == expected
+
+
+class TestTextRecordHeuristic:
+    def test_count_high_printable(self):
+        assert codec.count_high_printable(bytes([0x9F, 0xA0, 0xFE, 0xFF, 0x00])) == 2
+
+    def test_matches_reference(self):
+        for blob in _random_blobs():
+            assert is_text_record(blob) == _ref_is_text_record(blob)
+
+    def test_parse_tlk_data_bulk(self):
+        data = b''.join(encode_record([f'LINE {i}', 'MORE']) for i in range(50))
+        records = parse_tlk_data(data)
+        assert len(records) == 50
+        assert records[7] == ['LINE 7', 'MORE']
@@ -5,6 +5,7 @@ from ult3edit.constants import (
     MARKS_BITS, CARDS_BITS, MONSTER_NAMES, WEAPON_DAMAGE, WEAPON_PRICE, ARMOR_EVASION, CLASS_MAX_WEAPON, CLASS_MAX_ARMOR,
     WIZARD_SPELLS, CLERIC_SPELLS, MON_GROUP_NAMES,
     tile_char, tile_name, TILE_CHARS_REVERSE, DUNGEON_TILE_CHARS_REVERSE,
+    TILE_CHAR_TABLE, DUNGEON_CHAR_TABLE, TILE_NAME_TABLE, DUNGEON_NAME_TABLE, tile_chars,
 )
 
 
@@ -67,6 +68,20 @@ class TestTileName:
         assert 'Unknown' in name
 
 
+class TestTileTables:
+    def test_tables_match_lookups(self):
+        for b in range(256):
+            assert chr(TILE_CHAR_TABLE[b]) == tile_char(b)
+            assert chr(DUNGEON_CHAR_TABLE[b]) == tile_char(b, is_dungeon=True)
+            assert TILE_NAME_TABLE[b] == tile_name(b)
+            assert DUNGEON_NAME_TABLE[b] == tile_name(b, is_dungeon=True)
+
+    def test_tile_chars(self):
+        assert tile_chars(bytes([0x00, 0x05, 0x1A, 0xE3])) == '~.#?'
+        assert tile_chars(bytearray([0x01, 0x12]), is_dungeon=True) == '#D'
+        assert tile_chars(b'') == ''
+
+
 class TestEquipment:
     def test_weapons_count(self):
         assert len(WEAPONS) == 16
@@ -1,12 +1,15 @@
 """Tests for file utilities."""
 
+import argparse
+import json
 import os
 
 import pytest
 
 from ult3edit.fileutil import (
     resolve_game_file, find_game_files, decode_high_ascii, encode_high_ascii, backup_file,
-    resolve_single_file, hex_int,
+    resolve_single_file, hex_int, check_jobs, job_count, pool_imap, pool_map,
+    load_json_cache, save_json_cache,
 )
 
 
@@ -253,3 +256,47 @@ class TestFileUtilEdgeCases:
         encoded = encode_high_ascii(text, len(text))
         decoded = decode_high_ascii(encoded)
         assert decoded == text
+
+
+class TestPool:
+    @pytest.mark.parametrize('jobs', [0, 1, 2])
+    def test_results_in_task_order(self, jobs):
+        tasks = list(range(50))
+        assert pool_map(divmod, tasks, jobs, (7,)) == [divmod(t, 7) for t in tasks]
+
+    def test_imap_streams(self):
+        results = pool_imap(abs, [-1, -2, -3], 2)
+        assert next(results) == 1
+        assert list(results) == [2, 3]
+
+    def test_single_task_and_empty(self):
+        assert pool_map(abs, [-4], 4) == [4]
+        assert pool_map(abs, [], 4) == []
+
+    def test_negative_jobs_rejected_up_front(self):
+        with pytest.raises(ValueError, match='jobs must be 0'):
+            pool_imap(abs, [1, 2], -1)
+        assert check_jobs(0) == 0
+
+    def test_job_count(self):
+        assert job_count('3') == 3
+        for text in ('-1', 'x'):
+            with pytest.raises(argparse.ArgumentTypeError):
+                job_count(text)
+
+
+class TestJsonCache:
+    def test_roundtrip(self, tmp_dir):
+        path = os.path.join(tmp_dir, 'cache.json')
+        save_json_cache(path, 3, 'entries', {'a': [1, 2]}, indent=1)
+        assert load_json_cache(path, 3, 'entries') == {'a': [1, 2]}
+        assert load_json_cache(path, 4, 'entries') == {}
+        assert load_json_cache(path, 3, 'files') == {}
+
+    @pytest.mark.parametrize('content', ['{bad', '[1, 2]', json.dumps({'version': 1, 'entries': [1]})])
+    def test_bad_files_are_empty(self, tmp_dir, content):
+        path = os.path.join(tmp_dir, 'cache.json')
+        with open(path, 'w') as f:
+            f.write(content)
+        assert load_json_cache(path, 1, 'entries') == {}
+        assert load_json_cache(os.path.join(tmp_dir, 'missing'), 1, 'entries') == {}
@@ -53,6 +53,9 @@ def _make_session(tmp_dir, files=None):
     session = GameSession.__new__(GameSession)
     session.image_path = 'fake.po'
     session.catalog = {}
+    session.warnings = {}
+    session.held = {}
+    session._monster_index = None
 
     for fname, size in files.items():
         path = os.path.join(tmp_dir, fname)
@@ -304,3 +307,55 @@ class TestGameSessionNoCtx:
         from ult3edit.tui.game_session import GameSession
         session = GameSession('fake.po')
         session.write('MAPA', b'0') # Should not raise
+
+
+class TestGameSessionValidation:
+    def test_invalid_save_is_held_until_confirmed(self, mock_session):
+        """Validation runs before the write; a repeat save confirms."""
+        from ult3edit.tui.game_session import SaveBlocked
+        prty = bytearray(16)
+        prty[0] = 0x77  # unknown transport
+        cb = mock_session.make_save_callback('PRTY')
+        with pytest.raises(SaveBlocked, match='save again to write anyway'):
+            cb(bytes(prty))
+        assert mock_session.read('PRTY') == bytes(16)
+        assert any('transport' in w['message'] for w in mock_session.warnings['PRTY'])
+        cb(bytes(prty))
+        assert mock_session.read('PRTY') == bytes(prty)
+        assert mock_session.held == {}
+
+    def test_changed_content_is_checked_again(self, mock_session):
+        from ult3edit.tui.game_session import SaveBlocked
+        cb = mock_session.make_save_callback('PRTY')
+        with pytest.raises(SaveBlocked):
+            cb(b'\x77' + bytes(15))
+        with pytest.raises(SaveBlocked):
+            cb(b'\x78' + bytes(15))
+
+    def test_clean_save_writes(self, mock_session):
+        mock_session.make_save_callback('PRTY')(bytes(16))
+        assert mock_session.warnings == {'PRTY': []}
+
+    def test_save_callback_ignores_other_files(self, mock_session):
+        mock_session.make_save_callback('MAPA')(b'\x00')
+        assert mock_session.warnings == {}
+
+
+class TestGameSessionMonsterIndex:
+    def test_index_built_once_and_updated_on_save(self, tmp_dir, sample_mon_bytes, monkeypatch):
+        session = _make_session(tmp_dir, {'MONA#069900': 256, 'MONB#069900': 256})
+        session.ctx._modified['MONA'] = sample_mon_bytes
+        index = session.monster_index()
+        assert index.find('dragon') == [('MONA', 1)]
+        monkeypatch.setattr(session.ctx, 'read', lambda name: pytest.fail('re-read'))
+        assert session.monster_index() is index
+        session.make_save_callback('MONB')(sample_mon_bytes)
+        assert index.find('dragon') == [('MONA', 1), ('MONB', 1)]
+        session.write('MONA', b'')
+        assert index.find('dragon') == [('MONB', 1)]
+        session.write('MAPA', b'\x00')
+
+    def test_write_before_index_is_built(self, mock_session):
+        mock_session.write('MONA', bytes(256))
+        assert mock_session._monster_index is None
+        assert len(mock_session.monster_index()) == 0
@@ -0,0 +1,117 @@
+"""Tests for the save-state history store."""
+
+import json
+import os
+
+import pytest
+
+from ult3edit.bcd import int_to_bcd16
+from ult3edit.constants import CHAR_GOLD_HI
+from ult3edit.history import (
+    KEYFRAME_INTERVAL, HistoryStore, apply_delta, decode_snapshot, diff_snapshot_data,
+    encode_delta, history_name,
+)
+
+
+def _roster_with_gold(roster_bytes, gold):
+    data = bytearray(roster_bytes)
+    data[CHAR_GOLD_HI:CHAR_GOLD_HI + 2] = bytes(int_to_bcd16(gold))
+    return bytes(data)
+
+
+class TestDelta:
+    @pytest.mark.parametrize('base, data', [
+        (bytes(16), bytes(16)),
+        (bytes(range(16)), bytes(range(1, 17))),
+        (bytes(64), b'\x01' + bytes(30) + b'\x02\x00\x03' + bytes(30)),
+        (b'', b''),
+    ])
+    def test_round_trip(self, base, data):
+        assert apply_delta(base, encode_delta(base, data)) == data
+
+    def test_runs_are_compact(self):
+        base = bytes(1280)
+        data = bytearray(base)
+        data[100] = 7
+        data[102] = 9
+        data[900] = 1
+        # Gap of one zero byte merges into one run; distant bytes get their own
+        assert encode_delta(base, bytes(data)) == (
+            b'\x64\x00\x03\x00\x07\x00\x09' + b'\x84\x03\x01\x00\x01')
+
+    def test_history_name(self):
+        assert history_name('/g/PRTY#060000') == 'PRTY'
+        assert history_name('rost') == 'ROST'
+        assert history_name('MONA') is None
+
+
+class TestHistoryStore:
+    def test_keyframe_then_deltas(self, tmp_dir, sample_roster_bytes):
+        store = HistoryStore(os.path.join(tmp_dir, 'h'))
+        first = store.add('ROST', sample_roster_bytes, tag='start')
+        second = store.add('ROST', _roster_with_gold(sample_roster_bytes, 250))
+        again = store.add('ROST', sample_roster_bytes)
+        assert again['sha1'] == first['sha1']
+        assert store.stats() == {'snapshots': 3, 'objects': 2, 'keyframes': 1, 'deltas': 1,
+                                 'pack_bytes': len(sample_roster_bytes) + 6}
+        assert store.objects[second['sha1']][2] == first['sha1']
+        assert store.read(second) == _roster_with_gold(sample_roster_bytes, 250)
+
+    def test_new_keyframe_conditions(self, tmp_dir, monkeypatch):
+        store = HistoryStore(tmp_dir)
+        store.put('PRTY', bytes(16))
+        # Delta larger than half the file
+        assert store.objects[store.put('PRTY', bytes(range(1, 17)))][2] is None
+        # Size change
+        assert store.objects[store.put('PRTY', bytes(32))][2] is None
+        monkeypatch.setattr('ult3edit.history.KEYFRAME_INTERVAL', 1)
+        assert store.objects[store.put('PRTY', b'\x01' + bytes(31))][2] is not None
+        assert store.objects[store.put('PRTY', b'\x02' + bytes(31))][2] is None
+        assert KEYFRAME_INTERVAL > 1
+
+    def test_persist_and_resolve(self, tmp_dir, sample_prty_bytes, sample_roster_bytes):
+        root = os.path.join(tmp_dir, 'h')
+        store = HistoryStore(root)
+        store.add('PRTY', sample_prty_bytes, 'alpha', time='2026-10-02T09:00:00+00:00')
+        store.add('ROST', sample_roster_bytes, 'alpha', time='2026-10-03T09:00:00+00:00')
+        late = store.add('PRTY', bytes(16), time='2026-10-05T09:00:00+00:00')
+        store.add('PRTY', sample_prty_bytes, time='2026-10-01T09:00:00+00:00')
+        store.save()
+
+        store = HistoryStore(root)
+        assert [s['id'] for s in store.log()] == [3, 0, 1, 2]
+        assert [s['id'] for s in store.log('PRTY', since='2026-10-02')] == [0, 2]
+        assert [s['id'] for s in store.log(until='2026-10-03')] == [3, 0, 1]
+        assert [s['id'] for s in store.log(tag='alpha')] == [0, 1]
+        assert store.resolve('2') == late
+        assert store.resolve('alpha')['file'] == 'ROST'
+        assert store.resolve('alpha', 'PRTY')['id'] == 0
+        assert store.resolve(late['sha1'][:6])['id'] == 2
+        assert store.previous(store.snapshot(2))['id'] == 0
+        assert store.previous(store.snapshot(3)) is None
+        for ref in ('99', 'beta', 'abc', 'ffffffff', 'id:alpha', 'tag:2', 'sha1:ab'):
+            with pytest.raises(KeyError):
+                store.resolve(ref)
+
+    def test_prefixed_refs(self, tmp_dir, sample_prty_bytes):
+        store = HistoryStore(tmp_dir)
+        tagged = store.add('PRTY', sample_prty_bytes, '1')
+        second = store.add('PRTY', bytes(16), 'a:b')
+        assert store.resolve('1') == second  # a bare digit ref is an id first
+        assert store.resolve('tag:1') == tagged
+        assert store.resolve('id:1') == second
+        assert store.resolve('sha1:' + second['sha1'][:4]) == second
+        assert store.resolve('tag:a:b') == store.resolve('a:b') == second
+
+    def test_version_mismatch(self, tmp_dir):
+        with open(os.path.join(tmp_dir, 'index.json'), 'w') as f:
+            json.dump({'version': 0}, f)
+        with pytest.raises(ValueError, match='Unsupported'):
+            HistoryStore(tmp_dir)
+
+    def test_decode_and_diff(self, sample_prty_bytes, sample_roster_bytes):
+        assert decode_snapshot('PRTY', sample_prty_bytes)['party_size'] == 4
+        assert decode_snapshot('ROST', sample_roster_bytes)[0]['name'] == 'HERO'
+        fd = diff_snapshot_data('ROST', sample_roster_bytes,
+                                _roster_with_gold(sample_roster_bytes, 250))
+        assert [(f.path, f.old, f.new) for f in fd.entities[0].fields] == [('gold', 100, 250)]
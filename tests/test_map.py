@@ -59,6 +59,14 @@ class TestRenderMap:
         # Header + 10 rows
         assert len(lines) == 11
 
+    def test_crop_matches_per_cell_lookup(self, sample_overworld_bytes):
+        result = render_map(sample_overworld_bytes, 64, 64, crop=(3, 8, 40, 12))
+        rows = result.split('\n')[1:]
+        assert len(rows) == 4
+        for y, row in zip(range(8, 12), rows):
+            expected = ''.join(tile_char(sample_overworld_bytes[y * 64 + x]) for x in range(3, 40))
+            assert row == f'  {y:3d} {expected}'
+
     def test_dungeon(self, sample_dungeon_bytes):
         result = render_map(sample_dungeon_bytes[:256], 16, 16, is_dungeon=True)
         assert '#' in result  # Wall
@@ -1788,6 +1796,52 @@ class TestMapOverviewPreview:
         assert 'Sosaria' in out or 'scaled' in out.lower()
 
 
+class TestMapOverviewPyramid:
+    """map overview --preview draws a cached majority-reduced level."""
+
+    def _mapa(self, tmp_path):
+        data = bytearray(b'\x04' * 4096)
+        data[0:4] = b'\x10' * 4
+        data[64:64 * 2] = b'\x10' * 64
+        data[128:128 + 3] = b'\x10' * 3
+        with open(os.path.join(str(tmp_path), 'MAPA'), 'wb') as f:
+            f.write(data)
+
+    def test_zoom_levels(self, tmp_path, capsys):
+        from ult3edit.map import cmd_overview
+        self._mapa(tmp_path)
+        for zoom, rows in ((2, 32), (4, 16), (8, 8)):
+            cmd_overview(argparse.Namespace(game_dir=str(tmp_path), preview=True, zoom=zoom,
+                                            cache=None, json=False, output=None))
+            out = capsys.readouterr().out
+            assert f'(scaled {zoom}:1)' in out
+            preview = out.split('---\n\n')[1].rstrip('\n').split('\n')
+            assert len(preview) == rows and len(preview[0].strip()) == 2 * (64 // zoom)
+        # The corner 8x8 block holds only 15 mountain cells, so it reduces to grass
+        assert preview[0].strip().startswith('..')
+
+    def test_persistent_cache(self, tmp_path, capsys):
+        from ult3edit.map import cmd_overview
+        self._mapa(tmp_path)
+        cache = str(tmp_path / 'mips.json')
+        args = argparse.Namespace(game_dir=str(tmp_path), preview=True, zoom=4,
+                                  cache=cache, json=False, output=None)
+        cmd_overview(args)
+        first = capsys.readouterr().out
+        with open(cache) as f:
+            assert len(json.load(f)['entries']) == 1
+        cmd_overview(args)
+        assert capsys.readouterr().out == first
+
+    def test_cli_zoom(self, tmp_path, monkeypatch, capsys):
+        from ult3edit.cli import main
+        self._mapa(tmp_path)
+        monkeypatch.setattr('sys.argv', ['ult3edit', 'map', 'overview', str(tmp_path),
+                                         '--preview', '--zoom', '8'])
+        main()
+        assert '(scaled 8:1)' in capsys.readouterr().out
+
+
 class TestMapCompileLevelCommentMidLevel:
     """Test that a '# Level' comment mid-level splits the level prematurely.
 
@@ -2227,3 +2281,452 @@ class TestMapCompileRowTruncation:
         with open(out, 'rb') as f:
             data = f.read()
         assert len(data) == MAP_OVERWORLD_SIZE
+
+
+class TestMapRasterCommands:
+    """map remap / map stamp."""
+
+    def _remap_args(self, path, pairs, **kw):
+        defaults = dict(file=path, pairs=pairs, region=None, level=None,
+                        dry_run=False, backup=False, output=None)
+        defaults.update(kw)
+        return argparse.Namespace(**defaults)
+
+    def test_remap_pairs_and_region(self, tmp_path, capsys):
+        from ult3edit.map import cmd_remap
+        path = str(tmp_path / 'MAPA')
+        data = bytearray(b'\x04' * MAP_OVERWORLD_SIZE)
+        data[0] = 0x00
+        with open(path, 'wb') as f:
+            f.write(data)
+        cmd_remap(self._remap_args(path, [(0x04, 0x0C), (0x00, 0x04)], region=(0, 0, 1, 1)))
+        assert 'Remapped 4 tiles in (0,0)-(1,1): $04 -> $0C, $00 -> $04' in capsys.readouterr().out
+        with open(path, 'rb') as f:
+            result = f.read()
+        assert result[:3] == bytes([0x04, 0x0C, 0x04])
+        assert result[64:66] == bytes([0x0C, 0x0C])
+
+    def test_remap_dungeon_level(self, tmp_path, capsys):
+        from ult3edit.map import cmd_remap
+        path = str(tmp_path / 'MAPM')
+        with open(path, 'wb') as f:
+            f.write(bytes(MAP_DUNGEON_SIZE))
+        cmd_remap(self._remap_args(path, [(0x00, 0x01)], level=2, dry_run=True))
+        assert 'Remapped 256 tiles' in capsys.readouterr().out
+        cmd_remap(self._remap_args(path, [(0x00, 0x01)], level=2))
+        with open(path, 'rb') as f:
+            result = f.read()
+        assert result.count(1) == 256 and result[512:768] == b'\x01' * 256
+
+    def test_stamp(self, tmp_path, capsys):
+        from ult3edit.map import cmd_stamp
+        src = str(tmp_path / 'MAPB')
+        dst = str(tmp_path / 'MAPA')
+        with open(src, 'wb') as f:
+            f.write(bytes(range(64)) * 64)
+        with open(dst, 'wb') as f:
+            f.write(b'\x04' * MAP_OVERWORLD_SIZE)
+        args = argparse.Namespace(file=dst, source=src, rect=(0, 0, 2, 1), at=(62, 10),
+                                  transparent=0x01, source_level=None, level=None,
+                                  dry_run=False, backup=False, output=None)
+        cmd_stamp(args)
+        assert 'Stamped 2 tiles (3x2) from MAPB at (62, 10)' in capsys.readouterr().out
+        with open(dst, 'rb') as f:
+            result = f.read()
+        assert result[10 * 64 + 62:10 * 64 + 64] == bytes([0x00, 0x04])
+        assert result[11 * 64 + 62:11 * 64 + 64] == bytes([0x00, 0x04])
+
+    def test_stamp_rejects_mixed_formats(self, tmp_path, capsys):
+        from ult3edit.map import cmd_stamp
+        src = str(tmp_path / 'MAPM')
+        dst = str(tmp_path / 'MAPA')
+        with open(src, 'wb') as f:
+            f.write(bytes(MAP_DUNGEON_SIZE))
+        with open(dst, 'wb') as f:
+            f.write(bytes(MAP_OVERWORLD_SIZE))
+        args = argparse.Namespace(file=dst, source=src, rect=(0, 0, 1, 1), at=(0, 0),
+                                  transparent=None, source_level=None, level=None,
+                                  dry_run=False, backup=False, output=None)
+        with pytest.raises(SystemExit):
+            cmd_stamp(args)
+        assert 'cannot stamp' in capsys.readouterr().err
+
+    def test_arg_types(self):
+        from ult3edit.map import _int_list, _tile_byte, _tile_pair
+        assert _tile_pair('0x04:12') == (4, 12)
+        assert _tile_byte('0xFF') == 255
+        assert _int_list(2, 'x,y')('3,4') == (3, 4)
+        for bad in ('0x100', '-1', 'x'):
+            with pytest.raises(argparse.ArgumentTypeError):
+                _tile_byte(bad)
+        for bad in ('0x04', 'a:b', '1:300'):
+            with pytest.raises(argparse.ArgumentTypeError):
+                _tile_pair(bad)
+        for bad in ('1,2,3', 'a,b'):
+            with pytest.raises(argparse.ArgumentTypeError):
+                _int_list(2, 'x,y')(bad)
+
+    def test_cli(self, tmp_path, monkeypatch, capsys):
+        from ult3edit.cli import main
+        path = str(tmp_path / 'MAPA')
+        with open(path, 'wb') as f:
+            f.write(b'\x04' * MAP_OVERWORLD_SIZE)
+        monkeypatch.setattr('sys.argv', ['ult3edit', 'map', 'remap', path,
+                                         '--pair', '0x04:0x00', '--pair', '0x00:0x08'])
+        main()
+        monkeypatch.setattr('sys.argv', ['ult3edit', 'map', 'stamp', path, path,
+                                         '--rect', '0,0,3,3', '--at', '8,8'])
+        main()
+        out = capsys.readouterr().out
+        assert 'Remapped 4096 tiles' in out and 'Stamped 16 tiles' in out
+        monkeypatch.setattr('sys.argv', ['ult3edit', 'map', 'stamp', path, path, '--rect',
+                                         '0,0,3,3', '--at', '8,8', '--transparent', '0x400'])
+        with pytest.raises(SystemExit):
+            main()
+        assert 'expected a tile byte' in capsys.readouterr().err
+
+    def test_standalone_main(self, tmp_path, monkeypatch, capsys):
+        from ult3edit.map import main
+        path = str(tmp_path / 'MAPA')
+        with open(path, 'wb') as f:
+            f.write(bytes(MAP_OVERWORLD_SIZE))
+        monkeypatch.setattr('sys.argv', ['ult3-map', 'remap', path, '--pair', '0:4',
+                                         '--region', '0,0,0,0', '--dry-run'])
+        main()
+        assert 'Remapped 1 tiles' in capsys.readouterr().out
+
+
+class TestMapAnalyzeCommand:
+    """map analyze."""
+
+    def _game(self, tmp_path, dungeon=None):
+        with open(tmp_path / 'MAPA', 'wb') as f:
+            f.write(b'\x04' * MAP_OVERWORLD_SIZE)
+        if dungeon is not None:
+            with open(tmp_path / 'MAPM', 'wb') as f:
+                f.write(dungeon)
+        return str(tmp_path)
+
+    def test_clean_game(self, tmp_path, capsys):
+        from ult3edit.map import cmd_analyze
+        game_dir = self._game(tmp_path)
+        cmd_analyze(argparse.Namespace(game_dir=game_dir, json=False, output=None))
+        out = capsys.readouterr().out
+        assert '4096/4096 reachable' in out and 'OK' in out
+        assert 'Total: 0 issue(s) in 1 map(s)' in out
+
+    def test_issues_exit_nonzero(self, tmp_path, capsys):
+        from ult3edit.map import cmd_analyze
+        game_dir = self._game(tmp_path, dungeon=bytes(MAP_DUNGEON_SIZE))
+        out_path = str(tmp_path / 'report.json')
+        with pytest.raises(SystemExit) as exc:
+            cmd_analyze(argparse.Namespace(game_dir=game_dir, json=True, output=out_path))
+        assert exc.value.code == 1
+        with open(out_path) as f:
+            report = json.load(f)
+        assert report['issue_count'] == 1
+        assert report['maps'][1]['issues'][0]['entity'] == 'Level 0'
+
+    def test_no_maps(self, tmp_path, capsys):
+        from ult3edit.map import cmd_analyze
+        with pytest.raises(SystemExit):
+            cmd_analyze(argparse.Namespace(game_dir=str(tmp_path), json=False, output=None))
+        assert 'No MAP files' in capsys.readouterr().err
+
+    def test_cli(self, tmp_path, monkeypatch, capsys):
+        from ult3edit.cli import main
+        game_dir = self._game(tmp_path)
+        monkeypatch.setattr('sys.argv', ['ult3edit', 'map', 'analyze', game_dir])
+        main()
+        assert 'Map analysis' in capsys.readouterr().out
+
+    def test_standalone_main(self, tmp_path, monkeypatch, capsys):
+        from ult3edit.map import main
+        game_dir = self._game(tmp_path)
+        monkeypatch.setattr('sys.argv', ['ult3-map', 'analyze', game_dir, '--json'])
+        main()
+        assert '"issue_count": 0' in capsys.readouterr().out
+
+
+class TestMapRenderCommand:
+    """map render --png."""
+
+    def _game(self, path, shps=True):
+        path.mkdir(parents=True, exist_ok=True)
+        (path / 'MAPA#061000').write_bytes(b'\x04' * MAP_OVERWORLD_SIZE)
+        (path / 'MAPM#061000').write_bytes(bytes(MAP_DUNGEON_SIZE))
+        if shps:
+            (path / 'SHPS#060800').write_bytes(bytes(2048))
+        return str(path)
+
+    def _args(self, paths, png, **kw):
+        defaults = dict(paths=paths, png=png, shps=None, level=None, scale=1, mip=1, jobs=1)
+        defaults.update(kw)
+        return argparse.Namespace(**defaults)
+
+    def test_single_file(self, tmp_path, capsys):
+        from ult3edit.map import cmd_render
+        game = self._game(tmp_path / 'GAME')
+        out = str(tmp_path / 'mapa.png')
+        cmd_render(self._args([os.path.join(game, 'MAPA#061000')], out))
+        assert f'{out} (448x512)' in capsys.readouterr().out
+        with open(out, 'rb') as f:
+            assert f.read(8) == b'\x89PNG\r\n\x1a\n'
+
+    def test_game_dir_and_dungeon_level(self, tmp_path, capsys):
+        from ult3edit.map import cmd_render
+        game = self._game(tmp_path / 'GAME')
+        out_dir = str(tmp_path / 'png')
+        cmd_render(self._args([game], out_dir, level=2, scale=2))
+        out = capsys.readouterr().out
+        assert 'MAPA.png (896x1024)' in out and 'MAPM.png (224x256)' in out
+        assert 'Rendered 2 image(s)' in out
+        assert sorted(os.listdir(out_dir)) == ['MAPA.png', 'MAPM.png']
+
+    def test_many_builds(self, tmp_path, capsys):
+        from ult3edit.map import cmd_render
+        games = [self._game(tmp_path / b / 'GAME') for b in ('b1', 'b2')]
+        loose = str(tmp_path / 'b1' / 'GAME' / 'MAPA#061000')
+        out_dir = tmp_path / 'thumbs'
+        cmd_render(self._args(games + [loose], str(out_dir), jobs=2))
+        assert sorted(os.listdir(out_dir)) == ['GAME', 'GAME-2', 'MAPA.png']
+        assert sorted(os.listdir(out_dir / 'GAME-2')) == ['MAPA.png', 'MAPM.png']
+
+    def test_same_named_files_do_not_overwrite(self, tmp_path, capsys):
+        from ult3edit.map import cmd_render
+        files = [os.path.join(self._game(tmp_path / b / 'GAME'), 'MAPA#061000')
+                 for b in ('b1', 'b2', 'b3')]
+        out_dir = tmp_path / 'thumbs'
+        cmd_render(self._args(files, str(out_dir)))
+        assert sorted(os.listdir(out_dir)) == ['MAPA-2.png', 'MAPA-3.png', 'MAPA.png']
+        assert 'Rendered 3 image(s)' in capsys.readouterr().out
+
+    def test_mip_thumbnails(self, tmp_path, capsys):
+        from ult3edit.map import cmd_render
+        game = self._game(tmp_path / 'GAME')
+        cmd_render(self._args([game], str(tmp_path / 'thumbs'), mip=8))
+        out = capsys.readouterr().out
+        assert 'MAPA.png (56x64)' in out and 'MAPM.png (14x128)' in out
+
+    def test_explicit_shps(self, tmp_path, capsys):
+        from ult3edit.map import cmd_render
+        game = self._game(tmp_path / 'GAME', shps=False)
+        shps = tmp_path / 'tiles.shps'
+        shps.write_bytes(b'\xff' * 2048)
+        cmd_render(self._args([game], str(tmp_path / 'out'), shps=str(shps)))
+        assert 'Rendered 2 image(s)' in capsys.readouterr().out
+
+    @pytest.mark.parametrize('kw, setup, message', [
+        ({'level': 8}, True, 'level 8 out of range'),
+        ({'scale': 0}, True, '--scale must be at least 1'),
+        ({}, False, 'no SHPS file found'),
+        ({'paths': ['missing']}, True, 'missing not found'),
+    ])
+    def test_errors(self, tmp_path, capsys, kw, setup, message):
+        from ult3edit.map import cmd_render
+        game = self._game(tmp_path / 'GAME', shps=setup)
+        args = self._args([game], str(tmp_path / 'out'))
+        for key, value in kw.items():
+            setattr(args, key, value)
+        with pytest.raises(SystemExit):
+            cmd_render(args)
+        assert message in capsys.readouterr().err
+
+    def test_no_maps(self, tmp_path, capsys):
+        from ult3edit.map import cmd_render
+        (tmp_path / 'SHPS').write_bytes(bytes(2048))
+        with pytest.raises(SystemExit):
+            cmd_render(self._args([str(tmp_path)], str(tmp_path / 'out')))
+        assert 'No MAP files found' in capsys.readouterr().err
+
+    def test_cli(self, tmp_path, monkeypatch, capsys):
+        from ult3edit.cli import main
+        game = self._game(tmp_path / 'GAME')
+        monkeypatch.setattr('sys.argv', ['ult3edit', 'map', 'render', game,
+                                         '--png', str(tmp_path / 'out'), '-j', '1'])
+        main()
+        assert 'Rendered 2 image(s)' in capsys.readouterr().out
+
+    def test_standalone_main(self, tmp_path, monkeypatch, capsys):
+        from ult3edit.map import main
+        game = self._game(tmp_path / 'GAME')
+        monkeypatch.setattr('sys.argv', ['ult3-map', 'render', os.path.join(game, 'MAPM#061000'),
+                                         '--png', str(tmp_path / 'm.png'), '--level', '0'])
+        main()
+        assert '(112x128)' in capsys.readouterr().out
+
+
+class TestMapTileIndexCommands:
+    """map find --all and map stats."""
+
+    def _game(self, tmp_path):
+        mapa = bytearray(b'\x04' * MAP_OVERWORLD_SIZE)
+        mapa[5 * 64 + 7] = 0x18
+        mapa[9 * 64 + 3] = 0x88
+        (tmp_path / 'MAPA#060000').write_bytes(bytes(mapa))
+        mapm = bytearray(MAP_DUNGEON_SIZE)
+        mapm[256 + 17] = 0x04
+        (tmp_path / 'MAPM#060000').write_bytes(bytes(mapm))
+        (tmp_path / 'CONA#069900').write_bytes(b'\x18' + b'\x04' * 191)
+        return str(tmp_path)
+
+    def _find(self, path, tile, **kw):
+        defaults = dict(file=path, tile=tile, level=None, all=True, dungeon=False,
+                        cache=None, json=False, output=None)
+        defaults.update(kw)
+        return argparse.Namespace(**defaults)
+
+    def _stats(self, game_dir, **kw):
+        defaults = dict(game_dir=game_dir, file=None, cache=None, json=False, output=None)
+        defaults.update(kw)
+        return argparse.Namespace(**defaults)
+
+    def test_find_all_text(self, tmp_path, capsys):
+        cmd_find(self._find(self._game(tmp_path), [0x88, 0x18]))
+        out = capsys.readouterr().out
+        assert 'Tile $88 (Moongate): 1 found in 1 file(s)' in out
+        assert 'Tile $18 (Town): 2 found in 2 file(s)' in out
+        assert 'MAPA   (7, 5)' in out and 'CONA   (0, 0)' in out
+
+    def test_find_all_dungeon_json(self, tmp_path):
+        out_path = str(tmp_path / 'hits.json')
+        cmd_find(self._find(self._game(tmp_path), [0x04], level=1, json=True, output=out_path))
+        with open(out_path) as f:
+            result = json.load(f)
+        assert result['tile_name'] == 'Chest'
+        assert result['locations'] == [{'file': 'MAPM', 'x': 1, 'y': 1, 'level': 1}]
+
+    def test_find_all_cache(self, tmp_path, capsys):
+        game_dir = self._game(tmp_path)
+        cache = str(tmp_path / 'tiles.idx')
+        cmd_find(self._find(game_dir, [0x88], cache=cache, json=True))
+        assert os.path.exists(cache)
+        capsys.readouterr()
+        cmd_find(self._find(game_dir, [0x88, 0x89], cache=cache, json=True))
+        result = json.loads(capsys.readouterr().out)
+        assert [r['count'] for r in result] == [1, 1]
+
+    def test_find_all_dungeon_tile_out_of_range(self, tmp_path, capsys):
+        with pytest.raises(SystemExit):
+            cmd_find(self._find(self._game(tmp_path), [0x04, 0x14], dungeon=True))
+        assert 'dungeon tiles are 0x00-0x0F, got 0x14' in capsys.readouterr().err
+
+    def test_find_tile_out_of_range(self, tmp_path, monkeypatch, capsys):
+        from ult3edit.cli import main
+        monkeypatch.setattr('sys.argv', ['ult3edit', 'map', 'find', self._game(tmp_path),
+                                         '--all', '--tile', '0x400'])
+        with pytest.raises(SystemExit) as exc_info:
+            main()
+        assert exc_info.value.code == 2
+        assert 'expected a tile byte (0-255)' in capsys.readouterr().err
+
+    def test_find_all_no_maps(self, tmp_path, capsys):
+        with pytest.raises(SystemExit):
+            cmd_find(self._find(str(tmp_path), [0x04]))
+        assert 'No map files' in capsys.readouterr().err
+
+    def test_find_several_tiles_in_one_file(self, tmp_path, capsys):
+        game_dir = self._game(tmp_path)
+        path = os.path.join(game_dir, 'MAPA#060000')
+        cmd_find(self._find(path, [0x18, 0x88], all=False))
+        out = capsys.readouterr().out
+        assert 'Tile $18 (Town): 1 found' in out and '(3, 9)' in out
+        out_path = str(tmp_path / 'hits.json')
+        cmd_find(self._find(path, [0x18, 0x88], all=False, json=True, output=out_path))
+        with open(out_path) as f:
+            assert [r['tile'] for r in json.load(f)] == [0x18, 0x88]
+
+    def test_stats_text(self, tmp_path, capsys):
+        from ult3edit.map import cmd_stats
+        cmd_stats(self._stats(self._game(tmp_path)))
+        out = capsys.readouterr().out
+        assert 'Tile Statistics (3 files)' in out
+        assert 'All surface maps:' in out and 'All dungeons:' in out
+        assert '$18 Town' in out and 'MAPM (dungeon):' in out
+        os.remove(tmp_path / 'MAPM#060000')
+        cmd_stats(self._stats(str(tmp_path)))
+        assert 'All dungeons' not in capsys.readouterr().out
+
+    def test_stats_one_file_json(self, tmp_path):
+        from ult3edit.map import cmd_stats
+        out_path = str(tmp_path / 'stats.json')
+        cmd_stats(self._stats(self._game(tmp_path), file='cona', json=True, output=out_path))
+        with open(out_path) as f:
+            result = json.load(f)
+        assert list(result) == ['files']
+        assert result['files']['CONA']['tiles'] == [
+            {'tile': 4, 'tile_name': 'Grass', 'count': 120, 'percent': 99.2},
+            {'tile': 0x18, 'tile_name': 'Town', 'count': 1, 'percent': 0.8}]
+
+    def test_stats_unknown_file(self, tmp_path, capsys):
+        from ult3edit.map import cmd_stats
+        with pytest.raises(SystemExit):
+            cmd_stats(self._stats(self._game(tmp_path), file='MAPZ'))
+        assert 'MAPZ not found' in capsys.readouterr().err
+
+    def test_cli(self, tmp_path, monkeypatch, capsys):
+        from ult3edit.cli import main
+        game_dir = self._game(tmp_path)
+        monkeypatch.setattr('sys.argv', ['ult3edit', 'map', 'find', game_dir, '--all',
+                                         '--tile', '0x88', '--tile', '0x18'])
+        main()
+        assert '2 found in 2 file(s)' in capsys.readouterr().out
+
+    def test_standalone_main(self, tmp_path, monkeypatch, capsys):
+        from ult3edit.map import main
+        game_dir = self._game(tmp_path)
+        monkeypatch.setattr('sys.argv', ['ult3-map', 'stats', game_dir, '--file', 'MAPM'])
+        main()
+        assert 'MAPM (dungeon):' in capsys.readouterr().out
+
+
+class TestMapCompileAllCommand:
+    """map compile-all."""
+
+    def _sources(self, src):
+        src.mkdir()
+        (src / 'mapa.map').write_text('\n'.join(['.' * 64] * 64), encoding='utf-8')
+        (src / 'mapb.map').write_text('~' * 10, encoding='utf-8')
+        return str(src)
+
+    def _args(self, src, out, **kw):
+        defaults = dict(src_dir=src, out_dir=out, jobs=1, cache=None, force=False)
+        defaults.update(kw)
+        return argparse.Namespace(**defaults)
+
+    def test_compile_and_skip(self, tmp_path, capsys):
+        from ult3edit.map import cmd_compile_all
+        src = self._sources(tmp_path / 'src')
+        out = str(tmp_path / 'GAME')
+        cmd_compile_all(self._args(src, out))
+        captured = capsys.readouterr()
+        assert 'mapa.map -> ' in captured.out and '(overworld, 4096 bytes)' in captured.out
+        assert 'Compiled 2 map(s), 0 unchanged' in captured.out
+        assert 'Warning: mapb.map: only 1 rows found' in captured.err
+        cmd_compile_all(self._args(src, out))
+        assert 'Compiled 0 map(s), 2 unchanged' in capsys.readouterr().out
+
+    def test_errors(self, tmp_path, capsys):
+        from ult3edit.map import cmd_compile_all
+        with pytest.raises(SystemExit):
+            cmd_compile_all(self._args(str(tmp_path / 'missing'), str(tmp_path / 'out')))
+        assert 'is not a directory' in capsys.readouterr().err
+        with pytest.raises(SystemExit):
+            cmd_compile_all(self._args(str(tmp_path), str(tmp_path / 'out')))
+        assert 'No .map sources' in capsys.readouterr().err
+
+    def test_cli(self, tmp_path, monkeypatch, capsys):
+        from ult3edit.cli import main
+        src = self._sources(tmp_path / 'src')
+        monkeypatch.setattr('sys.argv', ['ult3edit', 'map', 'compile-all', src,
+                                         str(tmp_path / 'GAME'), '-j', '1'])
+        main()
+        assert 'Compiled 2 map(s)' in capsys.readouterr().out
+
+    def test_standalone_main(self, tmp_path, monkeypatch, capsys):
+        from ult3edit.map import main
+        src = self._sources(tmp_path / 'src')
+        monkeypatch.setattr('sys.argv', ['ult3-map', 'compile-all', src, str(tmp_path / 'GAME'),
+                                         '--force', '--cache', str(tmp_path / 'm.json')])
+        main()
+        assert 'Compiled 2 map(s)' in capsys.readouterr().out
@@ -0,0 +1,110 @@
+"""Tests for the text-art map compiler and incremental batch builds."""
+
+import json
+import os
+
+import pytest
+
+from ult3edit.constants import MAP_OVERWORLD_SIZE, MAP_DUNGEON_SIZE
+from ult3edit.mapcompile import (
+    MANIFEST_NAME, MANIFEST_VERSION, compile_map_text, compile_file, compile_all,
+    is_dungeon_source, load_manifest, output_path,
+)
+
+# Rows starting with '#' are comments, so each wall row starts with a door
+DUNGEON_SRC = '\n'.join(f'# Level {i + 1}\n' + '\n'.join(['D' + '#' * 15] * 16)
+                        for i in range(8))
+
+
+def _sources(src_dir):
+    os.makedirs(src_dir, exist_ok=True)
+    with open(os.path.join(src_dir, 'mapa.map'), 'w', encoding='utf-8') as f:
+        f.write('# MAPA\n' + '\n'.join(['.' * 64] * 64))
+    with open(os.path.join(src_dir, 'mapm.map'), 'w', encoding='utf-8') as f:
+        f.write(DUNGEON_SRC)
+    with open(os.path.join(src_dir, 'notes.txt'), 'w', encoding='utf-8') as f:
+        f.write('not a map')
+    return src_dir
+
+
+class TestCompileMapText:
+    def test_overworld_rows(self):
+        data, warnings = compile_map_text('# header\n~.^\n\n.~')
+        assert len(data) == MAP_OVERWORLD_SIZE
+        assert data[:4] == bytes([0x00, 0x04, 0x10, 0x04])
+        assert data[64:66] == bytes([0x04, 0x00])
+        assert warnings == ['only 2 rows found (expected 64), padding with empty rows']
+
+    def test_unknown_chars_and_long_rows(self):
+        data, warnings = compile_map_text('\n'.join(['é~' + '.' * 70] * 64))
+        assert data[:2] == bytes([0x04, 0x00]) and len(data) == MAP_OVERWORLD_SIZE
+        assert warnings == ["unknown tile chars mapped to 0x04: ['é']"]
+
+    def test_dungeon_levels(self):
+        data, warnings = compile_map_text(DUNGEON_SRC, is_dungeon=True)
+        assert data == (b'\x02' + b'\x01' * 15) * 128 and warnings == []
+        data, warnings = compile_map_text('# Level 1\nD.\n# Level 2\n.D', is_dungeon=True)
+        assert data[:2] == b'\x02\x00' and data[256:258] == b'\x00\x02'
+        assert warnings[0] == 'only 2 dungeon levels found (expected 8), padding with empty levels'
+        assert warnings[1:] == ['level 1 has 1 rows (expected 16), padding',
+                                'level 2 has 1 rows (expected 16), padding']
+
+    def test_detect_dungeon(self):
+        assert is_dungeon_source(DUNGEON_SRC)
+        assert not is_dungeon_source('# MAPA\n....')
+
+
+class TestCompileAll:
+    def test_output_path(self, tmp_path):
+        (tmp_path / 'MAPB#061000').write_bytes(b'')
+        assert output_path(str(tmp_path), 'src/mapb.map') == str(tmp_path / 'MAPB#061000')
+        assert output_path(str(tmp_path), 'mapc.map') == str(tmp_path / 'MAPC')
+
+    def test_compile_file_detects_layout(self, tmp_path):
+        src = _sources(str(tmp_path / 'src'))
+        out = str(tmp_path / 'MAPM')
+        assert compile_file(os.path.join(src, 'mapm.map'), out) == (out, True, MAP_DUNGEON_SIZE, [])
+
+    @pytest.mark.parametrize('jobs', [1, 2])
+    def test_incremental(self, tmp_path, jobs):
+        src = _sources(str(tmp_path / 'src'))
+        out = str(tmp_path / 'GAME')
+        compiled, unchanged = compile_all(src, out, jobs)
+        assert [(c[0], c[2], c[3]) for c in compiled] == [
+            ('mapa.map', False, MAP_OVERWORLD_SIZE), ('mapm.map', True, MAP_DUNGEON_SIZE)]
+        assert unchanged == []
+        assert (tmp_path / 'GAME' / 'MAPA').read_bytes() == b'\x04' * MAP_OVERWORLD_SIZE
+
+        assert compile_all(src, out, jobs) == ([], ['mapa.map', 'mapm.map'])
+        with open(os.path.join(src, 'mapa.map'), 'a', encoding='utf-8') as f:
+            f.write('\n# edited')
+        (tmp_path / 'GAME' / 'MAPM').write_bytes(b'clobbered')
+        compiled, unchanged = compile_all(src, out, jobs)
+        assert [c[0] for c in compiled] == ['mapa.map', 'mapm.map'] and unchanged == []
+        compiled, _ = compile_all(src, out, jobs, force=True)
+        assert len(compiled) == 2
+
+    def test_manifest(self, tmp_path):
+        src = _sources(str(tmp_path / 'src'))
+        out = str(tmp_path / 'GAME')
+        manifest = str(tmp_path / 'build.json')
+        compile_all(src, out, 1, manifest)
+        assert not os.path.exists(os.path.join(out, MANIFEST_NAME))
+        entries = load_manifest(manifest)
+        assert sorted(entries) == ['mapa.map', 'mapm.map']
+        assert entries['mapa.map']['output'] == 'MAPA'
+        os.remove(os.path.join(src, 'mapm.map'))
+        os.remove(os.path.join(out, 'MAPA'))
+        assert compile_all(src, out, 1, manifest)[0][0][0] == 'mapa.map'
+        assert sorted(load_manifest(manifest)) == ['mapa.map']
+
+    @pytest.mark.parametrize('content', [
+        'not json',
+        json.dumps({'version': 0, 'sources': {}}),
+        json.dumps({'version': MANIFEST_VERSION, 'sources': []}),
+    ])
+    def test_bad_manifest(self, tmp_path, content):
+        path = tmp_path / 'm.json'
+        path.write_text(content)
+        assert load_manifest(str(path)) == {}
+        assert load_manifest(str(tmp_path / 'missing.json')) == {}
@@ -0,0 +1,108 @@
+"""Tests for the map preview pyramid."""
+
+import json
+
+import pytest
+
+from ult3edit import mipmap
+from ult3edit.mipmap import (
+    MIP_FACTORS, downsample, build_pyramid, get_pyramid, mip_level,
+    load_cache, save_cache,
+)
+
+
+class TestDownsample:
+    def test_majority_per_block(self):
+        # 4x2 map: left block mostly grass, right block mostly water
+        data = bytes([0x04, 0x04, 0x00, 0x00,
+                      0x18, 0x04, 0x00, 0x10])
+        assert downsample(data, 4, 2) == (bytes([0x04, 0x00]), 2, 1)
+
+    def test_animation_frames_count_together(self):
+        data = bytes([0x01, 0x02, 0x03, 0x04])  # three water frames, one grass
+        assert downsample(data, 2, 2)[0] == b'\x00'
+
+    def test_ties_go_to_first_seen(self):
+        assert downsample(bytes([0x10, 0x04, 0x04, 0x10]), 2, 2)[0] == b'\x10'
+
+    def test_partial_edge_blocks(self):
+        data = bytes([4] * 9)
+        assert downsample(data, 3, 2) == (bytes([4] * 4), 2, 2)
+
+    def test_dungeon_levels_do_not_mix(self):
+        data = bytes(256) + b'\xF1' * 256  # open level, then a wall level (high bits set)
+        tiles, width, height = downsample(data, 16, 8, is_dungeon=True)
+        assert (width, height) == (2, 4)
+        assert tiles == bytes(4) + b'\x01' * 4
+
+    def test_exact_majority_not_majority_of_majorities(self):
+        # Three of the four 2x2 quadrants reduce to water (one outright, two
+        # on first-seen ties), but grass holds 9 of the 16 cells
+        data = bytearray([0x04]) * 16
+        for i in (0, 1, 4, 2, 3, 8, 12):
+            data[i] = 0x00
+        assert downsample(bytes(data), 4, 4)[0] == b'\x04'
+
+
+class TestPyramidCache:
+    def test_build(self):
+        levels = build_pyramid(bytes(4096), 64)
+        assert sorted(levels) == list(MIP_FACTORS)
+        assert {f: levels[f][1:] for f in levels} == {2: (32, 32), 4: (16, 16), 8: (8, 8)}
+
+    def test_cached_by_content(self):
+        data = bytearray(b'\x04' * 4096)
+        first = get_pyramid(data, 64)
+        assert get_pyramid(bytes(data), 64) is first
+        assert get_pyramid(data, 64, is_dungeon=True) is not first
+        data[0] = 0
+        assert get_pyramid(data, 64) is not first
+
+    def test_in_process_cache_is_bounded(self, monkeypatch):
+        monkeypatch.setattr(mipmap, '_cache', {})
+        monkeypatch.setattr(mipmap, 'CACHE_MAX_ENTRIES', 3)
+        for i in range(5):
+            get_pyramid(bytes([i]) * 64, 8)
+        assert len(mipmap._cache) == 3
+
+    def test_explicit_cache_dict(self):
+        cache = {}
+        get_pyramid(bytes(64), 8, cache=cache)
+        assert len(cache) == 1
+
+    def test_mip_level(self):
+        data = bytes(range(64))
+        assert mip_level(data, 8, 1) == (data, 8, 8)
+        assert mip_level(data, 8, 8)[1:] == (1, 1)
+        with pytest.raises(ValueError, match='no mip level for factor 3'):
+            mip_level(data, 8, 3)
+
+
+class TestPersistence:
+    def test_round_trip(self, tmp_path):
+        path = str(tmp_path / 'mips.json')
+        cache = {}
+        levels = get_pyramid(bytes(range(64)), 8, cache=cache)
+        save_cache(path, cache)
+        loaded = load_cache(path)
+        assert list(loaded.values()) == [levels]
+
+    @pytest.mark.parametrize('content', [
+        'not json',
+        json.dumps({'version': 0, 'entries': {}}),
+        json.dumps({'version': mipmap.CACHE_VERSION, 'entries': []}),
+    ])
+    def test_bad_files_give_empty_cache(self, tmp_path, content):
+        path = tmp_path / 'mips.json'
+        path.write_text(content)
+        assert load_cache(str(path)) == {}
+        assert load_cache(str(tmp_path / 'missing.json')) == {}
+
+    def test_bad_entries_skipped(self, tmp_path):
+        path = tmp_path / 'mips.json'
+        path.write_text(json.dumps({'version': mipmap.CACHE_VERSION, 'entries': {
+            'good': {'2': ['0400', 2, 1]},
+            'bad-hex': {'2': ['zz', 1, 1]},
+            'bad-shape': {'2': 5},
+        }}))
+        assert load_cache(str(path)) == {'good': {2: (b'\x04\x00', 2, 1)}}
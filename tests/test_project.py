@@ -0,0 +1,220 @@
+"""Tests for whole-game project export/import."""
+
+import json
+import os
+import random
+import sys
+
+import pytest
+
+from ult3edit.bench import make_game_dir
+from ult3edit.project import (
+    project_files, export_project, import_project, run_tool, run_tools,
+    cmd_export, cmd_import, dispatch,
+)
+
+
+@pytest.fixture
+def game(tmp_path):
+    """A synthetic game with every project file kind, plus its export."""
+    game_dir = tmp_path / 'game'
+    make_game_dir(str(game_dir), random.Random(30))
+    (game_dir / 'MAPM#061000').write_bytes(bytes(2048))  # dungeon
+    (game_dir / 'SHRN#069900').write_bytes(bytes(128))
+    (game_dir / 'TEXT#061000').write_bytes(bytes([0xC8, 0xC9, 0x00]) + bytes(1021))
+    (game_dir / 'ULT3#065000').write_bytes(bytes(17408))
+    return game_dir
+
+
+def _snapshot(game_dir):
+    return {p.name: p.read_bytes() for p in game_dir.iterdir() if p.is_file()}
+
+
+def _args(game_dir, src_dir, **kw):
+    import argparse
+    defaults = {'game_dir': str(game_dir), 'src_dir': str(src_dir), 'jobs': 1,
+                'dry_run': False, 'backup': False}
+    defaults.update(kw)
+    return argparse.Namespace(**defaults)
+
+
+class TestProjectFiles:
+    def test_every_kind_found(self, game):
+        entries = project_files(str(game))
+        kinds = {e['kind'] for e in entries}
+        assert kinds == {'roster', 'bestiary', 'map', 'combat', 'tlk', 'save',
+                         'special', 'text', 'patch'}
+        save = next(e for e in entries if e['kind'] == 'save')
+        assert [os.path.basename(p) for p in save['paths']] == ['PRTY', 'PLRS']
+
+    def test_empty_dir(self, tmp_dir):
+        assert project_files(tmp_dir) == []
+
+
+class TestRoundTrip:
+    @pytest.mark.parametrize('jobs', [1, 2])
+    def test_export_import_is_byte_identical(self, game, tmp_path, jobs):
+        before = _snapshot(game)
+        src = tmp_path / 'src'
+        report = export_project(str(game), str(src), jobs)
+        assert report['errors'] == []
+        assert {p.name for p in src.iterdir()} == {
+            f"{e['name']}.json" for e in report['entries']}
+
+        report = import_project(str(game), str(src), jobs)
+        assert report['errors'] == []
+        assert report['written'] == []
+        assert _snapshot(game) == before
+        assert not [n for n in os.listdir(game) if n.startswith('.ult3edit')]
+
+    def test_edit_writes_only_changed_binary(self, game, tmp_path):
+        src = tmp_path / 'src'
+        export_project(str(game), str(src), 1)
+        roster = json.loads((src / 'ROST.json').read_text())
+        roster[0]['gold'] = 4321
+        (src / 'ROST.json').write_text(json.dumps(roster))
+        (src / 'TLKA.json').unlink()  # missing sources are skipped
+
+        before = _snapshot(game)
+        report = import_project(str(game), str(src), 1, backup=True)
+        assert [os.path.basename(p) for p in report['written']] == ['ROST']
+        after = _snapshot(game)
+        assert after['ROST'] != before['ROST']
+        assert after['ROST.bak'] == before['ROST']
+        from ult3edit.roster import load_roster
+        chars, _ = load_roster(str(game / 'ROST'))
+        assert chars[0].gold == 4321
+
+    def test_bad_source_aborts_without_writing(self, game, tmp_path):
+        src = tmp_path / 'src'
+        export_project(str(game), str(src), 1)
+        roster = json.loads((src / 'ROST.json').read_text())
+        roster[0]['gold'] = 1
+        (src / 'ROST.json').write_text(json.dumps(roster))
+        (src / 'MAPA.json').write_text('{broken')
+
+        before = _snapshot(game)
+        report = import_project(str(game), str(src), 1)
+        assert report['errors'] == ['MAPA']
+        assert report['written'] == []
+        assert _snapshot(game) == before
+
+    def test_skipped_record_aborts_without_writing(self, game, tmp_path):
+        src = tmp_path / 'src'
+        export_project(str(game), str(src), 1)
+        (src / 'ROST.json').write_text(json.dumps([{'slot': 0, 'gold': 1}, {'slot': 99}]))
+        before = _snapshot(game)
+        report = import_project(str(game), str(src), 1)
+        assert report['errors'] == ['ROST']
+        rost = report['results'][[e['name'] for e in report['entries']].index('ROST')]
+        assert rost['ok'] and rost['warnings'] == ['Warning: skipping out-of-range slot 99']
+        assert _snapshot(game) == before
+
+    def test_dry_run(self, game, tmp_path):
+        src = tmp_path / 'src'
+        export_project(str(game), str(src), 1)
+        (src / 'ROST.json').write_text(json.dumps([{'slot': 0, 'gold': 1}]))
+        before = _snapshot(game)
+        report = import_project(str(game), str(src), 1, dry_run=True)
+        assert report['errors'] == []
+        assert _snapshot(game) == before
+
+
+class TestRunTool:
+    def test_captures_output(self, game):
+        result = run_tool(['roster', 'view', str(game / 'ROST')])
+        assert result['ok']
+        assert 'HERO0' in result['stdout']
+
+    def test_sys_exit_is_failure(self, tmp_dir):
+        result = run_tool(['combat', 'view', tmp_dir])
+        assert not result['ok']
+        assert 'No CON files' in result['stderr']
+
+    def test_exception_is_failure(self, tmp_dir):
+        result = run_tool(['roster', 'view', os.path.join(tmp_dir, 'missing')])
+        assert not result['ok']
+        assert result['stderr'].startswith('Error:')
+
+    def test_run_tools_order(self, game):
+        commands = [['text', 'view', str(game / 'TEXT#061000')],
+                    ['roster', 'view', str(game / 'ROST')]]
+        results = run_tools(commands, jobs=2)
+        assert [r['argv'] for r in results] == commands
+
+
+class TestCmds:
+    def test_export_and_import(self, game, tmp_path, capsys):
+        src = tmp_path / 'src'
+        cmd_export(_args(game, src))
+        assert 'Exported 23 file(s)' in capsys.readouterr().out
+        cmd_import(_args(game, src))
+        out = capsys.readouterr().out
+        assert 'Import: 23 source(s) validated' in out
+        assert 'Imported 0 changed file(s) (24 unchanged)' in out
+
+    def test_import_reports_written_and_dry_run(self, game, tmp_path, capsys):
+        src = tmp_path / 'src'
+        cmd_export(_args(game, src))
+        (src / 'ROST.json').write_text(json.dumps([{'slot': 0, 'gold': 1}]))
+        cmd_import(_args(game, src, dry_run=True))
+        assert 'Dry run' in capsys.readouterr().out
+        cmd_import(_args(game, src))
+        assert 'Wrote ROST' in capsys.readouterr().out
+
+    def test_import_failure(self, game, tmp_path, capsys):
+        src = tmp_path / 'src'
+        cmd_export(_args(game, src))
+        (src / 'CONA.json').write_text('[')
+        with pytest.raises(SystemExit):
+            cmd_import(_args(game, src))
+        err = capsys.readouterr().err
+        assert 'CONA: FAILED' in err
+        assert 'no files written' in err
+
+    def test_export_failure(self, game, tmp_path, capsys):
+        blocker = tmp_path / 'src'
+        blocker.mkdir()
+        (blocker / 'ROST.json').mkdir()  # cannot be written as a file
+        with pytest.raises(SystemExit):
+            cmd_export(_args(game, blocker))
+        assert '1 file(s) failed to export' in capsys.readouterr().err
+
+    def test_missing_dirs(self, tmp_path):
+        missing = tmp_path / 'nope'
+        with pytest.raises(SystemExit):
+            cmd_export(_args(missing, tmp_path / 'src'))
+        with pytest.raises(SystemExit):
+            cmd_import(_args(missing, tmp_path))
+        with pytest.raises(SystemExit):
+            cmd_import(_args(tmp_path, missing))
+
+    def test_nothing_to_do(self, tmp_path, capsys):
+        with pytest.raises(SystemExit):
+            cmd_export(_args(tmp_path, tmp_path / 'src'))
+        assert 'No game files' in capsys.readouterr().err
+        with pytest.raises(SystemExit):
+            cmd_import(_args(tmp_path, tmp_path))
+        assert 'No JSON sources' in capsys.readouterr().err
+
+    def test_dispatch_usage(self, capsys):
+        import argparse
+        dispatch(argparse.Namespace(project_command=None))
+        assert 'Usage' in capsys.readouterr().err
+
+    def test_main(self, game, tmp_path, monkeypatch, capsys):
+        from ult3edit.project import main
+        src = tmp_path / 'src'
+        monkeypatch.setattr(sys, 'argv', ['ult3-project', 'export', str(game), str(src), '-j', '1'])
+        main()
+        assert (src / 'ROST.json').exists()
+
+    def test_cli_dispatch(self, game, tmp_path, monkeypatch, capsys):
+        from ult3edit.cli import main
+        src = tmp_path / 'src'
+        monkeypatch.setattr(sys, 'argv', ['ult3edit', 'project', 'export', str(game), str(src), '-j', '1'])
+        main()
+        monkeypatch.setattr(sys, 'argv', ['ult3edit', 'project', 'import', str(game), str(src),
+                                          '--dry-run', '-j', '1'])
+        main()
+        assert 'Dry run' in capsys.readouterr().out
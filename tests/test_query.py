@@ -0,0 +1,306 @@
+"""Tests for roster query expressions, corpus scans, and their roster commands."""
+
+import argparse
+import json
+import os
+import sys
+
+import pytest
+
+from ult3edit import query as query_mod
+from ult3edit.constants import (
+    CHAR_IN_PARTY, CHAR_RECORD_SIZE, CHAR_READIED_WEAPON, CHAR_WEAPON_START,
+)
+from ult3edit.query import (
+    QueryError, compile_query, match_slots, roster_paths, read_roster_source,
+    query_file, query_paths, progress_file, progress_paths, summarize_progress,
+)
+from ult3edit.roster import Character, cmd_check_progress, cmd_query
+
+
+def _roster_with_wizard(sample_roster_bytes, sample_character_bytes):
+    """Slot 0 = HERO (Fighter), slot 3 = MAGE (Wizard, 300/400 HP, in party)."""
+    data = bytearray(sample_roster_bytes)
+    mage = Character(sample_character_bytes)
+    mage.name = 'MAGE'
+    mage.char_class = 'Wizard'
+    mage.max_hp = 400
+    mage.hp = 300
+    mage.in_party = True
+    mage.marks = ['Fire']
+    mage.equipped_weapon = 'Sword'
+    mage.set_weapon_count(1, 2)
+    data[3 * CHAR_RECORD_SIZE:4 * CHAR_RECORD_SIZE] = mage.raw
+    return bytes(data)
+
+
+def _args(expr, paths, **kw):
+    defaults = {'expr': expr, 'paths': paths, 'fields': None, 'jobs': 1, 'output': None}
+    defaults.update(kw)
+    return argparse.Namespace(**defaults)
+
+
+class TestCompileQuery:
+    @pytest.mark.parametrize('expr, expected', [
+        ('class=Wizard', True),
+        ('class=W and hp>150', True),
+        ('class = "Wizard" and hp > 300', False),
+        ('hp<max_hp', True),
+        ('hp>=max_hp', False),
+        ('"Fire" in marks', True),
+        ('"Kings" in marks', False),
+        ('"kings" not in marks', True),
+        ('"Dagger" in weapons', True),
+        ('"Exotic" in armors', False),
+        ('in_party', True),
+        ('not in_party', False),
+        ('in_party=false or status=Dead', False),
+        ('in_party == yes', True),
+        ('weapon>=Sword and weapon!=Exotic', True),
+        ('weapon=6', True),
+        ('race=$48', True),
+        ('race=0x45', False),
+        ('name=mage', True),
+        ('name!="HERO"', True),
+        ('"AG" in name', True),
+        ('name', True),
+        ('marks and weapons', True),
+        ('gems', False),
+        ('(class=Fighter or class=Wizard) AND NOT status=Dead', True),
+        ('strength=25 and str=25', True),
+    ])
+    def test_predicates(self, expr, expected, sample_roster_bytes, sample_character_bytes):
+        data = _roster_with_wizard(sample_roster_bytes, sample_character_bytes)
+        rec = data[3 * CHAR_RECORD_SIZE:4 * CHAR_RECORD_SIZE]
+        assert compile_query(expr)(rec) is expected
+
+    @pytest.mark.parametrize('expr, message', [
+        ('', 'Empty query'),
+        ('hp>', 'Unexpected end'),
+        ('hp > and', 'Expected a value'),
+        ('hp ~ 3', 'Unexpected character'),
+        ('level>3', 'Unknown field: level'),
+        ('"x" in level', 'Unknown field: level'),
+        ('class=Jester', 'Unknown class: Jester'),
+        ('hp=lots', 'needs a number'),
+        ('hp=name', 'Cannot compare hp with name'),
+        ('name>"A"', 'only supports'),
+        ('in_party=maybe', 'needs true or false'),
+        ('marks=Kings', "in marks' to test marks"),
+        ('"Crown" in marks', 'Unknown mark: Crown'),
+        ('"Laser" in weapons', 'Unknown weapon: Laser'),
+        ('"x" in hp', "'in' does not apply to hp"),
+        ('"x" not hp', "Expected 'in' after 'not'"),
+        ('class', 'needs a comparison'),
+        ('(hp>1', 'Missing'),
+        ('hp>1 hp', "Unexpected 'hp'"),
+    ])
+    def test_errors(self, expr, message):
+        with pytest.raises(QueryError, match=message):
+            compile_query(expr)
+
+    def test_compiled_once(self):
+        assert compile_query('hp>1') is compile_query('hp>1')
+
+
+class TestMatchSlots:
+    def test_skips_empty_slots(self, sample_roster_bytes, sample_character_bytes):
+        data = _roster_with_wizard(sample_roster_bytes, sample_character_bytes)
+        assert match_slots(data, compile_query('hp>=0')) == [0, 3]
+        assert match_slots(data, compile_query('class=Fighter')) == [0]
+
+    def test_raw_bytes_only(self, sample_roster_bytes):
+        data = bytearray(sample_roster_bytes)
+        data[CHAR_IN_PARTY] = 0xFF
+        data[CHAR_READIED_WEAPON] = 15
+        data[CHAR_WEAPON_START + 14] = 0x01
+        assert match_slots(data, compile_query('in_party and weapon=Exotic and "Exotic" in weapons')) == [0]
+
+
+class TestSources:
+    def test_roster_paths_expands_directories(self, tmp_path, sample_roster_bytes):
+        (tmp_path / 'g1').mkdir()
+        (tmp_path / 'g1' / 'ROST#069500').write_bytes(sample_roster_bytes)
+        (tmp_path / 'g1' / 'PRTY').write_bytes(b'\x00')
+        (tmp_path / 'game.po').write_bytes(b'')
+        found = roster_paths([str(tmp_path), 'missing'])
+        assert found == [str(tmp_path / 'game.po'), str(tmp_path / 'g1' / 'ROST#069500'), 'missing']
+
+    def test_read_image(self, tmp_path, sample_roster_bytes, monkeypatch):
+        class FakeContext:
+            def __init__(self, path):
+                self.path = path
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def read(self, name):
+                return sample_roster_bytes if 'good' in self.path else None
+        monkeypatch.setattr('ult3edit.disk.DiskContext', FakeContext)
+        assert read_roster_source(str(tmp_path / 'good.po')) == sample_roster_bytes
+        with pytest.raises(ValueError, match='No ROST file'):
+            read_roster_source(str(tmp_path / 'bad.2mg'))
+
+
+class TestQueryFiles:
+    def test_query_file_records(self, tmp_path, sample_roster_bytes, sample_character_bytes):
+        path = tmp_path / 'ROST'
+        path.write_bytes(_roster_with_wizard(sample_roster_bytes, sample_character_bytes))
+        records = query_file(str(path), 'class=Wizard')
+        assert len(records) == 1
+        assert records[0]['name'] == 'MAGE'
+        assert records[0]['slot'] == 3 and records[0]['file'] == str(path)
+        slim = query_file(str(path), 'hp>0', fields=['name', 'stats', 'slot'])
+        assert slim[0] == {'name': 'HERO', 'stats': {'str': 25, 'dex': 30, 'int': 15, 'wis': 20},
+                           'slot': 0, 'file': str(path)}
+        slim = query_file(str(path), 'hp>0', fields=['dex', 'hp', 'wisdom', 'max_hp'])
+        assert slim[0] == {'stats': {'dex': 30, 'wis': 20}, 'hp': 150, 'max_hp': 150,
+                           'slot': 0, 'file': str(path)}
+        with pytest.raises(QueryError, match='Unknown field: bogus'):
+            query_file(str(path), 'hp>0', fields=['name', 'bogus'])
+        with pytest.raises(QueryError, match='Unknown field'):
+            list(query_paths([str(path)], 'hp>0', fields=['hpp']))
+
+    def test_query_paths_parallel_in_order(self, tmp_path, sample_roster_bytes, sample_character_bytes):
+        paths = []
+        for i in range(3):
+            p = tmp_path / f'ROST{i}'
+            p.write_bytes(_roster_with_wizard(sample_roster_bytes, sample_character_bytes))
+            paths.append(str(p))
+        results = list(query_paths(paths + [str(tmp_path / 'missing')], 'class=Wizard', jobs=2))
+        assert [r[0] for r in results] == paths + [str(tmp_path / 'missing')]
+        assert [len(r[1]) for r in results] == [1, 1, 1, 0]
+        assert results[-1][2] is not None
+
+    def test_query_paths_beyond_window_in_order(self, tmp_path):
+        paths = [str(tmp_path / f'ROST{i}') for i in range(20)]
+        results = list(query_paths(paths, 'hp>0', jobs=2))
+        assert [r[0] for r in results] == paths
+        assert all(r[2] is not None for r in results)
+
+    def test_query_paths_bad_expression_before_work(self, monkeypatch):
+        monkeypatch.setattr(query_mod, 'roster_paths', lambda p: pytest.fail('should not expand'))
+        with pytest.raises(QueryError):
+            list(query_paths(['x'], 'hp>'))
+
+
+class TestCmdQuery:
+    def test_ndjson_stdout(self, tmp_path, sample_roster_bytes, sample_character_bytes, capsys):
+        (tmp_path / 'ROST#069500').write_bytes(
+            _roster_with_wizard(sample_roster_bytes, sample_character_bytes))
+        cmd_query(_args('hp>100', [str(tmp_path), str(tmp_path / 'nope')], fields='name'))
+        captured = capsys.readouterr()
+        lines = [json.loads(line) for line in captured.out.splitlines()]
+        assert [(r['name'], r['slot']) for r in lines] == [('HERO', 0), ('MAGE', 3)]
+        assert 'Warning:' in captured.err
+        assert '2 match(es) in 1 roster(s)' in captured.err
+
+    def test_output_file(self, sample_roster_file, tmp_dir, capsys):
+        out = os.path.join(tmp_dir, 'out.ndjson')
+        cmd_query(_args('"Kings" in marks', [sample_roster_file], output=out))
+        with open(out) as f:
+            assert json.loads(f.readline())['name'] == 'HERO'
+
+    def test_invalid_query_exits(self, sample_roster_file, capsys):
+        with pytest.raises(SystemExit) as exc_info:
+            cmd_query(_args('class=Jester', [sample_roster_file]))
+        assert exc_info.value.code == 1
+        assert 'Invalid query' in capsys.readouterr().err
+
+    def test_unknown_field_exits(self, sample_roster_file, tmp_dir, capsys):
+        out = os.path.join(tmp_dir, 'out.ndjson')
+        with pytest.raises(SystemExit) as exc_info:
+            cmd_query(_args('hp>0', [sample_roster_file], fields='name, strenght', output=out))
+        assert exc_info.value.code == 1
+        assert 'Unknown field: strenght' in capsys.readouterr().err
+        assert not os.path.exists(out)
+
+    def test_invalid_query_keeps_output_file(self, sample_roster_file, tmp_dir, capsys):
+        out = os.path.join(tmp_dir, 'out.ndjson')
+        with open(out, 'w') as f:
+            f.write('previous\n')
+        with pytest.raises(SystemExit):
+            cmd_query(_args('hp>', [sample_roster_file], output=out))
+        with open(out) as f:
+            assert f.read() == 'previous\n'
+
+    def test_cli_dispatch(self, sample_roster_file, monkeypatch, capsys):
+        from ult3edit.cli import main
+        monkeypatch.setattr(sys, 'argv', ['ult3edit', 'roster', 'query', 'class=F',
+                                          sample_roster_file, '-j', '1'])
+        main()
+        assert json.loads(capsys.readouterr().out)['class'] == 'Fighter'
+
+    def test_standalone_main(self, sample_roster_file, monkeypatch, capsys):
+        from ult3edit.roster import main
+        monkeypatch.setattr(sys, 'argv', ['ult3-roster', 'query', 'hp=150', sample_roster_file])
+        main()
+        assert json.loads(capsys.readouterr().out)['hp'] == 150
+
+
+class TestCorpusProgress:
+    def _corpus(self, tmp_path, sample_roster_bytes, sample_character_bytes):
+        (tmp_path / 'a').mkdir()
+        (tmp_path / 'a' / 'ROST#069500').write_bytes(sample_roster_bytes)
+        (tmp_path / 'b').mkdir()
+        (tmp_path / 'b' / 'ROST#069500').write_bytes(
+            _roster_with_wizard(sample_roster_bytes, sample_character_bytes))
+        return tmp_path
+
+    def test_progress_file(self, sample_roster_file):
+        progress = progress_file(sample_roster_file)
+        assert progress['classes'] == {'Fighter': 1}
+        assert progress['races'] == {'Human': 1}
+        assert progress['marks_missing'] == ['Fire', 'Snake']
+
+    def test_summary(self, tmp_path, sample_roster_bytes, sample_character_bytes):
+        root = self._corpus(tmp_path, sample_roster_bytes, sample_character_bytes)
+        results = progress_paths([str(root), str(root / 'missing')], jobs=2)
+        summary = summarize_progress(results)
+        assert summary['files'] == 2 and summary['errors'] == 1
+        assert summary['characters'] == 3
+        assert summary['classes'] == {'Fighter': 2, 'Wizard': 1}
+        assert summary['missing_marks'] == {'Snake': 2, 'Fire': 1}
+        assert summary['most_missing_mark'] == 'Snake'
+        assert summary['most_missing_card'] == 'Death'
+        assert summary['pct']['exodus_ready'] == 0.0
+
+    def test_empty_summary(self):
+        summary = summarize_progress(iter([]))
+        assert summary['files'] == 0
+        assert summary['pct']['party_ready'] == 0.0
+        assert summary['most_missing_mark'] is None
+
+    def test_cmd_text(self, tmp_path, sample_roster_bytes, sample_character_bytes, capsys):
+        root = self._corpus(tmp_path, sample_roster_bytes, sample_character_bytes)
+        cmd_check_progress(argparse.Namespace(file=str(root), more_files=[str(root / 'nope')],
+                                              corpus=False, jobs=1, json=False, output=None))
+        captured = capsys.readouterr()
+        assert '2 roster(s), 3 character(s)' in captured.out
+        assert 'Most missing:   mark Snake, card Death' in captured.out
+        assert 'Errors:         1 file(s)' in captured.out
+        assert 'Warning:' in captured.err
+
+    def test_cmd_json_single_file_corpus(self, sample_roster_file, tmp_dir):
+        out = os.path.join(tmp_dir, 'summary.json')
+        cmd_check_progress(argparse.Namespace(file=sample_roster_file, corpus=True,
+                                              json=True, output=out))
+        with open(out) as f:
+            assert json.load(f)['files'] == 1
+
+    def test_cmd_text_no_characters(self, tmp_dir, capsys):
+        path = os.path.join(tmp_dir, 'ROST')
+        with open(path, 'wb') as f:
+            f.write(bytes(CHAR_RECORD_SIZE * 20))
+        cmd_check_progress(argparse.Namespace(file=path, corpus=True, json=False))
+        out = capsys.readouterr().out
+        assert 'Classes:        -' in out
+        assert 'Errors' not in out
+
+    def test_image_path_is_corpus(self, tmp_path, sample_roster_bytes, monkeypatch, capsys):
+        monkeypatch.setattr(query_mod, 'read_roster_source', lambda path: sample_roster_bytes)
+        cmd_check_progress(argparse.Namespace(file=str(tmp_path / 'game.po'), json=True, output=None))
+        assert json.loads(capsys.readouterr().out)['files'] == 1
@@ -0,0 +1,151 @@
+"""Tests for the tile-map raster operations."""
+
+import pytest
+
+from ult3edit.raster import (
+    clip_rect, fill_rect, remap_table, remap, replace_masked, copy_rect, paste,
+    find_all, changed_offsets, flood_fill, rect_mask, polygon_mask,
+)
+
+
+def _grid(width, height, tile=0):
+    return bytearray([tile]) * (width * height)
+
+
+class TestClipAndFill:
+    @pytest.mark.parametrize('rect, expected', [
+        ((1, 1, 2, 2), (1, 1, 2, 2)),
+        ((2, 3, 0, 1), (0, 1, 2, 3)),
+        ((-5, -5, 99, 99), (0, 0, 3, 3)),
+        ((4, 0, 9, 3), None),
+    ])
+    def test_clip_rect(self, rect, expected):
+        assert clip_rect(4, 4, *rect) == expected
+
+    def test_fill_rect(self):
+        buf = _grid(4, 3)
+        assert fill_rect(buf, 4, 1, 1, 9, 2, 7) == 6
+        assert buf == bytes([0, 0, 0, 0, 0, 7, 7, 7, 0, 7, 7, 7])
+        assert fill_rect(buf, 4, 5, 5, 6, 6, 1) == 0
+
+
+class TestRemap:
+    def test_remap_table(self):
+        table = remap_table({0x04: 0x0C, 0x00: 0x04})
+        assert len(table) == 256
+        assert bytes([0x00, 0x04, 0x08]).translate(table) == bytes([0x04, 0x0C, 0x08])
+
+    def test_many_pairs_at_once(self):
+        # Pairs apply simultaneously, not in sequence
+        buf = bytearray([0, 4, 4, 8, 0, 4])
+        assert remap(buf, 3, {0: 4, 4: 0}) == 5
+        assert buf == bytearray([4, 0, 0, 8, 4, 0])
+        assert remap(buf, 3, {8: 8}) == 0
+
+    def test_remap_in_rect(self):
+        buf = _grid(4, 4, 4)
+        assert remap(buf, 4, {4: 1}, (1, 1, 2, 2)) == 4
+        assert find_all(buf, 4, 1) == [(1, 1), (2, 1), (1, 2), (2, 2)]
+
+    def test_replace_masked(self):
+        buf = bytearray([4, 4, 4, 4, 0, 4, 4, 4, 4])
+        mask = bytes([1, 0, 0, 0, 9, 9, 0, 0, 1])
+        assert replace_masked(buf, 3, mask, {4: 8}) == 3
+        assert buf == bytearray([8, 4, 4, 4, 0, 8, 4, 4, 8])
+        assert replace_masked(buf, 3, bytes(9), {4: 8}) == 0
+        assert replace_masked(buf, 3, b'\x01' * 9, {4: 8}, (0, 0, 0, 2)) == 2
+        assert buf[0::3] == bytes([8, 8, 8])
+
+
+class TestCopyPaste:
+    def test_copy_rect(self):
+        buf = bytearray(range(16))
+        assert copy_rect(buf, 4, 1, 1, 2, 3) == (2, 3, bytes([5, 6, 9, 10, 13, 14]))
+        assert copy_rect(buf, 4, 2, 2, 9, 9) == (2, 2, bytes([10, 11, 14, 15]))
+        assert copy_rect(buf, 4, 8, 8, 9, 9) == (0, 0, b'')
+
+    def test_paste_clips_at_edges(self):
+        buf = _grid(4, 4)
+        patch = (2, 2, bytes([1, 2, 3, 4]))
+        assert paste(buf, 4, patch, 3, 3) == 1
+        assert buf[15] == 1
+        assert paste(buf, 4, patch, -1, -1) == 1
+        assert buf[0] == 4
+        assert paste(buf, 4, patch, 9, 9) == 0
+        assert paste(buf, 4, (0, 0, b''), 0, 0) == 0
+
+    @pytest.mark.parametrize('transparent', [0, 5])
+    def test_stamp_skips_transparent(self, transparent):
+        buf = _grid(3, 2, 9)
+        patch = (3, 1, bytes([1, transparent, 2]))
+        assert paste(buf, 3, patch, 0, 1, transparent=transparent) == 2
+        assert buf == bytearray([9, 9, 9, 1, 9, 2])
+
+    def test_copy_between_maps(self):
+        src = bytearray(range(64))
+        dst = _grid(16, 16)
+        assert paste(dst, 16, copy_rect(src, 8, 0, 0, 7, 7), 4, 4) == 64
+        assert copy_rect(dst, 16, 4, 4, 11, 11)[2] == bytes(src)
+
+
+class TestFindAndDiff:
+    def test_find_all(self):
+        buf = bytearray([4, 0, 4, 0, 4, 4])
+        assert find_all(buf, 3, 4) == [(0, 0), (2, 0), (1, 1), (2, 1)]
+        assert find_all(buf, 3, 4, (1, 0, 2, 1)) == [(2, 0), (1, 1), (2, 1)]
+        assert find_all(buf, 3, 7) == []
+
+    def test_changed_offsets(self):
+        assert changed_offsets(bytes([1, 2, 3, 4]), bytes([1, 9, 9, 4])) == [1, 2]
+        assert changed_offsets(bytes(4), bytes(4)) == []
+
+
+class TestFloodFill:
+    def _reference(self, buf, width, x, y):
+        """Cells 4-connected to (x, y) with the same tile (plain BFS)."""
+        height = len(buf) // width
+        target = buf[y * width + x]
+        seen, todo = {(x, y)}, [(x, y)]
+        while todo:
+            cx, cy = todo.pop()
+            for nx, ny in ((cx + 1, cy), (cx - 1, cy), (cx, cy + 1), (cx, cy - 1)):
+                if (0 <= nx < width and 0 <= ny < height and (nx, ny) not in seen
+                        and buf[ny * width + nx] == target):
+                    seen.add((nx, ny))
+                    todo.append((nx, ny))
+        return seen
+
+    def test_matches_reference_on_maze(self):
+        import random
+        rng = random.Random(7)
+        buf = bytearray(rng.choice((0, 0, 0, 0x8C)) for _ in range(64 * 64))
+        buf[0] = 0
+        expected = self._reference(buf, 64, 0, 0)
+        assert flood_fill(buf, 64, 0, 0, 0x04) == len(expected)
+        assert {(i % 64, i // 64) for i, b in enumerate(buf) if b == 0x04} == expected
+
+    def test_noop_cases(self):
+        buf = bytearray(16)
+        assert flood_fill(buf, 4, 0, 0, 0) == 0
+        assert flood_fill(buf, 4, 4, 0, 1) == 0
+        assert buf == bytearray(16)
+
+    def test_u_shape_needs_several_seeds(self):
+        rows = ['.#..', '.#.#', '...#', '##..']
+        buf = bytearray(b''.join(r.encode() for r in rows))
+        assert flood_fill(buf, 4, 0, 0, ord('~')) == 10
+        assert buf.decode() == '~#~~' '~#~#' '~~~#' '##~~'
+
+
+class TestMasks:
+    def test_rect_mask(self):
+        assert rect_mask(3, 2, 1, 0, 5, 0) == bytearray([0, 1, 1, 0, 0, 0])
+
+    def test_polygon_mask(self):
+        square = polygon_mask(8, 8, [(1, 1), (6, 1), (6, 6), (1, 6)])
+        assert sum(square) == 36 and square[0] == 0 and square[9] == 1
+        triangle = polygon_mask(4, 4, [(0, 0), (3, 0), (0, 3)])
+        assert triangle == bytearray([1, 1, 1, 1, 1, 1, 1, 0, 1, 1, 0, 0, 1, 0, 0, 0])
+        assert polygon_mask(4, 4, []) == bytearray(16)
+        # Vertices off the map are clipped
+        assert sum(polygon_mask(4, 4, [(-2, -2), (9, -2), (9, 9), (-2, 9)])) == 16
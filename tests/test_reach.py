@@ -0,0 +1,274 @@
+"""Tests for map reachability analysis."""
+
+import random
+from pathlib import Path
+
+import pytest
+
+from ult3edit.constants import MAP_OVERWORLD_SIZE, MAP_DUNGEON_SIZE, PRTY_FILE_SIZE
+from ult3edit.patch import PATCHABLE_REGIONS
+from ult3edit.reach import (
+    _WALK, tile_bits, cells, edge_bits, flood, components,
+    analyze_overworld, analyze_town, analyze_dungeon, analyze_game,
+    load_moongates, format_text,
+)
+
+
+def _grid(rows, legend):
+    """Overworld-style bytes from rows of characters mapped through legend."""
+    return bytes(legend[ch] for row in rows for ch in row)
+
+
+def _overworld(fill=0x04):
+    return bytearray([fill]) * MAP_OVERWORLD_SIZE
+
+
+def _dungeon():
+    return bytearray(MAP_DUNGEON_SIZE)
+
+
+class TestBitsets:
+    def test_tile_bits_and_cells(self):
+        data = bytes([0x04, 0x10, 0x05, 0x00])
+        bits = tile_bits(data, _WALK)
+        assert bits == 0b0101
+        assert cells(bits) == [0, 2]
+        assert tile_bits(b'', _WALK) == 0
+        assert cells(0) == []
+
+    def test_edge_bits(self):
+        assert cells(edge_bits(3, 3)) == [0, 1, 2, 3, 5, 6, 7, 8]
+
+    def test_flood_does_not_wrap_rows(self):
+        # Cell (3, 0) and (0, 1) are adjacent in memory but not on the map
+        rows = ['...#', '#..#', '#...']
+        passable = tile_bits(_grid(rows, {'.': 0x04, '#': 0x10}), _WALK)
+        assert cells(flood(1 << 3 | 1 << 4, passable, 4, 3)) == []
+        assert flood(1, passable, 4, 3) == passable
+
+    def test_flood_matches_reference_bfs(self):
+        rng = random.Random(3)
+        width, height = 64, 64
+        data = bytes(rng.choice((0x04, 0x04, 0x10)) for _ in range(width * height))
+        passable = tile_bits(data, _WALK)
+        seed = cells(passable)[0]
+        seen, todo = {seed}, [seed]
+        while todo:
+            i = todo.pop()
+            x, y = i % width, i // width
+            for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+                j = ny * width + nx
+                if 0 <= nx < width and 0 <= ny < height and j not in seen and data[j] == 0x04:
+                    seen.add(j)
+                    todo.append(j)
+        assert cells(flood(1 << seed, passable, width, height)) == sorted(seen)
+
+    def test_layers_are_separate_without_links(self):
+        passable = (1 << 8) - 1  # two 2x2 layers, all open
+        assert flood(1, passable, 2, 2, layers=2) == 0b1111
+        assert flood(1, passable, 2, 2, layers=2, link=lambda r: (r & 1) << 4) == 0xFF
+
+    def test_components_largest_first(self):
+        rows = ['..#.', '..#.', '####']
+        passable = tile_bits(_grid(rows, {'.': 0x04, '#': 0x10}), _WALK)
+        comps = components(passable, 4, 3)
+        assert [c.bit_count() for c in comps] == [4, 2]
+        assert components(0, 4, 3) == []
+
+
+class TestOverworld:
+    def test_open_map_is_clean(self):
+        data = _overworld()
+        data[10 * 64 + 10] = 0x18
+        result = analyze_overworld(data, start=(32, 32))
+        assert result['issues'] == []
+        assert result['components'] == 1
+        assert result['reachable'] == result['passable'] == 4096
+        assert result['entrances'] == {'foot': 1, 'ship': 0, 'unreachable': 0}
+
+    def test_island_town_needs_ship(self):
+        data = _overworld(0x00)
+        data[0:10] = b'\x04' * 10              # mainland strip
+        data[20 * 64 + 20] = 0x18             # town on an island
+        data[40 * 64 + 40] = 0x1C             # castle ringed by mountains
+        for dy in (-1, 0, 1):
+            for dx in (-1, 0, 1):
+                if dx or dy:
+                    data[(40 + dy) * 64 + 40 + dx] = 0x10
+        result = analyze_overworld(data, start=(0, 0))
+        assert result['entrances'] == {'foot': 0, 'ship': 1, 'unreachable': 1}
+        assert result['issues'] == [{'entity': 'Castle (40, 40)',
+                                     'message': 'unreachable on foot or by ship'}]
+
+    def test_start_checks(self):
+        data = _overworld(0x00)
+        assert analyze_overworld(data, start=(5, 5))['issues'][0] == {
+            'entity': 'Start', 'message': '(5, 5) is on Water'}
+        assert analyze_overworld(data, start=(5, 5), ship=True)['issues'] == []
+        assert analyze_overworld(data, start=(70, 5))['issues'][0]['message'] == \
+            '(70, 5) is off the map'
+
+    def test_moongates_link_islands(self):
+        data = _overworld(0x00)
+        data[0:2] = b'\x04\x04'
+        data[63 * 64 + 62:] = b'\x04\x18'
+        gates = [(1, 0), (62, 63)]
+        linked = analyze_overworld(data, start=(0, 0), moongates=gates)
+        assert linked['entrances']['foot'] == 1
+        assert analyze_overworld(data, start=(0, 0))['entrances']['foot'] == 0
+
+    def test_bad_moongates(self):
+        data = _overworld(0x04)
+        data[0] = 0x10
+        data[64 * 63:] = b'\x10' * 64
+        data[64 * 62:64 * 63] = b'\x04' * 64
+        data[64 * 61:64 * 62] = b'\x10' * 64   # gate row walled off from the start
+        result = analyze_overworld(data, start=(5, 5),
+                                   moongates=[(0, 0), (80, 1), (3, 62)])
+        assert [i['message'] for i in result['issues']] == [
+            '(0, 0) is on Mountains', '(80, 1) is off the map', 'no moongate is reachable']
+
+    def test_without_start_uses_largest_region(self):
+        data = _overworld(0x10)
+        data[0:3] = b'\x04\x04\x04'
+        data[100] = 0x04
+        assert analyze_overworld(data)['reachable'] == 3
+        assert analyze_overworld(_overworld(0x10))['reachable'] == 0
+
+
+class TestTown:
+    def test_walled_chest(self):
+        rows = ['.' * 8, '.####...', '.#$#....', '.####.$.']
+        rows = [row.ljust(64, '#') for row in rows] + ['#' * 64] * 60
+        legend = {'.': 0x20, '#': 0x8C, '$': 0x24}
+        result = analyze_town(_grid(rows, legend))
+        assert result['issues'] == [{'entity': 'Chest (2, 2)',
+                                     'message': 'unreachable from the map edge'}]
+        assert result['components'] == 2
+
+    def test_no_way_in(self):
+        data = bytearray(b'\x8C' * 64 * 64)
+        data[32 * 64 + 32] = 0x20
+        assert analyze_town(data)['issues'][0]['entity'] == 'Edge'
+
+
+class TestDungeon:
+    def test_linked_levels(self):
+        data = _dungeon()
+        data[0] = 0x06                         # exit on level 0
+        for level in range(7):
+            data[level * 256 + 17] = 0x07 if level else 0x05
+            data[(level + 1) * 256 + 17] = 0x06
+        data[7 * 256 + 200] = 0x04             # chest on the bottom level
+        result = analyze_dungeon(data)
+        assert result['issues'] == []
+        assert result['components'] == 1
+        assert result['reachable'] == 2048
+
+    def test_sealed_ladders_and_lost_levels(self):
+        data = _dungeon()
+        data[0] = 0x06
+        data[5] = 0x05                         # leads to Open on level 1
+        data[256:512] = b'\x01' * 256          # level 1 is solid rock...
+        data[256 + 5] = 0x00                   # ...except under the ladder
+        data[2 * 256 + 9] = 0x06               # up ladder into rock
+        data[7 * 256 + 3] = 0x05               # down ladder off the bottom
+        data[3 * 256:4 * 256] = b'\x01' * 256  # level 3 solid
+        messages = [f"{i['entity']}: {i['message']}" for i in analyze_dungeon(data)['issues']]
+        assert messages == [
+            'Level 0 (5, 0): ladder down leads to Open',
+            'Level 7 (3, 0): ladder down leads to nothing (last level)',
+            'Level 2 (9, 0): ladder up leads to Wall',
+            'Level 1: unreachable from the entrance',
+            'Level 2: unreachable from the entrance',
+            'Level 4: unreachable from the entrance',
+            'Level 5: unreachable from the entrance',
+            'Level 6: unreachable from the entrance',
+            'Level 7: unreachable from the entrance',
+        ]
+
+    def test_unreachable_features(self):
+        data = _dungeon()
+        data[0] = 0x06
+        data[16 * 8:16 * 9] = b'\x01' * 16     # wall across level 0
+        data[16 * 12] = 0x09
+        data[16 * 12 + 1] = 0x04
+        data[16 * 12 + 2] = 0x04
+        issues = analyze_dungeon(data[:256])['issues']
+        assert issues == [{'entity': 'Level 0', 'message': '2 Chest(s) unreachable'},
+                          {'entity': 'Level 0', 'message': '1 Fountain(s) unreachable'}]
+
+    def test_no_exit(self):
+        issues = analyze_dungeon(_dungeon())['issues']
+        assert issues[0] == {'entity': 'Level 0', 'message': 'no ladder up (no way in or out)'}
+
+    def test_shorter_than_a_level(self):
+        result = analyze_dungeon(_dungeon()[:100])
+        assert result == {'components': 0, 'passable': 0, 'reachable': 0, 'issues': []}
+
+
+class TestAnalyzeGame:
+    def test_moongates(self):
+        regions = PATCHABLE_REGIONS['ULT3']
+        data = bytearray(17408)
+        data[regions['moongate-x']['offset']] = 7
+        data[regions['moongate-y']['offset']] = 9
+        assert load_moongates(data)[0] == (7, 9)
+        assert len(load_moongates(data)) == 8
+        assert load_moongates(b'\x00' * 100) == []
+        assert load_moongates(None) == []
+
+    def test_game_dir(self, sample_game_dir, sample_overworld_bytes, sample_dungeon_bytes):
+        Path(sample_game_dir, 'MAPA#060000').write_bytes(sample_overworld_bytes)
+        Path(sample_game_dir, 'MAPB#060000').write_bytes(sample_overworld_bytes)
+        Path(sample_game_dir, 'MAPM#060000').write_bytes(sample_dungeon_bytes)
+        ult3 = bytearray(17408)
+        ult3[0x29A7:0x29AF] = bytes(range(8, 16))
+        ult3[0x29AF:0x29B7] = bytes([20] * 8)
+        Path(sample_game_dir, 'ULT3#065000').write_bytes(ult3)
+        report = analyze_game(sample_game_dir)
+        assert [m['file'] for m in report['maps']] == ['MAPA', 'MAPB', 'MAPM']
+        assert [m['type'] for m in report['maps']] == ['overworld', 'town', 'dungeon']
+        mapa, mapb, mapm = report['maps']
+        assert mapa['issues'] == [] and mapa['entrances']['foot'] == 1
+        assert mapb['issues'] == []
+        # The sample dungeon has no ladders at all
+        assert mapm['issues'][0]['message'] == 'no ladder up (no way in or out)'
+        assert report['issue_count'] == len(mapm['issues'])
+        text = format_text(report)
+        assert 'MAPA   Sosaria (Overworld)' in text
+        assert 'entrances: 1 on foot, 0 by ship, 0 unreachable' in text
+        assert f"Total: {report['issue_count']} issue(s) in 3 map(s)" in text
+
+    @pytest.mark.parametrize('size', [100, 3000, 5000])
+    def test_wrong_size_map(self, tmp_dir, size):
+        Path(tmp_dir, 'MAPA').write_bytes(bytes(size))
+        report = analyze_game(tmp_dir)
+        assert report['maps'][0]['type'] == 'unknown'
+        assert report['maps'][0]['issues'] == [
+            {'entity': 'File', 'message': f'{size} bytes (expected 2048 or 4096)'}]
+        assert report['issue_count'] == 1
+        assert '1 issue(s)' in format_text(report)
+
+    def test_party_start(self, tmp_dir):
+        prty = bytearray(PRTY_FILE_SIZE)
+        prty[0], prty[2], prty[3], prty[4] = 0x0B, 0xFF, 1, 1   # afloat off Ambrosia
+        Path(tmp_dir, 'PRTY#060000').write_bytes(prty)
+        Path(tmp_dir, 'MAPA').write_bytes(_overworld(0x00))
+        Path(tmp_dir, 'MAPL').write_bytes(_overworld(0x00))
+        report = analyze_game(tmp_dir)
+        # Sosaria has no start; Ambrosia's start is on water but the party has a ship
+        assert report['issue_count'] == 0
+        prty[0] = 0x01
+        Path(tmp_dir, 'PRTY#060000').write_bytes(prty)
+        maps = analyze_game(tmp_dir)['maps']
+        assert maps[1]['issues'][0]['entity'] == 'Start'
+
+    @pytest.mark.parametrize('location,issues', [(0x00, 1), (0x01, 0), (0x02, 0), (0x80, 0)])
+    def test_party_start_only_on_overworld(self, tmp_dir, location, issues):
+        prty = bytearray(PRTY_FILE_SIZE)
+        prty[0], prty[2], prty[3], prty[4] = 0x01, location, 5, 5
+        Path(tmp_dir, 'PRTY#060000').write_bytes(prty)
+        Path(tmp_dir, 'MAPA').write_bytes(_overworld(0x00))
+        report = analyze_game(tmp_dir)
+        assert report['issue_count'] == issues
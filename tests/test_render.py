@@ -0,0 +1,137 @@
+"""Tests for glyph-atlas map image rendering."""
+
+import os
+import struct
+import zlib
+
+import pytest
+
+from ult3edit.constants import MAP_OVERWORLD_SIZE, MAP_DUNGEON_SIZE
+from ult3edit.render import (
+    GlyphAtlas, TILE_COLORS, DUNGEON_GLYPHS, get_atlas, render_map_image,
+    render_png, render_many,
+)
+from ult3edit.shapes import HGR_COLORS, GLYPH_WIDTH, glyph_to_pixels
+
+
+def _shps():
+    """SHPS data where glyph i has row r set to (i + r) & 0x7F."""
+    return bytes((i + r) & 0x7F for i in range(256) for r in range(8))
+
+
+def _decode_png(blob):
+    """(width, height, raw rows) of an 8-bit RGB PNG written by encode_png."""
+    width, height = struct.unpack('>II', blob[16:24])
+    length = struct.unpack('>I', blob[33:37])[0]
+    raw = zlib.decompress(blob[41:41 + length])
+    stride = width * 3 + 1
+    rows = [raw[y * stride:(y + 1) * stride] for y in range(height)]
+    assert all(r[0] == 0 for r in rows)
+    return width, height, [r[1:] for r in rows]
+
+
+class TestGlyphAtlas:
+    def test_strips_match_glyph_pixels(self):
+        shps = _shps()
+        atlas = GlyphAtlas(shps)
+        for tile in (0x00, 0x04, 0x8C, 0xFF):
+            fg = TILE_COLORS.get(tile & 0xFC, HGR_COLORS['white'])
+            pixels = glyph_to_pixels(shps, tile * 8, fg=fg)
+            for r in range(8):
+                expected = bytes(c for px in pixels[r * GLYPH_WIDTH:(r + 1) * GLYPH_WIDTH]
+                                 for c in px)
+                assert atlas.rows[r][tile] == expected
+
+    def test_scale_widens_strips(self):
+        atlas = GlyphAtlas(b'\x01' * 2048, scale=3)
+        assert len(atlas.rows[0][0x8C]) == GLYPH_WIDTH * 3 * 3
+        assert atlas.rows[0][0x8C][:9] == bytes(HGR_COLORS['white']) * 3
+
+    def test_dungeon_glyphs(self):
+        shps = _shps()
+        atlas = GlyphAtlas(shps, dungeon=True)
+        glyph, color = DUNGEON_GLYPHS[0x01]
+        assert atlas.rows[0][0x01] == atlas.rows[0][0xF1]  # high nibble ignored
+        expected = glyph_to_pixels(shps, glyph * 8, fg=HGR_COLORS[color])[:GLYPH_WIDTH]
+        assert atlas.rows[0][0x01] == bytes(c for px in expected for c in px)
+
+    def test_short_shps_renders_blank(self):
+        atlas = GlyphAtlas(b'')
+        assert atlas.rows[0][0x04] == bytes(3 * GLYPH_WIDTH)
+
+    def test_cached_by_content(self):
+        shps = _shps()
+        assert get_atlas(shps) is get_atlas(bytes(shps))
+        assert get_atlas(shps, scale=2) is not get_atlas(shps)
+
+
+class TestRenderMapImage:
+    def test_overworld_size_and_rows(self):
+        shps = _shps()
+        data = bytes(range(64)) * 64
+        rows, width, height = render_map_image(data, shps)
+        assert (width, height) == (448, 512)
+        atlas = get_atlas(shps)
+        # Row 8 is pixel row 0 of map row 1, which starts with tile 0
+        assert rows[8][:21] == atlas.rows[0][0]
+        assert rows[7][21:42] == atlas.rows[7][1]
+
+    def test_dungeon_level_and_stack(self):
+        shps = _shps()
+        data = bytearray(MAP_DUNGEON_SIZE)
+        data[3 * 256] = 0x01
+        rows, width, height = render_map_image(data, shps, level=3)
+        assert (width, height) == (112, 128)
+        assert rows[0][:21] == get_atlas(shps, dungeon=True).rows[0][0x01]
+        assert render_map_image(data, shps)[1:] == (112, 1024)
+
+    def test_mip_thumbnail(self):
+        data = bytearray(MAP_OVERWORLD_SIZE)
+        data[:8] = b'\x04' * 8
+        data[64:72] = b'\x04' * 8
+        rows, width, height = render_map_image(data, _shps(), mip=8)
+        assert (width, height) == (56, 64)
+        atlas = get_atlas(_shps())
+        assert rows[0][:21] == atlas.rows[0][0x00]   # 2 of 8 rows grass: still water
+        rows = render_map_image(data, _shps(), mip=2)[0]
+        assert rows[0][:21] == atlas.rows[0][0x04]
+
+    def test_scale(self):
+        rows, width, height = render_map_image(bytes(MAP_OVERWORLD_SIZE), _shps(), scale=2)
+        assert (width, height) == (896, 1024)
+        assert rows[0] == rows[1] and len(rows[0]) == 896 * 3
+
+
+class TestRenderFiles:
+    def _files(self, tmp_path, count=1):
+        shps = tmp_path / 'SHPS'
+        shps.write_bytes(_shps())
+        maps = []
+        for i in range(count):
+            path = tmp_path / f'MAP{"ABCD"[i]}'
+            path.write_bytes(bytes([i * 4]) * MAP_OVERWORLD_SIZE)
+            maps.append(str(path))
+        return str(shps), maps
+
+    def test_render_png_round_trip(self, tmp_path):
+        shps, (mapa,) = self._files(tmp_path)
+        out = str(tmp_path / 'out' / 'a.png')
+        assert render_png(mapa, out, shps) == (out, 448, 512)
+        with open(out, 'rb') as f:
+            width, height, rows = _decode_png(f.read())
+        assert (width, height) == (448, 512)
+        assert rows == render_map_image(bytes(MAP_OVERWORLD_SIZE), _shps())[0]
+
+    def test_render_png_in_cwd(self, tmp_path, monkeypatch):
+        shps, (mapa,) = self._files(tmp_path)
+        monkeypatch.chdir(tmp_path)
+        render_png(mapa, 'plain.png', shps)
+        assert os.path.exists(tmp_path / 'plain.png')
+
+    @pytest.mark.parametrize('jobs', [1, 2])
+    def test_render_many(self, tmp_path, jobs):
+        shps, maps = self._files(tmp_path, 3)
+        tasks = [(m, str(tmp_path / f'{i}.png'), shps, None, 1) for i, m in enumerate(maps)]
+        results = render_many(tasks, jobs)
+        assert [r[0] for r in results] == [t[1] for t in tasks]
+        assert all(os.path.getsize(t[1]) > 0 for t in tasks)
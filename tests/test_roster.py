@@ -7,13 +7,13 @@ import tempfile
 
 import pytest
 
-from ult3edit.roster import Character, load_roster, save_roster, cmd_edit, cmd_create, cmd_import, cmd_check_progress, check_progress, validate_character
+from ult3edit.roster import CHARACTER_LAYOUT, Character, Roster, load_roster, save_roster, cmd_edit, cmd_create, cmd_import, cmd_check_progress, check_progress, validate_character
 from ult3edit.bcd import int_to_bcd, int_to_bcd16
 from ult3edit.constants import (
     CHAR_CLASS, CHAR_GENDER, CHAR_HP_HI, CHAR_HP_LO, CHAR_IN_PARTY,
     CHAR_MARKS_CARDS, CHAR_MAX_SLOTS, CHAR_NAME_OFFSET, CHAR_RACE,
     CHAR_READIED_WEAPON, CHAR_RECORD_SIZE, CHAR_STATUS, CHAR_STR,
-    CHAR_WORN_ARMOR, ROSTER_FILE_SIZE,
+    CHAR_WEAPON_START, CHAR_WORN_ARMOR, ROSTER_FILE_SIZE, WEAPONS, ARMORS,
 )
 from ult3edit.tui.roster_editor import make_roster_tab
 
@@ -155,6 +155,24 @@ class TestToDict:
         assert d['stats']['str'] == 25
         assert d['hp'] == 150
 
+    def test_bulk_decode_matches_properties(self, sample_character_bytes):
+        """to_dict's one-pass BCD decode agrees with the property getters."""
+        char = Character(sample_character_bytes)
+        char.exp = 1234
+        char.mp = 42
+        char.gems = 7
+        char.sub_morsels = 55
+        char.set_weapon_count(3, 12)
+        char.set_armor_count(2, 4)
+        d = char.to_dict()
+        assert d['stats'] == {'str': char.strength, 'dex': char.dexterity,
+                              'int': char.intelligence, 'wis': char.wisdom}
+        for key in ('hp', 'max_hp', 'mp', 'exp', 'gold', 'food', 'gems',
+                    'keys', 'powders', 'torches', 'sub_morsels'):
+            assert d[key] == getattr(char, key)
+        assert d['weapons'] == char.weapon_inventory == {WEAPONS[3]: 12}
+        assert d['armors'] == char.armor_inventory == {ARMORS[2]: 4}
+
 
 class TestLoadSave:
     def test_load_roster(self, sample_roster_file):
@@ -174,6 +192,81 @@ class TestLoadSave:
         assert chars2[0].name == 'HERO'  # Other fields preserved
 
 
+class TestRosterBuffer:
+    def test_slots_are_views(self, sample_roster_bytes):
+        roster = Roster(sample_roster_bytes)
+        assert len(roster) == 20
+        assert isinstance(roster.data, bytearray)
+        roster[0].gold = 4321
+        assert roster.data[:CHAR_RECORD_SIZE] == roster[0].raw
+        assert Character(roster.data[:CHAR_RECORD_SIZE]).gold == 4321
+
+    def test_character_copies_non_views(self, sample_character_bytes):
+        buf = bytearray(sample_character_bytes)
+        char = Character(buf)
+        char.strength = 50
+        assert buf == sample_character_bytes
+        assert not hasattr(char, '__dict__')
+
+    def test_load_edit_save_single_buffer(self, sample_roster_file, tmp_dir):
+        roster = Roster.load(sample_roster_file)
+        assert roster.path == sample_roster_file
+        for char in roster:
+            char.torches = 9
+        out = os.path.join(tmp_dir, 'ROST_OUT')
+        roster.save(out)
+        with open(out, 'rb') as f:
+            assert f.read() == roster.data
+        roster.save()
+        assert Roster.load(sample_roster_file)[5].torches == 9
+
+    def test_setitem_copies_into_slot(self, sample_roster_bytes, sample_character_bytes):
+        roster = Roster(sample_roster_bytes)
+        view = roster[3]
+        roster[3] = Character(sample_character_bytes)
+        assert roster[3] is view
+        assert roster.data[3 * CHAR_RECORD_SIZE:4 * CHAR_RECORD_SIZE] == sample_character_bytes
+
+    def test_partial_record_ignored(self, sample_character_bytes):
+        roster = Roster(sample_character_bytes * 4 + b'\x00' * 10)
+        assert len(roster) == 4
+
+    def test_too_small(self, tmp_path):
+        path = tmp_path / 'ROST'
+        path.write_bytes(b'\x00' * 10)
+        with pytest.raises(ValueError, match='too small'):
+            Roster.load(str(path))
+        with pytest.raises(ValueError, match='too small'):
+            Roster.load(str(path), use_mmap=True)
+
+    def test_mmap_edits_write_through(self, sample_roster_file, capsys):
+        with Roster.load(sample_roster_file, use_mmap=True) as roster:
+            roster[0].gold = 777
+            roster.save()
+        assert 'Saved to' in capsys.readouterr().out
+        chars, _ = load_roster(sample_roster_file)
+        assert chars[0].gold == 777
+
+    def test_mmap_save_elsewhere(self, sample_roster_file, tmp_dir):
+        out = os.path.join(tmp_dir, 'COPY')
+        with Roster.load(sample_roster_file, use_mmap=True) as roster:
+            roster[1].name = 'NEW'
+            roster.save(out)
+        assert load_roster(out)[0][1].name == 'NEW'
+
+    def test_mmap_read_only(self, sample_roster_file):
+        with Roster.load(sample_roster_file, use_mmap=True, writable=False) as roster:
+            assert roster[0].name == 'HERO'
+            with pytest.raises(TypeError):
+                roster[0].gold = 1
+
+    def test_close_releases_views(self, sample_roster_bytes):
+        roster = Roster(sample_roster_bytes)
+        roster.close()
+        with pytest.raises(ValueError):
+            roster[0].raw[0]
+
+
 def _edit_args(**kwargs):
     """Build an argparse.Namespace with all roster edit args defaulting to None."""
     defaults = dict(
@@ -191,6 +284,46 @@ def _edit_args(**kwargs):
     return argparse.Namespace(**defaults)
 
 
+class TestRecordLayout:
+    def test_descriptors_compiled_from_table(self):
+        assert {f.attr for f in CHARACTER_LAYOUT} <= set(dir(Character))
+        assert Character.hp in CHARACTER_LAYOUT
+        offsets = {f.offset for f in CHARACTER_LAYOUT}
+        assert CHAR_STR in offsets and CHAR_WEAPON_START in offsets
+
+    def test_inventory_read_only(self, sample_character_bytes):
+        char = Character(sample_character_bytes)
+        with pytest.raises(AttributeError, match='read-only'):
+            char.weapon_inventory = {}
+
+    def test_from_dict_roundtrip(self, sample_character_bytes):
+        char = Character(sample_character_bytes)
+        clone = Character.from_dict(char.to_dict())
+        assert clone.to_dict() == char.to_dict()
+        assert bytes(clone.raw) == bytes(char.raw)
+
+    def test_from_dict_unknown_weapon_raises(self):
+        with pytest.raises(ValueError, match="Unknown weapon 'Laser'"):
+            Character.from_dict({'name': 'X', 'weapon': 'Laser'})
+
+    def test_apply_dict_warnings(self, sample_character_bytes):
+        char = Character(sample_character_bytes)
+        warnings = char.apply_dict({'armor': 'Cape', 'armors': {'Cape': 1}, 'hp': 300},
+                                   where=' in slot 2')
+        assert warnings == ["Unknown armor 'Cape' in slot 2",
+                            "Unknown armor 'Cape' in slot 2 inventory"]
+        assert char.hp == 300 and char.max_hp == 300
+
+    def test_to_records(self, sample_roster_bytes):
+        roster = Roster(sample_roster_bytes)
+        records = roster.to_records()
+        assert [r['slot'] for r in records] == [0]
+        expected = roster[0].to_dict()
+        expected['slot'] = 0
+        assert records[0] == expected
+        assert len(roster.to_records(include_empty=True)) == 20
+
+
 class TestCmdEdit:
     def test_edit_name(self, sample_roster_file, tmp_dir):
         out = os.path.join(tmp_dir, 'ROST_OUT')
@@ -344,6 +477,65 @@ class TestBulkRosterEdit:
         assert chars2[1].gold == 500
 
 
+class TestWhereEdit:
+    def _make(self, directory, name, sample_character_bytes):
+        data = bytearray(ROSTER_FILE_SIZE)
+        for slot, status in ((0, 'D'), (1, 'G'), (4, 'D')):
+            char = Character(sample_character_bytes)
+            char.status = status
+            char.max_hp = 400
+            char.hp = 0 if status == 'D' else 120
+            data[slot * CHAR_RECORD_SIZE:(slot + 1) * CHAR_RECORD_SIZE] = char.raw
+        path = os.path.join(directory, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def test_where_edits_matching_slots_across_files(self, tmp_dir, sample_character_bytes, capsys):
+        paths = [self._make(tmp_dir, n, sample_character_bytes) for n in ('ROST1', 'ROST2')]
+        args = _edit_args(file=paths[0], more_files=paths[1:], slot=None, all=False,
+                          where='status=Dead', status='Good', hp='max_hp',
+                          backup=True, dry_run=False)
+        cmd_edit(args)
+        out = capsys.readouterr().out
+        assert f'=== {paths[1]} ===' in out
+        for path in paths:
+            assert os.path.exists(path + '.bak')
+            chars, _ = load_roster(path)
+            assert [(c.status, c.hp) for c in chars[:5] if not c.is_empty] == \
+                [('Good', 400), ('Good', 120), ('Good', 400)]
+
+    def test_field_values_read_before_edits(self, tmp_dir, sample_character_bytes):
+        path = self._make(tmp_dir, 'ROST', sample_character_bytes)
+        cmd_edit(_edit_args(file=path, slot=1, max_hp=999, hp='max_hp', gold='hp',
+                            backup=False, dry_run=False))
+        char = load_roster(path)[0][1]
+        assert (char.hp, char.max_hp, char.gold) == (400, 999, 120)
+
+    def test_where_no_match(self, tmp_dir, sample_character_bytes, capsys):
+        path = self._make(tmp_dir, 'ROST', sample_character_bytes)
+        cmd_edit(_edit_args(file=path, slot=None, where='class=Wizard', gold=5))
+        assert 'No matching characters.' in capsys.readouterr().out
+
+    @pytest.mark.parametrize('kw, message', [
+        ({'slot': 0, 'where': 'hp>0'}, 'cannot be combined'),
+        ({'slot': None, 'where': 'hp>'}, 'Invalid --where'),
+        ({'slot': None, 'all': True, 'more_files': ['x'], 'output': 'o'}, 'single roster file'),
+    ])
+    def test_where_errors(self, kw, message, capsys):
+        with pytest.raises(SystemExit):
+            cmd_edit(_edit_args(file='ROST', gold=1, **kw))
+        assert message in capsys.readouterr().err
+
+    def test_int_or_field_type(self):
+        from ult3edit.roster import _int_or_field
+        assert _int_or_field('12') == 12
+        assert _int_or_field('MAX_HP') == 'max_hp'
+        assert _int_or_field('strength') == 'strength'
+        with pytest.raises(argparse.ArgumentTypeError):
+            _int_or_field('name')
+
+
 # =============================================================================
 # Roster JSON import
 # =============================================================================
@@ -2110,3 +2110,146 @@ class TestSaveMain:
         main()
         captured = capsys.readouterr()
         assert 'Usage' in captured.err
+
+
+class TestSaveHistory:
+    """save history add/log/show/diff."""
+
+    def _run(self, monkeypatch, *argv):
+        import sys
+        from ult3edit.cli import main
+        monkeypatch.setattr(sys, 'argv', ['ult3edit', 'save', 'history', *argv])
+        main()
+
+    def _bump_x(self, game_dir, x):
+        path = os.path.join(game_dir, 'PRTY#060000')
+        with open(path, 'r+b') as f:
+            f.seek(PRTY_OFF_SAVED_X)
+            f.write(bytes([x]))
+
+    def test_add_log_show_diff(self, sample_game_dir, tmp_dir, monkeypatch, capsys):
+        store = os.path.join(tmp_dir, 'history')
+        self._run(monkeypatch, 'add', store, sample_game_dir, '--tag', 'start')
+        out = capsys.readouterr().out
+        assert '#0 PRTY' in out and '#2 ROST' in out and '3 snapshot(s)' in out
+        self._bump_x(sample_game_dir, 40)
+        self._run(monkeypatch, 'add', store, os.path.join(sample_game_dir, 'PRTY#060000'))
+        capsys.readouterr()
+
+        self._run(monkeypatch, 'log', store, '--file', 'prty')
+        out = capsys.readouterr().out
+        assert '#0' in out and '[start]' in out and '2 snapshot(s)' in out
+
+        self._run(monkeypatch, 'diff', store, 'start', '3', '--file', 'PRTY')
+        out = capsys.readouterr().out
+        assert '#0 -> #3' in out and 'x: 32 -> 40' in out
+
+        self._run(monkeypatch, 'diff', store, '3', '--json')
+        result = json.loads(capsys.readouterr().out)
+        assert result['files'][0]['entities'][0]['changes'] == [
+            {'field': 'x', 'old': 32, 'new': 40}]
+
+        self._run(monkeypatch, 'show', store, '3')
+        shown = json.loads(capsys.readouterr().out)
+        assert shown['file'] == 'PRTY' and shown['data']['x'] == 40
+
+        raw = os.path.join(tmp_dir, 'ROST.out')
+        self._run(monkeypatch, 'show', store, 'start', '--file', 'ROST', '--raw', '-o', raw)
+        with open(raw, 'rb') as f, open(os.path.join(sample_game_dir, 'ROST#069500'), 'rb') as g:
+            assert f.read() == g.read()
+
+        log_json = os.path.join(tmp_dir, 'log.json')
+        self._run(monkeypatch, 'log', store, '--tag', 'start', '--json', '-o', log_json)
+        with open(log_json) as f:
+            assert [s['file'] for s in json.load(f)] == ['PRTY', 'PLRS', 'ROST']
+
+    @pytest.mark.parametrize('argv, message', [
+        (('show', '{store}', 'nope'), "No snapshot matches 'nope'"),
+        (('show', '{store}', '0', '--raw'), '--raw requires --output'),
+        (('diff', '{store}', '0'), 'no earlier PRTY snapshot'),
+        (('diff', '{store}', '0', '1'), 'Cannot diff PRTY against PLRS'),
+        (('add', '{store}', '{tmp}/MONA'), 'No PRTY, PLRS or ROST files'),
+    ])
+    def test_errors(self, sample_game_dir, tmp_dir, monkeypatch, capsys, argv, message):
+        store = os.path.join(tmp_dir, 'history')
+        self._run(monkeypatch, 'add', store, sample_game_dir)
+        capsys.readouterr()
+        with pytest.raises(SystemExit):
+            self._run(monkeypatch, *(a.format(store=store, tmp=tmp_dir) for a in argv))
+        captured = capsys.readouterr()
+        assert message in captured.err
+
+    def test_bad_store_and_usage(self, tmp_dir, monkeypatch, capsys):
+        with open(os.path.join(tmp_dir, 'index.json'), 'w') as f:
+            json.dump({'version': -1}, f)
+        with pytest.raises(SystemExit):
+            self._run(monkeypatch, 'log', tmp_dir)
+        assert 'Unsupported history store' in capsys.readouterr().err
+        self._run(monkeypatch)
+        assert 'save history {add|log|show|diff}' in capsys.readouterr().err
+
+
+class TestSaveWatch:
+    """save watch streams NDJSON diffs."""
+
+    def _args(self, game_dir, **kw):
+        defaults = {'game_dir': game_dir, 'interval': 0.0, 'count': 1, 'output': None}
+        defaults.update(kw)
+        return argparse.Namespace(**defaults)
+
+    def _edit_on_sleep(self, monkeypatch, game_dir):
+        path = os.path.join(game_dir, 'PRTY#060000')
+        calls = []
+
+        def fake_sleep(_):
+            calls.append(1)
+            with open(path, 'r+b') as f:
+                f.seek(PRTY_OFF_SAVED_Y)
+                f.write(bytes([len(calls)]))
+            os.utime(path, ns=(2_000_000_000_000_000_000 + len(calls),) * 2)
+        monkeypatch.setattr('ult3edit.save.time.sleep', fake_sleep)
+
+    def test_streams_events(self, sample_game_dir, tmp_dir, monkeypatch, capsys):
+        from ult3edit.save import cmd_watch
+        self._edit_on_sleep(monkeypatch, sample_game_dir)
+        cmd_watch(self._args(sample_game_dir))
+        captured = capsys.readouterr()
+        event = json.loads(captured.out)
+        assert event['file'] == 'PRTY'
+        assert event['entities'][0]['changes'][0]['field'] == 'y'
+        assert 'Watching PLRS, PRTY, ROST' in captured.err
+
+        out = os.path.join(tmp_dir, 'events.ndjson')
+        cmd_watch(self._args(sample_game_dir, output=out))
+        with open(out) as f:
+            assert [json.loads(line)['event'] for line in f] == ['changed']
+
+    def test_interrupt_and_missing_dir(self, tmp_dir, monkeypatch, capsys):
+        import sys
+        from ult3edit.cli import main
+
+        def interrupt(_):
+            raise KeyboardInterrupt
+        monkeypatch.setattr('ult3edit.save.time.sleep', interrupt)
+        monkeypatch.setattr(sys, 'argv', ['ult3edit', 'save', 'watch', tmp_dir, '--count', '0'])
+        main()
+        assert 'nothing yet' in capsys.readouterr().err
+        with pytest.raises(SystemExit):
+            from ult3edit.save import cmd_watch
+            cmd_watch(self._args(os.path.join(tmp_dir, 'missing')))
+        assert 'is not a directory' in capsys.readouterr().err
+
+    @pytest.mark.parametrize('interval', ['-1', '0', 'nan', 'inf', 'soon'])
+    def test_rejects_bad_interval(self, tmp_dir, monkeypatch, capsys, interval):
+        import sys
+        from ult3edit.cli import main
+        monkeypatch.setattr(sys, 'argv', ['ult3edit', 'save', 'watch', tmp_dir,
+                                          '--interval', interval])
+        with pytest.raises(SystemExit) as exc_info:
+            main()
+        assert exc_info.value.code == 2
+        assert 'expected a positive number of seconds' in capsys.readouterr().err
+
+    def test_interval_type(self):
+        from ult3edit.save import _positive_float
+        assert _positive_float('0.25') == 0.25
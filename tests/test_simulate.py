@@ -0,0 +1,94 @@
+"""Tests for the encounter simulator."""
+
+import pytest
+
+from ult3edit.bestiary import load_monsters
+from ult3edit.roster import Character
+from ult3edit.simulate import (
+    MAX_ROUNDS, _attack_tables, select_party, party_stats, monster_stats, simulate_batch, simulate_groups,
+)
+
+
+@pytest.fixture
+def hero(sample_character_bytes):
+    return Character(bytearray(sample_character_bytes))
+
+
+class TestPartySelection:
+    def test_party_stats(self, hero):
+        hero.equipped_weapon = 'Sword'
+        hero.equipped_armor = 'Chain'
+        assert party_stats([hero]) == [(150, 30, 16, 12, 0.562)]
+
+    def test_skips_empty_and_dead(self, hero):
+        dead = Character(bytearray(hero.raw))
+        dead.hp = 0
+        assert len(party_stats([hero, dead, Character(bytearray(64))])) == 1
+
+    def test_select_party(self, hero):
+        chars = [Character(bytearray(64)), hero, Character(bytearray(hero.raw))]
+        assert select_party(chars) == chars[1:]
+        chars[2].in_party = True
+        assert select_party(chars) == [chars[2]]
+        assert select_party(chars, [0, 1, 9]) == [hero]
+
+    def test_monster_stats(self, sample_mon_bytes):
+        assert monster_stats(load_monsters(sample_mon_bytes)) == [
+            (50, 30, 20, 15), (200, 80, 50, 25), (30, 15, 10, 10)]
+
+
+class TestSimulateBatch:
+    def test_reproducible(self):
+        party = [(150, 30, 8, 12, 0.5)] * 4
+        kinds = [(50, 30, 20, 15), (30, 15, 10, 10)]
+        first = simulate_batch(party, kinds, 500, seed='x')
+        assert first == simulate_batch(party, kinds, 500, seed='x')
+        wins, lost, rounds = first
+        assert 0 < wins <= 500 and lost > 0 and rounds >= 500
+
+    def test_overwhelming_sides(self):
+        strong = [(9999, 99, 30, 50, 0.95)] * 4
+        weak = [(1, 0, 0, 0, 0.0)]
+        assert simulate_batch(strong, [(1, 1, 0, 0)], 50)[0] == 50
+        wins, lost, _ = simulate_batch(weak, [(255, 255, 255, 99)], 50)
+        assert wins == 0 and lost == 50
+
+    def test_attack_tables(self):
+        hits, scales, damage, guards, wounds = _attack_tables(
+            [(100, 30, 2, 3, 0.25), (100, 99, 0, 0, 1.0)], 20, 4)
+        assert hits == [0.6, 0.95]
+        assert damage == [[3, 4, 5, 5], [1, 1]]
+        assert scales[0] == pytest.approx(3 / 0.6)
+        assert guards == [(0.25, 4 / 0.75), (1.0, 0.0)]
+        assert wounds == [1, 2, 3, 4, 4]
+
+    def test_stalemate_is_a_loss(self):
+        # Party can barely hit; monster can never get past perfect evasion
+        party = [(100, 0, 0, 0, 1.0)]
+        wins, lost, rounds = simulate_batch(party, [(255, 1, 255, 0)], 3, group=8)
+        assert (wins, lost, rounds) == (0, 0, 3 * MAX_ROUNDS)
+
+
+class TestSimulateGroups:
+    def test_aggregates_batches(self, monkeypatch):
+        monkeypatch.setattr('ult3edit.simulate.BATCH_SIZE', 40)
+        party = [(150, 30, 8, 12, 0.5)] * 2
+        groups = {'MONA': [(50, 30, 20, 15)], 'MONB': [], 'MONC': [(30, 15, 10, 10)]}
+        serial = simulate_groups(party, groups, trials=100, jobs=1, seed=3)
+        assert list(serial) == ['MONA', 'MONC']
+        assert serial['MONA']['trials'] == 100
+        assert 0 <= serial['MONA']['win_rate'] <= 1
+        assert serial['MONA']['damage'] == pytest.approx(
+            sum(simulate_batch(party, groups['MONA'], n, 4, f'3:MONA:{b}')[1]
+                for b, n in enumerate((40, 40, 20))) / 100)
+        assert simulate_groups(party, groups, trials=100, jobs=2, seed=3) == serial
+
+    def test_empty_party(self):
+        with pytest.raises(ValueError, match='no living'):
+            simulate_groups([], {'MONA': [(1, 1, 1, 1)]})
+
+    @pytest.mark.parametrize('kw', [{'group': 0}, {'group': -1}, {'trials': 0}, {'jobs': -1}])
+    def test_rejects_bad_counts(self, kw):
+        party = [(150, 30, 8, 12, 0.5)]
+        with pytest.raises(ValueError, match='must be'):
+            simulate_groups(party, {'MONA': [(1, 1, 1, 1)]}, **{'jobs': 1, **kw})
@@ -0,0 +1,115 @@
+"""Tests for the cross-map tile index."""
+
+import json
+import os
+import random
+from pathlib import Path
+
+import pytest
+
+from ult3edit.constants import MAP_OVERWORLD_SIZE, MAP_DUNGEON_SIZE, CON_FILE_SIZE
+from ult3edit.tileindex import INDEX_VERSION, TileIndex, canonical_tile, scan
+
+
+def _game(game_dir):
+    mapa = bytearray(b'\x04' * MAP_OVERWORLD_SIZE)
+    mapa[10 * 64 + 10] = 0x18                  # town
+    mapa[20 * 64 + 30] = 0x89                  # moongate, animation frame 1
+    Path(game_dir, 'MAPA#060000').write_bytes(mapa)
+    mapm = bytearray(MAP_DUNGEON_SIZE)
+    mapm[3 * 256 + 2 * 16 + 5] = 0x14          # chest with high bits, level 3 (5, 2)
+    Path(game_dir, 'MAPM#060000').write_bytes(mapm)
+    con = bytearray(CON_FILE_SIZE)
+    con[:121] = b'\x04' * 121
+    con[121:] = b'\x18' * (CON_FILE_SIZE - 121)   # padding/positions are not tiles
+    Path(game_dir, 'CONA#069900').write_bytes(con)
+    shrn = bytearray(128)
+    shrn[12] = 0x18
+    Path(game_dir, 'SHRN#069800').write_bytes(shrn)
+    return game_dir
+
+
+class TestScan:
+    def test_matches_reference(self):
+        rng = random.Random(7)
+        data = bytes(rng.choice((0x00, 0x04, 0x05, 0x18, 0x41)) for _ in range(4096))
+        expected = {}
+        for i, b in enumerate(data):
+            expected.setdefault(b & 0xFC, []).append(i)
+        assert scan(data) == dict(sorted(expected.items()))
+
+    def test_masks(self):
+        assert scan(bytes([0x01, 0xF1, 0x00])) == {0x00: [0, 2], 0xF0: [1]}
+        assert scan(bytes([0x01, 0xF1, 0x00]), dungeon=True) == {0x00: [2], 0x01: [0, 1]}
+
+    def test_canonical_tile(self):
+        assert canonical_tile(0x8B) == 0x88
+        assert canonical_tile(0xF4, dungeon=True) == 0x04
+
+
+class TestTileIndex:
+    def test_refresh_and_locations(self, tmp_dir):
+        index = TileIndex()
+        assert index.refresh(_game(tmp_dir)) == ['MAPA', 'MAPM', 'CONA', 'SHRN']
+        assert len(index) == 4
+        assert index.locations(0x88) == [('MAPA', 30, 20, None)]
+        assert index.locations(0x18) == [('MAPA', 10, 10, None), ('SHRN', 1, 1, None)]
+        assert index.locations(0x04, dungeon=True) == [('MAPM', 5, 2, 3)]
+        assert index.locations(0x04, dungeon=True, level=2) == []
+        assert index.locations(0xFC) == []
+
+    def test_histograms(self, tmp_dir):
+        index = TileIndex()
+        index.refresh(_game(tmp_dir))
+        assert index.histogram('CONA#069900') == {0x04: 121}
+        surface = index.histogram()
+        assert sum(surface.values()) == MAP_OVERWORLD_SIZE + 2 * 121
+        assert surface[0x18] == 2
+        assert index.histogram(dungeon=True) == {0x00: MAP_DUNGEON_SIZE - 1, 0x04: 1}
+
+    def test_incremental_update(self, tmp_dir):
+        index = TileIndex()
+        index.refresh(_game(tmp_dir))
+        assert index.refresh(tmp_dir) == []
+        mapa = bytearray(b'\x04' * MAP_OVERWORLD_SIZE)
+        mapa[0] = 0x1C
+        Path(tmp_dir, 'MAPA#060000').write_bytes(mapa)
+        os.remove(os.path.join(tmp_dir, 'SHRN#069800'))
+        assert index.refresh(tmp_dir) == ['MAPA', 'SHRN']
+        assert index.locations(0x88) == []
+        assert index.locations(0x18) == []
+        assert 0x18 not in index.surface
+        assert index.locations(0x1C) == [('MAPA', 0, 0, None)]
+        assert index.update('MAPA', bytes(mapa)) is False
+
+    def test_empty_data_removes(self):
+        index = TileIndex()
+        assert index.update('BRND', b'') is False
+        index.update('BRND', b'\x04' * 128)
+        assert index.update('BRND', b'') is True
+        assert index.files == {}
+        index.remove('BRND')
+
+    def test_persistence(self, tmp_dir):
+        index = TileIndex()
+        index.refresh(_game(tmp_dir))
+        path = os.path.join(tmp_dir, 'tiles.json')
+        index.save(path)
+        loaded = TileIndex.load(path)
+        assert loaded.files == index.files
+        assert loaded.surface == index.surface and loaded.dungeon == index.dungeon
+        assert loaded.refresh(tmp_dir) == []
+
+    @pytest.mark.parametrize('content', [
+        'not json',
+        json.dumps({'version': 0, 'files': {}}),
+        json.dumps({'version': INDEX_VERSION, 'files': {'MAPA': {'sha1': 'x'}}}),
+        json.dumps({'version': INDEX_VERSION, 'files': {'MAPA': {
+            'sha1': 'x', 'dungeon': False, 'width': 64, 'tiles': {'zz': [0]}}}}),
+    ])
+    def test_bad_cache_gives_empty_index(self, tmp_dir, content):
+        path = os.path.join(tmp_dir, 'tiles.json')
+        with open(path, 'w') as f:
+            f.write(content)
+        assert TileIndex.load(path).files == {}
+        assert TileIndex.load(os.path.join(tmp_dir, 'missing.json')).files == {}
@@ -159,3 +159,92 @@ class TestPalette:
         state.selected_tile = state.palette[5]
         assert state.palette_index == 5
         assert state.selected_tile == state.palette[5]
+
+
+class TestRasterOps:
+    def test_fill_rect_is_one_undo_group(self):
+        state = EditorState(data=bytearray(16), width=4, height=4)
+        state.selected_tile = 0x18
+        state.data[5] = 0x18
+        assert state.fill_rect(1, 1, 2, 2) == 3
+        assert state.tile_at(2, 2) == 0x18 and state.dirty
+        state.undo()
+        assert state.data == bytearray(5) + b'\x18' + bytearray(10)
+        assert not state.dirty
+        state.redo()
+        assert state.data.count(0x18) == 4
+
+    def test_replace_all(self):
+        state = EditorState(data=bytearray([4, 0, 4, 0]), width=2, height=2)
+        state.selected_tile = 0x0C
+        assert state.replace_all(0x04) == 2
+        assert state.data == bytearray([0x0C, 0, 0x0C, 0])
+        assert state.replace_all(0x08) == 0
+        assert state.history.undo_depth == 1
+
+
+class TestFloodFill:
+    def test_fills_connected_region_only(self):
+        # Water with a wall column splitting it
+        data = bytearray(b'\x00\x00\x8c\x00' * 4)
+        state = EditorState(data=data, width=4, height=4)
+        state.selected_tile = 0x04
+        state.cursor_x, state.cursor_y = 1, 2
+        assert state.flood_fill() == 8
+        assert state.data == bytearray(b'\x04\x04\x8c\x00' * 4)
+        assert state.history.undo_depth == 1
+        state.undo()
+        assert state.data == bytearray(b'\x00\x00\x8c\x00' * 4)
+
+    def test_same_tile_is_noop(self):
+        state = EditorState(data=bytearray(16), width=4, height=4)
+        state.selected_tile = 0x00
+        assert state.flood_fill() == 0
+        assert state.history.undo_depth == 0
+
+    def test_whole_overworld(self):
+        state = EditorState(data=bytearray(4096), width=64, height=64)
+        state.selected_tile = 0x04
+        assert state.flood_fill() == 4096
+        assert state.history.undo_depth == 1
+
+
+class TestSelection:
+    def test_rect_select_and_fill(self):
+        state = EditorState(data=bytearray(16), width=4, height=4)
+        state.selected_tile = 0x0C
+        state.cursor_x, state.cursor_y = 2, 2
+        state.toggle_rect_select()
+        assert state.selection is None and state.select_anchor == (2, 2)
+        state.cursor_x, state.cursor_y = 1, 1
+        state.toggle_rect_select()
+        assert state.is_selected(1, 2) and not state.is_selected(0, 0)
+        assert not state.is_selected(9, 9)
+        assert state.fill_selection() == 4
+        assert state.history.undo_depth == 1
+        state.undo()
+        assert state.data == bytearray(16)
+
+    def test_replace_within_selection(self):
+        state = EditorState(data=bytearray(16), width=4, height=4)
+        state.selected_tile = 0x04
+        state.cursor_x, state.cursor_y = 0, 0
+        state.toggle_rect_select()
+        state.cursor_x = 1
+        state.toggle_rect_select()
+        assert state.replace_all(0x00) == 2
+        assert state.data[:4] == bytearray([4, 4, 0, 0])
+
+    def test_lasso(self):
+        state = EditorState(data=bytearray(64), width=8, height=8)
+        state.close_lasso()
+        assert state.selection is None
+        for x, y in ((1, 1), (6, 1), (6, 6), (1, 6)):
+            state.cursor_x, state.cursor_y = x, y
+            state.add_lasso_point()
+        state.close_lasso()
+        assert state.lasso == []
+        assert sum(state.selection) == 36
+        state.clear_selection()
+        assert state.selection is None
+        assert state.fill_selection() == 0
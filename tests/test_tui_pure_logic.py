@@ -66,8 +66,120 @@ class TestBaseTileEditorPureLogic:
         editor._extra_keybindings(None)  # Should not raise
 
 
+class TestRowRenderCache:
+    """BaseTileEditor.render_row re-renders only rows whose inputs changed."""
+
+    def _editor(self):
+        state = EditorState(data=bytearray(4096), width=64, height=64)
+        state.viewport_w, state.viewport_h = 40, 20
+        editor = BaseTileEditor(state, 'test')
+        calls = []
+        render = editor._render_cell
+
+        def counting(x, y, tile_byte):
+            calls.append(y)
+            return render(x, y, tile_byte)
+        editor._render_cell = counting
+        return editor, calls
+
+    def _render_viewport(self, editor):
+        st = editor.state
+        return [editor.render_row(st.viewport_y + vy) for vy in range(st.viewport_h)]
+
+    def test_paint_rerenders_one_row(self):
+        editor, calls = self._editor()
+        state = editor.state
+        first = self._render_viewport(editor)
+        assert len(calls) == 40 * 20
+        assert first[0][1] == ('class:cursor', '~')
+        calls.clear()
+        assert self._render_viewport(editor) == first
+        assert calls == []
+        state.selected_tile = 0x04
+        state.set_tile(5, 7, 0x04)
+        self._render_viewport(editor)
+        assert set(calls) == {7}
+        calls.clear()
+        state.undo()
+        self._render_viewport(editor)
+        assert set(calls) == {7}
+        calls.clear()
+        state.redo()
+        state.set_tile(6, 9, 0x08, track_undo=False)
+        self._render_viewport(editor)
+        assert set(calls) == {7, 9}
+
+    def test_cursor_scroll_and_fill(self):
+        editor, calls = self._editor()
+        state = editor.state
+        self._render_viewport(editor)
+        calls.clear()
+        state.move_cursor(0, 1)
+        self._render_viewport(editor)
+        assert set(calls) == {0, 1}
+        calls.clear()
+        state.selected_tile = 0x04
+        state.fill_rect(0, 3, 63, 4)
+        self._render_viewport(editor)
+        assert set(calls) == {3, 4}
+        calls.clear()
+        state.viewport_x = 5
+        self._render_viewport(editor)
+        assert len(set(calls)) == 20
+
+    def test_selection_invalidates_everything(self):
+        editor, calls = self._editor()
+        state = editor.state
+        self._render_viewport(editor)
+        calls.clear()
+        state.add_lasso_point()
+        self._render_viewport(editor)
+        assert set(calls) == {0}
+        calls.clear()
+        state.toggle_rect_select()
+        state.move_cursor(2, 0)
+        state.toggle_rect_select()
+        row = editor.render_row(0)
+        assert [style for style, _ in row[1:5]] == [
+            'class:highlight', 'class:highlight', 'class:cursor', 'class:tile-water']
+        assert set(calls) == {0}
+        calls.clear()
+        state.clear_selection()
+        self._render_viewport(editor)
+        assert len(set(calls)) == 20
+
+
 # ---- CombatEditor pure logic ----
 
+class TestMinimap:
+    """BaseTileEditor.minimap_lines draws the smallest mip level that fits."""
+
+    def test_overworld_uses_4x_level(self):
+        data = bytearray(b'\x04' * 4096)
+        data[0:4] = b'\x10' * 4
+        data[64:68] = b'\x10' * 4
+        data[128:132] = b'\x10' * 4
+        state = EditorState(data=data, width=64, height=64)
+        state.cursor_x, state.cursor_y = 63, 63
+        state.viewport_w, state.viewport_h = 8, 8
+        lines = BaseTileEditor(state, 'test').minimap_lines()
+        assert (len(lines), len(lines[0])) == (16, 16)
+        assert lines[0][0][1] == '^' and lines[0][1][1] == '.'
+        assert lines[0][0][0].endswith(' underline')       # inside the viewport
+        assert lines[0][2][0].endswith(' underline') is False
+        assert lines[15][15][0] == 'class:cursor'
+
+    def test_small_maps_at_full_size(self):
+        state = EditorState(data=bytearray(256), width=16, height=16, is_dungeon=True)
+        lines = BaseTileEditor(state, 'test').minimap_lines()
+        assert (len(lines), len(lines[0])) == (16, 16)
+        assert len(BaseTileEditor(state, 'test').minimap_lines(4, 4)) == 4
+
+    def test_huge_map_falls_back_to_coarsest(self):
+        state = EditorState(data=bytearray(256 * 256), width=256, height=256)
+        assert len(BaseTileEditor(state, 'test').minimap_lines()) == 32
+
+
 class TestCombatEditorPureLogic:
     """Test CombatEditor methods that don't require prompt_toolkit."""
 
@@ -95,6 +207,16 @@ class TestCombatEditorPureLogic:
         assert style == 'class:overlay-pc'
         assert ch == '1'
 
+    def test_placement_invalidates_rows(self):
+        editor, _ = self._make_editor()
+        epoch = editor.state.render_epoch
+        editor.state.mode = 'monster'
+        editor._place_at_cursor()
+        assert editor.state.render_epoch == epoch + 1
+        editor.state.mode = 'paint'
+        editor._place_at_cursor()
+        assert editor.state.render_epoch == epoch + 1
+
     def test_render_cell_tile(self):
         editor, _ = self._make_editor()
         style, ch = editor._render_cell(1, 1, 0x04)
@@ -779,7 +901,7 @@ class TestUnifiedAppFactories:
                 raise RuntimeError('boom')
 
         failed = UnifiedApp._save_tabs([GoodTab(), BadTab()])
-        assert failed == ['Bad']
+        assert failed == ['Bad: boom']
 
     def test_build_tabs(self):
         from ult3edit.tui.app import UnifiedApp
@@ -1004,18 +1126,18 @@ class TestEditorStateUndoRedo:
         state = EditorState(data=bytearray(64), width=8, height=8)
         state.set_tile(0, 0, 0x10)
         assert state.tile_at(0, 0) == 0x10
-        assert len(state.undo_stack) == 1
+        assert state.history.undo_depth == 1
         assert state.dirty
 
         state.undo()
         assert state.tile_at(0, 0) == 0x00
-        assert len(state.undo_stack) == 0
-        assert len(state.redo_stack) == 1
+        assert state.history.undo_depth == 0
+        assert state.history.redo_depth == 1
         assert not state.dirty
 
         state.redo()
         assert state.tile_at(0, 0) == 0x10
-        assert len(state.redo_stack) == 0
+        assert state.history.redo_depth == 0
         assert state.dirty
 
         # Test no-op undo/redo
@@ -1027,7 +1149,7 @@ class TestEditorStateUndoRedo:
         from ult3edit.tui.base import EditorState
         state = EditorState(data=bytearray(64), width=8, height=8)
         state.set_tile(0, 0, 0x10, track_undo=False)
-        assert len(state.undo_stack) == 0
+        assert state.history.undo_depth == 0
         assert state.tile_at(0, 0) == 0x10
 
     def test_tile_at_out_of_bounds(self):
@@ -1453,27 +1575,27 @@ class TestSearchTabLogic:
         assert tab.results[0]['type'] == 'Party'
         assert tab.results[0]['jump'][0] == 'active_party'
 
-    def test_search_bestiary(self, monkeypatch):
+    def test_search_bestiary(self, sample_mon_bytes):
+        from ult3edit.bestiary import MonsterIndex
         from ult3edit.tui.search_tab import SearchTab
 
-        class MockMonster:
-            def __init__(self, name):
-                self.name = name
-                self.is_empty = False
-
-        monkeypatch.setattr('ult3edit.bestiary.load_monsters',
-                            lambda data, letter: [MockMonster('DRAGON')])
+        index = MonsterIndex()
+        index.update('MONA', sample_mon_bytes)
+        index.update('MONB', sample_mon_bytes)
+        index.update('MONC', sample_mon_bytes)
 
         class MockSession:
             def has_category(self, cat): return cat == 'bestiary'
-            def files_in(self, cat): return [('MONA', 'Monsters A')]
-            def read(self, name): return bytes(256)
+            def files_in(self, cat): return [('MONA', 'Monsters A'), ('MONB', 'Monsters B')]
+            def read(self, name): raise AssertionError('search must use the index')
+            def monster_index(self): return index
 
         tab = SearchTab(MockSession())
         tab.query = 'drag'
         tab._perform_search()
-        assert len(tab.results) == 1
+        assert [r['jump'] for r in tab.results] == [('bestiary', 'MONA', 1), ('bestiary', 'MONB', 1)]
         assert tab.results[0]['type'] == 'Monster'
+        assert tab.results[0]['label'] == 'Dragon (Monsters A, slot 1)'
 
     def test_search_dialog(self):
         from ult3edit.tui.search_tab import SearchTab
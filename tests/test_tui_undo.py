@@ -0,0 +1,93 @@
+"""Tests for the compact grouped undo log (no prompt_toolkit needed)."""
+
+from ult3edit.tui.base import EditorState
+from ult3edit.tui.undo import GROUP_BYTES, MAX_RUN, RECORD_BYTES, UndoLog
+
+
+class TestRecording:
+    def test_fill_is_run_length_encoded(self):
+        log = UndoLog()
+        # A 64x64 fill of water over grass is one run
+        assert log.record((i, 0x04, 0x00) for i in range(4096)) == 1
+        assert log.nbytes == RECORD_BYTES + GROUP_BYTES
+        assert log.undo_depth == 1
+
+    def test_runs_break_on_gaps_and_values(self):
+        log = UndoLog()
+        changes = [(5, 1, 2), (0, 1, 2), (1, 1, 2), (2, 3, 2), (6, 1, 2)]
+        assert log.record(changes) == 3  # [0-1], [2] (different old tile), [5-6]
+        assert log.record([]) == 0
+        assert log.undo_depth == 1
+
+    def test_long_runs_split(self):
+        log = UndoLog()
+        assert log.record((i, 0, 1) for i in range(MAX_RUN + 10)) == 2
+
+
+class TestUndoRedo:
+    def test_group_wise(self):
+        data = bytearray(8)
+        log = UndoLog()
+        data[0:4] = b'\x04' * 4
+        log.record((i, 0, 4) for i in range(4))
+        data[2] = 9
+        log.record([(2, 4, 9)])
+        assert log.undo(data) == [(2, 1)]
+        assert data == bytearray(b'\x04' * 4 + bytes(4))
+        assert log.undo(data) == [(0, 4)]
+        assert data == bytearray(8)
+        assert log.undo(data) is None
+        assert (log.undo_depth, log.redo_depth) == (0, 2)
+        assert log.redo(data) == [(0, 4)]
+        assert log.redo(data) == [(2, 1)]
+        assert log.redo(data) is None
+        assert data == bytearray(b'\x04\x04\x09\x04' + bytes(4))
+
+    def test_new_edit_discards_redo(self):
+        data = bytearray(4)
+        log = UndoLog()
+        data[0] = 1
+        log.record([(0, 0, 1)])
+        log.undo(data)
+        data[1] = 2
+        log.record([(1, 0, 2)])
+        assert (log.undo_depth, log.redo_depth) == (1, 0)
+        log.undo(data)
+        assert data == bytearray(4)
+
+    def test_clear(self):
+        log = UndoLog()
+        log.record([(0, 0, 1)])
+        log.clear()
+        assert (log.undo_depth, log.redo_depth, log.nbytes) == (0, 0, 0)
+
+
+class TestMemoryCap:
+    def test_oldest_groups_dropped(self):
+        per_group = RECORD_BYTES + GROUP_BYTES
+        log = UndoLog(max_bytes=per_group * 3)
+        data = bytearray(100)
+        for i in range(100):
+            data[i] = 1
+            log.record([(i, 0, 1)])
+            assert log.nbytes <= per_group * 3
+        assert log.undo_depth == 3
+        while log.undo(data):
+            pass
+        assert data == b'\x01' * 97 + bytearray(3)
+        assert log.redo_depth == 3
+
+    def test_newest_group_kept_even_if_oversized(self):
+        log = UndoLog(max_bytes=1)
+        log.record([(0, 0, 1), (2, 0, 1)])
+        assert log.undo_depth == 1
+
+    def test_bounded_over_long_session(self):
+        state = EditorState(data=bytearray(4096), width=64, height=64,
+                            history=UndoLog(max_bytes=4096))
+        for n in range(2000):
+            state.cursor_x, state.cursor_y = n % 64, (n * 7) % 64
+            state.selected_tile = 0x04 + 4 * (n % 3)
+            state.paint()
+        assert state.history.nbytes <= 4096
+        assert state.history.undo_depth == 4096 // (RECORD_BYTES + GROUP_BYTES)
@@ -0,0 +1,286 @@
+"""Tests for the batch game validator."""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+from ult3edit import validate as validate_mod
+from ult3edit.constants import CHAR_STR, CON_PC_X_OFFSET, PRTY_OFF_TRANSPORT
+from ult3edit.validate import (
+    file_kind, validate_data, validate_directory, validate_image, validate_path,
+    validate_paths, load_cache, save_cache, format_text, cmd_validate,
+)
+
+
+def _corrupt_game(game_dir, sample_roster_bytes, sample_prty_bytes):
+    """Introduce one roster issue and one party issue."""
+    rost = bytearray(sample_roster_bytes)
+    rost[CHAR_STR] = 0xAA  # invalid BCD
+    Path(game_dir, 'ROST#069500').write_bytes(bytes(rost))
+    prty = bytearray(sample_prty_bytes)
+    prty[PRTY_OFF_TRANSPORT] = 0x77  # unknown transport
+    Path(game_dir, 'PRTY#060000').write_bytes(bytes(prty))
+
+
+def _args(paths, **kw):
+    defaults = {'paths': paths, 'json': False, 'output': None, 'jobs': 1, 'cache': None}
+    defaults.update(kw)
+    return argparse.Namespace(**defaults)
+
+
+class TestFileKind:
+    def test_known(self):
+        assert file_kind('ROST#069500') == 'ROST'
+        assert file_kind('/x/PLRS') == 'PLRS'
+        assert file_kind('prty') == 'PRTY'
+        assert file_kind('MONZ#069900') == 'MON'
+        assert file_kind('CONF') == 'CON'
+
+    def test_unknown(self):
+        assert file_kind('MAPA') is None
+        assert file_kind('MONX') is None
+        assert file_kind('CONX') is None
+        assert file_kind('TEXT') is None
+
+
+class TestValidateData:
+    def test_clean_roster(self, sample_roster_bytes):
+        entry = validate_data('ROST', sample_roster_bytes, {})
+        assert entry['file'] == 'ROST'
+        assert entry['type'] == 'ROST'
+        assert entry['issues'] == []
+
+    def test_roster_issue(self, sample_roster_bytes):
+        rost = bytearray(sample_roster_bytes)
+        rost[CHAR_STR] = 0xAA
+        entry = validate_data('ROST#069500', bytes(rost), {})
+        assert entry['issues'][0]['entity'] == 'Slot 0'
+        assert 'Strength' in entry['issues'][0]['message']
+
+    def test_monster_issue(self, sample_mon_bytes):
+        mon = bytearray(sample_mon_bytes)
+        mon[2 * 16 + 0] = 0x01  # undefined flags1 bit on monster 0
+        entry = validate_data('MONA', bytes(mon), {})
+        assert entry['type'] == 'MON'
+        assert entry['issues'] == [{'entity': 'Monster 0',
+                                    'message': 'Undefined flag1 bits: $01'}]
+
+    def test_combat_issue(self, sample_con_bytes):
+        con = bytearray(sample_con_bytes)
+        con[CON_PC_X_OFFSET] = 20
+        entry = validate_data('CONA', bytes(con), {})
+        assert any('PC 0' in i['message'] for i in entry['issues'])
+
+    def test_plrs_limited_to_four_slots(self, sample_character_bytes):
+        rec = bytearray(sample_character_bytes)
+        rec[CHAR_STR] = 0xAA
+        data = bytes(rec) * 5
+        entry = validate_data('PLRS', data, {})
+        assert {i['entity'] for i in entry['issues']} == {'Slot 0', 'Slot 1', 'Slot 2', 'Slot 3'}
+
+    def test_unparseable_file_reported(self):
+        entry = validate_data('PRTY', b'\x00\x01', {})
+        assert entry['issues'][0]['entity'] == 'File'
+        entry = validate_data('ROST', b'\x00' * 10, {})
+        assert 'too small' in entry['issues'][0]['message']
+
+    def test_cache_hit_skips_validator(self, sample_prty_bytes, monkeypatch):
+        cache = {}
+        first = validate_data('PRTY', sample_prty_bytes, cache)
+        assert len(cache) == 1
+
+        def boom(data):
+            raise AssertionError('validator should not run on cache hit')
+        monkeypatch.setitem(validate_mod.VALIDATORS, 'PRTY', boom)
+        second = validate_data('PRTY', sample_prty_bytes, cache)
+        assert second == first
+
+    def test_default_cache_is_module_level(self, sample_prty_bytes, monkeypatch):
+        monkeypatch.setattr(validate_mod, '_cache', {})
+        validate_data('PRTY', sample_prty_bytes)
+        assert len(validate_mod._cache) == 1
+
+
+class TestValidateDirectory:
+    def test_all_files_visited(self, sample_game_dir):
+        report = validate_directory(sample_game_dir, {})
+        assert [f['file'] for f in report['files']] == ['ROST', 'PLRS', 'PRTY', 'MONA', 'CONA']
+        assert report['issue_count'] == 0
+
+    def test_issues_counted(self, sample_game_dir, sample_roster_bytes, sample_prty_bytes):
+        _corrupt_game(sample_game_dir, sample_roster_bytes, sample_prty_bytes)
+        report = validate_directory(sample_game_dir, {})
+        # STR $AA: invalid BCD + exceeds race max; PRTY: unknown transport
+        assert report['issue_count'] == 3
+
+    def test_validate_path_missing(self, tmp_dir):
+        report = validate_path(os.path.join(tmp_dir, 'nope'), {})
+        assert 'error' in report
+        assert report['files'] == []
+
+    def test_validate_path_image(self, sample_game_dir, tmp_dir, monkeypatch):
+        image = os.path.join(tmp_dir, 'game.po')
+        Path(tmp_dir, 'game.po').write_bytes(b'\x00' * 16)
+
+        def fake_extract(image_path, output_dir, diskiigs_path=None):
+            for name in os.listdir(sample_game_dir):
+                if '#' in name:
+                    with open(os.path.join(sample_game_dir, name), 'rb') as f:
+                        Path(output_dir, name).write_bytes(f.read())
+            return True
+        monkeypatch.setattr('ult3edit.disk.disk_extract_all', fake_extract)
+        report = validate_path(image, {})
+        assert report['path'] == image
+        assert len(report['files']) == 5
+
+    def test_validate_image_extract_failure(self, tmp_dir, monkeypatch):
+        monkeypatch.setattr('ult3edit.disk.disk_extract_all', lambda *a, **k: False)
+        with pytest.raises(ValueError):
+            validate_image(os.path.join(tmp_dir, 'x.po'), {})
+
+
+class TestValidatePaths:
+    def test_serial(self, sample_game_dir):
+        reports = validate_paths([sample_game_dir, sample_game_dir], jobs=1, cache={})
+        assert len(reports) == 2
+
+    def test_process_pool_merges_cache(self, tmp_path, sample_roster_bytes, sample_prty_bytes):
+        dirs = []
+        for i in range(2):
+            d = tmp_path / f'game{i}'
+            d.mkdir()
+            (d / 'ROST').write_bytes(sample_roster_bytes)
+            prty = bytearray(sample_prty_bytes)
+            prty[3] = i  # distinct content per game
+            (d / 'PRTY').write_bytes(bytes(prty))
+            dirs.append(str(d))
+        cache = {}
+        reports = validate_paths(dirs, jobs=2, cache=cache)
+        assert [r['path'] for r in reports] == dirs
+        # One shared ROST hash + two distinct PRTY hashes
+        assert len(cache) == 3
+
+
+    def test_default_cache(self, sample_game_dir, monkeypatch):
+        monkeypatch.setattr(validate_mod, '_cache', {})
+        validate_paths([sample_game_dir])
+        assert len(validate_mod._cache) == 5
+
+    def test_worker_returns_only_new_entries(self, sample_game_dir):
+        cache = {}
+        with open(os.path.join(sample_game_dir, 'PRTY#060000'), 'rb') as f:
+            validate_data('PRTY', f.read(), cache)
+        report, new_entries = validate_mod._validate_worker((sample_game_dir, dict(cache)))
+        assert len(report['files']) == 5
+        assert len(new_entries) == 4
+        assert not (new_entries.keys() & cache.keys())
+
+    def test_tasks_carry_only_their_entries(self, sample_game_dir, tmp_dir, monkeypatch):
+        cache = {'ROST:unrelated': []}
+        with open(os.path.join(sample_game_dir, 'PRTY#060000'), 'rb') as f:
+            validate_data('PRTY', f.read(), cache)
+        prty_key = next(k for k in cache if k.startswith('PRTY:'))
+        sent = []
+
+        def fake_imap(worker, tasks, jobs, args=()):
+            sent.extend((path, dict(entries)) for path, entries in tasks)
+            return map(worker, tasks)
+        monkeypatch.setattr(validate_mod, 'pool_imap', fake_imap)
+        image = os.path.join(tmp_dir, 'game.po')
+        reports = validate_paths([sample_game_dir, image], jobs=2, cache=cache)
+        assert sent == [(sample_game_dir, {prty_key: cache[prty_key]}), (image, {})]
+        assert len(reports[0]['files']) == 5 and 'error' in reports[1]
+        assert len(cache) == 6
+
+    def test_cached_entries_skips_unreadable(self, tmp_dir, monkeypatch):
+        monkeypatch.setattr(validate_mod, 'game_files',
+                            lambda d: [('ROST', os.path.join(d, 'missing'))])
+        assert validate_mod._cached_entries(tmp_dir, {'ROST:x': []}) == {}
+
+
+class TestCachePersistence:
+    def test_roundtrip(self, tmp_dir):
+        path = os.path.join(tmp_dir, 'cache.json')
+        save_cache(path, {'ROST:abc': []})
+        assert load_cache(path) == {'ROST:abc': []}
+
+    def test_missing_or_corrupt(self, tmp_dir):
+        assert load_cache(os.path.join(tmp_dir, 'missing.json')) == {}
+        path = os.path.join(tmp_dir, 'bad.json')
+        with open(path, 'w') as f:
+            f.write('{not json')
+        assert load_cache(path) == {}
+
+    def test_stale_version_discarded(self, tmp_dir):
+        path = os.path.join(tmp_dir, 'old.json')
+        with open(path, 'w') as f:
+            json.dump({'version': -1, 'entries': {'ROST:abc': []}}, f)
+        assert load_cache(path) == {}
+        with open(path, 'w') as f:
+            json.dump({'version': validate_mod.CACHE_VERSION, 'entries': []}, f)
+        assert load_cache(path) == {}
+
+
+class TestCmdValidate:
+    def test_clean_text(self, sample_game_dir, capsys):
+        cmd_validate(_args([sample_game_dir]))
+        out = capsys.readouterr().out
+        assert 'ROST   OK' in out
+        assert 'Total: 0 issue(s) in 1 game(s)' in out
+
+    def test_issues_exit_nonzero(self, sample_game_dir, sample_roster_bytes,
+                                 sample_prty_bytes, capsys):
+        _corrupt_game(sample_game_dir, sample_roster_bytes, sample_prty_bytes)
+        with pytest.raises(SystemExit) as exc_info:
+            cmd_validate(_args([sample_game_dir]))
+        assert exc_info.value.code == 1
+        out = capsys.readouterr().out
+        assert 'Slot 0: Invalid BCD in Strength' in out
+
+    def test_json_report(self, sample_game_dir, tmp_dir):
+        out_path = os.path.join(tmp_dir, 'report.json')
+        cmd_validate(_args([sample_game_dir], json=True, output=out_path))
+        with open(out_path) as f:
+            report = json.load(f)
+        assert report['issue_count'] == 0
+        assert report['games'][0]['files'][0]['sha1']
+
+    def test_cache_file_written(self, sample_game_dir, tmp_dir, capsys):
+        cache_path = os.path.join(tmp_dir, 'validate-cache.json')
+        cmd_validate(_args([sample_game_dir], cache=cache_path))
+        assert len(load_cache(cache_path)) == 5
+
+    def test_format_text_error_and_empty(self, tmp_dir):
+        text = format_text([
+            {'path': 'a', 'files': [], 'issue_count': 0, 'error': 'Not found: a'},
+            {'path': tmp_dir, 'files': [], 'issue_count': 0},
+        ])
+        assert 'ERROR: Not found: a' in text
+        assert '(no validatable files found)' in text
+        assert '1 error(s)' in text
+
+    def test_main(self, sample_game_dir, monkeypatch, capsys):
+        from ult3edit.validate import main
+        monkeypatch.setattr(sys, 'argv', ['ult3-validate', sample_game_dir, '-j', '1'])
+        main()
+        assert 'Total: 0 issue(s)' in capsys.readouterr().out
+
+    def test_cli_dispatch(self, sample_game_dir, monkeypatch, capsys):
+        from ult3edit.cli import main
+        monkeypatch.setattr(sys, 'argv', ['ult3edit', 'validate', sample_game_dir, '--json'])
+        main()
+        assert json.loads(capsys.readouterr().out)['issue_count'] == 0
+
+    def test_negative_jobs_rejected(self, sample_game_dir, monkeypatch, capsys):
+        from ult3edit.cli import main
+        monkeypatch.setattr(sys, 'argv', ['ult3edit', 'validate', sample_game_dir, '-j', '-1'])
+        with pytest.raises(SystemExit) as exc_info:
+            main()
+        assert exc_info.value.code == 2
+        assert 'expected 0 (CPU count) or more' in capsys.readouterr().err
+        with pytest.raises(ValueError, match='jobs must be 0'):
+            validate_paths([sample_game_dir], jobs=-1)
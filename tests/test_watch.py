@@ -0,0 +1,78 @@
+"""Tests for the save directory watcher."""
+
+import os
+from pathlib import Path
+
+from ult3edit.constants import PRTY_OFF_SAVED_X
+from ult3edit.watch import SaveWatcher, _save_name
+
+
+class TestSaveWatcher:
+    def test_save_name(self):
+        assert _save_name('PRTY#060000') == 'PRTY'
+        assert _save_name('plrs') == 'PLRS'
+        assert _save_name('PRTY#060000.bak') is None
+        assert _save_name('MONA#069900') is None
+
+    def test_baseline_is_silent(self, sample_game_dir):
+        watcher = SaveWatcher(sample_game_dir)
+        assert sorted(watcher.paths) == ['PLRS', 'PRTY', 'ROST']
+        assert watcher.poll() == []
+
+    def test_changed_event(self, sample_game_dir, sample_prty_bytes):
+        path = os.path.join(sample_game_dir, 'PRTY#060000')
+        watcher = SaveWatcher(sample_game_dir)
+        data = bytearray(sample_prty_bytes)
+        data[PRTY_OFF_SAVED_X] = 40
+        Path(path).write_bytes(bytes(data))
+        os.utime(path, ns=(2_000_000_000_000_000_000,) * 2)
+        [event] = watcher.poll()
+        assert event['event'] == 'changed' and event['file'] == 'PRTY'
+        assert event['entities'][0]['changes'] == [{'field': 'x', 'old': 32, 'new': 40}]
+        assert 'time' in event and len(event['sha1']) == 40
+        # Touched but identical: stat differs, hash does not
+        os.utime(path, ns=(2_100_000_000_000_000_000,) * 2)
+        assert watcher.poll() == []
+
+    def test_undecoded_change_and_error(self, sample_game_dir, sample_prty_bytes):
+        path = os.path.join(sample_game_dir, 'PRTY#060000')
+        watcher = SaveWatcher(sample_game_dir)
+        data = bytearray(sample_prty_bytes)
+        data[15] = 0x55  # unused byte
+        Path(path).write_bytes(bytes(data))
+        os.utime(path, ns=(2_000_000_000_000_000_000,) * 2)
+        [event] = watcher.poll()
+        assert event['event'] == 'changed' and event['entities'] == []
+        Path(path).write_bytes(b'\x01')
+        os.utime(path, ns=(2_100_000_000_000_000_000,) * 2)
+        [event] = watcher.poll()
+        assert event['event'] == 'error' and 'too small' in event['error']
+
+    def test_added_and_removed(self, sample_game_dir, sample_prty_bytes):
+        path = os.path.join(sample_game_dir, 'PRTY#060000')
+        os.remove(path)
+        watcher = SaveWatcher(sample_game_dir)
+        assert 'PRTY' not in watcher.paths
+        Path(path).write_bytes(sample_prty_bytes)
+        os.utime(sample_game_dir, ns=(2_000_000_000_000_000_000,) * 2)
+        assert [e['event'] for e in watcher.poll()] == ['added']
+        # Directory listing unchanged (same mtime): the stale path fails to stat
+        st = os.stat(sample_game_dir)
+        os.remove(path)
+        os.utime(sample_game_dir, ns=(st.st_atime_ns, st.st_mtime_ns))
+        assert [(e['event'], e['file']) for e in watcher.poll()] == [('removed', 'PRTY')]
+        assert watcher.poll() == []
+
+    def test_vanishes_mid_poll(self, sample_game_dir, monkeypatch):
+        watcher = SaveWatcher(sample_game_dir)
+        os.utime(os.path.join(sample_game_dir, 'ROST#069500'), ns=(2_000_000_000_000_000_000,) * 2)
+        real_open = open
+
+        def flaky_open(path, *a, **kw):
+            if 'ROST' in str(path):
+                raise FileNotFoundError(path)
+            return real_open(path, *a, **kw)
+        monkeypatch.setattr('builtins.open', flaky_open)
+        assert watcher.poll() == []
+        monkeypatch.undo()
+        assert watcher.poll() == []